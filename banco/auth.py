@@ -1,21 +1,29 @@
 # banco/auth.py
+import math
 import sqlite3
+import threading
+import time
 import uuid
 import bcrypt
+from collections import deque
 from datetime import datetime
-from typing import Tuple, Optional, List, Dict
-from banco.database import conectar
+from typing import Deque, Tuple, Optional, List, Dict
+from banco.database import escrever, usar_conexao
 import os
 
+# fator de custo do bcrypt (2^custo rodadas). Hashes com outro custo são refeitos
+# no próximo login bem-sucedido (ver autenticar)
+CUSTO_BCRYPT = int(os.environ.get("DEVHIVE_BCRYPT_CUSTO", "12"))
+
 # -------------------------
 # Inicialização (tabelas de usuários)
 # -------------------------
 def inicializar_tabela():
     """
     Cria a tabela de usuários com colunas extras (foto, cargo).
-    Se a tabela já existir, tenta adicionar colunas novas (migração simples).
+    Bancos antigos recebem as colunas novas pelas migrações (banco.migracoes).
     """
-    with conectar() as conn:
+    with usar_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS usuarios (
@@ -32,21 +40,7 @@ def inicializar_tabela():
             )
         """)
         conn.commit()
-
-        # Migração minimalista: adiciona colunas se ausentes (robusto para upgrades)
-        cursor.execute("PRAGMA table_info(usuarios)")
-        cols = [row[1] for row in cursor.fetchall()]
-        if 'cargo' not in cols:
-            try:
-                cursor.execute("ALTER TABLE usuarios ADD COLUMN cargo TEXT")
-            except Exception:
-                pass
-        if 'foto' not in cols:
-            try:
-                cursor.execute("ALTER TABLE usuarios ADD COLUMN foto TEXT")
-            except Exception:
-                pass
-        conn.commit()
+        # colunas adicionadas depois (cargo, foto) chegam via banco/migracoes.py
 
 
 # garantir inicialização ao importar
@@ -57,11 +51,107 @@ except Exception:
     pass
 
 
+# -------------------------
+# Hash de senha
+# -------------------------
+def gerar_hash(senha: str, custo: Optional[int] = None) -> str:
+    """bcrypt com o custo configurado (CUSTO_BCRYPT). Lento de propósito: fora da thread da GUI."""
+    return bcrypt.hashpw(senha.encode(), bcrypt.gensalt(rounds=custo or CUSTO_BCRYPT)).decode()
+
+
+def custo_do_hash(senha_hash: str) -> Optional[int]:
+    """Custo gravado no hash ("$2b$12$..." -> 12); None se o formato não for reconhecido."""
+    try:
+        return int(senha_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+# -------------------------
+# Limite de tentativas
+# -------------------------
+class LimitadorTentativas:
+    """
+    Tentativas de login por identificador (email) numa janela deslizante.
+    reservar() conta a tentativa antes de qualquer hash; limpar() zera o
+    identificador depois de um login certo. Passou de MAX_TENTATIVAS dentro de
+    JANELA segundos, as próximas são recusadas sem tocar no banco nem no bcrypt.
+    Fica em memória: reiniciar o app zera os contadores. Guarda no máximo
+    MAX_IDENTIFICADORES; acima disso sai o de tentativa mais antiga.
+    """
+
+    MAX_TENTATIVAS = 5
+    JANELA = 300.0              # segundos
+    MAX_IDENTIFICADORES = 10000
+
+    def __init__(self, max_tentativas: int = MAX_TENTATIVAS, janela: float = JANELA, relogio=time.monotonic):
+        self.max_tentativas = max_tentativas
+        self.janela = janela
+        self._relogio = relogio
+        self._tentativas: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _vigentes(self, identificador: str, agora: float) -> Deque[float]:
+        tentativas = self._tentativas.get(identificador)
+        if tentativas is None:
+            return deque()
+        while tentativas and tentativas[0] <= agora - self.janela:
+            tentativas.popleft()
+        if not tentativas:
+            del self._tentativas[identificador]
+        return tentativas
+
+    def espera(self, identificador: str) -> float:
+        """Segundos até a próxima tentativa ser aceita (0 = liberado)."""
+        with self._lock:
+            agora = self._relogio()
+            tentativas = self._vigentes(identificador, agora)
+            if len(tentativas) < self.max_tentativas:
+                return 0.0
+            return tentativas[-self.max_tentativas] + self.janela - agora
+
+    def reservar(self, identificador: str) -> float:
+        """Conta uma tentativa se houver vaga; devolve 0 ou os segundos de espera (sem contar)."""
+        with self._lock:
+            agora = self._relogio()
+            tentativas = self._vigentes(identificador, agora)
+            if len(tentativas) >= self.max_tentativas:
+                return tentativas[-self.max_tentativas] + self.janela - agora
+            if identificador not in self._tentativas:
+                # muitos identificadores (ex.: varredura de emails): a ordem do dict é a da
+                # última tentativa, então o primeiro é o mais antigo (vencido ou não)
+                while len(self._tentativas) >= self.MAX_IDENTIFICADORES:
+                    del self._tentativas[next(iter(self._tentativas))]
+            else:
+                del self._tentativas[identificador]
+            self._tentativas[identificador] = tentativas
+            tentativas.append(agora)
+            return 0.0
+
+    def limpar(self, identificador: str) -> None:
+        with self._lock:
+            self._tentativas.pop(identificador, None)
+
+
+_limitador: Optional[LimitadorTentativas] = None
+
+
+def obter_limitador() -> LimitadorTentativas:
+    global _limitador
+    if _limitador is None:
+        _limitador = LimitadorTentativas()
+    return _limitador
+
+
+def mensagem_bloqueio(segundos: float) -> str:
+    return f"Muitas tentativas. Tente novamente em {math.ceil(segundos)} s."
+
+
 # -------------------------
 # Utilitários
 # -------------------------
 def existe_usuario() -> bool:
-    with conectar() as conn:
+    with usar_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM usuarios")
         row = cursor.fetchone()
@@ -77,10 +167,7 @@ def criar_usuario(nome: str, email: str, senha: str, cargo: Optional[str] = None
     """
     email = email.strip().lower()
 
-    senha_hash = bcrypt.hashpw(
-        senha.encode(),
-        bcrypt.gensalt()
-    ).decode()
+    senha_hash = gerar_hash(senha)
 
     usuario_id = str(uuid.uuid4())
     data_criacao = datetime.utcnow().isoformat()
@@ -88,23 +175,20 @@ def criar_usuario(nome: str, email: str, senha: str, cargo: Optional[str] = None
     papel = "admin" if not existe_usuario() else "membro"
 
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO usuarios 
-                (id, nome_exibicao, email, senha_hash, papel, cargo, foto, data_criacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                usuario_id,
-                nome.strip(),
-                email,
-                senha_hash,
-                papel,
-                cargo,
-                foto_path,
-                data_criacao
-            ))
-            conn.commit()
+        escrever(lambda cursor: cursor.execute("""
+            INSERT INTO usuarios 
+            (id, nome_exibicao, email, senha_hash, papel, cargo, foto, data_criacao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            usuario_id,
+            nome.strip(),
+            email,
+            senha_hash,
+            papel,
+            cargo,
+            foto_path,
+            data_criacao
+        )))
 
         return True, f"Usuário criado como {papel}."
 
@@ -116,9 +200,19 @@ def criar_usuario(nome: str, email: str, senha: str, cargo: Optional[str] = None
 # Autenticação
 # -------------------------
 def autenticar(email: str, senha: str) -> Tuple[bool, object]:
+    """
+    Confere email/senha. Bloqueia antes de consultar o banco se o email passou
+    do limite de tentativas (obter_limitador()). Roda bcrypt: chame fora da
+    thread da GUI (a TelaLogin usa uma Tarefa).
+    """
     email = email.strip().lower()
+    limitador = obter_limitador()
+    espera = limitador.reservar(email)
+    if espera > 0:
+        return False, mensagem_bloqueio(espera)
 
-    with conectar() as conn:
+    # a conexão volta ao pool antes do bcrypt (centenas de ms)
+    with usar_conexao(somente_leitura=True) as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, nome_exibicao, senha_hash, papel, cargo, foto
@@ -128,48 +222,69 @@ def autenticar(email: str, senha: str) -> Tuple[bool, object]:
 
         usuario = cursor.fetchone()
 
-        if not usuario:
-            return False, "Usuário não encontrado."
+    if not usuario:
+        return False, "Usuário não encontrado."
 
-        usuario_id, nome, senha_hash, papel, cargo, foto = usuario
+    usuario_id, nome, senha_hash, papel, cargo, foto = usuario
 
-        if bcrypt.checkpw(senha.encode(), senha_hash.encode()):
-            atualizar_ultimo_login(usuario_id)
+    if bcrypt.checkpw(senha.encode(), senha_hash.encode()):
+        limitador.limpar(email)
+        if custo_do_hash(senha_hash) != CUSTO_BCRYPT:
+            atualizar_hash_senha(usuario_id, senha_hash, gerar_hash(senha))
+        atualizar_ultimo_login(usuario_id)
 
-            return True, {
-                "id": usuario_id,
-                "nome": nome,
-                "email": email,
-                "papel": papel,
-                "cargo": cargo,
-                "foto": foto
-            }
+        return True, {
+            "id": usuario_id,
+            "nome": nome,
+            "email": email,
+            "papel": papel,
+            "cargo": cargo,
+            "foto": foto
+        }
 
-        return False, "Senha incorreta."
+    return False, "Senha incorreta."
 
 
 # -------------------------
 # Atualizar último login
 # -------------------------
 def atualizar_ultimo_login(usuario_id: str):
-    with conectar() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE usuarios
-            SET ultimo_login = ?
-            WHERE id = ?
-        """, (
-            datetime.utcnow().isoformat(),
-            usuario_id
-        ))
-        conn.commit()
+    """Não espera a gravação (o login não depende dela); retorna o Future do escritor."""
+    ultimo_login = datetime.utcnow().isoformat()
+    return escrever(lambda cursor: cursor.execute("""
+        UPDATE usuarios
+        SET ultimo_login = ?
+        WHERE id = ?
+    """, (
+        ultimo_login,
+        usuario_id
+    )), esperar=False)
+
+
+# -------------------------
+# Refazer hash (custo mudou)
+# -------------------------
+def atualizar_hash_senha(usuario_id: str, hash_antigo: str, hash_novo: str):
+    """
+    Troca o hash só se ainda for o conferido no login (uma troca de senha no
+    meio do caminho vence). Não espera a gravação; retorna o Future do escritor.
+    """
+    return escrever(lambda cursor: cursor.execute("""
+        UPDATE usuarios
+        SET senha_hash = ?
+        WHERE id = ? AND senha_hash = ?
+    """, (
+        hash_novo,
+        usuario_id,
+        hash_antigo
+    )), esperar=False)
 
 
 # -------------------------
 # Listar usuários
 # -------------------------
 def listar_usuarios() -> List[Dict]:
-    with conectar() as conn:
+    with usar_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, nome_exibicao, email, papel, cargo, foto, ativo
@@ -198,7 +313,7 @@ def listar_usuarios() -> List[Dict]:
 def buscar_usuario_por_email(email: str) -> Optional[Dict]:
     email = email.strip().lower()
 
-    with conectar() as conn:
+    with usar_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, nome_exibicao, email, papel, cargo, foto, ativo
@@ -228,7 +343,7 @@ def buscar_usuario_por_email(email: str) -> Optional[Dict]:
 def buscar_usuario_por_nome(nome: str) -> Optional[Dict]:
     nome = nome.strip()
 
-    with conectar() as conn:
+    with usar_conexao() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, nome_exibicao, email, papel, cargo, foto, ativo
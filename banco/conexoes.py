@@ -0,0 +1,192 @@
+# banco/conexoes.py
+"""
+Gerenciador de conexões SQLite do projeto.
+
+Mantém um pool de conexões por thread (sqlite3 não permite compartilhar uma
+conexão entre threads por padrão). Cada conexão é criada uma única vez, recebe
+os PRAGMAs de desempenho (WAL, synchronous, cache, mmap, foreign keys) e é
+reaproveitada pelas chamadas seguintes de conectar().
+
+As conexões entregues são instâncias de ConexaoPool (subclasse de
+sqlite3.Connection), então os call sites existentes continuam iguais:
+- conn.close() (ou conn.devolver()) devolve a conexão ao pool em vez de fechá-la;
+- `with conn:` mantém o significado do sqlite3 (commit/rollback) e NÃO devolve:
+  quem guarda a conexão (ex.: self.conn de um controle) continua dono dela;
+- para um bloco que pega e devolve: `with pool.emprestar() as conn:`
+  (banco.database.usar_conexao), que faz commit/rollback e devolve ao sair.
+
+Pools com somente_leitura=True (banco.database.conectar_leitura) aplicam
+PRAGMA query_only: as escritas da aplicação passam pelo escritor único
+(banco/escritor.py).
+
+ConexaoPool herda de ConexaoRastreada: com o rastreio ligado (banco/rastreio.py)
+os comandos entram nas estatísticas de consultas.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from banco.rastreio import ConexaoRastreada
+
+# PRAGMAs aplicados uma única vez, na criação de cada conexão
+PRAGMAS_PADRAO = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),   # seguro com WAL; evita fsync a cada commit
+    ("cache_size", "-16000"),    # ~16 MB de cache de páginas por conexão
+    ("mmap_size", "268435456"),  # 256 MB de leitura via mmap
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),
+)
+
+MAX_OCIOSAS_POR_THREAD = 4
+TIMEOUT_PADRAO = 30
+
+
+def aplicar_pragmas(conn: sqlite3.Connection, pragmas=PRAGMAS_PADRAO) -> None:
+    cursor = conn.cursor()
+    for nome, valor in pragmas:
+        try:
+            cursor.execute(f"PRAGMA {nome} = {valor}")
+        except sqlite3.DatabaseError:
+            # ex.: WAL indisponível em alguns sistemas de arquivos; segue com o padrão
+            pass
+    cursor.close()
+
+
+class ConexaoPool(ConexaoRastreada):
+    """Conexão que volta para o pool ao ser fechada."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool: Optional["PoolConexoes"] = None
+        self._emprestada = False
+
+    def devolver(self):
+        """Devolve a conexão ao pool (o dono não pode mais usá-la)."""
+        pool = self._pool
+        if pool is None or not self._emprestada:
+            # conexão fora do pool (ou já devolvida): comportamento padrão
+            if pool is None:
+                super().close()
+            return
+        pool._devolver(self)
+
+    def close(self):
+        self.devolver()
+
+    def fechar_definitivo(self):
+        """Fecha a conexão de fato (usado pelo pool)."""
+        self._pool = None
+        self._emprestada = False
+        super().close()
+
+
+class PoolConexoes:
+    """
+    Pool de conexões por thread para um único arquivo de banco.
+
+    Cada thread tem sua própria lista de conexões ociosas; uma conexão só é
+    entregue a uma chamada por vez, então estados como row_factory de um
+    controle não vazam para outro.
+    """
+
+    def __init__(self, caminho: str, timeout: float = TIMEOUT_PADRAO,
+                 max_ociosas: int = MAX_OCIOSAS_POR_THREAD, pragmas=PRAGMAS_PADRAO,
+                 somente_leitura: bool = False):
+        self.caminho = str(caminho)
+        self.timeout = timeout
+        self.max_ociosas = max_ociosas
+        self.somente_leitura = somente_leitura
+        self.pragmas = tuple(pragmas) + ((("query_only", "ON"),) if somente_leitura else ())
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"criadas": 0, "reutilizadas": 0, "devolvidas": 0, "descartadas": 0}
+
+    # ------------------ internos ------------------
+    def _ociosas(self) -> List[ConexaoPool]:
+        ociosas = getattr(self._local, "ociosas", None)
+        if ociosas is None:
+            ociosas = []
+            self._local.ociosas = ociosas
+        return ociosas
+
+    def _contar(self, chave: str):
+        with self._lock:
+            self._stats[chave] += 1
+
+    def _criar(self) -> ConexaoPool:
+        conn = sqlite3.connect(self.caminho, timeout=self.timeout, factory=ConexaoPool)
+        aplicar_pragmas(conn, self.pragmas)
+        conn._pool = self
+        self._contar("criadas")
+        return conn
+
+    def _devolver(self, conn: ConexaoPool):
+        conn._emprestada = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+        except sqlite3.Error:
+            conn.fechar_definitivo()
+            self._contar("descartadas")
+            return
+
+        ociosas = self._ociosas()
+        if len(ociosas) >= self.max_ociosas:
+            conn.fechar_definitivo()
+            self._contar("descartadas")
+            return
+        ociosas.append(conn)
+        self._contar("devolvidas")
+
+    # ------------------ API ------------------
+    def obter(self) -> ConexaoPool:
+        """Retorna uma conexão ociosa da thread atual ou cria uma nova."""
+        ociosas = self._ociosas()
+        if ociosas:
+            conn = ociosas.pop()
+            self._contar("reutilizadas")
+        else:
+            conn = self._criar()
+        conn._emprestada = True
+        return conn
+
+    @contextmanager
+    def emprestar(self) -> Iterator[ConexaoPool]:
+        """`with pool.emprestar() as conn:` — commit/rollback ao sair do bloco e devolve a conexão."""
+        conn = self.obter()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.devolver()
+
+    def fechar_ociosas(self):
+        """Fecha as conexões ociosas da thread atual."""
+        ociosas = self._ociosas()
+        while ociosas:
+            ociosas.pop().fechar_definitivo()
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["ociosas_thread_atual"] = len(self._ociosas())
+        return stats
+
+
+_POOLS: Dict[Tuple[str, bool], PoolConexoes] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def obter_pool(caminho: str, somente_leitura: bool = False) -> PoolConexoes:
+    """Retorna (criando se preciso) o pool associado a um arquivo de banco."""
+    chave = (str(caminho), somente_leitura)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(chave)
+        if pool is None:
+            pool = PoolConexoes(chave[0], somente_leitura=somente_leitura)
+            _POOLS[chave] = pool
+        return pool
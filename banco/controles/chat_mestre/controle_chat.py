@@ -1,8 +1,10 @@
 # banco/controles/controle_chat.py
 
-from banco.database import conectar
+from banco.database import conectar_leitura, escrever
 from typing import List, Tuple, Optional
 
+from nucleo.comandos.contexto import ContextoComando
+
 
 class ChatController:
     """
@@ -19,7 +21,7 @@ class ChatController:
 
     @staticmethod
     def obter_ou_criar_sessao(usuario: str) -> int:
-        conn = conectar()
+        conn = conectar_leitura()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -28,40 +30,95 @@ class ChatController:
         )
 
         row = cursor.fetchone()
+        conn.close()
 
         if row:
-            session_id = row[0]
-        else:
-            cursor.execute(
-                "INSERT INTO chat_sessions (usuario) VALUES (?)",
-                (usuario,)
-            )
-            session_id = cursor.lastrowid
-            conn.commit()
+            return row[0]
 
-        conn.close()
-        return session_id
+        return escrever(lambda cur: cur.execute(
+            "INSERT INTO chat_sessions (usuario) VALUES (?)",
+            (usuario,)
+        ).lastrowid)
 
     # ======================================================
     # MENSAGENS
     # ======================================================
 
+    # tamanho padrão de uma página do histórico
+    PAGINA_MENSAGENS = 50
+
     @staticmethod
-    def salvar_mensagem(session_id: int, remetente: str, conteudo: str):
-        conn = conectar()
+    def salvar_mensagem(session_id: int, remetente: str, conteudo: str) -> int:
+        # escritor único: mensagens de várias threads saem no mesmo commit
+        return escrever(lambda cur: cur.execute(
+            "INSERT INTO chat_mensagens (session_id, remetente, conteudo) VALUES (?, ?, ?)",
+            (session_id, remetente, conteudo)
+        ).lastrowid)
+
+    @staticmethod
+    def listar_pagina(session_id: int, antes_de_id: Optional[int] = None,
+                      limite: int = PAGINA_MENSAGENS) -> List[Tuple]:
+        """
+        Página do histórico por chave (id), da mais antiga para a mais nova:
+        as `limite` mensagens anteriores a `antes_de_id` (None = as mais recentes).
+        Usa idx_chat_mensagens_sessao_id (migração 8); o custo não cresce com a sessão.
+        """
+        conn = conectar_leitura()
+        cursor = conn.cursor()
+
+        if antes_de_id is None:
+            cursor.execute(
+                """
+                SELECT id, remetente, conteudo, criado_em
+                FROM chat_mensagens
+                WHERE session_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (session_id, limite)
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT id, remetente, conteudo, criado_em
+                FROM chat_mensagens
+                WHERE session_id = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (session_id, antes_de_id, limite)
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+        rows.reverse()
+        return rows
+
+    @staticmethod
+    def listar_apos(session_id: int, depois_de_id: int, limite: int = PAGINA_MENSAGENS) -> List[Tuple]:
+        """Até `limite` mensagens posteriores a `depois_de_id`, em ordem (novas mensagens / página seguinte)."""
+        conn = conectar_leitura()
         cursor = conn.cursor()
 
         cursor.execute(
-            "INSERT INTO chat_mensagens (session_id, remetente, conteudo) VALUES (?, ?, ?)",
-            (session_id, remetente, conteudo)
+            """
+            SELECT id, remetente, conteudo, criado_em
+            FROM chat_mensagens
+            WHERE session_id = ? AND id > ?
+            ORDER BY id ASC
+            LIMIT ?
+            """,
+            (session_id, depois_de_id, limite)
         )
 
-        conn.commit()
+        rows = cursor.fetchall()
         conn.close()
+        return rows
 
     @staticmethod
     def listar_mensagens(session_id: int) -> List[Tuple]:
-        conn = conectar()
+        """Histórico completo da sessão (exportação/ferramentas); a UI usa listar_pagina."""
+        conn = conectar_leitura()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -83,17 +140,12 @@ class ChatController:
     # ======================================================
 
     @staticmethod
-    def processar_mensagem(session_id: int, texto: str) -> str:
+    def responder(session_id: int, texto: str, usuario: Optional[str] = None,
+                  contexto: Optional[ContextoComando] = None) -> str:
         """
-        1. Salva mensagem do usuário
-        2. Envia texto para controle_comando (se for comando)
-        3. Recebe resposta
-        4. Salva resposta do sistema
+        Resposta do sistema ao texto (sem gravar nada no chat).
+        Pode demorar: a UI chama pelo PipelineChat, fora da thread da GUI.
         """
-
-        # salva mensagem do usuário
-        ChatController.salvar_mensagem(session_id, "user", texto)
-
         # tenta importar controle_comando dinamicamente
         try:
             try:
@@ -102,10 +154,26 @@ class ChatController:
             except ModuleNotFoundError:
                 # fallback para estruturas antigas
                 from banco.controles.controle_comando import ComandoController
-            resposta = ComandoController.processar_texto(texto, session_id=session_id)
+            return ComandoController.processar_texto(texto, session_id=session_id, usuario=usuario,
+                                                     contexto=contexto)
         except Exception:
             # fallback caso ainda não exista controle_comando
-            resposta = "Mensagem recebida e salva."
+            return "Mensagem recebida e salva."
+
+    @staticmethod
+    def processar_mensagem(session_id: int, texto: str) -> str:
+        """
+        Versão síncrona (scripts/ferramentas); a tela usa o PipelineChat.
+        1. Salva mensagem do usuário
+        2. Envia texto para controle_comando (se for comando)
+        3. Recebe resposta
+        4. Salva resposta do sistema
+        """
+
+        # salva mensagem do usuário
+        ChatController.salvar_mensagem(session_id, "user", texto)
+
+        resposta = ChatController.responder(session_id, texto)
 
         # salva resposta do sistema
         ChatController.salvar_mensagem(session_id, "bot", resposta)
@@ -1,9 +1,136 @@
 # banco/controles/controle_comando.py
 
-from banco.database import conectar
-from typing import List, Tuple, Optional
-
-from nucleo.comandos.chat_router import dispatch_chat_command
+import sqlite3
+import threading
+import time
+
+from banco.database import conectar_leitura, escrever
+from banco.modelos.db_model_alteracoes import (
+    alteracoes_perdidas, informar_posicao, ler_alteracoes, nome_leitor, ultimo_id_alteracao
+)
+from typing import Dict, List, Tuple, Optional
+
+from nucleo.comandos.chat_router import dispatch_chat_command, get_registry
+from nucleo.comandos.contexto import ContextoComando
+from nucleo.comandos.registro import RegistroComandos
+
+
+def _handler_cadastrado(nome: str, descricao: str):
+    def _handler(ctx: ContextoComando, args: str) -> str:
+        return descricao or f"Comando '{nome}' cadastrado, ainda sem ação associada."
+
+    return _handler
+
+
+def _criar_comando_handler(ctx: ContextoComando, args: str) -> str:
+    ok, msg = ComandoController.criar_comando(args)
+    return msg
+
+
+def _listar_comandos_handler(ctx: ContextoComando, args: str) -> str:
+    comandos = ComandoController.listar_comandos()
+    if not comandos:
+        return "Nenhum comando cadastrado."
+    return "\n".join([f"{c[1]} - {'Ativo' if c[2] else 'Arquivado'}" for c in comandos])
+
+
+class _SincronizadorComandos:
+    """
+    Mantém os comandos ativos de chat_comandos no registro do chat.
+
+    A primeira chamada carrega a tabela inteira; as seguintes leem só as
+    alterações de chat_comandos no registro db_alteracoes (migração 7) e
+    recarregam as linhas que mudaram. Sem o registro de alterações, recarrega
+    tudo no máximo a cada INTERVALO_SEM_REGISTRO segundos; se a poda já apagou
+    alterações que ainda não foram lidas (sincronizador parado por mais que
+    LEITOR_EXPIRA), também recarrega tudo.
+    Comandos do código têm prioridade: um nome cadastrado igual a um deles é ignorado.
+    """
+
+    INTERVALO_SEM_REGISTRO = 1.0
+    LIMITE_ALTERACOES = 5000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._desde: Optional[int] = None        # última alteração já aplicada
+        self._por_id: Dict[int, str] = {}        # id em chat_comandos -> keyword registrada
+        self._ultima_carga = 0.0
+        self._registro: Optional[RegistroComandos] = None
+        self._leitor = nome_leitor("comandos")
+
+    def sincronizar(self, registro: RegistroComandos) -> None:
+        with self._lock:
+            if registro is not self._registro:
+                self._registro = registro
+                self._desde = None
+                self._ultima_carga = 0.0
+                self._por_id.clear()
+                registro.register("criar comando", _criar_comando_handler,
+                                  "Cadastra um comando: criar comando <nome>")
+                registro.register("listar comandos", _listar_comandos_handler,
+                                  "Lista os comandos cadastrados e o estado de cada um")
+            conn = conectar_leitura()
+            try:
+                if self._desde is None:
+                    if time.monotonic() - self._ultima_carga >= self.INTERVALO_SEM_REGISTRO:
+                        self._carregar_tudo(conn, registro)
+                else:
+                    self._carregar_alterados(conn, registro)
+            finally:
+                conn.close()
+            if self._desde is not None:
+                informar_posicao(self._leitor, self._desde)
+
+    def _carregar_tudo(self, conn: sqlite3.Connection, registro: RegistroComandos) -> None:
+        self._ultima_carga = time.monotonic()
+        try:
+            desde = ultimo_id_alteracao(conn)
+        except sqlite3.OperationalError:
+            desde = None      # sem db_alteracoes: volta a carregar tudo depois do intervalo
+        for comando_id in list(self._por_id):
+            self._remover(registro, comando_id)
+        rows = conn.execute("SELECT id, nome, descricao, ativo FROM chat_comandos").fetchall()
+        for row in rows:
+            self._aplicar(registro, row)
+        self._desde = desde
+
+    def _carregar_alterados(self, conn: sqlite3.Connection, registro: RegistroComandos) -> None:
+        maximo = ultimo_id_alteracao(conn)
+        if maximo == self._desde:
+            return
+        if alteracoes_perdidas(conn, self._desde):
+            self._carregar_tudo(conn, registro)
+            return
+        lote = ler_alteracoes(conn, self._desde, self.LIMITE_ALTERACOES, tabelas=["chat_comandos"])
+        if len(lote) >= self.LIMITE_ALTERACOES:
+            self._carregar_tudo(conn, registro)
+            return
+        for comando_id in lote.ids("chat_comandos"):
+            self._remover(registro, comando_id)
+            row = conn.execute("SELECT id, nome, descricao, ativo FROM chat_comandos WHERE id = ?",
+                               (comando_id,)).fetchone()
+            if row is not None:
+                self._aplicar(registro, row)
+        # avança também sobre as alterações das outras tabelas
+        self._desde = max(lote.ultimo_id, maximo)
+
+    def _aplicar(self, registro: RegistroComandos, row) -> None:
+        comando_id, nome, descricao, ativo = row
+        existente = registro.get(nome or "")
+        if not ativo or not (nome or "").strip() or (existente is not None and existente.origem != "banco"):
+            return
+        registro.register(nome, _handler_cadastrado(nome, descricao or ""), descricao or "", origem="banco")
+        self._por_id[comando_id] = registro.get(nome).keyword
+
+    def _remover(self, registro: RegistroComandos, comando_id: int) -> None:
+        keyword = self._por_id.pop(comando_id, None)
+        if keyword is not None:
+            cmd = registro.get(keyword)
+            if cmd is not None and cmd.origem == "banco":
+                registro.unregister(keyword)
+
+
+_sincronizador = _SincronizadorComandos()
 
 
 class ComandoController:
@@ -13,34 +140,33 @@ class ComandoController:
     # ======================================================
 
     @staticmethod
-    def processar_texto(texto: str, session_id: Optional[int] = None, usuario: Optional[str] = None) -> str:
+    def processar_texto(texto: str, session_id: Optional[int] = None, usuario: Optional[str] = None,
+                        contexto: Optional[ContextoComando] = None) -> str:
         """
         Decide se o texto corresponde a um comando
         e executa ação correspondente.
+        `contexto` permite ao chamador receber respostas parciais e cancelar
+        (ver banco/controles/chat_mestre/pipeline_chat.py).
         """
 
-        texto_lower = texto.lower().strip()
+        ComandoController.sincronizar_registro()
 
-        # Nova camada: comandos por palavra-chave (registry extensível)
-        resultado = dispatch_chat_command(texto, session_id=session_id, usuario=usuario)
+        # comandos por palavra-chave (registry extensível, inclui os de chat_comandos)
+        resultado = dispatch_chat_command(texto, session_id=session_id, usuario=usuario, contexto=contexto)
         if resultado.matched and resultado.message:
             return resultado.message
 
-        # exemplo simples
-        if texto_lower.startswith("criar comando "):
-            nome = texto[15:].strip()
-            ok, msg = ComandoController.criar_comando(nome)
-            return msg
-
-        if texto_lower.startswith("listar comandos"):
-            comandos = ComandoController.listar_comandos()
-            if not comandos:
-                return "Nenhum comando cadastrado."
-            return "\n".join([f"{c[0]} - {'Ativo' if c[2] else 'Arquivado'}" for c in comandos])
+        if resultado.sugestoes:
+            return "Comando não encontrado. Você quis dizer: " + ", ".join(resultado.sugestoes) + "?"
 
         # nenhum comando identificado
         return "Mensagem recebida e salva."
 
+    @staticmethod
+    def sincronizar_registro(registro: Optional[RegistroComandos] = None) -> None:
+        """Traz para o registro do chat o que mudou em chat_comandos desde a última chamada."""
+        _sincronizador.sincronizar(registro or get_registry())
+
     # ======================================================
     # CRUD DE COMANDOS
     # ======================================================
@@ -50,96 +176,66 @@ class ComandoController:
         if not nome:
             return False, "Nome do comando é obrigatório."
 
-        conn = conectar()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute(
+            escrever(lambda cur: cur.execute(
                 "INSERT INTO chat_comandos (nome, descricao, ativo) VALUES (?, ?, 1)",
                 (nome, descricao)
-            )
-            conn.commit()
+            ))
             return True, "Comando criado com sucesso."
         except Exception:
             return False, "Já existe um comando com esse nome."
-        finally:
-            conn.close()
 
     @staticmethod
     def renomear_comando(nome_atual: str, novo_nome: str):
-        conn = conectar()
-        cursor = conn.cursor()
-
-        cursor.execute(
+        alteradas = escrever(lambda cur: cur.execute(
             "UPDATE chat_comandos SET nome = ? WHERE nome = ?",
             (novo_nome, nome_atual)
-        )
+        ).rowcount)
 
-        if cursor.rowcount == 0:
-            conn.close()
+        if alteradas == 0:
             return False, "Comando não encontrado."
 
-        conn.commit()
-        conn.close()
         return True, "Comando renomeado."
 
     @staticmethod
     def arquivar_comando(nome: str):
-        conn = conectar()
-        cursor = conn.cursor()
-
-        cursor.execute(
+        alteradas = escrever(lambda cur: cur.execute(
             "UPDATE chat_comandos SET ativo = 0 WHERE nome = ?",
             (nome,)
-        )
+        ).rowcount)
 
-        if cursor.rowcount == 0:
-            conn.close()
+        if alteradas == 0:
             return False, "Comando não encontrado."
 
-        conn.commit()
-        conn.close()
         return True, "Comando arquivado."
 
     @staticmethod
     def restaurar_comando(nome: str):
-        conn = conectar()
-        cursor = conn.cursor()
-
-        cursor.execute(
+        alteradas = escrever(lambda cur: cur.execute(
             "UPDATE chat_comandos SET ativo = 1 WHERE nome = ?",
             (nome,)
-        )
+        ).rowcount)
 
-        if cursor.rowcount == 0:
-            conn.close()
+        if alteradas == 0:
             return False, "Comando não encontrado."
 
-        conn.commit()
-        conn.close()
         return True, "Comando restaurado."
 
     @staticmethod
     def deletar_comando(nome: str):
-        conn = conectar()
-        cursor = conn.cursor()
-
-        cursor.execute(
+        alteradas = escrever(lambda cur: cur.execute(
             "DELETE FROM chat_comandos WHERE nome = ?",
             (nome,)
-        )
+        ).rowcount)
 
-        if cursor.rowcount == 0:
-            conn.close()
+        if alteradas == 0:
             return False, "Comando não encontrado."
 
-        conn.commit()
-        conn.close()
         return True, "Comando deletado permanentemente."
 
     @staticmethod
     def listar_comandos() -> List[Tuple]:
-        conn = conectar()
+        conn = conectar_leitura()
         cursor = conn.cursor()
 
         cursor.execute(
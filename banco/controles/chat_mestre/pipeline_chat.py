@@ -0,0 +1,226 @@
+# banco/controles/chat_mestre/pipeline_chat.py
+"""
+Processamento assíncrono das mensagens do chat.
+
+A tela não chama mais ChatController.processar_mensagem (duas gravações e o
+dispatch do comando na thread da GUI). Ela entrega o texto a PipelineChat.enviar()
+e recebe o andamento por um callback `ao_evento(tipo, pedido, dado)`:
+
+1. thread "chat-gravacao": grava a mensagem do usuário assim que ela chega,
+   mesmo que um comando anterior ainda esteja rodando        -> SALVA
+2. thread "chat-comandos": uma mensagem por vez, na ordem de chegada, roda
+   ChatController.responder em um pool de handlers e espera no máximo
+   `timeout` segundos; trechos enviados pelo handler com contexto.parcial()
+   são repassados acumulados, no máximo um a cada INTERVALO_PARCIAL -> PARCIAL
+3. a resposta (ou o aviso de tempo esgotado, com o que já tinha saído) é
+   gravada como mensagem do bot                               -> CONCLUIDA
+
+Erro de banco em qualquer etapa encerra o pedido com FALHOU.
+
+Threads Python não podem ser interrompidas: no tempo esgotado o pipeline
+marca contexto.cancelamento (handlers longos devem consultar
+contexto.cancelado), responde e segue para a próxima mensagem; o handler
+abandonado ocupa um dos MAX_HANDLERS do pool até terminar, e o que ele
+produzir depois disso é descartado.
+
+O callback é chamado nas threads do pipeline; a ponte para sinais Qt fica em
+interface/objeto/processador_chat.py.
+"""
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as TempoEsgotado
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from banco.controles.chat_mestre.controle_chat import ChatController
+from nucleo.comandos.contexto import ContextoComando
+
+# eventos / estados do pedido
+PENDENTE = "pendente"
+SALVA = "salva"
+PARCIAL = "parcial"
+CONCLUIDA = "concluida"
+FALHOU = "falhou"
+
+_ids = itertools.count(1)
+
+
+class FilaChatCheia(RuntimeError):
+    """Levantada por PipelineChat.enviar quando há mensagens demais aguardando."""
+
+
+@dataclass
+class PedidoChat:
+    session_id: int
+    texto: str
+    usuario: Optional[str] = None
+    id: int = field(default_factory=lambda: next(_ids))
+    estado: str = PENDENTE
+    mensagem_id: Optional[int] = None      # mensagem do usuário, depois de gravada
+    resposta_id: Optional[int] = None      # mensagem do bot
+    resposta: str = ""
+    erro: str = ""
+    tempo_esgotado: bool = False
+    contexto: Optional[ContextoComando] = None
+
+    @property
+    def finalizado(self) -> bool:
+        return self.estado in (CONCLUIDA, FALHOU)
+
+
+OuvintePipeline = Callable[[str, PedidoChat, Any], None]
+
+
+class PipelineChat:
+    """Fila de mensagens do chat com gravação imediata e comandos com tempo limite."""
+
+    TIMEOUT = 30.0              # segundos por comando
+    MAX_HANDLERS = 4            # handlers simultâneos (inclui os abandonados por tempo)
+    MAX_PENDENTES = 64
+    INTERVALO_PARCIAL = 0.05    # segundos entre eventos PARCIAL do mesmo pedido
+
+    def __init__(self, ao_evento: Optional[OuvintePipeline] = None, timeout: float = TIMEOUT,
+                 max_handlers: int = MAX_HANDLERS, max_pendentes: int = MAX_PENDENTES):
+        self.ao_evento = ao_evento
+        self.timeout = timeout
+        self.max_pendentes = max_pendentes
+        self._max_handlers = max_handlers
+        self._gravacao: "queue.Queue[Optional[PedidoChat]]" = queue.Queue()
+        self._comandos: "queue.Queue[Optional[PedidoChat]]" = queue.Queue()
+        self._pendentes = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._handlers: Optional[ThreadPoolExecutor] = None
+
+    # -------------------------
+    # Ciclo de vida
+    # -------------------------
+    def iniciar(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._handlers = ThreadPoolExecutor(self._max_handlers, thread_name_prefix="chat-handler")
+            self._threads = [
+                threading.Thread(target=self._laco, args=(self._gravacao, self._gravar),
+                                 name="chat-gravacao", daemon=True),
+                threading.Thread(target=self._laco, args=(self._comandos, self._responder),
+                                 name="chat-comandos", daemon=True),
+            ]
+            for t in self._threads:
+                t.start()
+
+    def parar(self, timeout: Optional[float] = None) -> None:
+        """Termina o que já está na fila e encerra as threads (handlers presos são abandonados)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            handlers, self._handlers = self._handlers, None
+        if not threads:
+            return
+        self._gravacao.put(None)
+        for t in threads:
+            t.join(timeout)
+        handlers.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def pendentes(self) -> int:
+        return self._pendentes
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Bloqueia até não haver pedidos em andamento (ferramentas e benchmarks)."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while self._pendentes:
+            if limite is not None and time.monotonic() > limite:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # -------------------------
+    # API
+    # -------------------------
+    def enviar(self, session_id: int, texto: str, usuario: Optional[str] = None) -> PedidoChat:
+        """Enfileira o texto e retorna já; o andamento chega por ao_evento."""
+        with self._lock:
+            if self._pendentes >= self.max_pendentes:
+                raise FilaChatCheia(f"Há {self._pendentes} mensagens sendo processadas; aguarde um instante.")
+            self._pendentes += 1
+        self.iniciar()
+        pedido = PedidoChat(session_id, texto, usuario)
+        self._gravacao.put(pedido)
+        return pedido
+
+    # -------------------------
+    # Threads do pipeline
+    # -------------------------
+    def _laco(self, fila: "queue.Queue", etapa: Callable[[PedidoChat], None]) -> None:
+        while True:
+            pedido = fila.get()
+            if pedido is None:
+                if fila is self._gravacao:
+                    # a etapa seguinte termina depois de esvaziar a sua fila
+                    self._comandos.put(None)
+                return
+            try:
+                etapa(pedido)
+            except Exception as e:
+                self._falhar(pedido, e)
+
+    def _gravar(self, pedido: PedidoChat) -> None:
+        pedido.mensagem_id = ChatController.salvar_mensagem(pedido.session_id, "user", pedido.texto)
+        pedido.estado = SALVA
+        self._emitir(SALVA, pedido, pedido.mensagem_id)
+        self._comandos.put(pedido)
+
+    def _responder(self, pedido: PedidoChat) -> None:
+        ultimo_parcial = [0.0]
+
+        def _ao_parcial(_trecho: str) -> None:
+            if pedido.finalizado or contexto.cancelado:
+                return
+            agora = time.monotonic()
+            if agora - ultimo_parcial[0] >= self.INTERVALO_PARCIAL:
+                ultimo_parcial[0] = agora
+                self._emitir(PARCIAL, pedido, "".join(contexto.parciais))
+
+        contexto = ContextoComando(texto_original=pedido.texto, session_id=pedido.session_id,
+                                   usuario=pedido.usuario, ao_parcial=_ao_parcial)
+        pedido.contexto = contexto
+        futuro = self._handlers.submit(ChatController.responder, pedido.session_id, pedido.texto,
+                                       pedido.usuario, contexto)
+        try:
+            resposta = futuro.result(timeout=self.timeout)
+        except TempoEsgotado:
+            contexto.cancelamento.set()
+            futuro.cancel()
+            pedido.tempo_esgotado = True
+            parcial = "".join(contexto.parciais)
+            aviso = f"Tempo esgotado: o comando não respondeu em {self.timeout:g}s."
+            resposta = f"{parcial}\n\n{aviso}" if parcial else aviso
+
+        pedido.resposta = resposta
+        pedido.resposta_id = ChatController.salvar_mensagem(pedido.session_id, "bot", resposta)
+        pedido.estado = CONCLUIDA
+        self._terminar()
+        self._emitir(CONCLUIDA, pedido, resposta)
+
+    def _falhar(self, pedido: PedidoChat, erro: Exception) -> None:
+        if pedido.contexto is not None:
+            pedido.contexto.cancelamento.set()
+        pedido.erro = str(erro)
+        pedido.estado = FALHOU
+        self._terminar()
+        self._emitir(FALHOU, pedido, pedido.erro)
+
+    def _terminar(self) -> None:
+        with self._lock:
+            self._pendentes -= 1
+
+    def _emitir(self, tipo: str, pedido: PedidoChat, dado: Any) -> None:
+        if self.ao_evento is None:
+            return
+        try:
+            self.ao_evento(tipo, pedido, dado)
+        except Exception as e:
+            # um ouvinte com problema não pode travar o pipeline
+            print("Erro em ouvinte do pipeline do chat:", e)
@@ -0,0 +1,293 @@
+# banco/controles/kanban/armazem_blobs.py
+"""
+Armazenamento de anexos por conteúdo (SHA-256) com deduplicação.
+
+Layout: <base>/ab/cd/abcd...  (dois níveis de shard pelos primeiros bytes do hash).
+
+- o hash é calculado em blocos, sem carregar o arquivo na memória;
+- um conteúdo já conhecido não é gravado de novo;
+- um conteúdo novo entra por reflink (FICLONE, ex. btrfs/XFS) quando o sistema
+  de arquivos suporta, senão por cópia; a gravação é atômica (arquivo
+  temporário + os.replace);
+- o arquivo que o anexo referencia (caminho_local, na pasta hierárquica do card)
+  é um hardlink para o blob — ou reflink; sem nenhum dos dois, o anexo aponta
+  para o próprio blob. Em nenhum caso os bytes ficam duplicados em disco;
+- os blobs ficam somente leitura (POSIX), para que editar um anexo "no lugar"
+  não altere os demais anexos com o mesmo conteúdo.
+
+A contagem de referências fica na tabela kanban_blobs (banco/modelos/db_model_blobs.py),
+mantida por triggers; coletar_lixo() remove blobs sem referência e arquivos
+perdidos no armazém (ex.: importação interrompida), respeitando um período de
+carência para não competir com importações em andamento.
+
+Manutenção manual:
+    python -m banco.controles.kanban.armazem_blobs --gc [--verificar]
+    python -m banco.controles.kanban.armazem_blobs --deduplicar   # anexos anteriores ao armazém
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sqlite3
+import stat
+import time
+import uuid
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BLOCO_BYTES = 1024 * 1024
+CARENCIA_GC_SEGUNDOS = 3600
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+_PREFIXO_TMP = ".tmp-"
+
+
+def hash_arquivo(caminho: str, avancar: Optional[Callable[[int], None]] = None) -> Tuple[str, int]:
+    """SHA-256 e tamanho, lendo em blocos. avancar(n) é chamado a cada bloco lido."""
+    h = hashlib.sha256()
+    tamanho = 0
+    with open(caminho, "rb") as f:
+        while True:
+            bloco = f.read(BLOCO_BYTES)
+            if not bloco:
+                break
+            h.update(bloco)
+            tamanho += len(bloco)
+            if avancar is not None:
+                avancar(len(bloco))
+    return h.hexdigest(), tamanho
+
+
+def _reflink(origem: str, destino: str) -> bool:
+    """Clona os extents de origem em destino (copy-on-write). False se não suportado."""
+    if fcntl is None:
+        return False
+    try:
+        with open(origem, "rb") as src, open(destino, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(destino)
+        except OSError:
+            pass
+        return False
+
+
+class ArmazemBlobs:
+    def __init__(self, base_dir: str):
+        self.base_dir = os.path.abspath(base_dir)
+
+    # ------------------ caminhos ------------------
+    def caminho(self, sha: str) -> str:
+        return os.path.join(self.base_dir, sha[:2], sha[2:4], sha)
+
+    def contem(self, caminho: Optional[str]) -> bool:
+        return bool(caminho) and os.path.abspath(caminho).startswith(self.base_dir + os.sep)
+
+    def _tmp(self) -> str:
+        os.makedirs(self.base_dir, exist_ok=True)
+        return os.path.join(self.base_dir, f"{_PREFIXO_TMP}{uuid.uuid4().hex}")
+
+    def _publicar(self, tmp: str, sha: str) -> None:
+        """Move o temporário para o endereço do conteúdo (ou descarta, se já existir)."""
+        destino = self.caminho(sha)
+        if os.path.exists(destino):
+            os.remove(tmp)
+            # renova o mtime: a coleta de lixo respeita a carência de blobs "tocados"
+            os.utime(destino)
+            return
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        if os.name == "posix":
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp, destino)
+
+    # ------------------ entrada ------------------
+    def armazenar(self, origem: str, avancar: Optional[Callable[[int], None]] = None) -> Tuple[str, int]:
+        """Guarda o conteúdo de `origem` (se ainda não existir). Retorna (sha256, tamanho)."""
+        sha, tamanho = hash_arquivo(origem, avancar)
+        destino = self.caminho(sha)
+        if os.path.exists(destino):
+            os.utime(destino)
+            return sha, tamanho
+        tmp = self._tmp()
+        try:
+            if not _reflink(origem, tmp):
+                shutil.copyfile(origem, tmp)
+            self._publicar(tmp, sha)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return sha, tamanho
+
+    def adotar(self, caminho: str, sha: str) -> None:
+        """
+        Coloca no armazém um arquivo que já pertence ao app (dentro de IMPORT_BASE_DIR)
+        sem copiar: hardlink, senão reflink, senão cópia.
+        """
+        tmp = self._tmp()
+        try:
+            try:
+                os.link(caminho, tmp)
+            except OSError:
+                if not _reflink(caminho, tmp):
+                    shutil.copyfile(caminho, tmp)
+            self._publicar(tmp, sha)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def armazenar_stream(self, leitor: BinaryIO, avancar: Optional[Callable[[int], None]] = None) -> Tuple[str, int]:
+        """Grava um stream (ex.: membro de ZIP) calculando o hash na mesma passada."""
+        h = hashlib.sha256()
+        tamanho = 0
+        tmp = self._tmp()
+        try:
+            with open(tmp, "xb") as saida:
+                while True:
+                    bloco = leitor.read(BLOCO_BYTES)
+                    if not bloco:
+                        break
+                    h.update(bloco)
+                    saida.write(bloco)
+                    tamanho += len(bloco)
+                    if avancar is not None:
+                        avancar(len(bloco))
+            sha = h.hexdigest()
+            self._publicar(tmp, sha)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return sha, tamanho
+
+    def materializar(self, sha: str, destino: str) -> str:
+        """
+        Disponibiliza o blob em `destino` sem copiar bytes: hardlink, senão reflink.
+        Retorna o caminho a gravar em caminho_local (o próprio blob se nenhum dos dois funcionar).
+        """
+        blob = self.caminho(sha)
+        try:
+            os.link(blob, destino)
+            return destino
+        except OSError:
+            pass
+        if _reflink(blob, destino):
+            return destino
+        return blob
+
+    # ------------------ manutenção ------------------
+    def verificar(self, sha: str) -> bool:
+        """Confere se o conteúdo do blob ainda corresponde ao hash."""
+        caminho = self.caminho(sha)
+        return os.path.isfile(caminho) and hash_arquivo(caminho)[0] == sha
+
+    def _remover(self, caminho: str) -> int:
+        try:
+            tamanho = os.path.getsize(caminho)
+            os.remove(caminho)
+            return tamanho
+        except OSError:
+            return 0
+
+    def _recente(self, caminho: str, limite: float) -> bool:
+        try:
+            return os.path.getmtime(caminho) > limite
+        except OSError:
+            return False
+
+    @staticmethod
+    def _gravar_em(conn: sqlite3.Connection, funcao: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """Roda funcao(cursor) numa transação de `conn`, com commit/rollback explícitos."""
+        cur = conn.cursor()
+        try:
+            resultado = funcao(cur)
+            conn.commit()
+            return resultado
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def coletar_lixo(self, conn: sqlite3.Connection, carencia: float = CARENCIA_GC_SEGUNDOS,
+                     verificar: bool = False,
+                     gravar: Optional[Callable[[Callable[[sqlite3.Cursor], Any]], Any]] = None) -> Dict[str, int]:
+        """
+        Remove blobs com refs <= 0 e arquivos do armazém que não estão em kanban_blobs,
+        desde que não tenham sido tocados nos últimos `carencia` segundos.
+        Com verificar=True também recalcula o hash dos blobs em uso e conta os corrompidos.
+
+        `conn` só é lida. As linhas de kanban_blobs saem numa transação só, via
+        gravar(funcao) — o controle passa o escritor único (banco.database.escrever);
+        sem `gravar`, commit explícito em `conn`. Os arquivos são apagados depois do commit.
+        """
+        limite = time.time() - carencia
+        stats = {"removidos": 0, "bytes": 0, "ausentes": 0, "corrompidos": 0}
+
+        orfaos = [r[0] for r in conn.execute("SELECT sha256 FROM kanban_blobs WHERE refs <= 0").fetchall()]
+        candidatos = [sha for sha in orfaos if not self._recente(self.caminho(sha), limite)]
+
+        def _apagar(cur: sqlite3.Cursor) -> List[str]:
+            # só apaga se continuar sem referência (outra importação pode ter acabado de usar)
+            return [sha for sha in candidatos
+                    if cur.execute("DELETE FROM kanban_blobs WHERE sha256 = ? AND refs <= 0", (sha,)).rowcount]
+
+        apagados = (gravar(_apagar) if gravar else self._gravar_em(conn, _apagar)) if candidatos else []
+        for sha in apagados:
+            caminho = self.caminho(sha)
+            # republicado no meio do caminho (importação nova do mesmo conteúdo): fica
+            if os.path.exists(caminho) and not self._recente(caminho, limite):
+                stats["bytes"] += self._remover(caminho)
+                stats["removidos"] += 1
+
+        conhecidos = {r[0] for r in conn.execute("SELECT sha256 FROM kanban_blobs").fetchall()}
+        if os.path.isdir(self.base_dir):
+            for raiz, dirs, arquivos in os.walk(self.base_dir, topdown=False):
+                for nome in arquivos:
+                    caminho = os.path.join(raiz, nome)
+                    if nome in conhecidos:
+                        if verificar and not self.verificar(nome):
+                            stats["corrompidos"] += 1
+                        continue
+                    try:
+                        if os.path.getmtime(caminho) > limite:
+                            continue
+                    except OSError:
+                        continue
+                    stats["bytes"] += self._remover(caminho)
+                    stats["removidos"] += 1
+                if raiz != self.base_dir:
+                    try:
+                        os.rmdir(raiz)
+                    except OSError:
+                        pass
+
+        for sha in conhecidos:
+            if not os.path.exists(self.caminho(sha)):
+                stats["ausentes"] += 1
+        return stats
+
+
+if __name__ == "__main__":
+    from banco.controles.kanban.controle_card import ControleCardKanban
+
+    parser = argparse.ArgumentParser(description="Armazém de blobs dos anexos do Kanban")
+    parser.add_argument("--gc", action="store_true", help="remove blobs sem referência")
+    parser.add_argument("--verificar", action="store_true", help="confere o hash dos blobs em uso")
+    parser.add_argument("--deduplicar", action="store_true", help="move para o armazém os anexos antigos")
+    args = parser.parse_args()
+    if args.gc or args.verificar or args.deduplicar:
+        controle = ControleCardKanban()
+        try:
+            if args.deduplicar:
+                print(controle.deduplicar_anexos_existentes())
+            if args.gc or args.verificar:
+                print(controle.coletar_lixo_blobs(verificar=args.verificar))
+        finally:
+            controle.close()
+    else:
+        parser.print_help()
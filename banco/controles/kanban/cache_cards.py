@@ -0,0 +1,167 @@
+# banco/controles/kanban/cache_cards.py
+"""
+Cache LRU das leituras por card do ControleCardKanban.
+
+Durante uma renderização o mesmo card é lido várias vezes (load_card_data,
+view_card, _render_dialog_sections...). O cache guarda o resultado já montado
+(meta já convertido de JSON) por chave (tipo, card_id, ...), limitado por
+número de entradas, e conta acertos/faltas.
+
+A invalidação é feita pelo próprio controle: cada método de escrita derruba as
+entradas do card que alterou (invalidar_card) ou, em escritas em lote
+(purge_subtree, exclusão com CASCADE), limpa tudo. Escritas de outras conexões
+(tarefas em background, outro processo) são detectadas pelo PRAGMA data_version
+da conexão do controle, que muda a cada commit alheio: consultado a cada
+leitura (obter), ele descarta o cache inteiro quando mudou, então uma leitura
+nunca devolve dado anterior a um commit já concluído. Com INTERVALO_VERSAO > 0
+a consulta passa a ser feita no máximo uma vez por intervalo, e commits alheios
+podem ficar invisíveis por até INTERVALO_VERSAO segundos.
+As escritas do próprio controle passam pelo escritor do banco (outra conexão)
+e rodam dentro de escrita_propria(), que aceita a versão nova só quando o lote
+do escritor tinha apenas aquela escrita e nenhum outro COMMIT aconteceu entre
+a última verificação e a leitura da versão nova (números de sequência do
+escritor, EscritorBanco.commits()); senão o cache é limpo.
+
+Os valores saem copiados: quem recebe um card pode alterar o dict (ex.: meta)
+sem corromper o que está guardado.
+"""
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+# (concluídos, iniciados) do escritor do banco (EscritorBanco.commits)
+ContadorCommits = Callable[[], Tuple[int, int]]
+
+Chave = Tuple[Hashable, ...]
+
+
+def _copiar(valor: Any) -> Any:
+    # resultados são dicts/listas de valores simples (linhas do sqlite + meta JSON)
+    if isinstance(valor, dict):
+        return {k: _copiar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_copiar(v) for v in valor]
+    return valor
+
+
+class CacheCards:
+    """LRU por número de entradas; chaves são tuplas (tipo, card_id, *extras)."""
+
+    # segundos entre consultas da versão do banco; 0 = a cada leitura (sem janela de
+    # dado velho). Um PRAGMA data_version custa poucos µs (bench/bench_cache.py)
+    INTERVALO_VERSAO = 0.0
+
+    def __init__(self, max_entradas: int = 1024, versao: Optional[Callable[[], int]] = None,
+                 commits: Optional[ContadorCommits] = None):
+        self.max_entradas = max_entradas
+        self._versao = versao
+        self._commits = commits
+        self._versao_atual: Optional[int] = None
+        self._versao_em = 0.0
+        self._entradas: "OrderedDict[Chave, Any]" = OrderedDict()
+        # card_id -> chaves guardadas daquele card (invalidação sem varrer o cache)
+        self._por_card: Dict[Hashable, Set[Chave]] = {}
+        self._stats = {"acertos": 0, "faltas": 0, "descartes": 0, "invalidacoes": 0}
+
+    def obter(self, chave: Chave, carregar: Callable[[], Any]) -> Any:
+        """Devolve uma cópia do valor em cache ou carrega, guarda e devolve."""
+        if self.max_entradas <= 0:
+            return carregar()
+        self._verificar_versao()
+        try:
+            valor = self._entradas[chave]
+        except KeyError:
+            self._stats["faltas"] += 1
+            valor = carregar()
+            self._guardar(chave, valor)
+            return _copiar(valor)
+        self._stats["acertos"] += 1
+        self._entradas.move_to_end(chave)
+        return _copiar(valor)
+
+    def _verificar_versao(self) -> None:
+        if self._versao is None:
+            return
+        agora = time.monotonic()
+        if agora - self._versao_em < self.INTERVALO_VERSAO:
+            return
+        self._versao_em = agora
+        versao = self._versao()
+        if versao != self._versao_atual:
+            if self._versao_atual is not None and self._entradas:
+                self.limpar()
+            self._versao_atual = versao
+
+    def escrita_propria(self, submeter: Callable[[], "Future[Any]"]) -> Any:
+        """Roda uma escrita do controle feita pelo escritor do banco e devolve o resultado.
+
+        Commits alheios anteriores são verificados antes. Depois, a versão nova é
+        aceita sem limpar o cache (quem escreveu já invalidou o que alterou) só se
+        o lote do escritor continha apenas esta escrita, o COMMIT dele foi o
+        seguinte ao último já concluído na verificação e nenhum outro começou até
+        a versão ser lida. Em qualquer outro caso o cache é limpo: o commit de
+        outro lote pode ter alterado o que está guardado.
+        """
+        if self._versao is None or self.max_entradas <= 0:
+            return submeter().result()
+        # lido antes da verificação: todo COMMIT até aqui já aparece na versão verificada
+        concluidos = self._commits()[0] if self._commits is not None else None
+        self._versao_em = 0.0
+        self._verificar_versao()
+        futuro = submeter()
+        resultado = futuro.result()
+        seq = getattr(futuro, "seq_commit", None)
+        if (concluidos is not None and seq == concluidos + 1
+                and getattr(futuro, "tamanho_lote", 0) == 1):
+            versao = self._versao()
+            if self._commits()[1] == seq:
+                self._versao_atual = versao
+                self._versao_em = time.monotonic()
+                return resultado
+        self.limpar()
+        return resultado
+
+    def guardar(self, chave: Chave, valor: Any) -> None:
+        """Guarda um valor carregado junto com outro (ex.: todos os grupos de um checklist)."""
+        if self.max_entradas > 0:
+            self._guardar(chave, valor)
+
+    def _guardar(self, chave: Chave, valor: Any) -> None:
+        self._entradas[chave] = valor
+        self._por_card.setdefault(chave[1], set()).add(chave)
+        while len(self._entradas) > self.max_entradas:
+            antiga, _ = self._entradas.popitem(last=False)
+            self._desindexar(antiga)
+            self._stats["descartes"] += 1
+
+    def _desindexar(self, chave: Chave) -> None:
+        chaves = self._por_card.get(chave[1])
+        if chaves is not None:
+            chaves.discard(chave)
+            if not chaves:
+                del self._por_card[chave[1]]
+
+    def invalidar_card(self, card_id: Hashable) -> None:
+        for chave in self._por_card.pop(card_id, ()):
+            self._entradas.pop(chave, None)
+            self._stats["invalidacoes"] += 1
+
+    def invalidar_tipo(self, tipo: str) -> None:
+        for chave in [c for c in self._entradas if c[0] == tipo]:
+            del self._entradas[chave]
+            self._desindexar(chave)
+            self._stats["invalidacoes"] += 1
+
+    def limpar(self) -> None:
+        self._stats["invalidacoes"] += len(self._entradas)
+        self._entradas.clear()
+        self._por_card.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        total = self._stats["acertos"] + self._stats["faltas"]
+        return dict(self._stats, entradas=len(self._entradas), max_entradas=self.max_entradas,
+                    taxa_acerto=(self._stats["acertos"] / total) if total else 0.0)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
@@ -1,14 +1,27 @@
 # banco/controles/kanban/controle_card.py
+import bisect
 import sqlite3
 import json
 import os
+import re
 import shutil
-import tempfile
 import time
 import zipfile
-from banco.database import conectar  # ajuste caso o módulo esteja em outro path
-from contextlib import contextmanager
-from typing import List, Optional, Dict, Any
+from banco.database import conectar_leitura, escritor_do_banco, escrever  # ajuste caso o módulo esteja em outro path
+from banco.controles.kanban.armazem_blobs import ArmazemBlobs, hash_arquivo
+from banco.controles.kanban.cache_cards import CacheCards
+from banco.controles.kanban.eventos import (
+    CARD_ATUALIZADO, CARD_CRIADO, CARD_MOVIDO, CARD_REMOVIDO, CARDS_ALTERADOS, CHECKLIST_ALTERADO,
+    EmissorEventos, EventoKanban
+)
+from banco.controles.kanban.zip_pastas import (
+    OperacaoCancelada, escrever_zip_pasta, ler_estrutura_zip, membro_exportado, validar_destino
+)
+from banco.modelos.db_model_busca import repovoar_indice_busca
+from typing import List, Optional, Dict, Any, Callable, Tuple
+
+# trocados por "_" no nome da pasta física de um card (ver _nome_pasta_fisica)
+_INVALIDOS_PASTA = re.compile(r'[\\/:\x00-\x1f]')
 
 
 class ControleCardKanban:
@@ -19,18 +32,23 @@ class ControleCardKanban:
     """
 
     IMPORT_BASE_DIR = os.path.join(os.getcwd(), "kanban_storage")
+    # blobs por conteúdo ficam ao lado de IMPORT_BASE_DIR (mesmo sistema de arquivos: hardlinks)
+    BLOBS_DIR_NOME = "kanban_blobs"
+    # entradas do cache de leituras por card (get_card, tags, checklist, anexos); 0 desliga
+    CACHE_MAX_ENTRADAS = 1024
 
     def __init__(self, db_path: Optional[str] = None):
-        # conectar() pode aceitar um path ou retornar uma conexão já configurada
-        self.conn = conectar() if db_path is None else conectar(db_path)
+        # só leitura (pool com query_only): toda escrita passa por _escrever()
+        self.db_path = db_path
+        self.conn = conectar_leitura(db_path)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
-        try:
-            self.cursor.execute("PRAGMA foreign_keys = ON")
-            self.conn.commit()
-        except Exception:
-            # pragma pode falhar em contextos especiais; não bloqueamos a inicialização
-            pass
+        # avisos de alteração para a UI (ver eventos.py); emitidos após o commit
+        self.eventos = EmissorEventos()
+        # leituras por card já montadas; cada escrita invalida o que alterou (ver cache_cards.py)
+        self.cache = CacheCards(self.CACHE_MAX_ENTRADAS,
+                                versao=lambda: self.conn.execute("PRAGMA data_version").fetchone()[0],
+                                commits=lambda: escritor_do_banco(self.db_path).commits())
         # garante diretório de imports
         try:
             os.makedirs(self.IMPORT_BASE_DIR, exist_ok=True)
@@ -38,14 +56,14 @@ class ControleCardKanban:
             pass
 
     # ------------------ utilitários ------------------
-    @contextmanager
-    def _transaction(self):
-        try:
-            yield
-            self.conn.commit()
-        except Exception:
-            self.conn.rollback()
-            raise
+    def _escrever(self, funcao: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """Roda funcao(cur) no escritor do banco (commit em grupo) e espera o commit.
+
+        A função roda na thread do escritor: tudo que ela lê ou grava usa `cur`,
+        nunca self.cursor. O commit vem de outra conexão, então o cache aceita a
+        nova versão do banco (ver CacheCards.escrita_propria) em vez de se limpar.
+        """
+        return self.cache.escrita_propria(lambda: escrever(funcao, self.db_path, esperar=False))
 
     def _ensure_meta_dict(self, meta: Optional[Any]) -> Dict[str, Any]:
         if meta is None:
@@ -62,7 +80,8 @@ class ControleCardKanban:
     def _serialize_meta(self, meta: Optional[Dict[str, Any]]) -> str:
         return json.dumps(meta or {})
 
-    def _get_max_ordem(self, coluna_id: int, pai_id: Optional[int] = None) -> int:
+    def _get_max_ordem(self, coluna_id: int, pai_id: Optional[int] = None, cur: Optional[sqlite3.Cursor] = None) -> int:
+        cur = cur or self.cursor
         q = "SELECT COALESCE(MAX(ordem), -1) as m FROM kanban_cards WHERE coluna_id = ?"
         params = [coluna_id]
         if pai_id is None:
@@ -70,8 +89,8 @@ class ControleCardKanban:
         else:
             q += " AND pai_id = ?"
             params.append(pai_id)
-        self.cursor.execute(q, tuple(params))
-        row = self.cursor.fetchone()
+        cur.execute(q, tuple(params))
+        row = cur.fetchone()
         return row["m"] if row else -1
 
     def close(self):
@@ -80,31 +99,71 @@ class ControleCardKanban:
         finally:
             self.conn.close()
 
+    def _local_card(self, card_id: int, cur: Optional[sqlite3.Cursor] = None) -> Tuple[Optional[int], Optional[int]]:
+        cur = cur or self.cursor
+        cur.execute("SELECT coluna_id, pai_id FROM kanban_cards WHERE id = ?", (card_id,))
+        row = cur.fetchone()
+        return (row["coluna_id"], row["pai_id"]) if row else (None, None)
+
+    def _notificar(self, tipo: str, card_id: Optional[int], local: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                   origem: Tuple[Optional[int], Optional[int]] = (None, None)) -> None:
+        """Emite um EventoKanban; `local` = (coluna_id, pai_id), consultado se omitido."""
+        if card_id is not None and local is None:
+            local = self._local_card(card_id)
+        coluna_id, pai_id = local or (None, None)
+        self.eventos.emitir(EventoKanban(tipo, card_id, coluna_id, pai_id, origem[0], origem[1]))
+
+    def notificar_alteracao(self, card_id: int, tipo: str = CARD_ATUALIZADO) -> None:
+        """Avisa os ouvintes de uma escrita feita por outra instância (ex.: tarefa em background)."""
+        self.cache.invalidar_card(card_id)
+        self._notificar(tipo, card_id)
+
+    def invalidar_cache(self, card_ids: Optional[List[int]] = None) -> None:
+        """Descarta do cache os cards indicados (None = tudo). Escritas de outras conexões
+        já são detectadas sozinhas (CacheCards._verificar_versao)."""
+        if card_ids is None:
+            self.cache.limpar()
+            return
+        for card_id in card_ids:
+            self.cache.invalidar_card(card_id)
+
+    def estatisticas_cache(self) -> Dict[str, Any]:
+        """Acertos, faltas, descartes e invalidações do cache de leituras."""
+        return self.cache.estatisticas()
+
     # ============================
     # CARDS
     # ============================
     def criar_card(self, coluna_id: int, titulo: str, descricao: str = "", tipo: str = "card",
                    cor_etiqueta: Optional[str] = None, pai_id: Optional[int] = None,
                    meta: Optional[Dict[str, Any]] = None, ordem: Optional[int] = None) -> Dict:
-        """Cria um card. Se ordem não for fornecida, insere como último (max+1).
+        """Cria um card. Se ordem não for fornecida, insere como último (max + ORDEM_PASSO).
         Retorna o card completo (via get_card).
         """
-        meta = self._ensure_meta_dict(meta)
-        with self._transaction():
+        meta = self._serialize_meta(self._ensure_meta_dict(meta))
+
+        def _criar(cur):
+            nonlocal ordem
             if ordem is None:
-                max_ordem = self._get_max_ordem(coluna_id, pai_id)
-                ordem = max_ordem + 1
-            self.cursor.execute(
+                ordem = self._get_max_ordem(coluna_id, pai_id, cur) + self.ORDEM_PASSO
+            cur.execute(
                 """
                 INSERT INTO kanban_cards (coluna_id, pai_id, titulo, descricao, tipo, cor_etiqueta, ordem, meta)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (coluna_id, pai_id, titulo, descricao, tipo, cor_etiqueta, ordem, self._serialize_meta(meta))
+                (coluna_id, pai_id, titulo, descricao, tipo, cor_etiqueta, ordem, meta)
             )
-            card_id = self.cursor.lastrowid
+            return cur.lastrowid
+
+        card_id = self._escrever(_criar)
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_CRIADO, card_id, (coluna_id, pai_id))
         return self.get_card(card_id)
 
     def get_card(self, card_id: int) -> Optional[Dict[str, Any]]:
+        return self.cache.obter(("card", card_id), lambda: self._carregar_card(card_id))
+
+    def _carregar_card(self, card_id: int) -> Optional[Dict[str, Any]]:
         self.cursor.execute("SELECT * FROM kanban_cards WHERE id = ?", (card_id,))
         row = self.cursor.fetchone()
         if not row:
@@ -113,6 +172,34 @@ class ControleCardKanban:
         card["meta"] = self._ensure_meta_dict(card.get("meta"))
         return card
 
+    # operadores aceitos em meta_filters={"chave": (op, valor)}
+    META_OPERADORES = ("=", "!=", "<", "<=", ">", ">=")
+    _META_CHAVE_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+    def _meta_condicao(self, chave: str, valor: Any, params: List[Any]) -> str:
+        """Monta a condição SQL de um meta_filter. A chave entra literal no caminho
+        JSON (validada) para casar com os índices de expressão de META_INDEXADAS."""
+        if not isinstance(chave, str) or not self._META_CHAVE_RE.match(chave):
+            raise ValueError(f"Chave de meta inválida: {chave!r}")
+        expr = f"json_extract(meta, '$.{chave}')"
+
+        if valor is None:
+            return f"{expr} IS NULL"
+        if isinstance(valor, tuple):
+            if len(valor) != 2 or valor[0] not in self.META_OPERADORES:
+                raise ValueError(f"Filtro de meta inválido para {chave!r}: {valor!r}")
+            op, valor = valor
+            params.append(valor)
+            return f"{expr} {op} ?"
+        if isinstance(valor, (list, set, frozenset)):
+            valores = list(valor)
+            if not valores:
+                return "0"
+            params.extend(valores)
+            return f"{expr} IN ({', '.join('?' for _ in valores)})"
+        params.append(valor)
+        return f"{expr} = ?"
+
     def listar_cards(self,
                     coluna_id=None,
                     pai_id=None,
@@ -130,6 +217,10 @@ class ControleCardKanban:
         - pai_id=None → retorna SOMENTE cards de topo (pai_id IS NULL)
         - pai_id=int  → retorna apenas filhos desse card
         - inclui filtro por coluna se informado
+        - tags: lista de ids (int) e/ou nomes (str); o card precisa ter TODAS
+        - meta_filters: {"chave": valor} → igualdade; None → chave ausente;
+          lista → IN; tupla (op, valor) com op em META_OPERADORES (ex.: {"prazo": ("<=", "2025-01-31")})
+        - include_archived=False → omite cards com meta.arquivado
         """
 
         params = []
@@ -147,6 +238,23 @@ class ControleCardKanban:
             sql += " AND pai_id = ?"
             params.append(pai_id)
 
+        # tags: semi-join por tag via idx_card_tags_tag (tag_id, card_id) — o planner
+        # parte dos cards da tag em vez de testar cada card do quadro
+        for tag in tags or []:
+            if isinstance(tag, int):
+                sql += " AND id IN (SELECT card_id FROM kanban_card_tags WHERE tag_id = ?)"
+            else:
+                sql += (" AND id IN (SELECT ct.card_id FROM kanban_card_tags ct"
+                        " JOIN kanban_tags t ON t.id = ct.tag_id WHERE t.nome = ?)")
+            params.append(tag)
+
+        # meta (json_extract — chaves quentes têm índice de expressão)
+        for chave, valor in (meta_filters or {}).items():
+            sql += " AND " + self._meta_condicao(chave, valor, params)
+
+        if not include_archived and "arquivado" not in (meta_filters or {}):
+            sql += " AND COALESCE(json_extract(meta, '$.arquivado'), 0) = 0"
+
         # busca textual
         if search:
             sql += " AND (titulo LIKE ? OR descricao LIKE ?)"
@@ -187,17 +295,28 @@ class ControleCardKanban:
             return None
         values.append(card_id)
         sql = f"UPDATE kanban_cards SET {', '.join(fields)}, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?"
-        with self._transaction():
-            self.cursor.execute(sql, tuple(values))
-        return self.get_card(card_id)
+        origem = self._local_card(card_id)
+        self._escrever(lambda cur: cur.execute(sql, tuple(values)))
+        self.cache.invalidar_card(card_id)
+        card = self.get_card(card_id)
+        if card:
+            local = (card["coluna_id"], card["pai_id"])
+            if local != origem or "ordem" in kwargs:
+                self._notificar(CARD_MOVIDO, card_id, local, origem)
+            else:
+                self._notificar(CARD_ATUALIZADO, card_id, local)
+        return card
 
     def deletar_card(self, card_id: int, hard: bool = False) -> bool:
         """Se hard=True, deleta fisicamente; caso contrário marca como arquivado no meta.
         Isso preserva o histórico e os attachments para recuperação.
         """
         if hard:
-            with self._transaction():
-                self.cursor.execute("DELETE FROM kanban_cards WHERE id = ?", (card_id,))
+            local = self._local_card(card_id)
+            self._escrever(lambda cur: cur.execute("DELETE FROM kanban_cards WHERE id = ?", (card_id,)))
+            # ON DELETE CASCADE leva sub-cards, checklist e anexos junto
+            self.cache.limpar()
+            self._notificar(CARD_REMOVIDO, card_id, local)
             return True
 
         card = self.get_card(card_id)
@@ -205,53 +324,196 @@ class ControleCardKanban:
             return False
         meta = self._ensure_meta_dict(card.get("meta"))
         meta.setdefault("arquivado", True)
-        with self._transaction():
-            self.cursor.execute("UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
-                                (self._serialize_meta(meta), card_id))
+        self._escrever(lambda cur: cur.execute(
+            "UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
+            (self._serialize_meta(meta), card_id)))
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id, (card["coluna_id"], card["pai_id"]))
         return True
 
     # move e reordenação
+    # ------------------ ordem esparsa ------------------
+    # `ordem` usa chaves inteiras com folga (ORDEM_PASSO entre vizinhos): mover um
+    # card grava só a linha dele, com a chave no meio do vão entre os novos
+    # vizinhos. Quando o vão acaba (vizinhos consecutivos), o grupo de irmãos é
+    # redistribuído por _rebalancear_ordem — raro, O(n) amortizado.
+    ORDEM_PASSO = 1 << 16
+
+    @staticmethod
+    def _grupo_where(coluna_id: int, pai_id: Optional[int]):
+        if pai_id is None:
+            return "coluna_id = ? AND pai_id IS NULL", [coluna_id]
+        return "coluna_id = ? AND pai_id = ?", [coluna_id, pai_id]
+
+    def _rebalancear_ordem(self, coluna_id: int, pai_id: Optional[int] = None,
+                           cur: Optional[sqlite3.Cursor] = None) -> int:
+        """Reescreve a ordem dos irmãos como PASSO, 2*PASSO, ... mantendo a ordem
+        visível. Não abre transação (o chamador já está em uma, no escritor)."""
+        cur = cur or self.cursor
+        where, params = self._grupo_where(coluna_id, pai_id)
+        cur.execute(f"SELECT id FROM kanban_cards WHERE {where} ORDER BY ordem ASC, criado_em ASC, id ASC",
+                    tuple(params))
+        ids = [r[0] for r in cur.fetchall()]
+        cur.executemany("UPDATE kanban_cards SET ordem = ? WHERE id = ?",
+                        [((i + 1) * self.ORDEM_PASSO, cid) for i, cid in enumerate(ids)])
+        for cid in ids:
+            self.cache.invalidar_card(cid)
+        return len(ids)
+
+    def rebalancear_ordem(self, coluna_id: int, pai_id: Optional[int] = None) -> int:
+        """Redistribui as chaves de ordem de um grupo de irmãos (manutenção em background)."""
+        return self._escrever(lambda cur: self._rebalancear_ordem(coluna_id, pai_id, cur))
+
+    def _ordem_para_posicao(self, coluna_id: int, pai_id: Optional[int], posicao: Optional[int],
+                            excluir_id: Optional[int] = None, _rebalanceado: bool = False,
+                            cur: Optional[sqlite3.Cursor] = None) -> int:
+        """Chave de ordem para inserir na `posicao` (0 = topo; None = fim) entre os
+        irmãos, ignorando `excluir_id` (o próprio card em um move)."""
+        cur = cur or self.cursor
+        if posicao is None:
+            return self._get_max_ordem(coluna_id, pai_id, cur) + self.ORDEM_PASSO
+
+        where, params = self._grupo_where(coluna_id, pai_id)
+        if excluir_id is not None:
+            where += " AND id != ?"
+            params.append(excluir_id)
+        posicao = max(0, posicao)
+        cur.execute(
+            f"SELECT ordem FROM kanban_cards WHERE {where} ORDER BY ordem ASC, criado_em ASC LIMIT 2 OFFSET ?",
+            (*params, max(posicao - 1, 0)))
+        vizinhos = [r[0] for r in cur.fetchall()]
+        if posicao == 0:
+            antes, depois = None, (vizinhos[0] if vizinhos else None)
+        else:
+            antes = vizinhos[0] if vizinhos else None
+            depois = vizinhos[1] if len(vizinhos) > 1 else None
+            if antes is None:
+                # posição além do fim
+                return self._get_max_ordem(coluna_id, pai_id, cur) + self.ORDEM_PASSO
+
+        if depois is None:
+            return (antes if antes is not None else 0) + self.ORDEM_PASSO
+        if antes is None:
+            return depois - self.ORDEM_PASSO
+        if depois - antes > 1:
+            return (antes + depois) // 2
+        if _rebalanceado:
+            raise RuntimeError("Não foi possível abrir espaço na ordem dos cards")
+        self._rebalancear_ordem(coluna_id, pai_id, cur)
+        return self._ordem_para_posicao(coluna_id, pai_id, posicao, excluir_id, _rebalanceado=True, cur=cur)
+
     def move_card(self, card_id: int, coluna_id: int, nova_ordem: Optional[int] = None, pai_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
-        """Move card para outra coluna/pai e insere na ordem desejada (ou último).
-        Ajusta ordens dos irmãos automaticamente.
+        """Move card para outra coluna/pai e insere na posição `nova_ordem` entre os
+        irmãos de destino (0 = topo; None = último). Grava apenas a linha do card
+        (salvo quando o grupo precisa ser rebalanceado).
         """
         card = self.get_card(card_id)
         if not card:
             return None
 
-        with self._transaction():
-            # reduzir ordens dos irmãos na coluna antiga
-            self.cursor.execute(
-                "UPDATE kanban_cards SET ordem = ordem - 1 WHERE coluna_id = ? AND (pai_id IS ? OR pai_id = ?) AND ordem > ?",
-                (card["coluna_id"], card["pai_id"], card["pai_id"], card["ordem"]))
-
-            # inserir no destino
-            if nova_ordem is None:
-                max_ord = self._get_max_ordem(coluna_id, pai_id)
-                nova_ordem = max_ord + 1
-            else:
-                # deslocar irmãos para abrir espaço
-                self.cursor.execute(
-                    "UPDATE kanban_cards SET ordem = ordem + 1 WHERE coluna_id = ? AND (pai_id IS ? OR pai_id = ?) AND ordem >= ?",
-                    (coluna_id, pai_id, pai_id, nova_ordem)
-                )
-
-            self.cursor.execute(
+        def _mover(cur):
+            ordem = self._ordem_para_posicao(coluna_id, pai_id, nova_ordem, excluir_id=card_id, cur=cur)
+            cur.execute(
                 "UPDATE kanban_cards SET coluna_id = ?, pai_id = ?, ordem = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
-                (coluna_id, pai_id, nova_ordem, card_id)
+                (coluna_id, pai_id, ordem, card_id)
             )
+
+        self._escrever(_mover)
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_MOVIDO, card_id, (coluna_id, pai_id), (card["coluna_id"], card["pai_id"]))
         return self.get_card(card_id)
 
+    @staticmethod
+    def _maior_subsequencia_crescente(valores: List[int]) -> set:
+        """Índices de uma subsequência estritamente crescente máxima (O(n log n))."""
+        caudas: List[int] = []       # menor valor final de cada comprimento
+        caudas_idx: List[int] = []
+        anterior = [-1] * len(valores)
+        for i, v in enumerate(valores):
+            k = bisect.bisect_left(caudas, v)
+            if k == len(caudas):
+                caudas.append(v)
+                caudas_idx.append(i)
+            else:
+                caudas[k] = v
+                caudas_idx[k] = i
+            anterior[i] = caudas_idx[k - 1] if k > 0 else -1
+        manter = set()
+        i = caudas_idx[-1] if caudas_idx else -1
+        while i != -1:
+            manter.add(i)
+            i = anterior[i]
+        return manter
+
     def reorder_cards(self, coluna_id: int, ordem_ids: List[int], pai_id: Optional[int] = None) -> bool:
         """Define a ordem de uma coluna de acordo com a lista de ids (ordem na lista = ordem no board).
-        Somente cartões presentes na lista serão considerados; os demais ficam após, na ordem atual.
+        Somente cartões presentes na lista serão considerados; os demais mantêm a ordem atual.
+
+        Só grava os cards cuja posição relativa mudou: os que já estão no grupo e
+        formam a maior subsequência em ordem crescente ficam intactos, e os outros
+        recebem chaves nos vãos entre eles (arrastar um card = 1 UPDATE).
         """
-        with self._transaction():
-            for idx, cid in enumerate(ordem_ids):
-                self.cursor.execute(
-                    "UPDATE kanban_cards SET ordem = ?, coluna_id = ?, pai_id = ? WHERE id = ?",
-                    (idx, coluna_id, pai_id, cid)
-                )
+        ordem_ids = list(dict.fromkeys(ordem_ids))
+
+        def _reordenar(cur):
+            where, params = self._grupo_where(coluna_id, pai_id)
+            cur.execute(f"SELECT id, ordem FROM kanban_cards WHERE {where}", tuple(params))
+            atual = {r[0]: r[1] for r in cur.fetchall()}
+
+            presentes = [i for i, cid in enumerate(ordem_ids) if cid in atual]
+            manter = {presentes[k] for k in self._maior_subsequencia_crescente([atual[ordem_ids[i]] for i in presentes])}
+
+            novas: Dict[int, int] = {}
+            i = 0
+            n = len(ordem_ids)
+            ok = True
+            while i < n and ok:
+                if i in manter:
+                    i += 1
+                    continue
+                j = i
+                while j < n and j not in manter:
+                    j += 1
+                # ordem_ids[i:j] ficam entre as âncoras i-1 e j
+                lo = atual[ordem_ids[i - 1]] if i > 0 else None
+                hi = atual[ordem_ids[j]] if j < n else None
+                k = j - i
+                if lo is None and hi is None:
+                    chaves = [(t + 1) * self.ORDEM_PASSO for t in range(k)]
+                elif hi is None:
+                    chaves = [lo + (t + 1) * self.ORDEM_PASSO for t in range(k)]
+                elif lo is None:
+                    chaves = [hi - (k - t) * self.ORDEM_PASSO for t in range(k)]
+                else:
+                    passo = (hi - lo) // (k + 1)
+                    ok = passo >= 1
+                    chaves = [lo + (t + 1) * passo for t in range(k)]
+                for t, chave in enumerate(chaves):
+                    novas[ordem_ids[i + t]] = chave
+                i = j
+
+            if not ok:
+                # sem espaço entre âncoras: reescreve a lista inteira com folga
+                novas = {cid: (t + 1) * self.ORDEM_PASSO for t, cid in enumerate(ordem_ids)}
+
+            # cards que vieram de outro grupo: origem para o evento de movimento
+            origens = {cid: (coluna_id, pai_id) for cid in novas if cid in atual}
+            for cid in novas:
+                if cid not in origens:
+                    origens[cid] = self._local_card(cid, cur)
+
+            cur.executemany(
+                "UPDATE kanban_cards SET ordem = ?, coluna_id = ?, pai_id = ? WHERE id = ?",
+                [(ordem, coluna_id, pai_id, cid) for cid, ordem in novas.items()]
+            )
+            return novas, origens
+
+        novas, origens = self._escrever(_reordenar)
+        for cid in novas:
+            self.cache.invalidar_card(cid)
+        with self.eventos.adiar_eventos():
+            for cid in novas:
+                self._notificar(CARD_MOVIDO, cid, (coluna_id, pai_id), origens[cid])
         return True
 
     def get_card_children(self, card_id: int) -> List[Dict[str, Any]]:
@@ -264,32 +526,354 @@ class ControleCardKanban:
             result.append(row)
         return result
 
-    def get_card_tree(self, root_id: int) -> Dict[str, Any]:
-        root = self.get_card(root_id)
-        if not root:
+    # ============================
+    # ÁRVORE (WITH RECURSIVE)
+    # ============================
+    # limite de profundidade: protege contra ciclos em pai_id (dados corrompidos)
+    ARVORE_MAX_PROFUNDIDADE = 256
+
+    def _subtree_cte(self, somente_pastas: bool = False) -> str:
+        """CTE `arvore(id, profundidade)` com o card raiz (parâmetros: root_id,
+        max_profundidade) e todos os descendentes. Com somente_pastas=True a
+        descida só passa por filhos tipo 'folder' (a raiz entra de qualquer tipo)."""
+        # "+c.tipo": sem o + o planner monta um índice automático (tipo, pai_id)
+        # varrendo kanban_cards a cada passo; assim ele desce por idx_cards_pai_ordem
+        filtro = " AND +c.tipo = 'folder'" if somente_pastas else ""
+        return f"""
+            WITH RECURSIVE arvore(id, profundidade) AS (
+                SELECT id, 0 FROM kanban_cards WHERE id = ?
+                UNION ALL
+                SELECT c.id, a.profundidade + 1
+                FROM kanban_cards c JOIN arvore a ON c.pai_id = a.id
+                WHERE a.profundidade < ?{filtro}
+            )"""
+
+    def _rows_to_cards(self, rows) -> List[Dict[str, Any]]:
+        cards = []
+        for r in rows:
+            card = dict(r)
+            card["meta"] = self._ensure_meta_dict(card.get("meta"))
+            cards.append(card)
+        return cards
+
+    def get_subtree(self, root_id: int, somente_pastas: bool = False) -> List[Dict[str, Any]]:
+        """Raiz + descendentes em uma única query, em ordem de profundidade e depois
+        (ordem, criado_em). Cada card traz a chave extra `profundidade` (raiz = 0)."""
+        self.cursor.execute(
+            f"""{self._subtree_cte(somente_pastas)}
+            SELECT c.*, arvore.profundidade FROM arvore JOIN kanban_cards c ON c.id = arvore.id
+            ORDER BY arvore.profundidade ASC, c.ordem ASC, c.criado_em ASC
+            """, (root_id, self.ARVORE_MAX_PROFUNDIDADE))
+        return self._rows_to_cards(self.cursor.fetchall())
+
+    def get_ancestors(self, card_id: int) -> List[Dict[str, Any]]:
+        """Cadeia do card até a raiz em uma única query, ordenada da raiz para o card
+        (o próprio card é o último elemento). Lista vazia se o card não existir."""
+        self.cursor.execute(
+            """
+            WITH RECURSIVE cadeia(id, pai_id, nivel) AS (
+                SELECT id, pai_id, 0 FROM kanban_cards WHERE id = ?
+                UNION ALL
+                SELECT c.id, c.pai_id, cadeia.nivel + 1
+                FROM kanban_cards c JOIN cadeia ON c.id = cadeia.pai_id
+                WHERE cadeia.nivel < ?
+            )
+            SELECT c.* FROM cadeia JOIN kanban_cards c ON c.id = cadeia.id
+            ORDER BY cadeia.nivel DESC
+            """, (card_id, self.ARVORE_MAX_PROFUNDIDADE))
+        return self._rows_to_cards(self.cursor.fetchall())
+
+    def _montar_arvore(self, cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aninha a lista plana de get_subtree em {card..., 'children': [...]}."""
+        if not cards:
             return {}
-        def _walk(node):
-            children = self.get_card_children(node['id'])
-            node['children'] = [ _walk(child) for child in children ]
-            return node
-        return _walk(root)
+        por_id: Dict[int, Dict[str, Any]] = {}
+        for card in cards:
+            card.pop("profundidade", None)
+            card["children"] = []
+            por_id[card["id"]] = card
+        root = cards[0]
+        for card in cards[1:]:
+            pai = por_id.get(card["pai_id"])
+            if pai is not None:
+                pai["children"].append(card)
+        return root
+
+    def get_card_tree(self, root_id: int) -> Dict[str, Any]:
+        return self._montar_arvore(self.get_subtree(root_id))
+
+    def purge_subtree(self, card_id: int) -> List[str]:
+        """
+        Remove fisicamente o card e toda a sub-árvore (filhos, checklist, anexos e
+        tags) em uma única transação, com um DELETE por tabela.
+
+        Não toca no disco: retorna os caminhos locais dos anexos removidos que não
+        são mais referenciados por nenhum outro anexo, para que o chamador os apague
+        (ver interface/objeto/tarefas_io.py). Lista vazia se o card não existir.
+        """
+        local = self._local_card(card_id)
+
+        def _purgar(cur):
+            # tabela TEMP da conexão do escritor; esvaziada ao fim de cada uso
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS _purge_ids (id INTEGER PRIMARY KEY)")
+            cur.execute("DELETE FROM _purge_ids")
+            cur.execute(
+                f"""{self._subtree_cte()}
+                INSERT OR IGNORE INTO _purge_ids (id) SELECT id FROM arvore
+                """, (card_id, self.ARVORE_MAX_PROFUNDIDADE))
+            if not cur.rowcount:
+                return None
+
+            cur.execute(
+                """
+                SELECT DISTINCT caminho_local FROM kanban_card_attachments
+                WHERE card_id IN (SELECT id FROM _purge_ids) AND caminho_local IS NOT NULL
+                """)
+            candidatos = [r[0] for r in cur.fetchall()]
+            # arquivos ainda usados por anexos fora da sub-árvore ficam no disco
+            cur.execute(
+                """
+                SELECT DISTINCT caminho_local FROM kanban_card_attachments
+                WHERE card_id NOT IN (SELECT id FROM _purge_ids)
+                  AND caminho_local IN (SELECT caminho_local FROM kanban_card_attachments
+                                        WHERE card_id IN (SELECT id FROM _purge_ids))
+                """)
+            compartilhados = {r[0] for r in cur.fetchall()}
+
+            for sql in (
+                # sai do índice de busca primeiro: os triggers de checklist/anexos
+                # deixam de reindexar o card a cada linha apagada
+                "DELETE FROM kanban_busca WHERE rowid IN (SELECT id FROM _purge_ids)",
+                "DELETE FROM kanban_card_tags WHERE card_id IN (SELECT id FROM _purge_ids)",
+                "DELETE FROM kanban_card_attachments WHERE card_id IN (SELECT id FROM _purge_ids)",
+                "DELETE FROM kanban_card_checklist WHERE card_id IN (SELECT id FROM _purge_ids)",
+                "DELETE FROM kanban_cards WHERE id IN (SELECT id FROM _purge_ids)",
+            ):
+                cur.execute(sql)
+            cur.execute("DELETE FROM _purge_ids")
+            return candidatos, compartilhados
+
+        removidos = self._escrever(_purgar)
+        if removidos is None:
+            return []
+        candidatos, compartilhados = removidos
+        self.cache.limpar()
+        self._notificar(CARD_REMOVIDO, card_id, local)
+        # blobs do armazém só saem pela coleta de lixo (refs via trigger)
+        armazem = self.armazem
+        return [c for c in candidatos if c not in compartilhados and not armazem.contem(c)]
+
+    # ============================
+    # SNAPSHOT (carga em lote para a UI)
+    # ============================
+    def _load_cards_snapshot(self, topo_sql: str, params: tuple) -> List[Dict[str, Any]]:
+        """Carrega os cards de topo definidos por `topo_sql` (SELECT id ...) com tags,
+        checklist de topo, anexos e sub-pastas em um número fixo de queries.
+        Cada card volta com as chaves extras: tags, checklist, checklist_resumo, anexos, pastas.
+        """
+        cte = f"WITH topo AS ({topo_sql})"
+
+        self.cursor.execute(
+            f"""{cte}
+            SELECT c.* FROM kanban_cards c JOIN topo ON topo.id = c.id
+            ORDER BY c.ordem ASC, c.criado_em ASC
+            """, params)
+        cards = []
+        por_id: Dict[int, Dict[str, Any]] = {}
+        for r in self.cursor.fetchall():
+            card = dict(r)
+            card["meta"] = self._ensure_meta_dict(card.get("meta"))
+            card["tags"] = []
+            card["checklist"] = []
+            card["checklist_resumo"] = {"total": 0, "concluidos": 0}
+            card["anexos"] = []
+            card["pastas"] = []
+            cards.append(card)
+            por_id[card["id"]] = card
+        if not cards:
+            return cards
+
+        # tags
+        self.cursor.execute(
+            f"""{cte}
+            SELECT ct.card_id, t.id, t.nome
+            FROM kanban_card_tags ct
+            JOIN topo ON topo.id = ct.card_id
+            JOIN kanban_tags t ON t.id = ct.tag_id
+            ORDER BY t.nome ASC
+            """, params)
+        for r in self.cursor.fetchall():
+            por_id[r["card_id"]]["tags"].append({"id": r["id"], "nome": r["nome"]})
+
+        # checklist: itens de topo + resumo (todas as subtarefas contam no resumo)
+        self.cursor.execute(
+            f"""{cte}
+            SELECT ch.* FROM kanban_card_checklist ch
+            JOIN topo ON topo.id = ch.card_id
+            ORDER BY ch.ordem ASC, ch.criado_em ASC
+            """, params)
+        for r in self.cursor.fetchall():
+            card = por_id[r["card_id"]]
+            resumo = card["checklist_resumo"]
+            resumo["total"] += 1
+            if r["concluido"]:
+                resumo["concluidos"] += 1
+            if r["pai_id"] is None:
+                card["checklist"].append(dict(r))
+
+        # anexos
+        self.cursor.execute(
+            f"""{cte}
+            SELECT a.* FROM kanban_card_attachments a
+            JOIN topo ON topo.id = a.card_id
+            ORDER BY a.criado_em ASC
+            """, params)
+        for r in self.cursor.fetchall():
+            por_id[r["card_id"]]["anexos"].append(dict(r))
+
+        # sub-pastas diretas
+        self.cursor.execute(
+            f"""{cte}
+            SELECT f.* FROM kanban_cards f
+            JOIN topo ON topo.id = f.pai_id
+            WHERE f.tipo = 'folder'
+            ORDER BY f.ordem ASC, f.criado_em ASC
+            """, params)
+        for r in self.cursor.fetchall():
+            por_id[r["pai_id"]]["pastas"].append(dict(r))
+
+        return cards
+
+    def load_board_snapshot(self, quadro_id: int) -> Dict[str, Any]:
+        """Carrega o quadro inteiro (colunas, cards de topo, tags, checklist, anexos e
+        sub-pastas) em um número fixo de queries, já agrupado por coluna:
+
+            {"quadro_id": id, "colunas": [{"id", "titulo", "ordem", "cards": [...]}]}
+
+        Os widgets de coluna/card consomem essa estrutura sem tocar no banco.
+        """
+        self.cursor.execute(
+            "SELECT id, titulo, ordem FROM kanban_colunas WHERE quadro_id = ? ORDER BY ordem ASC, id ASC",
+            (quadro_id,))
+        colunas = [dict(r, cards=[]) for r in self.cursor.fetchall()]
+        por_coluna = {c["id"]: c for c in colunas}
+
+        cards = self._load_cards_snapshot(
+            """
+            SELECT c.id FROM kanban_cards c
+            JOIN kanban_colunas k ON k.id = c.coluna_id
+            WHERE k.quadro_id = ? AND c.pai_id IS NULL
+            """, (quadro_id,))
+        for card in cards:
+            coluna = por_coluna.get(card["coluna_id"])
+            if coluna is not None:
+                coluna["cards"].append(card)
+        return {"quadro_id": quadro_id, "colunas": colunas}
+
+    def load_column_snapshot(self, coluna_id: int) -> List[Dict[str, Any]]:
+        """Mesma estrutura de cards do load_board_snapshot, para uma única coluna."""
+        return self._load_cards_snapshot(
+            "SELECT id FROM kanban_cards WHERE coluna_id = ? AND pai_id IS NULL",
+            (coluna_id,))
+
+    def load_card_snapshot(self, card_id: int) -> Optional[Dict[str, Any]]:
+        """Um card no formato do snapshot (atualização pontual de um widget após um evento)."""
+        cards = self._load_cards_snapshot("SELECT id FROM kanban_cards WHERE id = ?", (card_id,))
+        return cards[0] if cards else None
+
+    # ============================
+    # BUSCA (FTS5 — banco/modelos/db_model_busca.py)
+    # ============================
+    # pesos do bm25 por coluna do índice: titulo, descricao, checklist, anexos
+    BUSCA_PESOS = (10.0, 4.0, 2.0, 2.0)
+
+    @staticmethod
+    def _fts_query(termo: str) -> Optional[str]:
+        """Converte o texto digitado em uma expressão MATCH segura: cada palavra vira
+        um termo entre aspas com busca por prefixo ("pala"* "outr"*), combinados com AND."""
+        palavras = [p.replace('"', "") for p in (termo or "").split()]
+        palavras = [p for p in palavras if p]
+        if not palavras:
+            return None
+        return " ".join(f'"{p}"*' for p in palavras)
+
+    def buscar_cards(self, termo: str, quadro_id: Optional[int] = None, coluna_id: Optional[int] = None,
+                     limit: int = 50, include_archived: bool = False) -> List[Dict[str, Any]]:
+        """
+        Busca textual ranqueada (bm25) em título, descrição, checklist e nomes de anexos.
+        Inclui sub-cards e pastas. Cada resultado é o card com as chaves extras:
+        - rank: score bm25 (menor = mais relevante)
+        - trecho: snippet com os termos encontrados entre [colchetes]
+        """
+        match = self._fts_query(termo)
+        if match is None:
+            return []
+
+        params: List[Any] = [*self.BUSCA_PESOS, match]
+        sql = """
+            SELECT c.*,
+                   bm25(kanban_busca, ?, ?, ?, ?) AS rank,
+                   snippet(kanban_busca, -1, '[', ']', '…', 12) AS trecho
+            FROM kanban_busca
+            JOIN kanban_cards c ON c.id = kanban_busca.rowid
+        """
+        if quadro_id is not None:
+            sql += " JOIN kanban_colunas k ON k.id = c.coluna_id"
+        sql += " WHERE kanban_busca MATCH ?"
+        if quadro_id is not None:
+            sql += " AND k.quadro_id = ?"
+            params.append(quadro_id)
+        if coluna_id is not None:
+            sql += " AND c.coluna_id = ?"
+            params.append(coluna_id)
+        if not include_archived:
+            sql += " AND COALESCE(json_extract(c.meta, '$.arquivado'), 0) = 0"
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        try:
+            self.cursor.execute(sql, tuple(params))
+            rows = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print("Erro na busca de cards:", e)
+            return []
+        resultados = []
+        for r in rows:
+            card = dict(r)
+            card["meta"] = self._ensure_meta_dict(card.get("meta"))
+            resultados.append(card)
+        return resultados
+
+    def reconstruir_indice_busca(self) -> int:
+        """Recria o índice FTS a partir das tabelas (ex.: banco antigo ou índice corrompido)."""
+        return self._escrever(repovoar_indice_busca)
 
     # ============================
     # ANEXOS
     # ============================
+    @property
+    def armazem(self) -> ArmazemBlobs:
+        return ArmazemBlobs(os.path.join(os.path.dirname(self.IMPORT_BASE_DIR), self.BLOBS_DIR_NOME))
+
     def adicionar_anexo(self, card_id: int, nome_arquivo: str, caminho_local: Optional[str] = None,
-                        url_remoto: Optional[str] = None, mime: Optional[str] = None, tamanho: Optional[int] = None) -> int:
-        with self._transaction():
-            self.cursor.execute(
-                """
-                INSERT INTO kanban_card_attachments (card_id, nome_arquivo, caminho_local, url_remoto, mime, tamanho)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (card_id, nome_arquivo, caminho_local, url_remoto, mime, tamanho)
-            )
-            return self.cursor.lastrowid
+                        url_remoto: Optional[str] = None, mime: Optional[str] = None, tamanho: Optional[int] = None,
+                        blob_sha256: Optional[str] = None) -> int:
+        """Registra um anexo. blob_sha256 liga o anexo a um blob do armazém (kanban_blobs.refs via trigger)."""
+        anexo_id = self._escrever(lambda cur: cur.execute(
+            """
+            INSERT INTO kanban_card_attachments (card_id, nome_arquivo, caminho_local, url_remoto, mime, tamanho, blob_sha256)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (card_id, nome_arquivo, caminho_local, url_remoto, mime, tamanho, blob_sha256)
+        ).lastrowid)
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id)
+        return anexo_id
 
     def listar_anexos(self, card_id: int) -> List[Dict[str, Any]]:
+        return self.cache.obter(("anexos", card_id), lambda: self._carregar_anexos(card_id))
+
+    def _carregar_anexos(self, card_id: int) -> List[Dict[str, Any]]:
         self.cursor.execute("SELECT * FROM kanban_card_attachments WHERE card_id = ? ORDER BY criado_em ASC", (card_id,))
         rows = self.cursor.fetchall()
         return [dict(r) for r in rows]
@@ -300,14 +884,21 @@ class ControleCardKanban:
         return dict(row) if row else None
 
     def deletar_anexo(self, anexo_id: int) -> bool:
-        with self._transaction():
-            self.cursor.execute("DELETE FROM kanban_card_attachments WHERE id = ?", (anexo_id,))
+        anexo = self.get_anexo(anexo_id)
+        self._escrever(lambda cur: cur.execute("DELETE FROM kanban_card_attachments WHERE id = ?", (anexo_id,)))
+        if anexo:
+            self.cache.invalidar_card(anexo["card_id"])
+            self._notificar(CARD_ATUALIZADO, anexo["card_id"])
         return True
 
     # utilitário para copiar arquivo para área de imports e registrar no DB
-    def import_file_to_folder(self, folder_card_id: int, source_file_path: str) -> Optional[int]:
+    def import_file_to_folder(self, folder_card_id: int, source_file_path: str,
+                              avancar: Optional[Callable[[int], None]] = None) -> Optional[int]:
         """
-        Copia arquivo para a pasta física REAL do card (hierárquica)
+        Importa o arquivo para a pasta física REAL do card (hierárquica).
+        O conteúdo vai para o armazém de blobs (SHA-256, uma cópia por conteúdo) e a
+        pasta do card recebe um hardlink/reflink para o blob — ver armazem_blobs.py.
+        avancar(n) recebe os bytes lidos (pode levantar OperacaoCancelada).
         """
         if not os.path.isfile(source_file_path):
             raise FileNotFoundError("Arquivo não encontrado.")
@@ -319,43 +910,101 @@ class ControleCardKanban:
         dest_name = f"{timestamp}_{base}"
         dest_path = os.path.join(dest_dir, dest_name)
 
-        shutil.copy2(source_file_path, dest_path)
-        tamanho = os.path.getsize(dest_path)
+        armazem = self.armazem
+        sha, tamanho = armazem.armazenar(source_file_path, avancar)
+        caminho = armazem.materializar(sha, dest_path)
 
         return self.adicionar_anexo(
             folder_card_id,
             nome_arquivo=base,
-            caminho_local=dest_path,
-            tamanho=tamanho
+            caminho_local=caminho,
+            tamanho=tamanho,
+            blob_sha256=sha
         )
 
+    def coletar_lixo_blobs(self, verificar: bool = False) -> Dict[str, int]:
+        """Remove blobs sem referência do armazém (ver ArmazemBlobs.coletar_lixo)."""
+        return self.armazem.coletar_lixo(self.conn, verificar=verificar,
+                                         gravar=lambda funcao: escrever(funcao, self.db_path))
+
+    def deduplicar_anexos_existentes(self) -> Dict[str, int]:
+        """
+        Move para o armazém os anexos gravados antes dele (blob_sha256 NULL) que estão
+        dentro de IMPORT_BASE_DIR: cada arquivo vira um hardlink/reflink para o blob do
+        seu conteúdo, então cópias iguais passam a ocupar espaço uma vez só.
+        """
+        armazem = self.armazem
+        base = os.path.abspath(self.IMPORT_BASE_DIR) + os.sep
+        self.cursor.execute(
+            "SELECT DISTINCT caminho_local FROM kanban_card_attachments "
+            "WHERE blob_sha256 IS NULL AND caminho_local IS NOT NULL")
+        caminhos = [r[0] for r in self.cursor.fetchall() if os.path.abspath(r[0]).startswith(base)]
+        stats = {"arquivos": 0, "bytes_liberados": 0}
+        for caminho in caminhos:
+            if not os.path.isfile(caminho):
+                continue
+            # a primeira ocorrência de um conteúdo é adotada pelo armazém (hardlink);
+            # as seguintes são trocadas por links para o blob e deixam de ocupar espaço
+            sha, tamanho = hash_arquivo(caminho)
+            blob = armazem.caminho(sha)
+            if os.path.exists(blob):
+                stats["bytes_liberados"] += tamanho
+            else:
+                armazem.adotar(caminho, sha)
+            novo = caminho
+            if not os.path.samefile(caminho, blob):
+                tmp = f"{caminho}.dedup"
+                novo = armazem.materializar(sha, tmp)
+                if novo == tmp:
+                    os.replace(tmp, caminho)
+                    novo = caminho
+                else:
+                    os.remove(caminho)
+            self._escrever(lambda cur: cur.execute(
+                "UPDATE kanban_card_attachments SET blob_sha256 = ?, caminho_local = ?, tamanho = ? "
+                "WHERE caminho_local = ? AND blob_sha256 IS NULL", (sha, novo, tamanho, caminho)))
+            stats["arquivos"] += 1
+        if stats["arquivos"]:
+            self.cache.invalidar_tipo("anexos")
+        return stats
+
 
     # ============================
     # CHECKLIST (HIERÁRQUICO)
     # ============================
     def adicionar_checklist(self, card_id: int, descricao: str, ordem: int = 0, pai_id: Optional[int] = None) -> int:
         """Adiciona um item de checklist. Se pai_id fornecido, cria como subtarefa."""
-        with self._transaction():
-            self.cursor.execute(
-                "INSERT INTO kanban_card_checklist (card_id, pai_id, descricao, concluido, ordem) VALUES (?, ?, ?, ?, ?)",
-                (card_id, pai_id, descricao, 0, ordem)
-            )
-            return self.cursor.lastrowid
+        checklist_id = self._escrever(lambda cur: cur.execute(
+            "INSERT INTO kanban_card_checklist (card_id, pai_id, descricao, concluido, ordem) VALUES (?, ?, ?, ?, ?)",
+            (card_id, pai_id, descricao, 0, ordem)
+        ).lastrowid)
+        self.cache.invalidar_card(card_id)
+        self._notificar(CHECKLIST_ALTERADO, card_id)
+        return checklist_id
 
     def listar_checklist(self, card_id: int, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Lista itens de checklist do card; por padrão retorna itens de topo (parent_id=None).
-        Para obter subtarefas, passe parent_id=item_id."""
-        if parent_id is None:
-            self.cursor.execute(
-                "SELECT * FROM kanban_card_checklist WHERE card_id = ? AND (pai_id IS NULL) ORDER BY ordem ASC, criado_em ASC",
-                (card_id,)
-            )
-        else:
-            self.cursor.execute(
-                "SELECT * FROM kanban_card_checklist WHERE card_id = ? AND pai_id = ? ORDER BY ordem ASC, criado_em ASC",
-                (card_id, parent_id)
-            )
-        return [dict(r) for r in self.cursor.fetchall()]
+        Para obter subtarefas, passe parent_id=item_id.
+
+        A primeira chamada lê o checklist inteiro do card e guarda no cache um grupo
+        por pai (inclusive os vazios): as chamadas por item da renderização não vão ao banco."""
+        return self.cache.obter(("checklist", card_id, parent_id),
+                                lambda: self._carregar_checklist(card_id).get(parent_id, []))
+
+    def _carregar_checklist(self, card_id: int) -> Dict[Optional[int], List[Dict[str, Any]]]:
+        self.cursor.execute(
+            "SELECT * FROM kanban_card_checklist WHERE card_id = ? ORDER BY pai_id ASC, ordem ASC, criado_em ASC",
+            (card_id,)
+        )
+        itens = [dict(r) for r in self.cursor.fetchall()]
+        grupos: Dict[Optional[int], List[Dict[str, Any]]] = {None: []}
+        for item in itens:
+            grupos.setdefault(item["id"], [])
+        for item in itens:
+            grupos.setdefault(item["pai_id"], []).append(item)
+        for pai, grupo in grupos.items():
+            self.cache.guardar(("checklist", card_id, pai), grupo)
+        return grupos
 
     def get_checklist_item(self, checklist_id: int) -> Optional[Dict[str, Any]]:
         self.cursor.execute("SELECT * FROM kanban_card_checklist WHERE id = ?", (checklist_id,))
@@ -381,28 +1030,39 @@ class ControleCardKanban:
             return False
         values.append(checklist_id)
         sql = f"UPDATE kanban_card_checklist SET {', '.join(fields)} WHERE id = ?"
-        with self._transaction():
-            self.cursor.execute(sql, tuple(values))
+        self._escrever(lambda cur: cur.execute(sql, tuple(values)))
+        item = self.get_checklist_item(checklist_id)
+        if item:
+            self.cache.invalidar_card(item["card_id"])
+            self._notificar(CHECKLIST_ALTERADO, item["card_id"])
         return True
 
-    def _delete_checklist_recursive(self, checklist_id: int):
+    def _delete_checklist_recursive(self, checklist_id: int, cur: Optional[sqlite3.Cursor] = None):
         """Apaga recursivamente subtarefas (seguro se DB não tiver ON DELETE CASCADE)."""
+        cur = cur or self.cursor
         # obter filhos
-        self.cursor.execute("SELECT id FROM kanban_card_checklist WHERE pai_id = ?", (checklist_id,))
-        rows = self.cursor.fetchall()
+        cur.execute("SELECT id FROM kanban_card_checklist WHERE pai_id = ?", (checklist_id,))
+        rows = cur.fetchall()
         for r in rows:
-            self._delete_checklist_recursive(r["id"])
+            self._delete_checklist_recursive(r["id"], cur)
         # apagar o próprio item
-        self.cursor.execute("DELETE FROM kanban_card_checklist WHERE id = ?", (checklist_id,))
+        cur.execute("DELETE FROM kanban_card_checklist WHERE id = ?", (checklist_id,))
 
     def deletar_checklist(self, checklist_id: int) -> bool:
-        with self._transaction():
+        item = self.get_checklist_item(checklist_id)
+
+        def _deletar(cur):
             # tentamos uma deleção simples (se FK com cascade estiver presente, isso apagará filhos)
             try:
-                self.cursor.execute("DELETE FROM kanban_card_checklist WHERE id = ?", (checklist_id,))
+                cur.execute("DELETE FROM kanban_card_checklist WHERE id = ?", (checklist_id,))
             except sqlite3.IntegrityError:
                 # fallback: deletar recursivamente
-                self._delete_checklist_recursive(checklist_id)
+                self._delete_checklist_recursive(checklist_id, cur)
+
+        self._escrever(_deletar)
+        if item:
+            self.cache.invalidar_card(item["card_id"])
+            self._notificar(CHECKLIST_ALTERADO, item["card_id"])
         return True
 
     # ============================
@@ -410,9 +1070,7 @@ class ControleCardKanban:
     # ============================
     def criar_tag(self, nome: str) -> int:
         try:
-            with self._transaction():
-                self.cursor.execute("INSERT INTO kanban_tags (nome) VALUES (?)", (nome,))
-                return self.cursor.lastrowid
+            return self._escrever(lambda cur: cur.execute("INSERT INTO kanban_tags (nome) VALUES (?)", (nome,)).lastrowid)
         except sqlite3.IntegrityError:
             # tag já existe -> retornar id existente
             self.cursor.execute("SELECT id FROM kanban_tags WHERE nome = ?", (nome,))
@@ -420,32 +1078,39 @@ class ControleCardKanban:
             return row["id"] if row else 0
 
     def atualizar_tag(self, tag_id: int, novo_nome: str) -> bool:
-        with self._transaction():
-            try:
-                self.cursor.execute("UPDATE kanban_tags SET nome = ? WHERE id = ?", (novo_nome, tag_id))
-                return True
-            except sqlite3.IntegrityError:
-                # nome já em uso
-                return False
+        try:
+            self._escrever(lambda cur: cur.execute("UPDATE kanban_tags SET nome = ? WHERE id = ?", (novo_nome, tag_id)))
+        except sqlite3.IntegrityError:
+            # nome já em uso
+            return False
+        self.cache.invalidar_tipo("tags")
+        self._notificar(CARDS_ALTERADOS, None)
+        return True
 
     def deletar_tag(self, tag_id: int) -> bool:
-        with self._transaction():
-            self.cursor.execute("DELETE FROM kanban_tags WHERE id = ?", (tag_id,))
+        self._escrever(lambda cur: cur.execute("DELETE FROM kanban_tags WHERE id = ?", (tag_id,)))
+        self.cache.invalidar_tipo("tags")
+        self._notificar(CARDS_ALTERADOS, None)
         return True
 
     def adicionar_tag_ao_card(self, card_id: int, tag_id: int) -> bool:
         try:
-            with self._transaction():
-                self.cursor.execute("INSERT INTO kanban_card_tags (card_id, tag_id) VALUES (?, ?)", (card_id, tag_id))
-                return True
+            self._escrever(lambda cur: cur.execute(
+                "INSERT INTO kanban_card_tags (card_id, tag_id) VALUES (?, ?)", (card_id, tag_id)))
         except sqlite3.IntegrityError:
             return False
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id)
+        return True
 
     def adicionar_tag_por_nome(self, card_id: int, tag_nome: str) -> bool:
         tag_id = self.criar_tag(tag_nome)
         return self.adicionar_tag_ao_card(card_id, tag_id)
 
     def listar_tags_do_card(self, card_id: int) -> List[Dict[str, Any]]:
+        return self.cache.obter(("tags", card_id), lambda: self._carregar_tags_do_card(card_id))
+
+    def _carregar_tags_do_card(self, card_id: int) -> List[Dict[str, Any]]:
         self.cursor.execute(
             """
             SELECT t.id, t.nome
@@ -458,8 +1123,10 @@ class ControleCardKanban:
         return [dict(r) for r in self.cursor.fetchall()]
 
     def remover_tag_do_card(self, card_id: int, tag_id: int) -> bool:
-        with self._transaction():
-            self.cursor.execute("DELETE FROM kanban_card_tags WHERE card_id = ? AND tag_id = ?", (card_id, tag_id))
+        self._escrever(lambda cur: cur.execute(
+            "DELETE FROM kanban_card_tags WHERE card_id = ? AND tag_id = ?", (card_id, tag_id)))
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id)
         return True
 
     # ============================
@@ -471,9 +1138,11 @@ class ControleCardKanban:
             return False
         meta = self._ensure_meta_dict(card.get("meta"))
         meta["arquivado"] = True
-        with self._transaction():
-            self.cursor.execute("UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
-                                (self._serialize_meta(meta), card_id))
+        self._escrever(lambda cur: cur.execute(
+            "UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
+            (self._serialize_meta(meta), card_id)))
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id, (card["coluna_id"], card["pai_id"]))
         return True
 
     def desarquivar_card(self, card_id: int) -> bool:
@@ -482,109 +1151,126 @@ class ControleCardKanban:
             return False
         meta = self._ensure_meta_dict(card.get("meta"))
         meta.pop("arquivado", None)
-        with self._transaction():
-            self.cursor.execute("UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
-                                (self._serialize_meta(meta), card_id))
+        self._escrever(lambda cur: cur.execute(
+            "UPDATE kanban_cards SET meta = ?, atualizado_em = CURRENT_TIMESTAMP WHERE id = ?",
+            (self._serialize_meta(meta), card_id)))
+        self.cache.invalidar_card(card_id)
+        self._notificar(CARD_ATUALIZADO, card_id, (card["coluna_id"], card["pai_id"]))
         return True
 
     # ============================
     # EXPORT / IMPORT DE PASTAS (ZIP)
     # ============================
     def _gather_folder_structure(self, folder_card_id: int) -> Dict[str, Any]:
-        """Retorna estrutura serializável (metadados) da pasta e seus filhos recursivamente, sem arquivos binários."""
-        folder = self.get_card(folder_card_id) or {}
-        anexos = self.listar_anexos(folder_card_id) or []
-        anexos_serial = []
-        for a in anexos:
-            anexos_serial.append({
-                'id': a.get('id'),
-                'nome_arquivo': a.get('nome_arquivo'),
-                'caminho_local': a.get('caminho_local'),
-                'url_remoto': a.get('url_remoto'),
-                'mime': a.get('mime'),
-                'tamanho': a.get('tamanho')
+        """Retorna estrutura serializável (metadados) da pasta e seus filhos recursivamente, sem arquivos binários.
+        Pastas e anexos de toda a sub-árvore vêm em duas queries (WITH RECURSIVE)."""
+        pastas = self.get_subtree(folder_card_id, somente_pastas=True)
+
+        self.cursor.execute(
+            f"""{self._subtree_cte(somente_pastas=True)}
+            SELECT a.* FROM kanban_card_attachments a JOIN arvore ON arvore.id = a.card_id
+            ORDER BY a.criado_em ASC, a.id ASC
+            """, (folder_card_id, self.ARVORE_MAX_PROFUNDIDADE))
+        anexos_por_card: Dict[int, List[Dict[str, Any]]] = {}
+        for a in self.cursor.fetchall():
+            anexos_por_card.setdefault(a["card_id"], []).append({
+                'id': a['id'],
+                'nome_arquivo': a['nome_arquivo'],
+                'caminho_local': a['caminho_local'],
+                'url_remoto': a['url_remoto'],
+                'mime': a['mime'],
+                'tamanho': a['tamanho']
             })
-        # subfolders
-        children = self.get_card_children(folder_card_id)
-        subfolders = [c for c in children if c.get('tipo') == 'folder']
-        return {
-            'folder': {
-                'id': folder.get('id'),
-                'titulo': folder.get('titulo'),
-                'descricao': folder.get('descricao'),
-                'meta': folder.get('meta'),
-                'pai_id': folder.get('pai_id'),
-                'tipo': folder.get('tipo'),
-                'coluna_id': folder.get('coluna_id')
-            },
-            'anexos': anexos_serial,
-            'subfolders': [self._gather_folder_structure(f['id']) for f in subfolders]
-        }
-
-    def export_folder_as_zip(self, folder_card_id: int, zip_path: str) -> bool:
+
+        def _struct(folder: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                'folder': {
+                    'id': folder.get('id'),
+                    'titulo': folder.get('titulo'),
+                    'descricao': folder.get('descricao'),
+                    'meta': folder.get('meta'),
+                    'pai_id': folder.get('pai_id'),
+                    'tipo': folder.get('tipo'),
+                    'coluna_id': folder.get('coluna_id')
+                },
+                'anexos': anexos_por_card.get(folder.get('id'), []),
+                'subfolders': []
+            }
+
+        if not pastas:
+            return _struct({})
+        structs = {p['id']: _struct(p) for p in pastas}
+        for p in pastas[1:]:
+            pai = structs.get(p['pai_id'])
+            if pai is not None:
+                pai['subfolders'].append(structs[p['id']])
+        return structs[pastas[0]['id']]
+
+    def preparar_exportacao(self, folder_card_id: int) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """
+        Lê do banco tudo o que a exportação precisa: a estrutura (folder.json, com
+        `exported_filename` em cada anexo) e a lista [(caminho_origem, nome_no_zip)].
+        Separado da escrita para que o ZIP possa ser gravado fora da thread da conexão.
+        """
+        data = self._gather_folder_structure(folder_card_id)
+        arquivos: List[Tuple[str, str]] = []
+        armazem = self.armazem
+
+        def _marcar_arquivos(struct):
+            # struct: {'folder':..., 'anexos': [...], 'subfolders': [...]}
+            for a in struct.get('anexos', []):
+                src = a.get('caminho_local')
+                if src and os.path.isfile(src):
+                    # nome único no zip
+                    # anexo apontando direto para o blob: o nome no disco é o hash, sem extensão
+                    nome = a.get('nome_arquivo') if armazem.contem(src) else None
+                    unique_name = f"{a.get('id', int(time.time()))}_{os.path.basename(nome or src)}"
+                    a['exported_filename'] = unique_name
+                    arquivos.append((src, f"files/{unique_name}"))
+                else:
+                    a['exported_filename'] = None
+            for sf in struct.get('subfolders', []):
+                _marcar_arquivos(sf)
+
+        _marcar_arquivos(data)
+        return data, arquivos
+
+    def export_folder_as_zip(self, folder_card_id: int, zip_path: str,
+                             progresso: Optional[Callable[[int, int], Optional[bool]]] = None,
+                             workers: Optional[int] = None) -> bool:
         """
         Exporta a pasta (metadados + arquivos) para um ZIP.
         O ZIP conterá:
           - folder.json (estrutura/metadata)
-          - files/ (arquivos copiados, nomes únicos)
+          - files/ (arquivos lidos direto da origem, nomes únicos)
+        progresso(bytes_feitos, bytes_total) é chamado durante a escrita; retornar
+        False cancela (o ZIP parcial é removido e o método retorna False).
+        Ver zip_pastas.escrever_zip_pasta.
         """
         try:
-            data = self._gather_folder_structure(folder_card_id)
-            # temp dir
-            tmpdir = tempfile.mkdtemp(prefix="kanban_export_")
-            try:
-                # copiar arquivos para tmpdir/files e atualizar json com nome de arquivo relativo
-                files_dir = os.path.join(tmpdir, "files")
-                os.makedirs(files_dir, exist_ok=True)
-
-                def _copy_files_from_structure(struct):
-                    # struct: {'folder':..., 'anexos': [...], 'subfolders': [...]}
-                    for a in struct.get('anexos', []):
-                        src = a.get('caminho_local')
-                        if src and os.path.isfile(src):
-                            # nome único no zip
-                            unique_name = f"{a.get('id', int(time.time()))}_{os.path.basename(src)}"
-                            dest = os.path.join(files_dir, unique_name)
-                            try:
-                                shutil.copy2(src, dest)
-                                a['exported_filename'] = unique_name
-                            except Exception:
-                                a['exported_filename'] = None
-                        else:
-                            a['exported_filename'] = None
-                    for sf in struct.get('subfolders', []):
-                        _copy_files_from_structure(sf)
-
-                _copy_files_from_structure(data)
-
-                # escrever JSON
-                json_path = os.path.join(tmpdir, "folder.json")
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-
-                # criar zip do tmpdir
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    # adicionar json
-                    zf.write(json_path, arcname="folder.json")
-                    # adicionar arquivos
-                    for fname in os.listdir(files_dir):
-                        full = os.path.join(files_dir, fname)
-                        zf.write(full, arcname=os.path.join("files", fname))
-                return True
-            finally:
-                # limpa temp
-                try:
-                    shutil.rmtree(tmpdir)
-                except Exception:
-                    pass
+            data, arquivos = self.preparar_exportacao(folder_card_id)
+            escrever_zip_pasta(zip_path, data, arquivos, progresso=progresso, workers=workers)
+            return True
+        except OperacaoCancelada:
+            return False
         except Exception as e:
             print("Erro exportando pasta:", e)
             return False
 
-    def import_folder_from_zip(self, parent_folder_id: int, zip_path: str) -> bool:
+    def import_folder_from_zip(self, parent_folder_id: int, zip_path: str,
+                               progresso: Optional[Callable[[int, int], Optional[bool]]] = None) -> bool:
         """
         Importa uma pasta a partir de um ZIP gerado por export_folder_as_zip.
         parent_folder_id: card_id do folder onde a nova pasta será criada como subfolder.
+
+        Em duas fases: primeiro os arquivos vão do ZIP para o armazém de blobs (por
+        hash, sem transação aberta); depois uma escrita curta no escritor do banco
+        insere todos os cards/anexos com executemany e liga cada blob na pasta física
+        final do card (mesma hierarquia de _get_card_storage_path) por hardlink.
+        Os nomes do folder.json e cada diretório são validados antes de qualquer
+        escrita (zip-slip). progresso(bytes_feitos, bytes_total) pode cancelar
+        retornando False durante a primeira fase: nada entra no banco e o método
+        retorna False (blobs já gravados ficam para coletar_lixo_blobs).
         """
         if not os.path.isfile(zip_path):
             raise FileNotFoundError("ZIP não encontrado.")
@@ -595,102 +1281,130 @@ class ControleCardKanban:
         if coluna_id is None:
             raise ValueError("Parent folder não tem coluna associada; import abortado.")
 
-        tmpdir = tempfile.mkdtemp(prefix="kanban_import_")
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                zf.extractall(tmpdir)
-
-            json_path = os.path.join(tmpdir, "folder.json")
-            if not os.path.isfile(json_path):
-                raise ValueError("Arquivo folder.json não encontrado no ZIP.")
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            data = ler_estrutura_zip(zf)
+
+            # plano: pastas em ordem BFS (pai antes dos filhos) e anexos com o membro já validado
+            pastas = []   # (titulo, indice da pasta pai ou None, posição entre os irmãos)
+            anexos = []   # (indice da pasta, anexo do folder.json, ZipInfo ou None)
+            fila = [(data, None, 0)]
+            while fila:
+                struct, pai_idx, posicao = fila.pop(0)
+                idx = len(pastas)
+                pastas.append(((struct.get('folder') or {}).get('titulo') or 'Nova Pasta', pai_idx, posicao))
+                for a in struct.get('anexos', []):
+                    exported = a.get('exported_filename')
+                    anexos.append((idx, a, membro_exportado(zf, exported) if exported else None))
+                for i, sub in enumerate(struct.get('subfolders', [])):
+                    fila.append((sub, idx, i))
+
+            total = sum(info.file_size for _, _, info in anexos if info is not None)
+            feitos = 0
+
+            def _avancar(n: int):
+                nonlocal feitos
+                feitos += n
+                if progresso is not None and progresso(feitos, total) is False:
+                    raise OperacaoCancelada()
+
+            # fase 1: conteúdo para o armazém, fora de qualquer transação
+            armazem = self.armazem
+            blobs: List[Tuple[Optional[str], Any]] = []
+            try:
+                for _, a, info in anexos:
+                    if info is None:
+                        blobs.append((None, a.get('tamanho')))
+                        continue
+                    # zf.open confere o CRC ao final da leitura
+                    with zf.open(info) as membro:
+                        blobs.append(armazem.armazenar_stream(membro, _avancar))
+            except OperacaoCancelada:
+                return False
 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        # fase 2: ids, pastas e linhas em uma escrita só
+        base_pai = self._get_card_storage_path(parent_folder_id)
+        dirs: List[str] = []
 
-            def _restore_struct(struct, target_parent_card_id):
-                # struct contains 'folder', 'anexos', 'subfolders'
-                title = (struct.get('folder') or {}).get('titulo') or 'Nova Pasta'
-                created = self.criar_card(coluna_id=coluna_id, titulo=title, pai_id=target_parent_card_id, tipo='folder')
-                if not created or not created.get('id'):
-                    return None
-                new_folder_id = created['id']
+        def _inserir(cur):
+            dirs.clear()
+            cur.execute(
+                """
+                SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'kanban_cards'), 0),
+                           COALESCE((SELECT MAX(id) FROM kanban_cards), 0)) + 1
+                """)
+            primeiro_id = cur.fetchone()[0]
+            ordem_raiz = self._get_max_ordem(coluna_id, parent_folder_id, cur) + self.ORDEM_PASSO
+
+            linhas_cards = []
+            for idx, (titulo, pai_idx, posicao) in enumerate(pastas):
+                card_id = primeiro_id + idx
+                if pai_idx is None:
+                    pai_id, ordem, base = parent_folder_id, ordem_raiz, base_pai
+                else:
+                    pai_id, ordem, base = primeiro_id + pai_idx, (posicao + 1) * self.ORDEM_PASSO, dirs[pai_idx]
+                d = os.path.join(base, self._nome_pasta_fisica(card_id, titulo))
+                validar_destino(d, self.IMPORT_BASE_DIR)
+                dirs.append(d)
+                linhas_cards.append((card_id, coluna_id, pai_id, titulo, "", 'folder', None, ordem, "{}"))
+            cur.executemany(
+                """
+                INSERT INTO kanban_cards (id, coluna_id, pai_id, titulo, descricao, tipo, cor_etiqueta, ordem, meta)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, linhas_cards)
+
+            for d in dirs:
+                os.makedirs(d, exist_ok=True)
+            ts = int(time.time())
+            linhas_anexos = []
+            for (idx, a, info), (sha, tamanho) in zip(anexos, blobs):
+                caminho = None
+                if sha is not None:
+                    destino = os.path.join(dirs[idx], f"{ts}_{a['exported_filename']}")
+                    validar_destino(destino, self.IMPORT_BASE_DIR)
+                    # só links: nenhum byte é copiado com a escrita aberta
+                    caminho = armazem.materializar(sha, destino)
+                linhas_anexos.append((primeiro_id + idx, a.get('nome_arquivo'), caminho,
+                                      a.get('url_remoto'), a.get('mime'), tamanho, sha))
+            cur.executemany(
+                """
+                INSERT INTO kanban_card_attachments (card_id, nome_arquivo, caminho_local, url_remoto, mime, tamanho, blob_sha256)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, linhas_anexos)
+            return primeiro_id
 
-                # anexos: se exported_filename existir, copiar do tmpdir/files
-                for a in struct.get('anexos', []):
-                    exported = a.get('exported_filename')
-                    if exported:
-                        src = os.path.join(tmpdir, "files", exported)
-                        if os.path.isfile(src):
-                            # copiar para import dir permanente
-                            try:
-                                ts = int(time.time())
-                                dest_parent = os.path.join(self.IMPORT_BASE_DIR, str(ts))
-                                os.makedirs(dest_parent, exist_ok=True)
-                                dest_name = f"{ts}_{os.path.basename(src)}"
-                                dest_path = os.path.join(dest_parent, dest_name)
-                                shutil.copy2(src, dest_path)
-                                tamanho = os.path.getsize(dest_path)
-                                self.adicionar_anexo(new_folder_id, nome_arquivo=a.get('nome_arquivo'), caminho_local=dest_path, tamanho=tamanho, url_remoto=a.get('url_remoto'), mime=a.get('mime'))
-                            except Exception:
-                                # tenta adicionar metadado sem caminho_local
-                                try:
-                                    self.adicionar_anexo(new_folder_id, nome_arquivo=a.get('nome_arquivo'), caminho_local=None, tamanho=a.get('tamanho'), url_remoto=a.get('url_remoto'), mime=a.get('mime'))
-                                except Exception:
-                                    pass
-                        else:
-                            # arquivo ausente no ZIP: registra apenas metadado
-                            try:
-                                self.adicionar_anexo(new_folder_id, nome_arquivo=a.get('nome_arquivo'), caminho_local=None, tamanho=a.get('tamanho'), url_remoto=a.get('url_remoto'), mime=a.get('mime'))
-                            except Exception:
-                                pass
-                    else:
-                        # nenhum arquivo exportado — registra metadado
-                        try:
-                            self.adicionar_anexo(new_folder_id, nome_arquivo=a.get('nome_arquivo'), caminho_local=None, tamanho=a.get('tamanho'), url_remoto=a.get('url_remoto'), mime=a.get('mime'))
-                        except Exception:
-                            pass
-
-                # subfolders recursivos
-                for sub in struct.get('subfolders', []):
-                    _restore_struct(sub, new_folder_id)
-
-                return new_folder_id
-
-            _restore_struct(data, parent_folder_id)
-            return True
+        try:
+            primeiro_id = self._escrever(_inserir)
+        except BaseException:
+            # o escritor desfez as linhas; remove as pastas que chegaram ao disco
+            if dirs:
+                shutil.rmtree(dirs[0], ignore_errors=True)
+            raise
+        self._notificar(CARD_CRIADO, primeiro_id, (coluna_id, parent_folder_id))
+        return True
 
-        finally:
-            try:
-                shutil.rmtree(tmpdir)
-            except Exception:
-                pass
-    
     # ==========================================================
     # DIRETÓRIO REAL POR CARD (PASTA FÍSICA HIERÁRQUICA)
     # ==========================================================
 
+    @staticmethod
+    def _nome_pasta_fisica(card_id: int, titulo: str) -> str:
+        """Um componente de caminho só: sem separadores (/ e \\), ':' de drive,
+        caracteres de controle nem '..' — o título pode vir de um ZIP."""
+        nome = _INVALIDOS_PASTA.sub('_', titulo or '').replace('..', '_').strip(' .')
+        return f"{card_id}_{nome or 'pasta'}"
+
     def _get_card_storage_path(self, card_id: int) -> str:
         """
         Retorna o caminho físico da pasta de um card.
         Se for subpasta, respeita hierarquia.
         """
-        card = self.get_card(card_id)
-        if not card:
+        # cadeia raiz → card em uma única query
+        cadeia = self.get_ancestors(card_id)
+        if not cadeia:
             raise ValueError("Card não encontrado")
 
         base = self.IMPORT_BASE_DIR
-
-        # monta caminho hierárquico subindo pais
-        path_parts = []
-        current = card
-
-        while current:
-            safe_name = f"{current['id']}_{current['titulo'].replace('/', '_')}"
-            path_parts.insert(0, safe_name)
-
-            if not current.get("pai_id"):
-                break
-            current = self.get_card(current["pai_id"])
+        path_parts = [self._nome_pasta_fisica(c['id'], c['titulo']) for c in cadeia]
 
         full_path = os.path.join(base, *path_parts)
         os.makedirs(full_path, exist_ok=True)
@@ -1,4 +1,4 @@
-from banco.database import conectar
+from banco.database import conectar_leitura, escrever
 
 class ControleKanban:
     def __init__(self):
@@ -6,7 +6,7 @@ class ControleKanban:
 
     def listar_quadros(self, user_id):
         """Busca todos os quadros de um usuário específico."""
-        conn = conectar()
+        conn = conectar_leitura()
         cursor = conn.cursor()
         try:
             cursor.execute("""
@@ -25,17 +25,13 @@ class ControleKanban:
 
     def criar_quadro(self, user_id, nome):
         """Insere um novo quadro no banco."""
-        conn = conectar()
-        cursor = conn.cursor()
         try:
-            cursor.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (?, ?)", (user_id, nome))
-            conn.commit()
-            return {"id": cursor.lastrowid, "nome": nome, "user_id": user_id}
+            quadro_id = escrever(lambda cursor: cursor.execute(
+                "INSERT INTO quadros_kanban (usuario_id, nome) VALUES (?, ?)", (user_id, nome)).lastrowid)
+            return {"id": quadro_id, "nome": nome, "user_id": user_id}
         except Exception as e:
             print(f"Erro ao criar: {e}")
             return None
-        finally:
-            conn.close()
 
     # ==========================================
     # NOVAS LOGICAS: EDIT E DELETE
@@ -45,40 +41,28 @@ class ControleKanban:
         """
         Atualiza o nome de um quadro existente.
         """
-        conn = conectar()
-        cursor = conn.cursor()
         try:
-            cursor.execute("""
+            return escrever(lambda cursor: cursor.execute("""
                 UPDATE quadros_kanban 
                 SET nome = ? 
                 WHERE id = ?
-            """, (novo_nome, quadro_id))
-            conn.commit()
-            return cursor.rowcount > 0 # Retorna True se alterou algo
+            """, (novo_nome, quadro_id)).rowcount) > 0 # Retorna True se alterou algo
         except Exception as e:
             print(f"Erro ao editar quadro {quadro_id}: {e}")
             return False
-        finally:
-            conn.close()
 
     def deletar_quadro(self, quadro_id):
         """
         Remove o quadro do banco. 
         Nota: Colunas e Cards serão removidos via CASCADE se configurado no DB.
         """
-        conn = conectar()
-        cursor = conn.cursor()
         try:
-            # Ativa FK para garantir o Cascade se o SQLite não o fizer sozinho
-            cursor.execute("PRAGMA foreign_keys = ON")
-            cursor.execute("DELETE FROM quadros_kanban WHERE id = ?", (quadro_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            # FK (e o Cascade) já vêm ativas na conexão do escritor
+            return escrever(lambda cursor: cursor.execute(
+                "DELETE FROM quadros_kanban WHERE id = ?", (quadro_id,)).rowcount) > 0
         except Exception as e:
             print(f"Erro ao deletar quadro {quadro_id}: {e}")
             return False
-        finally:
-            conn.close()
     
     def buscar_nome_quadro(self):
         try:
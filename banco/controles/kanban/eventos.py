@@ -0,0 +1,82 @@
+# banco/controles/kanban/eventos.py
+"""
+Eventos de alteração emitidos pelo ControleCardKanban.
+
+Cada escrita do controle (depois do commit) avisa os ouvintes com um
+EventoKanban dizendo qual card mudou e onde ele está (coluna_id/pai_id).
+Assim a UI atualiza só o widget afetado em vez de recarregar coluna/quadro
+(ver ColunaKanbanWidget._on_evento_kanban).
+
+Os ouvintes são chamados na thread que fez a escrita: controles usados em
+threads de trabalho (tarefas_io) criam a própria instância, sem ouvintes de UI.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+CARD_CRIADO = "card_criado"
+CARD_ATUALIZADO = "card_atualizado"        # título/descrição/meta, tags, anexos
+CARD_MOVIDO = "card_movido"                # coluna, pai ou posição
+CARD_REMOVIDO = "card_removido"
+CHECKLIST_ALTERADO = "checklist_alterado"
+# mudança que atinge vários cards sem id definido (ex.: renomear uma tag)
+CARDS_ALTERADOS = "cards_alterados"
+
+
+@dataclass(frozen=True)
+class EventoKanban:
+    tipo: str
+    card_id: Optional[int] = None
+    coluna_id: Optional[int] = None
+    pai_id: Optional[int] = None
+    # origem de um CARD_MOVIDO
+    coluna_origem: Optional[int] = None
+    pai_origem: Optional[int] = None
+
+
+OuvinteKanban = Callable[[EventoKanban], None]
+
+
+class EmissorEventos:
+    """Lista de ouvintes + emissão com agrupamento opcional (adiar_eventos)."""
+
+    def __init__(self):
+        self._ouvintes: List[OuvinteKanban] = []
+        self._adiados: Optional[List[EventoKanban]] = None
+
+    def assinar(self, ouvinte: OuvinteKanban) -> OuvinteKanban:
+        if ouvinte not in self._ouvintes:
+            self._ouvintes.append(ouvinte)
+        return ouvinte
+
+    def cancelar_assinatura(self, ouvinte: OuvinteKanban) -> None:
+        try:
+            self._ouvintes.remove(ouvinte)
+        except ValueError:
+            pass
+
+    def emitir(self, evento: EventoKanban) -> None:
+        if self._adiados is not None:
+            if evento not in self._adiados:
+                self._adiados.append(evento)
+            return
+        for ouvinte in list(self._ouvintes):
+            try:
+                ouvinte(evento)
+            except Exception as e:
+                # um ouvinte com problema (ex.: widget já destruído) não impede os demais
+                print("Erro em ouvinte de evento do Kanban:", e)
+
+    @contextmanager
+    def adiar_eventos(self):
+        """Agrupa as emissões do bloco e as entrega no fim, sem repetidos."""
+        if self._adiados is not None:
+            yield
+            return
+        self._adiados = []
+        try:
+            yield
+        finally:
+            eventos, self._adiados = self._adiados, None
+            for evento in eventos:
+                self.emitir(evento)
@@ -0,0 +1,183 @@
+# banco/controles/kanban/zip_pastas.py
+"""
+Leitura/escrita streaming dos ZIPs de pasta do Kanban (export_folder_as_zip e
+import_folder_from_zip).
+
+Exportação: os anexos vão direto do caminho de origem para o arquivo ZIP, sem cópia em
+diretório temporário:
+
+- cada arquivo é lido em blocos de BLOCO_BYTES por um pool de threads (leitura
+  antecipada) e gravado em ordem por uma única thread escritora, pela API
+  pública de streaming do zipfile (ZipFile.open(zinfo, "w")), que comprime,
+  calcula o CRC e fecha o cabeçalho de cada entrada;
+- mídia e arquivos já comprimidos (EXTENSOES_ARMAZENADAS) entram como
+  ZIP_STORED, sem gastar CPU com deflate;
+- o número de blocos em voo é limitado, então a memória usada não depende do
+  tamanho dos arquivos.
+
+Importação: folder.json é lido direto do ZIP e cada membro referenciado é
+copiado em blocos para o armazém de blobs (armazem_blobs.py), sem extractall em
+diretório temporário.
+Os nomes vindos do folder.json são validados (zip-slip) antes de qualquer escrita.
+
+progresso(feitos, total) recebe bytes processados/total de bytes; se retornar
+False a operação é cancelada com OperacaoCancelada (na exportação o ZIP parcial
+é apagado).
+"""
+import json
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BLOCO_BYTES = 1024 * 1024
+EXTENSOES_ARMAZENADAS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.mp4', '.mov', '.mkv', '.webm', '.avi', '.mp3', '.m4a', '.ogg',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.docx', '.xlsx', '.pptx',
+}
+
+Progresso = Callable[[int, int], Optional[bool]]
+
+
+class OperacaoCancelada(Exception):
+    """Levantada quando o callback de progresso pede o cancelamento."""
+
+
+def deve_comprimir(caminho: str) -> bool:
+    return os.path.splitext(caminho)[1].lower() not in EXTENSOES_ARMAZENADAS
+
+
+def workers_padrao() -> int:
+    return max(1, min(8, os.cpu_count() or 2))
+
+
+def _ler_bloco(caminho: str, offset: int, tamanho: int) -> bytes:
+    """Executa no pool: lê um bloco do arquivo."""
+    with open(caminho, "rb") as f:
+        f.seek(offset)
+        return f.read(tamanho)
+
+
+def _abrir_entrada(zf: zipfile.ZipFile, caminho: str, arcname: str, tamanho: int, comprimir: bool):
+    """Abre a entrada para escrita em streaming; file_size antecipado decide o zip64."""
+    zinfo = zipfile.ZipInfo.from_file(caminho, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED if comprimir else zipfile.ZIP_STORED
+    zinfo.file_size = tamanho
+    return zf.open(zinfo, "w")
+
+
+def _blocos(entradas: List[Tuple[str, str, int, bool]]):
+    """Gera (indice_entrada, offset, tamanho, final) para todos os arquivos, em ordem."""
+    for i, (_, _, tamanho, _) in enumerate(entradas):
+        offset = 0
+        while True:
+            n = min(BLOCO_BYTES, tamanho - offset)
+            final = offset + n >= tamanho
+            yield i, offset, n, final
+            if final:
+                break
+            offset += n
+
+
+def escrever_zip_pasta(zip_path: str, estrutura: Dict[str, Any], arquivos: List[Tuple[str, str]],
+                       progresso: Optional[Progresso] = None, workers: Optional[int] = None) -> int:
+    """
+    Grava `zip_path` com folder.json (estrutura) e os arquivos [(origem, arcname)].
+    Retorna o total de bytes de anexos lidos.
+    """
+    entradas: List[Tuple[str, str, int, bool]] = []
+    for origem, arcname in arquivos:
+        entradas.append((origem, arcname, os.path.getsize(origem), deve_comprimir(origem)))
+    total = sum(e[2] for e in entradas)
+    workers = workers or workers_padrao()
+    janela = workers * 4
+    feitos = 0
+
+    def _continuar() -> bool:
+        return progresso is None or progresso(feitos, total) is not False
+
+    try:
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip_pasta") as pool:
+            zf.writestr("folder.json", json.dumps(estrutura, ensure_ascii=False, indent=2))
+            if not _continuar():
+                raise OperacaoCancelada()
+
+            pendentes = deque()
+            blocos = _blocos(entradas)
+            atual = None      # entrada aberta (ZipFile.open em modo "w")
+            atual_idx = -1
+            try:
+                while True:
+                    while len(pendentes) < janela:
+                        bloco = next(blocos, None)
+                        if bloco is None:
+                            break
+                        i, offset, n, final = bloco
+                        pendentes.append((i, final, pool.submit(_ler_bloco, entradas[i][0], offset, n)))
+                    if not pendentes:
+                        break
+
+                    i, final, futuro = pendentes.popleft()
+                    dados = futuro.result()
+                    if i != atual_idx:
+                        atual, atual_idx = _abrir_entrada(zf, *entradas[i]), i
+                    atual.write(dados)
+                    if final:
+                        atual.close()
+                    feitos += len(dados)
+                    if not _continuar():
+                        raise OperacaoCancelada()
+            except BaseException:
+                for _, _, futuro in pendentes:
+                    futuro.cancel()
+                if atual is not None and not atual.closed:
+                    # o ZipFile não fecha com uma entrada aberta; o ZIP parcial é apagado abaixo
+                    try:
+                        atual.close()
+                    except Exception:
+                        pass
+                raise
+        return feitos
+    except BaseException:
+        # ZIP parcial nunca fica no disco
+        try:
+            os.remove(zip_path)
+        except OSError:
+            pass
+        raise
+
+
+# -------------------------
+# Importação
+# -------------------------
+def ler_estrutura_zip(zf: zipfile.ZipFile) -> Dict[str, Any]:
+    try:
+        info = zf.getinfo("folder.json")
+    except KeyError:
+        raise ValueError("Arquivo folder.json não encontrado no ZIP.")
+    with zf.open(info) as f:
+        return json.load(f)
+
+
+def membro_exportado(zf: zipfile.ZipFile, nome: Any) -> Optional[zipfile.ZipInfo]:
+    """
+    Valida um `exported_filename` do folder.json e retorna o membro files/<nome>
+    (None se não estiver no ZIP). Nomes com separadores, '..', drive ou NUL são
+    rejeitados: o valor vira nome de arquivo no disco.
+    """
+    if (not isinstance(nome, str) or not nome or nome in (".", "..")
+            or any(c in nome for c in ("/", "\\", ":", "\x00"))):
+        raise ValueError(f"Nome de arquivo inválido no ZIP: {nome!r}")
+    try:
+        return zf.getinfo(f"files/{nome}")
+    except KeyError:
+        return None
+
+
+def validar_destino(destino: str, base_dir: str) -> None:
+    """Garante que um caminho montado a partir do ZIP fica dentro de base_dir."""
+    if not os.path.realpath(destino).startswith(os.path.realpath(base_dir) + os.sep):
+        raise ValueError(f"Destino fora da área de armazenamento: {destino}")
@@ -3,13 +3,15 @@
 Controller/DAO para manipular a tabela `themes`.
 Usa a função conectar() de banco.database por padrão, mas aceita uma conexão
 sqlite3.Connection injetada (útil para testes ou para compartilhar a conexão global).
+Com a conexão do projeto, as escritas vão pelo escritor do banco (escrever());
+com uma conexão injetada, rodam nela mesma e são commitadas aqui.
 """
 from typing import Optional, List, Dict, Any
 import sqlite3
 import traceback
 
 from banco.modelos.db_model_tema import DBModelTema
-from banco.database import conectar  # função do seu projeto para obter conexão
+from banco.database import conectar, escrever  # funções do projeto para conexão/escrita
 
 
 class ControleTema:
@@ -19,11 +21,13 @@ class ControleTema:
         Se conn fornecida, não tentará fechar essa conexão no método close().
         """
         self._owns_connection = False
+        self._usa_escritor = False
         if conn is None:
             # obtém conexão do projeto
             try:
                 self._conn = conectar()
                 self._owns_connection = True
+                self._usa_escritor = True
             except Exception:
                 traceback.print_exc()
                 # fallback: criar conexão local mínima (não ideal, mas previne crash)
@@ -49,19 +53,27 @@ class ControleTema:
         except Exception:
             pass
 
+    def _escrever(self, funcao):
+        """Roda funcao(cursor) no escritor do banco ou, com conexão injetada, nela mesma."""
+        if self._usa_escritor:
+            return escrever(funcao)
+        resultado = funcao(self._conn.cursor())
+        self._commit()
+        return resultado
+
     def create(self, name: str, scope: str = "Global", theme_mode: str = "dark",
                cor_fundo: Optional[str] = None, cor_destaque: Optional[str] = None,
                imagem_fundo: Optional[str] = None, imagem_opacity: float = 0.8,
                set_active: bool = False) -> int:
-        cur = self._conn.cursor()
-        if set_active:
-            cur.execute("UPDATE themes SET is_active = 0 WHERE is_active = 1")
-        cur.execute("""
-            INSERT INTO themes (name, scope, theme_mode, cor_fundo, cor_destaque, imagem_fundo, imagem_opacity, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (name, scope, theme_mode, cor_fundo, cor_destaque, imagem_fundo, float(imagem_opacity), 1 if set_active else 0))
-        self._commit()
-        return cur.lastrowid
+        def _criar(cur):
+            if set_active:
+                cur.execute("UPDATE themes SET is_active = 0 WHERE is_active = 1")
+            cur.execute("""
+                INSERT INTO themes (name, scope, theme_mode, cor_fundo, cor_destaque, imagem_fundo, imagem_opacity, is_active)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, scope, theme_mode, cor_fundo, cor_destaque, imagem_fundo, float(imagem_opacity), 1 if set_active else 0))
+            return cur.lastrowid
+        return self._escrever(_criar)
 
     def update(self, theme_id: int, **fields: Any) -> None:
         if not fields:
@@ -74,14 +86,10 @@ class ControleTema:
         params = [fields[k] for k in keys]
         sql = f"UPDATE themes SET {set_clause}, updated_at = datetime('now') WHERE id = ?"
         params.append(theme_id)
-        cur = self._conn.cursor()
-        cur.execute(sql, params)
-        self._commit()
+        self._escrever(lambda cur: cur.execute(sql, params))
 
     def delete(self, theme_id: int) -> None:
-        cur = self._conn.cursor()
-        cur.execute("DELETE FROM themes WHERE id = ?", (theme_id,))
-        self._commit()
+        self._escrever(lambda cur: cur.execute("DELETE FROM themes WHERE id = ?", (theme_id,)))
 
     def get(self, theme_id: int) -> Optional[Dict]:
         cur = self._conn.cursor()
@@ -102,11 +110,11 @@ class ControleTema:
         return DBModelTema.row_to_dict(row)
 
     def set_active(self, theme_id: Optional[int]) -> None:
-        cur = self._conn.cursor()
-        cur.execute("UPDATE themes SET is_active = 0 WHERE is_active = 1")
-        if theme_id is not None:
-            cur.execute("UPDATE themes SET is_active = 1 WHERE id = ?", (theme_id,))
-        self._commit()
+        def _ativar(cur):
+            cur.execute("UPDATE themes SET is_active = 0 WHERE is_active = 1")
+            if theme_id is not None:
+                cur.execute("UPDATE themes SET is_active = 1 WHERE id = ?", (theme_id,))
+        self._escrever(_ativar)
 
     def close(self):
         """
@@ -1,14 +1,54 @@
 # banco/database.py
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Any, ContextManager, Optional, Union
 import sqlite3
 
+from banco.conexoes import obter_pool
+from banco.escritor import EscritorBanco, FuncaoEscrita, obter_escritor
+
 BASE_DIR = Path(__file__).resolve().parent
 CAMINHO_DB = BASE_DIR / "devhive.sqlite"
 
-def conectar():
+def conectar(caminho: Optional[str] = None) -> sqlite3.Connection:
     """
     Conecta ao banco único do projeto.
-    Retorna um sqlite3.Connection.
+    Retorna um sqlite3.Connection vindo do pool da thread atual
+    (WAL + PRAGMAs já aplicados). conn.close() devolve a conexão ao pool.
+    Escritas da aplicação usam escrever(); conexão de escrita própria só para
+    migrações/criação de tabelas e ferramentas de linha de comando.
     """
     # garantir que o caminho exista implicitamente (sqlite cria o arquivo)
-    return sqlite3.connect(str(CAMINHO_DB), timeout=30)
+    return obter_pool(caminho or CAMINHO_DB).obter()
+
+
+def conectar_leitura(caminho: Optional[str] = None) -> sqlite3.Connection:
+    """Como conectar(), mas de um pool só de leitura (PRAGMA query_only)."""
+    return obter_pool(caminho or CAMINHO_DB, somente_leitura=True).obter()
+
+
+def usar_conexao(caminho: Optional[str] = None, somente_leitura: bool = False) -> ContextManager[sqlite3.Connection]:
+    """
+    `with usar_conexao() as conn:` — conexão do pool só pelo bloco: commit
+    (ou rollback, se houver exceção) ao sair e devolução ao pool. Use no lugar
+    de `with conectar() as conn:`, que só faz commit/rollback (como no sqlite3).
+    """
+    return obter_pool(caminho or CAMINHO_DB, somente_leitura=somente_leitura).emprestar()
+
+
+def escritor_do_banco(caminho: Optional[str] = None) -> EscritorBanco:
+    """O escritor único do arquivo (estatísticas e contadores de commit)."""
+    return obter_escritor(caminho or CAMINHO_DB)
+
+
+def escrever(funcao: FuncaoEscrita, caminho: Optional[str] = None,
+             esperar: bool = True) -> Union[Any, "Future[Any]"]:
+    """
+    Roda funcao(cursor) no escritor único do banco (banco/escritor.py), em
+    commit de grupo com as outras escritas. esperar=True devolve o retorno da
+    função (ou levanta a exceção dela); esperar=False devolve o Future.
+    """
+    escritor = escritor_do_banco(caminho)
+    if esperar:
+        return escritor.escrever(funcao)
+    return escritor.submeter(funcao)
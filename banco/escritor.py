@@ -0,0 +1,302 @@
+# banco/escritor.py
+"""
+Escritor único do banco.
+
+Cada arquivo de banco tem um EscritorBanco (obter_escritor()): uma thread que
+é dona da única conexão de escrita e recebe as escritas por uma fila. Quem
+escreve entrega uma função `funcao(cursor)` e recebe um Future com o retorno
+dela (ou a exceção). Na prática usa-se banco.database.escrever(), que espera
+o resultado, ou escrever(..., esperar=False) para não esperar.
+
+Commit em grupo: a thread pega o primeiro pedido da fila e tudo que já estiver
+esperando (até MAX_LOTE) — o que chega enquanto um lote grava forma o próximo.
+Com janela > 0, se chegou mais de um, espera até `janela` segundos por outros
+do mesmo surto (só compensa com commits caros, ex. synchronous=FULL: quem
+chama escrever() fica parado esperando, então a janela vira latência).
+O lote inteiro roda numa transação só (BEGIN IMMEDIATE ... COMMIT), cada
+pedido dentro do seu SAVEPOINT: um pedido que falha é desfeito sozinho e os
+outros seguem. Os Futures só são resolvidos depois do
+COMMIT, então quem esperou já lê o que escreveu. Uma escrita isolada nunca
+espera a janela. Cada COMMIT recebe um número de sequência (Future.seq_commit,
+commits()): quem guarda cache pela versão do banco sabe se outro lote gravou
+entre a sua leitura e o seu commit, ou logo depois dele.
+
+Regras para a função:
+- não chama commit/rollback (o escritor decide);
+- roda na thread do escritor: não toca em widgets; quem chamou escrever() e
+  está esperando pode ter seu estado lido/alterado por ela com segurança;
+- pode chamar escrever() de novo (roda direto, no mesmo lote).
+
+Falha do próprio lote (BEGIN IMMEDIATE ocupado além do busy_timeout, erro em
+ROLLBACK TO/RELEASE/COMMIT) desfaz o lote inteiro: todos os Futures dele
+recebem o erro, a conexão é descartada e reaberta no lote seguinte. A thread
+não morre com isso; se morrer por outro motivo, a próxima submeter() (ou a
+própria thread, ao sair com pedidos na fila) sobe outra.
+
+As leituras ficam nas conexões do pool (banco.database.conectar_leitura, só
+leitura). Migrações continuam com conexão própria; o escritor espera por
+elas via busy_timeout, sem "database is locked".
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from banco.conexoes import PRAGMAS_PADRAO, TIMEOUT_PADRAO, aplicar_pragmas
+from banco.rastreio import ConexaoRastreada
+
+FuncaoEscrita = Callable[[sqlite3.Cursor], Any]
+
+_FIM = object()
+
+
+class EscritorBanco:
+    """Thread dona da conexão de escrita de um arquivo de banco (ver docstring do módulo)."""
+
+    JANELA = 0.0            # segundos de espera por mais pedidos quando há um surto
+    MAX_LOTE = 256          # pedidos por transação
+    MAX_FILA = 10000        # submeter() bloqueia acima disso (contrapressão)
+
+    def __init__(self, caminho: str, janela: float = JANELA, max_lote: int = MAX_LOTE,
+                 timeout: float = TIMEOUT_PADRAO, pragmas=PRAGMAS_PADRAO):
+        self.caminho = str(caminho)
+        self.janela = janela
+        self.max_lote = max_lote
+        self.timeout = timeout
+        self.pragmas = tuple(pragmas)
+        self._fila: "queue.Queue" = queue.Queue(self.MAX_FILA)
+        self._thread: Optional[threading.Thread] = None
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._lock = threading.Lock()
+        self._stats = {"pedidos": 0, "lotes": 0, "falhas": 0, "maior_lote": 0}
+        self._commits_iniciados = 0     # COMMITs já enviados (o em andamento inclusive)
+        self._commits_concluidos = 0    # COMMITs que já voltaram (com sucesso ou não)
+
+    # ------------------ API ------------------
+    def submeter(self, funcao: FuncaoEscrita) -> "Future[Any]":
+        """Enfileira funcao(cursor); o Future resolve depois do commit do lote."""
+        futuro: Future = Future()
+        if self._na_thread():
+            # escrita aninhada (a função de um pedido chamou escrever): roda no lote atual
+            try:
+                futuro.set_result(funcao(self._cursor))
+            except BaseException as e:
+                futuro.set_exception(e)
+            return futuro
+        self._iniciar()
+        self._fila.put((funcao, futuro))
+        return futuro
+
+    def escrever(self, funcao: FuncaoEscrita, timeout: Optional[float] = None) -> Any:
+        """submeter() e espera: devolve o retorno da função ou levanta a exceção dela."""
+        return self.submeter(funcao).result(timeout)
+
+    def executar(self, sql: str, params=()) -> "Future[Tuple[int, int]]":
+        """Atalho para um comando só; o Future traz (lastrowid, rowcount)."""
+        def _executar(cur: sqlite3.Cursor):
+            cur.execute(sql, params)
+            return cur.lastrowid, cur.rowcount
+        return self.submeter(_executar)
+
+    def parar(self, timeout: Optional[float] = None) -> None:
+        """Grava o que está na fila e encerra a thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._fila.put(_FIM)
+        thread.join(timeout)
+
+    def commits(self) -> Tuple[int, int]:
+        """(concluídos, iniciados): iniciados > concluídos enquanto um COMMIT está em andamento."""
+        with self._lock:
+            return self._commits_concluidos, self._commits_iniciados
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pendentes"] = self._fila.qsize()
+        stats["media_por_lote"] = stats["pedidos"] / stats["lotes"] if stats["lotes"] else 0.0
+        return stats
+
+    # ------------------ thread ------------------
+    def _na_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _iniciar(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._laco, name="banco-escritor", daemon=True)
+            self._thread.start()
+
+    def _abrir(self) -> sqlite3.Connection:
+        # isolation_level=None: BEGIN/COMMIT explícitos, um por lote
+        conn = sqlite3.connect(self.caminho, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False, factory=ConexaoRastreada)
+        aplicar_pragmas(conn, self.pragmas)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _proximo_lote(self, primeiro) -> Tuple[List, bool]:
+        lote = [primeiro]
+        fim = False
+        limite = None
+        while len(lote) < self.max_lote:
+            try:
+                item = self._fila.get_nowait()
+            except queue.Empty:
+                if len(lote) == 1 or self.janela <= 0:
+                    break          # escrita isolada: não espera a janela
+                if limite is None:
+                    limite = time.monotonic() + self.janela
+                resta = limite - time.monotonic()
+                if resta <= 0:
+                    break
+                try:
+                    item = self._fila.get(timeout=resta)
+                except queue.Empty:
+                    break
+            if item is _FIM:
+                fim = True
+                break
+            lote.append(item)
+        return lote, fim
+
+    def _laco(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        encerrado = False
+        try:
+            while True:
+                primeiro = self._fila.get()
+                if primeiro is _FIM:
+                    encerrado = True
+                    return
+                lote, fim = self._proximo_lote(primeiro)
+                try:
+                    if conn is None:
+                        # aberta no primeiro lote; se falhar (ex.: pasta inexistente), o
+                        # lote falha com o erro e o próximo tenta de novo
+                        conn = self._abrir()
+                    if not self._gravar(conn, lote):
+                        conn = self._descartar(conn)
+                except BaseException as e:
+                    # nenhum pedido pode ficar sem resposta: quem espera o Future travaria
+                    self._falhar(lote, e)
+                    conn = self._descartar(conn)
+                if fim:
+                    encerrado = True
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+            if not encerrado and not self._fila.empty():
+                self._iniciar()
+
+    @staticmethod
+    def _descartar(conn: Optional[sqlite3.Connection]) -> None:
+        """Fecha uma conexão que pode ter ficado no meio de uma transação."""
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        return None
+
+    def _falhar(self, lote: List, erro: BaseException) -> None:
+        for _funcao, futuro in lote:
+            if futuro.done():
+                continue
+            if futuro.running() or futuro.set_running_or_notify_cancel():
+                futuro.set_exception(erro)
+        self._contar(len(lote), len(lote))
+
+    def _gravar(self, conn: sqlite3.Connection, lote: List) -> bool:
+        """Grava o lote numa transação. False se o próprio lote falhou (todos os
+        Futures recebem o erro e a conexão deve ser descartada)."""
+        cur = conn.cursor()
+        self._cursor = cur
+        feitos: List[Tuple[Future, Any]] = []
+        falhas: List[Tuple[Future, BaseException]] = []
+        seq: Optional[int] = None
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for funcao, futuro in lote:
+                if not futuro.set_running_or_notify_cancel():
+                    continue
+                cur.execute("SAVEPOINT pedido")
+                try:
+                    resultado = funcao(cur)
+                except BaseException as e:
+                    cur.execute("ROLLBACK TO pedido")
+                    cur.execute("RELEASE pedido")
+                    falhas.append((futuro, e))
+                else:
+                    cur.execute("RELEASE pedido")
+                    feitos.append((futuro, resultado))
+            with self._lock:
+                self._commits_iniciados += 1
+                seq = self._commits_iniciados
+            cur.execute("COMMIT")
+        except BaseException as e:
+            # BEGIN ocupado, ROLLBACK TO/RELEASE/COMMIT com erro: nada do lote foi gravado
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                pass
+            for futuro, erro in falhas:
+                futuro.set_exception(erro)
+            self._falhar(lote, e)
+            return False
+        finally:
+            self._cursor = None
+            if seq is not None:
+                with self._lock:
+                    self._commits_concluidos = seq
+        self._contar(len(lote), len(falhas))
+        for futuro, resultado in feitos:
+            # quem mantém cache pela versão do banco sabe se o commit só tinha a sua escrita
+            futuro.tamanho_lote = len(lote)
+            futuro.seq_commit = seq
+            futuro.set_result(resultado)
+        for futuro, erro in falhas:
+            futuro.set_exception(erro)
+        return True
+
+    def _contar(self, pedidos: int, falhas: int) -> None:
+        with self._lock:
+            self._stats["pedidos"] += pedidos
+            self._stats["lotes"] += 1
+            self._stats["falhas"] += falhas
+            self._stats["maior_lote"] = max(self._stats["maior_lote"], pedidos)
+
+
+_ESCRITORES: Dict[str, EscritorBanco] = {}
+_ESCRITORES_LOCK = threading.Lock()
+
+
+def obter_escritor(caminho: str) -> EscritorBanco:
+    """Retorna (criando se preciso) o escritor associado a um arquivo de banco."""
+    chave = str(caminho)
+    with _ESCRITORES_LOCK:
+        escritor = _ESCRITORES.get(chave)
+        if escritor is None:
+            escritor = EscritorBanco(chave)
+            _ESCRITORES[chave] = escritor
+        return escritor
+
+
+@atexit.register
+def parar_escritores(timeout: Optional[float] = 5.0) -> None:
+    """Grava as filas pendentes (ex.: escritas sem espera) antes de sair."""
+    with _ESCRITORES_LOCK:
+        escritores = list(_ESCRITORES.values())
+    for escritor in escritores:
+        escritor.parar(timeout)
@@ -4,6 +4,7 @@ from banco.auth import inicializar_tabela as init_usuarios
 from banco.modelos.db_model_chat import criar_tabelas_chat
 from banco.modelos.db_model_quadro import criar_tabelas_kanban
 from banco.modelos.db_model_tema import criar_tabela_tema  # 👈 NOVO IMPORT
+from banco.migracoes import aplicar_migracoes
 
 def inicializar_banco():
     """
@@ -23,4 +24,9 @@ def inicializar_banco():
     # Tema (NOVO)
     criar_tabela_tema()
 
+    # Migrações versionadas (colunas novas, índices, FTS) sobre as tabelas base
+    aplicadas = aplicar_migracoes()
+    if aplicadas:
+        print(f"Migrações aplicadas: {aplicadas}")
+
     print("Banco inicializado com sucesso.")
@@ -0,0 +1,213 @@
+# banco/migracoes.py
+"""
+Migrações versionadas do schema.
+
+As tabelas base continuam sendo criadas pelos módulos de banco/modelos
+(CREATE TABLE IF NOT EXISTS). Toda mudança posterior — colunas novas, índices,
+tabelas auxiliares — entra aqui como uma migração numerada:
+
+    @migracao(N, "descrição curta")
+    def _mNNNN_nome(cur): ...
+
+Regras:
+- versões são aplicadas em ordem crescente, cada uma em sua própria transação;
+- a versão aplicada fica registrada em schema_version e nunca roda de novo;
+- migrações devem ser idempotentes (IF NOT EXISTS / checagem de colunas), pois
+  bancos antigos podem já ter parte das mudanças feitas à mão.
+"""
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar, usar_conexao
+from banco.modelos.db_model_alteracoes import LEITORES_SQL as ALTERACOES_LEITORES_SQL, instalar_registro_alteracoes
+from banco.modelos.db_model_blobs import instalar_armazem_blobs
+from banco.modelos.db_model_busca import instalar_indice_busca
+from banco.modelos.db_model_quadro import META_INDEXADAS
+from banco.modelos.db_model_sessoes import instalar_tabela_sessoes
+
+
+@dataclass(frozen=True)
+class Migracao:
+    versao: int
+    descricao: str
+    aplicar: Callable[[sqlite3.Cursor], None]
+
+
+MIGRACOES: List[Migracao] = []
+
+
+def migracao(versao: int, descricao: str):
+    """Registra a função decorada como a migração `versao`."""
+    def decorator(func: Callable[[sqlite3.Cursor], None]):
+        if any(m.versao == versao for m in MIGRACOES):
+            raise ValueError(f"Migração {versao} registrada duas vezes")
+        MIGRACOES.append(Migracao(versao, descricao, func))
+        MIGRACOES.sort(key=lambda m: m.versao)
+        return func
+    return decorator
+
+
+# -------------------------
+# Utilitários
+# -------------------------
+def _tabela_existe(cur: sqlite3.Cursor, tabela: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,))
+    return cur.fetchone() is not None
+
+
+def _adicionar_coluna(cur: sqlite3.Cursor, tabela: str, coluna: str, tipo: str) -> None:
+    cur.execute(f"PRAGMA table_info({tabela})")
+    if coluna not in [row[1] for row in cur.fetchall()]:
+        cur.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+
+
+# -------------------------
+# Migrações
+# -------------------------
+@migracao(1, "usuarios: colunas cargo e foto")
+def _m0001_usuarios_cargo_foto(cur):
+    if _tabela_existe(cur, "usuarios"):
+        _adicionar_coluna(cur, "usuarios", "cargo", "TEXT")
+        _adicionar_coluna(cur, "usuarios", "foto", "TEXT")
+
+
+@migracao(2, "kanban: índices dos caminhos de acesso quentes")
+def _m0002_kanban_indices(cur):
+    # cards de uma coluna/nível em ordem (listar_cards, snapshot, _get_max_ordem, move_card)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_cards_coluna_pai_ordem "
+                "ON kanban_cards(coluna_id, pai_id, ordem, criado_em)")
+    # filhos de um card/pasta (get_card_children, sub-pastas, ON DELETE CASCADE de pai_id)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_cards_pai_ordem ON kanban_cards(pai_id, ordem)")
+    # checklist por card e subtarefas
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_checklist_card_pai_ordem "
+                "ON kanban_card_checklist(card_id, pai_id, ordem, criado_em)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_checklist_pai ON kanban_card_checklist(pai_id)")
+    # anexos por card
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_anexos_card_criado "
+                "ON kanban_card_attachments(card_id, criado_em)")
+    # cards por tag (listar_cards(tags=...))
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_card_tags_tag ON kanban_card_tags(tag_id, card_id)")
+    # colunas do quadro
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_colunas_quadro_ordem ON kanban_colunas(quadro_id, ordem)")
+    # substituídos pelos índices compostos acima
+    cur.execute("DROP INDEX IF EXISTS idx_checklist_card")
+    cur.execute("DROP INDEX IF EXISTS idx_anexos_card")
+
+
+@migracao(3, "kanban: índices de expressão para chaves quentes do meta")
+def _m0003_kanban_meta(cur):
+    for chave in META_INDEXADAS:
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_cards_meta_{chave} ON kanban_cards(json_extract(meta, '$.{chave}')) "
+            f"WHERE json_extract(meta, '$.{chave}') IS NOT NULL"
+        )
+
+
+@migracao(4, "kanban: índice de busca textual (FTS5)")
+def _m0004_kanban_busca(cur):
+    instalar_indice_busca(cur.connection)
+
+
+@migracao(5, "kanban: ordem esparsa dos cards")
+def _m0005_kanban_ordem_esparsa(cur):
+    # ControleCardKanban passou a usar chaves com folga (ORDEM_PASSO) para que mover
+    # um card grave uma linha só; multiplicar preserva a ordem relativa de cada grupo
+    cur.execute("UPDATE kanban_cards SET ordem = (COALESCE(ordem, 0) + 1) * ?", (ControleCardKanban.ORDEM_PASSO,))
+
+
+@migracao(6, "kanban: armazém de anexos por conteúdo (blobs)")
+def _m0006_kanban_blobs(cur):
+    # anexos antigos continuam com blob_sha256 NULL até
+    # `python -m banco.controles.kanban.armazem_blobs --deduplicar`
+    instalar_armazem_blobs(cur.connection)
+
+
+@migracao(7, "registro de alterações (changelog) para o barramento da UI")
+def _m0007_registro_alteracoes(cur):
+    instalar_registro_alteracoes(cur.connection)
+
+
+@migracao(8, "chat: índice de mensagens por sessão (paginação por id)")
+def _m0008_chat_mensagens_sessao(cur):
+    # páginas do histórico: WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?
+    if _tabela_existe(cur, "chat_mensagens"):
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_chat_mensagens_sessao_id ON chat_mensagens(session_id, id)")
+
+
+@migracao(9, "usuarios: sessões lembradas (token por dispositivo)")
+def _m0009_sessoes_login(cur):
+    instalar_tabela_sessoes(cur.connection)
+
+
+@migracao(10, "registro de alterações: posição de cada leitor para a poda")
+def _m0010_alteracoes_leitores(cur):
+    cur.execute(ALTERACOES_LEITORES_SQL)
+
+
+# -------------------------
+# Runner
+# -------------------------
+def _garantir_tabela_versao(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicado_em TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+
+def versao_atual(conn: sqlite3.Connection) -> int:
+    _garantir_tabela_versao(conn)
+    row = conn.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version").fetchone()
+    return row[0] if row else 0
+
+
+def aplicar_migracoes(conn: Optional[sqlite3.Connection] = None) -> List[int]:
+    """
+    Aplica as migrações pendentes em ordem. Cada migração roda em uma transação
+    (BEGIN IMMEDIATE) junto com o registro em schema_version; em caso de erro a
+    migração é desfeita e a exceção propagada. Retorna as versões aplicadas.
+    """
+    created = conn is None
+    if created:
+        conn = conectar()
+    aplicadas: List[int] = []
+    try:
+        atual = versao_atual(conn)
+        for m in MIGRACOES:
+            if m.versao <= atual:
+                continue
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                # outra instância pode ter migrado enquanto esperávamos o lock
+                cur.execute("SELECT 1 FROM schema_version WHERE versao = ?", (m.versao,))
+                if cur.fetchone() is None:
+                    m.aplicar(cur)
+                    cur.execute(
+                        "INSERT INTO schema_version (versao, descricao, aplicado_em) VALUES (?, ?, ?)",
+                        (m.versao, m.descricao, datetime.utcnow().isoformat()))
+                    aplicadas.append(m.versao)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return aplicadas
+    finally:
+        if created:
+            conn.close()
+
+
+if __name__ == "__main__":
+    aplicadas = aplicar_migracoes()
+    with usar_conexao() as c:
+        atual = versao_atual(c)
+    if aplicadas:
+        print(f"Migrações aplicadas: {aplicadas}. Versão atual: {atual}.")
+    else:
+        print(f"Schema já está na versão {atual}.")
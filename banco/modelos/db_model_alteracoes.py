@@ -0,0 +1,273 @@
+# banco/modelos/db_model_alteracoes.py
+"""
+Registro de alterações (changelog) das tabelas da aplicação.
+
+Triggers AFTER INSERT/UPDATE/DELETE em cada tabela de TABELAS_MONITORADAS
+acrescentam uma linha em db_alteracoes com a tabela, a operação ('I', 'U',
+'D'), o id da linha e uma referência ao "dono" da linha (ex.: card_id de um
+item de checklist, session_id de uma mensagem). Como os triggers rodam no
+próprio SQLite, escritas de qualquer conexão, thread ou processo (incluindo
+as tarefas em segundo plano) aparecem no registro.
+
+Quem lê é o barramento de alterações (interface/objeto/barramento_alteracoes.py),
+que consulta as linhas com id maior que o último visto e entrega um
+LoteAlteracoes agrupado por tabela aos assinantes, e o sincronizador de
+comandos do chat. A criação é feita pela migração 7 (banco/migracoes.py).
+
+Poda: cada leitor informa até onde leu (informar_posicao); o barramento grava
+essas posições em db_alteracoes_leitores e apaga só as linhas que todos os
+leitores vivos já leram (podar_alteracoes, pelo escritor único). Leitores de
+outros processos entram pela mesma tabela. Um leitor que some deixa de contar
+depois de LEITOR_EXPIRA segundos; se voltar, alteracoes_perdidas() avisa que
+o registro tem um buraco e ele recarrega tudo.
+
+Inspeção manual:
+    python -m banco.modelos.db_model_alteracoes --ultimas 20
+    python -m banco.modelos.db_model_alteracoes --podar
+"""
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from banco.database import escrever, usar_conexao
+
+INSERCAO = "I"
+ATUALIZACAO = "U"
+REMOCAO = "D"
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS db_alteracoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tabela TEXT NOT NULL,
+    operacao TEXT NOT NULL,
+    linha_id,
+    ref_id,
+    criado_em REAL NOT NULL DEFAULT ((julianday('now') - 2440587.5) * 86400.0)  -- epoch em segundos
+)
+"""
+
+INDICES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_alteracoes_criado_em ON db_alteracoes(criado_em)",
+]
+
+# até onde cada leitor (nome único por processo) já leu; a poda não passa do menor
+LEITORES_SQL = """
+CREATE TABLE IF NOT EXISTS db_alteracoes_leitores (
+    nome TEXT PRIMARY KEY,
+    ultimo_id INTEGER NOT NULL,
+    atualizado_em REAL NOT NULL
+)
+"""
+
+# leitor sem notícia há mais que isso não segura a poda (processo encerrado, tela parada)
+LEITOR_EXPIRA = 600.0
+
+# tabela -> (expressão do id da linha, expressão da referência ao dono); {r} vira new/old
+TABELAS_MONITORADAS: Dict[str, Tuple[str, Optional[str]]] = {
+    "usuarios": ("{r}.id", None),
+    "themes": ("{r}.id", None),
+    "quadros_kanban": ("{r}.id", "{r}.usuario_id"),
+    "kanban_colunas": ("{r}.id", "{r}.quadro_id"),
+    "kanban_cards": ("{r}.id", "{r}.pai_id"),
+    "kanban_card_attachments": ("{r}.id", "{r}.card_id"),
+    "kanban_card_checklist": ("{r}.id", "{r}.card_id"),
+    "kanban_tags": ("{r}.id", None),
+    "kanban_card_tags": ("{r}.card_id", "{r}.tag_id"),
+    "chat_sessions": ("{r}.id", None),
+    "chat_mensagens": ("{r}.id", "{r}.session_id"),
+    "chat_comandos": ("{r}.id", None),
+    "chat_controls": ("{r}.id", None),
+}
+
+_OPERACOES = (("ai", "INSERT", INSERCAO, "new"), ("au", "UPDATE", ATUALIZACAO, "new"),
+              ("ad", "DELETE", REMOCAO, "old"))
+
+
+def _triggers_sql(tabela: str) -> List[str]:
+    linha, ref = TABELAS_MONITORADAS[tabela]
+    sqls = []
+    for sufixo, evento, operacao, r in _OPERACOES:
+        ref_sql = ref.format(r=r) if ref else "NULL"
+        sqls.append(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_alteracoes_{tabela}_{sufixo} AFTER {evento} ON {tabela} BEGIN
+            INSERT INTO db_alteracoes (tabela, operacao, linha_id, ref_id)
+            VALUES ('{tabela}', '{operacao}', {linha.format(r=r)}, {ref_sql});
+        END
+        """)
+    return sqls
+
+
+def _tabela_existe(cur: sqlite3.Cursor, tabela: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,))
+    return cur.fetchone() is not None
+
+
+def instalar_registro_alteracoes(conn: sqlite3.Connection) -> None:
+    """Cria tabela, índices e triggers. Não faz commit (roda dentro da migração).
+    Tabelas ainda inexistentes são ignoradas; rodar de novo depois as inclui."""
+    cur = conn.cursor()
+    cur.execute(CREATE_SQL)
+    cur.execute(LEITORES_SQL)
+    for sql in INDICES_SQL:
+        cur.execute(sql)
+    for tabela in TABELAS_MONITORADAS:
+        if _tabela_existe(cur, tabela):
+            for sql in _triggers_sql(tabela):
+                cur.execute(sql)
+
+
+# -------------------------
+# Leitura
+# -------------------------
+@dataclass
+class LoteAlteracoes:
+    """Alterações agrupadas por tabela. Vários INSERT/UPDATE/DELETE da mesma
+    linha viram uma entrada só: vale a última operação, exceto que INSERT
+    seguido de UPDATE continua INSERT."""
+
+    ultimo_id: int = 0
+    # tabela -> {linha_id: operação}
+    linhas: Dict[str, Dict[object, str]] = field(default_factory=dict)
+    # tabela -> referências (dono) das linhas alteradas
+    refs: Dict[str, Set[object]] = field(default_factory=dict)
+
+    def adicionar(self, alteracao_id: int, tabela: str, operacao: str, linha_id, ref_id) -> None:
+        self.ultimo_id = max(self.ultimo_id, alteracao_id)
+        linhas = self.linhas.setdefault(tabela, {})
+        # INSERT seguido de UPDATE continua sendo uma linha nova
+        if not (operacao == ATUALIZACAO and linhas.get(linha_id) == INSERCAO):
+            linhas[linha_id] = operacao
+        if ref_id is not None:
+            self.refs.setdefault(tabela, set()).add(ref_id)
+
+    def mesclar(self, outro: "LoteAlteracoes") -> None:
+        self.ultimo_id = max(self.ultimo_id, outro.ultimo_id)
+        for tabela, linhas in outro.linhas.items():
+            for linha_id, operacao in linhas.items():
+                self.adicionar(outro.ultimo_id, tabela, operacao, linha_id, None)
+        for tabela, refs in outro.refs.items():
+            self.refs.setdefault(tabela, set()).update(refs)
+
+    def filtrar(self, tabelas: Iterable[str]) -> "LoteAlteracoes":
+        tabelas = set(tabelas)
+        lote = LoteAlteracoes(ultimo_id=self.ultimo_id)
+        for t in tabelas & self.linhas.keys():
+            lote.linhas[t] = dict(self.linhas[t])
+        for t in tabelas & self.refs.keys():
+            lote.refs[t] = set(self.refs[t])
+        return lote
+
+    @property
+    def tabelas(self) -> Set[str]:
+        return set(self.linhas)
+
+    def ids(self, tabela: str, operacao: Optional[str] = None) -> Set[object]:
+        linhas = self.linhas.get(tabela, {})
+        if operacao is None:
+            return set(linhas)
+        return {linha for linha, op in linhas.items() if op == operacao}
+
+    def __bool__(self) -> bool:
+        return bool(self.linhas)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.linhas.values())
+
+
+def ultimo_id_alteracao(conn: sqlite3.Connection) -> int:
+    # sqlite_sequence (AUTOINCREMENT) não volta quando a poda esvazia a tabela
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'db_alteracoes'").fetchone()
+    if row:
+        return row[0]
+    row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM db_alteracoes").fetchone()
+    return row[0] if row else 0
+
+
+def alteracoes_perdidas(conn: sqlite3.Connection, desde_id: int) -> bool:
+    """True se alterações com id > desde_id já foram podadas: quem leu até
+    desde_id tem um buraco e precisa recarregar tudo."""
+    row = conn.execute("SELECT MIN(id) FROM db_alteracoes").fetchone()
+    # ids do AUTOINCREMENT são contíguos (rollback devolve o número); só a poda abre buracos
+    primeiro = row[0] if row and row[0] is not None else ultimo_id_alteracao(conn) + 1
+    return primeiro > desde_id + 1
+
+
+def ler_alteracoes(conn: sqlite3.Connection, desde_id: int, limite: int = 5000,
+                   tabelas: Optional[Iterable[str]] = None) -> LoteAlteracoes:
+    """Agrupa as alterações com id > desde_id (no máximo `limite` linhas; o resto
+    fica para a próxima leitura a partir de lote.ultimo_id). Com `tabelas`, só
+    as dessas tabelas; lote.ultimo_id avança só até a última lida."""
+    lote = LoteAlteracoes(ultimo_id=desde_id)
+    filtro, params = "", []
+    if tabelas is not None:
+        tabelas = list(tabelas)
+        filtro = f" AND tabela IN ({', '.join('?' * len(tabelas))})"
+        params = tabelas
+    cur = conn.execute(
+        f"SELECT id, tabela, operacao, linha_id, ref_id FROM db_alteracoes WHERE id > ?{filtro} ORDER BY id LIMIT ?",
+        (desde_id, *params, limite))
+    for row in cur:
+        lote.adicionar(*row)
+    return lote
+
+
+# -------------------------
+# Leitores e poda
+# -------------------------
+_PROCESSO = f"{socket.gethostname()}:{os.getpid()}"
+_posicoes: Dict[str, Tuple[int, float]] = {}
+_posicoes_lock = threading.Lock()
+
+
+def nome_leitor(tipo: str) -> str:
+    """Nome do leitor `tipo` neste processo (chave em db_alteracoes_leitores)."""
+    return f"{_PROCESSO}:{tipo}"
+
+
+def informar_posicao(nome: str, ultimo_id: int) -> None:
+    """O leitor `nome` já processou tudo até ultimo_id. Só memória; vai para o banco na poda."""
+    with _posicoes_lock:
+        _posicoes[nome] = (ultimo_id, time.time())
+
+
+def podar_alteracoes(cur: sqlite3.Cursor, expira: float = LEITOR_EXPIRA) -> int:
+    """
+    Função de escrita (banco.database.escrever): grava as posições informadas
+    neste processo, descarta leitores expirados e apaga as alterações que todos
+    os leitores vivos já leram. Sem leitor vivo, não apaga nada. Retorna quantas.
+    """
+    with _posicoes_lock:
+        posicoes = dict(_posicoes)
+    cur.executemany(
+        "INSERT INTO db_alteracoes_leitores (nome, ultimo_id, atualizado_em) VALUES (?, ?, ?) "
+        "ON CONFLICT(nome) DO UPDATE SET ultimo_id = excluded.ultimo_id, atualizado_em = excluded.atualizado_em",
+        [(nome, ultimo_id, quando) for nome, (ultimo_id, quando) in posicoes.items()])
+    cur.execute("DELETE FROM db_alteracoes_leitores WHERE atualizado_em < ?", (time.time() - expira,))
+    limite = cur.execute("SELECT MIN(ultimo_id) FROM db_alteracoes_leitores").fetchone()[0]
+    if limite is None:
+        return 0
+    cur.execute("DELETE FROM db_alteracoes WHERE id <= ?", (limite,))
+    return cur.rowcount
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registro de alterações do banco")
+    parser.add_argument("--ultimas", type=int, metavar="N", help="mostra as N alterações mais recentes")
+    parser.add_argument("--podar", action="store_true", help="remove as alterações que todos os leitores já leram")
+    args = parser.parse_args()
+    if args.ultimas:
+        with usar_conexao() as c:
+            rows = c.execute(
+                "SELECT id, tabela, operacao, linha_id, ref_id, datetime(criado_em, 'unixepoch', 'localtime') "
+                "FROM db_alteracoes ORDER BY id DESC LIMIT ?", (args.ultimas,)).fetchall()
+        for row in reversed(rows):
+            print(*row, sep="\t")
+    elif args.podar:
+        print(f"{escrever(podar_alteracoes)} alterações removidas.")
+    else:
+        parser.print_help()
@@ -0,0 +1,108 @@
+# banco/modelos/db_model_blobs.py
+"""
+Tabela de blobs do armazenamento de anexos por conteúdo.
+
+Cada arquivo importado é guardado uma única vez, identificado pelo SHA-256
+(ver banco/controles/kanban/armazem_blobs.py); kanban_card_attachments.blob_sha256
+aponta para ele e kanban_blobs.refs conta quantos anexos usam cada blob.
+A contagem é mantida por triggers, então DELETEs em lote (purge_subtree) e
+ON DELETE CASCADE também a atualizam. Blobs com refs = 0 são removidos pela
+coleta de lixo do armazém. A criação é feita pela migração 6 (banco/migracoes.py).
+
+Recontagem manual (ex.: após editar o banco à mão):
+    python -m banco.modelos.db_model_blobs --recontar
+"""
+import argparse
+import sqlite3
+from typing import Optional
+
+from banco.database import conectar
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS kanban_blobs (
+    sha256 TEXT PRIMARY KEY,
+    tamanho INTEGER,
+    refs INTEGER NOT NULL DEFAULT 0,
+    criado_em DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+INDICES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_anexos_blob ON kanban_card_attachments(blob_sha256) WHERE blob_sha256 IS NOT NULL",
+    # candidatos da coleta de lixo
+    "CREATE INDEX IF NOT EXISTS idx_blobs_orfaos ON kanban_blobs(sha256) WHERE refs <= 0",
+]
+
+_INCREMENTA = """
+        INSERT INTO kanban_blobs (sha256, tamanho, refs) VALUES (new.blob_sha256, new.tamanho, 1)
+        ON CONFLICT(sha256) DO UPDATE SET refs = refs + 1;
+"""
+_DECREMENTA = """
+        UPDATE kanban_blobs SET refs = refs - 1 WHERE sha256 = old.blob_sha256;
+"""
+
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_blob_anexo_ai AFTER INSERT ON kanban_card_attachments
+    WHEN new.blob_sha256 IS NOT NULL BEGIN {_INCREMENTA}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_blob_anexo_ad AFTER DELETE ON kanban_card_attachments
+    WHEN old.blob_sha256 IS NOT NULL BEGIN {_DECREMENTA}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_blob_anexo_au_old AFTER UPDATE OF blob_sha256 ON kanban_card_attachments
+    WHEN old.blob_sha256 IS NOT NULL AND old.blob_sha256 IS NOT new.blob_sha256 BEGIN {_DECREMENTA}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_blob_anexo_au_new AFTER UPDATE OF blob_sha256 ON kanban_card_attachments
+    WHEN new.blob_sha256 IS NOT NULL AND old.blob_sha256 IS NOT new.blob_sha256 BEGIN {_INCREMENTA}
+    END
+    """,
+]
+
+RECONTAR_SQL = """
+UPDATE kanban_blobs SET refs = (
+    SELECT COUNT(*) FROM kanban_card_attachments a WHERE a.blob_sha256 = kanban_blobs.sha256
+)
+"""
+
+
+def instalar_armazem_blobs(conn: sqlite3.Connection) -> None:
+    """Cria coluna, tabela, índices e triggers. Não faz commit (roda dentro da migração)."""
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(kanban_card_attachments)")
+    if "blob_sha256" not in [row[1] for row in cur.fetchall()]:
+        cur.execute("ALTER TABLE kanban_card_attachments ADD COLUMN blob_sha256 TEXT")
+    cur.execute(CREATE_SQL)
+    for sql in INDICES_SQL + TRIGGERS_SQL:
+        cur.execute(sql)
+
+
+def recontar_refs(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Recalcula kanban_blobs.refs a partir dos anexos. Retorna o número de blobs."""
+    created = conn is None
+    if created:
+        conn = conectar()
+    try:
+        cur = conn.cursor()
+        cur.execute(RECONTAR_SQL)
+        total = cur.rowcount
+        conn.commit()
+        return total
+    finally:
+        if created:
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blobs de anexos do Kanban")
+    parser.add_argument("--recontar", action="store_true", help="recalcula as referências de cada blob")
+    args = parser.parse_args()
+    if args.recontar:
+        print(f"{recontar_refs()} blobs recontados.")
+    else:
+        parser.print_help()
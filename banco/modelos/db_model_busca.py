@@ -0,0 +1,167 @@
+# banco/modelos/db_model_busca.py
+"""
+Índice de busca textual (FTS5) dos cards do Kanban.
+
+Uma linha por card (rowid = kanban_cards.id) com quatro colunas pesquisáveis:
+titulo, descricao, checklist (descrições concatenadas) e anexos (nomes de
+arquivo concatenados). Triggers em kanban_cards, kanban_card_checklist e
+kanban_card_attachments mantêm o índice sincronizado. A criação é feita pela
+migração 4 (banco/migracoes.py).
+
+Reconstrução manual:
+    python -m banco.modelos.db_model_busca --rebuild
+"""
+import argparse
+import sqlite3
+from typing import Optional
+
+from banco.database import conectar
+
+CREATE_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS kanban_busca USING fts5(
+    titulo,
+    descricao,
+    checklist,
+    anexos,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_CHECKLIST_DO_CARD = "COALESCE((SELECT group_concat(descricao, ' ') FROM kanban_card_checklist WHERE card_id = {ref}), '')"
+_ANEXOS_DO_CARD = "COALESCE((SELECT group_concat(nome_arquivo, ' ') FROM kanban_card_attachments WHERE card_id = {ref}), '')"
+
+TRIGGERS_SQL = [
+    # cards
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_busca_card_ai AFTER INSERT ON kanban_cards BEGIN
+        INSERT INTO kanban_busca (rowid, titulo, descricao, checklist, anexos)
+        VALUES (new.id, new.titulo, COALESCE(new.descricao, ''), '', '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_busca_card_au AFTER UPDATE OF titulo, descricao ON kanban_cards BEGIN
+        UPDATE kanban_busca SET titulo = new.titulo, descricao = COALESCE(new.descricao, '')
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_busca_card_ad AFTER DELETE ON kanban_cards BEGIN
+        DELETE FROM kanban_busca WHERE rowid = old.id;
+    END
+    """,
+    # checklist
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_checklist_ai AFTER INSERT ON kanban_card_checklist BEGIN
+        UPDATE kanban_busca SET checklist = {_CHECKLIST_DO_CARD.format(ref='new.card_id')}
+        WHERE rowid = new.card_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_checklist_au AFTER UPDATE OF descricao, card_id ON kanban_card_checklist BEGIN
+        UPDATE kanban_busca SET checklist = {_CHECKLIST_DO_CARD.format(ref='old.card_id')}
+        WHERE rowid = old.card_id;
+        UPDATE kanban_busca SET checklist = {_CHECKLIST_DO_CARD.format(ref='new.card_id')}
+        WHERE rowid = new.card_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_checklist_ad AFTER DELETE ON kanban_card_checklist BEGIN
+        UPDATE kanban_busca SET checklist = {_CHECKLIST_DO_CARD.format(ref='old.card_id')}
+        WHERE rowid = old.card_id;
+    END
+    """,
+    # anexos
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_anexo_ai AFTER INSERT ON kanban_card_attachments BEGIN
+        UPDATE kanban_busca SET anexos = {_ANEXOS_DO_CARD.format(ref='new.card_id')}
+        WHERE rowid = new.card_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_anexo_au AFTER UPDATE OF nome_arquivo, card_id ON kanban_card_attachments BEGIN
+        UPDATE kanban_busca SET anexos = {_ANEXOS_DO_CARD.format(ref='old.card_id')}
+        WHERE rowid = old.card_id;
+        UPDATE kanban_busca SET anexos = {_ANEXOS_DO_CARD.format(ref='new.card_id')}
+        WHERE rowid = new.card_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_busca_anexo_ad AFTER DELETE ON kanban_card_attachments BEGIN
+        UPDATE kanban_busca SET anexos = {_ANEXOS_DO_CARD.format(ref='old.card_id')}
+        WHERE rowid = old.card_id;
+    END
+    """,
+]
+
+REBUILD_SQL = f"""
+INSERT INTO kanban_busca (rowid, titulo, descricao, checklist, anexos)
+SELECT c.id, c.titulo, COALESCE(c.descricao, ''),
+       {_CHECKLIST_DO_CARD.format(ref='c.id')},
+       {_ANEXOS_DO_CARD.format(ref='c.id')}
+FROM kanban_cards c
+"""
+
+
+def _ensure(conn: sqlite3.Connection) -> None:
+    # os triggers reagregam checklist/anexos do card por card_id; os índices
+    # dessas colunas vêm da migração 2 (banco/migracoes.py)
+    cur = conn.cursor()
+    cur.execute(CREATE_FTS_SQL)
+    for sql in TRIGGERS_SQL:
+        cur.execute(sql)
+
+
+def _popular(cur: sqlite3.Cursor) -> int:
+    cur.execute("DELETE FROM kanban_busca")
+    cur.execute(REBUILD_SQL)
+    total = cur.rowcount
+    cur.execute("INSERT INTO kanban_busca (kanban_busca) VALUES ('optimize')")
+    return total
+
+
+def instalar_indice_busca(conn: sqlite3.Connection) -> None:
+    """
+    Cria a tabela FTS5 e os triggers; se o índice estiver vazio e já houver cards,
+    popula com os dados atuais. Não faz commit (roda dentro da migração).
+    """
+    _ensure(conn)
+    cur = conn.cursor()
+    cur.execute("SELECT EXISTS (SELECT 1 FROM kanban_busca)")
+    indexado = cur.fetchone()[0]
+    cur.execute("SELECT EXISTS (SELECT 1 FROM kanban_cards)")
+    if cur.fetchone()[0] and not indexado:
+        _popular(cur)
+
+
+def repovoar_indice_busca(cur: sqlite3.Cursor) -> int:
+    """Como reconstruir_indice_busca, sem commit (função de escrita: banco.database.escrever)."""
+    _ensure(cur.connection)
+    return _popular(cur)
+
+
+def reconstruir_indice_busca(conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Recria o conteúdo do índice a partir das tabelas do Kanban e otimiza os segmentos.
+    Retorna o número de cards indexados.
+    """
+    created = conn is None
+    if created:
+        conn = conectar()
+    try:
+        total = repovoar_indice_busca(conn.cursor())
+        conn.commit()
+        return total
+    finally:
+        if created:
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Índice de busca do Kanban (FTS5)")
+    parser.add_argument("--rebuild", action="store_true", help="recria o índice a partir das tabelas")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"Índice de busca reconstruído: {reconstruir_indice_busca()} cards.")
+    else:
+        parser.print_help()
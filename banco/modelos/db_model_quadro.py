@@ -1,11 +1,22 @@
 # banco/modelos/db_model_quadro.py
+import sqlite3
+from typing import Optional
+
 from banco.database import conectar
 
-def criar_tabelas_kanban():
+# chaves de kanban_cards.meta com índice de expressão (migração 3 em banco/migracoes.py);
+# listar_cards(meta_filters=...) gera exatamente json_extract(meta, '$.<chave>')
+# para que o planner use esses índices
+META_INDEXADAS = ("arquivado", "prazo", "prioridade")
+
+def criar_tabelas_kanban(conn: Optional[sqlite3.Connection] = None):
     """
     Cria as tabelas do módulo Kanban: Quadros, Colunas e Cards.
+    Se conn for None, usa banco.database.conectar() e fecha a conexão.
     """
-    conn = conectar()
+    created = conn is None
+    if created:
+        conn = conectar()
     cursor = conn.cursor()
 
     # 🔥 Ativar suporte a foreign keys no SQLite
@@ -102,7 +113,9 @@ def criar_tabelas_kanban():
     """)
 
     conn.commit()
-    conn.close()
+
+    if created:
+        conn.close()
     print("✅ Tabelas de Kanban verificadas/criadas com sucesso.")
 
 def salvar_novo_quadro(user_id, nome):
@@ -0,0 +1,37 @@
+# banco/modelos/db_model_sessoes.py
+"""
+Tabela das sessões "lembrar de mim" (ver banco/sessoes.py).
+
+Cada linha é um dispositivo com login lembrado: token_hash é o SHA-256 do
+token guardado no arquivo local do dispositivo (o token em si nunca vai para o
+banco). O índice UNIQUE em token_hash faz a validação na abertura do app ser
+uma busca só. Sessões vencidas são apagadas ao criar uma nova. A criação é
+feita pela migração 9 (banco/migracoes.py).
+"""
+import sqlite3
+
+CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS sessoes_login (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id TEXT NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
+    token_hash TEXT NOT NULL UNIQUE,
+    dispositivo TEXT,
+    criado_em TEXT NOT NULL,
+    expira_em TEXT NOT NULL,
+    ultimo_uso TEXT
+)
+"""
+
+INDICES_SQL = [
+    # sessões de um usuário (painel de perfil) e limpeza das vencidas
+    "CREATE INDEX IF NOT EXISTS idx_sessoes_login_usuario ON sessoes_login(usuario_id, expira_em)",
+    "CREATE INDEX IF NOT EXISTS idx_sessoes_login_expira ON sessoes_login(expira_em)",
+]
+
+
+def instalar_tabela_sessoes(conn: sqlite3.Connection) -> None:
+    """Cria tabela e índices. Não faz commit (roda dentro da migração)."""
+    cur = conn.cursor()
+    cur.execute(CREATE_SQL)
+    for sql in INDICES_SQL:
+        cur.execute(sql)
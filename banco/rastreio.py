@@ -0,0 +1,455 @@
+# banco/rastreio.py
+"""
+Rastreio de consultas SQL (ferramenta de desenvolvimento).
+
+Desligado por padrão: ative com DEVHIVE_RASTREIO=1 no ambiente ou com
+ativar_rastreio() (o painel "Consultas" da Biblioteca faz isso). Desligado, o
+custo é um teste de flag por execute(). Os cursores são sempre CursorRastreado,
+então cursores guardados pelos controles (self.cursor) passam a ser medidos
+assim que o rastreio é ligado.
+
+As conexões do projeto (pool de banco.conexoes e o escritor) são
+ConexaoRastreada. Com o rastreio ligado:
+- execute/executemany/commit são cronometrados por CursorRastreado; cada
+  execução entra nas estatísticas quando o execute volta (que num SELECT já
+  leu a primeira linha), e o fetch do resto soma tempo e linhas ao comando;
+- set_trace_callback mostra o que o SQLite roda de fato: o BEGIN implícito do
+  módulo sqlite3 (ou o que vem de executescript) entra só com contagem, e os
+  callbacks extras durante uma execução (triggers) somam em eventos_trigger.
+  Isso conta callbacks, não comandos: o SQLite avisa a entrada de cada trigger
+  e cada comando dentro dele, e o sqlite3 do CPython passa o texto do comando
+  externo nos dois casos, então não dá para separá-los (trigger de um comando
+  só = 2 por linha afetada);
+- por comando normalizado (literais viram ?, espaços colapsados) guarda
+  chamadas, histograma de latência, linhas, erros e locais de chamada;
+- execuções acima de LIMIAR_LENTA_MS vão para o log de consultas lentas
+  (um JSON por linha, sem os parâmetros);
+- N+1: o mesmo comando repetido LIMIAR_N_MAIS_1 vezes numa ação da thread.
+  Uma ação é o bloco `with acao("nome"):` ou, sem ele, uma sequência de
+  comandos sem pausa maior que PAUSA_ACAO (um clique na UI roda de uma vez e
+  volta ao event loop).
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+LIMITES_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)   # baldes do histograma (+ acima do último)
+LIMIAR_LENTA_MS = float(os.environ.get("DEVHIVE_CONSULTA_LENTA_MS", "100"))
+LIMIAR_N_MAIS_1 = 10
+PAUSA_ACAO = 0.05           # segundos sem comandos que encerram uma ação implícita
+MAX_LOCAIS = 20             # locais de chamada guardados por comando
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# frames destes arquivos são pulados ao procurar quem fez a consulta
+_IGNORAR = {os.path.abspath(__file__), os.path.join(_RAIZ, "banco", "conexoes.py")}
+
+# controle de transação não conta para N+1 (o escritor repete a cada lote)
+_CONTROLE = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA", "END")
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+_ativo = os.environ.get("DEVHIVE_RASTREIO", "").lower() in ("1", "true", "sim")
+
+
+@lru_cache(maxsize=4096)
+def normalizar_sql(sql: str) -> str:
+    """'SELECT * FROM t WHERE id = 5 AND x IN (?, ?)' -> 'SELECT * FROM t WHERE id = ? AND x IN (?...)'."""
+    sql = _LITERAL.sub("?", sql)
+    sql = _LISTA.sub("(?...)", sql)
+    return _ESPACOS.sub(" ", sql).strip().rstrip(";")
+
+
+def _local_chamada() -> str:
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _IGNORAR:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    arquivo = frame.f_code.co_filename
+    if arquivo.startswith(_RAIZ):
+        arquivo = os.path.relpath(arquivo, _RAIZ)
+    return f"{arquivo}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+@dataclass
+class Execucao:
+    sql: str
+    local: str
+    duracao: float = 0.0
+    linhas: int = 0
+    eventos_trigger: int = 0
+    erro: bool = False
+    visto: bool = False         # o trace já mostrou o próprio comando
+
+
+@dataclass
+class EstatisticaConsulta:
+    sql: str
+    chamadas: int = 0
+    total: float = 0.0          # segundos
+    maximo: float = 0.0
+    linhas: int = 0
+    erros: int = 0
+    eventos_trigger: int = 0
+    so_trace: int = 0           # vistas só pelo trace (sem tempo)
+    histograma: List[int] = field(default_factory=lambda: [0] * (len(LIMITES_MS) + 1))
+    locais: Dict[str, int] = field(default_factory=dict)
+
+    def percentil(self, p: float) -> float:
+        """Limite superior (ms) do balde onde cai o percentil p (0-100)."""
+        if not self.chamadas:
+            return 0.0
+        alvo = self.chamadas * p / 100.0
+        acumulado = 0
+        for i, n in enumerate(self.histograma):
+            acumulado += n
+            if acumulado >= alvo:
+                return LIMITES_MS[i] if i < len(LIMITES_MS) else self.maximo * 1000
+        return self.maximo * 1000
+
+    def resumo(self) -> Dict[str, Any]:
+        locais = sorted(self.locais.items(), key=lambda kv: -kv[1])
+        return {
+            "sql": self.sql,
+            "chamadas": self.chamadas,
+            "total_ms": self.total * 1000,
+            "media_ms": (self.total / self.chamadas * 1000) if self.chamadas else 0.0,
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "max_ms": self.maximo * 1000,
+            "linhas": self.linhas,
+            "erros": self.erros,
+            "eventos_trigger": self.eventos_trigger,
+            "so_trace": self.so_trace,
+            "histograma": list(self.histograma),
+            "locais": [local for local, _ in locais[:3]],
+        }
+
+
+class _Acao:
+    __slots__ = ("nome", "explicita", "ultimo", "contagem")
+
+    def __init__(self, nome: str, explicita: bool):
+        self.nome = nome
+        self.explicita = explicita
+        self.ultimo = time.monotonic()
+        self.contagem: Dict[str, int] = {}
+
+
+class Rastreador:
+    """Agrega as execuções de todas as threads (ver docstring do módulo)."""
+
+    def __init__(self, caminho_log: Optional[str] = None, limiar_lenta_ms: float = LIMIAR_LENTA_MS):
+        self.caminho_log = caminho_log or os.environ.get(
+            "DEVHIVE_LOG_CONSULTAS", os.path.join(os.getcwd(), "logs", "consultas_lentas.jsonl"))
+        self.limiar_lenta_ms = limiar_lenta_ms
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._local = threading.local()
+        self._consultas: Dict[str, EstatisticaConsulta] = {}
+        self._n_mais_1: Dict[str, Dict[str, Any]] = {}
+        self.lentas = 0
+
+    # ------------------ registro ------------------
+    def _estatistica(self, sql: str) -> EstatisticaConsulta:
+        est = self._consultas.get(sql)
+        if est is None:
+            est = self._consultas[sql] = EstatisticaConsulta(sql)
+        return est
+
+    def registrar(self, execucao: Execucao) -> None:
+        sql = normalizar_sql(execucao.sql)
+        ms = execucao.duracao * 1000
+        balde = next((i for i, limite in enumerate(LIMITES_MS) if ms <= limite), len(LIMITES_MS))
+        with self._lock:
+            est = self._estatistica(sql)
+            est.chamadas += 1
+            est.total += execucao.duracao
+            est.maximo = max(est.maximo, execucao.duracao)
+            est.linhas += execucao.linhas
+            est.erros += execucao.erro
+            est.eventos_trigger += execucao.eventos_trigger
+            est.histograma[balde] += 1
+            if execucao.local in est.locais or len(est.locais) < MAX_LOCAIS:
+                est.locais[execucao.local] = est.locais.get(execucao.local, 0) + 1
+        self._contar_na_acao(sql, execucao.local)
+        if ms >= self.limiar_lenta_ms:
+            self._registrar_lenta(sql, execucao, ms)
+
+    def somar_fetch(self, sql: str, duracao: float, linhas: int) -> None:
+        """Tempo e linhas lidos depois do execute (fetch) de um SELECT já registrado."""
+        with self._lock:
+            est = self._estatistica(sql)
+            est.total += duracao
+            est.linhas += linhas
+
+    def registrar_trace(self, sql: str) -> None:
+        """Comando visto só pelo trace (fora dos wrappers): conta, sem tempo."""
+        with self._lock:
+            self._estatistica(normalizar_sql(sql)).so_trace += 1
+
+    def _acao_atual(self) -> _Acao:
+        agora = time.monotonic()
+        acao = getattr(self._local, "acao", None)
+        if acao is None or (not acao.explicita and agora - acao.ultimo > PAUSA_ACAO):
+            acao = _Acao(f"{threading.current_thread().name} {datetime.now():%H:%M:%S}", False)
+            self._local.acao = acao
+        acao.ultimo = agora
+        return acao
+
+    def _contar_na_acao(self, sql: str, local: str) -> None:
+        if sql.upper().startswith(_CONTROLE):
+            return
+        acao = self._acao_atual()
+        vezes = acao.contagem.get(sql, 0) + 1
+        acao.contagem[sql] = vezes
+        if vezes < LIMIAR_N_MAIS_1:
+            return
+        with self._lock:
+            info = self._n_mais_1.get(sql)
+            if info is None:
+                info = self._n_mais_1[sql] = {"sql": sql, "acoes": 0, "max_repeticoes": 0}
+            if vezes == LIMIAR_N_MAIS_1:
+                info["acoes"] += 1
+            info["max_repeticoes"] = max(info["max_repeticoes"], vezes)
+            info["acao"] = acao.nome
+            info["local"] = local
+
+    def _registrar_lenta(self, sql: str, execucao: Execucao, ms: float) -> None:
+        registro = {
+            "quando": datetime.now().isoformat(timespec="milliseconds"),
+            "ms": round(ms, 3),
+            "sql": sql,
+            "linhas": execucao.linhas,
+            "eventos_trigger": execucao.eventos_trigger,
+            "local": execucao.local,
+            "thread": threading.current_thread().name,
+            "acao": getattr(getattr(self._local, "acao", None), "nome", None),
+        }
+        with self._log_lock:
+            self.lentas += 1
+            try:
+                os.makedirs(os.path.dirname(self.caminho_log), exist_ok=True)
+                with open(self.caminho_log, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+    @contextmanager
+    def acao(self, nome: str) -> Iterator[None]:
+        anterior = getattr(self._local, "acao", None)
+        self._local.acao = _Acao(nome, True)
+        try:
+            yield
+        finally:
+            self._local.acao = anterior
+
+    # ------------------ consulta ------------------
+    def top(self, limite: int = 20, ordem: str = "total_ms") -> List[Dict[str, Any]]:
+        """Comandos ordenados por `ordem` (total_ms, chamadas, max_ms, p95_ms, linhas...)."""
+        with self._lock:
+            resumos = [est.resumo() for est in self._consultas.values()]
+        resumos.sort(key=lambda r: r[ordem], reverse=True)
+        return resumos[:limite]
+
+    def suspeitas_n_mais_1(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted((dict(i) for i in self._n_mais_1.values()), key=lambda i: -i["max_repeticoes"])
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "comandos": len(self._consultas),
+                "execucoes": sum(e.chamadas for e in self._consultas.values()),
+                "total_ms": sum(e.total for e in self._consultas.values()) * 1000,
+                "lentas": self.lentas,
+                "n_mais_1": len(self._n_mais_1),
+            }
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._consultas.clear()
+            self._n_mais_1.clear()
+            self.lentas = 0
+
+
+_rastreador: Optional[Rastreador] = None
+_rastreador_lock = threading.Lock()
+
+
+def obter_rastreador() -> Rastreador:
+    global _rastreador
+    if _rastreador is None:
+        with _rastreador_lock:
+            if _rastreador is None:
+                _rastreador = Rastreador()
+    return _rastreador
+
+
+def ativar_rastreio(ativo: bool = True) -> None:
+    """Liga/desliga o rastreio em todas as conexões (vale a partir do próximo comando)."""
+    global _ativo
+    _ativo = bool(ativo)
+
+
+def rastreio_ativo() -> bool:
+    return _ativo
+
+
+def acao(nome: str):
+    """`with acao("abrir quadro"):` agrupa os comandos da thread para a detecção de N+1."""
+    return obter_rastreador().acao(nome)
+
+
+# ------------------ conexão e cursor ------------------
+_execucao_atual = threading.local()
+
+
+def _trace(sql: str) -> None:
+    if not _ativo:
+        return          # desligado; a conexão remove o callback no próximo uso
+    execucao = getattr(_execucao_atual, "valor", None)
+    if execucao is None:
+        obter_rastreador().registrar_trace(sql)
+    elif not execucao.visto and sql.startswith("BEGIN") and not execucao.sql.lstrip().upper().startswith("BEGIN"):
+        obter_rastreador().registrar_trace(sql)       # BEGIN implícito antes de um DML
+    elif not execucao.visto:
+        execucao.visto = True
+    else:
+        execucao.eventos_trigger += 1                # entrada de trigger ou comando dentro dele
+
+
+class CursorRastreado(sqlite3.Cursor):
+    """Cursor que cronometra execute/fetch enquanto o rastreio está ligado."""
+
+    _sql: Optional[str] = None      # comando (normalizado) cujo resultado está sendo lido
+
+    def _medir(self, metodo, consulta: bool, sql: str, *args):
+        self._sql = None
+        conexao = self.connection
+        if getattr(conexao, "_com_trace", True) is not _ativo:
+            conexao._sincronizar_trace()
+        execucao = Execucao(sql, _local_chamada())
+        _execucao_atual.valor = execucao
+        inicio = time.perf_counter()
+        try:
+            return metodo(sql, *args)
+        except BaseException:
+            execucao.erro = True
+            raise
+        finally:
+            execucao.duracao = time.perf_counter() - inicio
+            _execucao_atual.valor = None
+            if consulta and not execucao.erro and self.description is not None:
+                # SELECT: o execute já leu a primeira linha; o resto do fetch soma depois
+                self._sql = normalizar_sql(sql)
+            else:
+                execucao.linhas = max(self.rowcount, 0)
+            obter_rastreador().registrar(execucao)
+
+    def _somar(self, inicio: float, linhas: int) -> None:
+        obter_rastreador().somar_fetch(self._sql, time.perf_counter() - inicio, linhas)
+
+    def execute(self, sql, parameters=(), /):
+        if not _ativo:
+            self._sql = None
+            return super().execute(sql, parameters)
+        return self._medir(super().execute, True, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        if not _ativo:
+            self._sql = None
+            return super().executemany(sql, seq_of_parameters)
+        return self._medir(super().executemany, False, sql, seq_of_parameters)
+
+    def fetchone(self):
+        if self._sql is None:
+            return super().fetchone()
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._somar(inicio, linha is not None)
+        return linha
+
+    def fetchmany(self, size=None):
+        if self._sql is None:
+            return super().fetchmany(self.arraysize if size is None else size)
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._somar(inicio, len(linhas))
+        return linhas
+
+    def fetchall(self):
+        if self._sql is None:
+            return super().fetchall()
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._somar(inicio, len(linhas))
+        self._sql = None
+        return linhas
+
+    def __next__(self):
+        if self._sql is None:
+            return super().__next__()
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._sql = None
+            raise
+        self._somar(inicio, 1)
+        return linha
+
+
+class ConexaoRastreada(sqlite3.Connection):
+    """Conexão cujos cursores são rastreados enquanto o rastreio está ligado."""
+
+    _com_trace = False
+
+    def _sincronizar_trace(self) -> None:
+        if self._com_trace is not _ativo:
+            self.set_trace_callback(_trace if _ativo else None)
+            self._com_trace = _ativo
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or CursorRastreado)
+
+    # Connection.execute/executemany não passam por cursor() no CPython
+    def execute(self, sql, parameters=(), /):
+        if not _ativo:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        if not _ativo:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        if not _ativo:
+            return super().commit()
+        self._sincronizar_trace()
+        if not self.in_transaction:
+            return super().commit()
+        execucao = Execucao("COMMIT", _local_chamada())
+        _execucao_atual.valor = execucao
+        inicio = time.perf_counter()
+        try:
+            super().commit()
+        except BaseException:
+            execucao.erro = True
+            raise
+        finally:
+            execucao.duracao = time.perf_counter() - inicio
+            _execucao_atual.valor = None
+            obter_rastreador().registrar(execucao)
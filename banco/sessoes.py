@@ -0,0 +1,230 @@
+# banco/sessoes.py
+"""
+Sessões "lembrar de mim".
+
+Login com "Lembrar de mim" marcado cria uma sessão: um token aleatório de 256
+bits cujo SHA-256 vai para sessoes_login (com validade e nome do dispositivo);
+o token em si fica só no arquivo local ARQUIVO_TOKEN, com permissão 0600. Na
+abertura do app, entrar_com_token_salvo() lê o arquivo e valida o token com uma
+busca pelo índice único — sem bcrypt e sem a tela de login.
+
+SHA-256 simples basta aqui (ao contrário da senha): o token é aleatório, não há
+dicionário a testar. Quem lê o banco não consegue entrar com os hashes; quem
+copiou o arquivo de token entra até a sessão vencer ou ser revogada no painel
+de perfil (listar_sessoes/revogar_sessao).
+"""
+import hashlib
+import os
+import platform
+import secrets
+import sqlite3
+import stat
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from banco.database import escrever, usar_conexao
+
+DIAS_VALIDADE = 30
+ARQUIVO_TOKEN = os.environ.get("DEVHIVE_ARQUIVO_SESSAO") or os.path.join(
+    os.path.expanduser("~"), ".devhive", "sessao.token")
+
+
+def _agora() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# -------------------------
+# Sessões no banco
+# -------------------------
+def criar_sessao(usuario_id: str, dispositivo: Optional[str] = None, dias: int = DIAS_VALIDADE) -> Dict:
+    """Cria a sessão e devolve {"id", "token"}; o token só existe aqui e no arquivo local."""
+    token = secrets.token_urlsafe(32)
+    agora = datetime.utcnow()
+
+    def _criar(cursor):
+        # aproveita a escrita para tirar as vencidas de todos os usuários
+        cursor.execute("DELETE FROM sessoes_login WHERE expira_em <= ?", (agora.isoformat(),))
+        cursor.execute("""
+            INSERT INTO sessoes_login (usuario_id, token_hash, dispositivo, criado_em, expira_em, ultimo_uso)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            usuario_id,
+            _hash_token(token),
+            dispositivo or platform.node() or "dispositivo",
+            agora.isoformat(),
+            (agora + timedelta(days=dias)).isoformat(),
+            agora.isoformat()
+        ))
+        return cursor.lastrowid
+
+    return {"id": escrever(_criar), "token": token}
+
+
+def validar_token(token: str) -> Optional[Dict]:
+    """
+    Dados do usuário dono do token (mesmo formato de auth.autenticar, mais
+    "sessao_id"), ou None se o token não existir, tiver vencido ou o usuário
+    estiver inativo. Registra o uso sem esperar a gravação.
+    """
+    if not token:
+        return None
+    with usar_conexao(somente_leitura=True) as conn:
+        row = conn.execute("""
+            SELECT s.id, u.id, u.nome_exibicao, u.email, u.papel, u.cargo, u.foto
+            FROM sessoes_login s
+            JOIN usuarios u ON u.id = s.usuario_id
+            WHERE s.token_hash = ? AND s.expira_em > ? AND u.ativo = 1
+        """, (_hash_token(token), _agora())).fetchone()
+
+    if not row:
+        return None
+
+    sessao_id, usuario_id, nome, email, papel, cargo, foto = row
+    agora = _agora()
+
+    def _registrar_uso(cursor):
+        cursor.execute("UPDATE sessoes_login SET ultimo_uso = ? WHERE id = ?", (agora, sessao_id))
+        cursor.execute("UPDATE usuarios SET ultimo_login = ? WHERE id = ?", (agora, usuario_id))
+
+    escrever(_registrar_uso, esperar=False)
+    return {
+        "id": usuario_id,
+        "nome": nome,
+        "email": email,
+        "papel": papel,
+        "cargo": cargo,
+        "foto": foto,
+        "sessao_id": sessao_id
+    }
+
+
+def listar_sessoes(usuario_id: str) -> List[Dict]:
+    """Sessões válidas do usuário, da usada mais recentemente para a mais antiga."""
+    with usar_conexao(somente_leitura=True) as conn:
+        rows = conn.execute("""
+            SELECT id, dispositivo, criado_em, expira_em, ultimo_uso
+            FROM sessoes_login
+            WHERE usuario_id = ? AND expira_em > ?
+            ORDER BY ultimo_uso DESC
+        """, (usuario_id, _agora())).fetchall()
+
+    return [
+        {
+            "id": row[0],
+            "dispositivo": row[1],
+            "criado_em": row[2],
+            "expira_em": row[3],
+            "ultimo_uso": row[4]
+        }
+        for row in rows
+    ]
+
+
+def revogar_sessao(sessao_id: int, usuario_id: str) -> bool:
+    """Apaga uma sessão do usuário. True se existia."""
+    def _revogar(cursor):
+        cursor.execute("DELETE FROM sessoes_login WHERE id = ? AND usuario_id = ?", (sessao_id, usuario_id))
+        return cursor.rowcount > 0
+    return escrever(_revogar)
+
+
+def revogar_todas(usuario_id: str) -> int:
+    """Apaga todas as sessões do usuário. Retorna quantas eram."""
+    def _revogar(cursor):
+        cursor.execute("DELETE FROM sessoes_login WHERE usuario_id = ?", (usuario_id,))
+        return cursor.rowcount
+    return escrever(_revogar)
+
+
+# -------------------------
+# Arquivo local do token
+# -------------------------
+def salvar_token_local(token: str, caminho: Optional[str] = None) -> None:
+    """Grava o token com permissão 0600 (pasta 0700), trocando o arquivo de uma vez."""
+    caminho = caminho or ARQUIVO_TOKEN
+    os.makedirs(os.path.dirname(caminho), mode=0o700, exist_ok=True)
+    temporario = caminho + ".tmp"
+    fd = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, token.encode())
+    finally:
+        os.close(fd)
+    # o modo do os.open passa pela umask; arquivo que já existia mantém o modo antigo
+    os.chmod(temporario, 0o600)
+    os.replace(temporario, caminho)
+
+
+def ler_token_local(caminho: Optional[str] = None) -> Optional[str]:
+    """Token salvo, ou None. Arquivo legível por outros usuários (POSIX) é descartado."""
+    caminho = caminho or ARQUIVO_TOKEN
+    try:
+        info = os.stat(caminho)
+        if os.name == "posix" and info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            apagar_token_local(caminho)
+            return None
+        with open(caminho, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def apagar_token_local(caminho: Optional[str] = None) -> None:
+    try:
+        os.remove(caminho or ARQUIVO_TOKEN)
+    except OSError:
+        pass
+
+
+# -------------------------
+# Fluxos usados pela UI
+# -------------------------
+def revogar_token(token: str) -> bool:
+    """Apaga a sessão dona do token (busca pelo token_hash). True se existia."""
+    def _revogar(cursor):
+        cursor.execute("DELETE FROM sessoes_login WHERE token_hash = ?", (_hash_token(token),))
+        return cursor.rowcount > 0
+    return escrever(_revogar)
+
+
+def lembrar_login(usuario_id: str, dispositivo: Optional[str] = None) -> int:
+    """
+    Cria a sessão deste dispositivo e salva o token. Retorna o id da sessão.
+    A sessão do token que estava no arquivo (outro login lembrado aqui) é
+    revogada antes: o token antigo deixaria de existir em disco, mas a sessão
+    continuaria válida no banco.
+    """
+    anterior = ler_token_local()
+    if anterior:
+        revogar_token(anterior)
+    sessao = criar_sessao(usuario_id, dispositivo)
+    salvar_token_local(sessao["token"])
+    return sessao["id"]
+
+
+def entrar_com_token_salvo() -> Optional[Dict]:
+    """
+    Login pela sessão lembrada (abertura do app). None se não houver token ou
+    ele não valer mais — nesse caso o arquivo é apagado e a tela de login abre.
+    """
+    token = ler_token_local()
+    if not token:
+        return None
+    try:
+        dados = validar_token(token)
+    except sqlite3.Error:
+        # banco sem a tabela ainda, travado etc.: segue pelo login normal sem perder o token
+        return None
+    if dados is None:
+        apagar_token_local()
+    return dados
+
+
+def esquecer_dispositivo(usuario_id: str, sessao_id: Optional[int]) -> None:
+    """Revoga a sessão deste dispositivo (se houver) e apaga o token local."""
+    if sessao_id is not None:
+        revogar_sessao(sessao_id, usuario_id)
+    apagar_token_local()
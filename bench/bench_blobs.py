@@ -0,0 +1,93 @@
+# bench/bench_blobs.py
+"""
+Benchmark do armazém de anexos por conteúdo em um quadro com muitas duplicatas:
+cópia por anexo (shutil.copy2, como era) x import_file_to_folder atual
+(SHA-256 + blob único + hardlink na pasta do card).
+
+Uso:
+    python -m bench.bench_blobs [--cards 200] [--unicos 20] [--mb 2]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _uso_disco(*pastas: str) -> int:
+    """Bytes ocupados, contando cada inode uma vez (hardlinks não duplicam)."""
+    inodes = {}
+    for pasta in pastas:
+        for raiz, _, arquivos in os.walk(pasta):
+            for nome in arquivos:
+                st = os.stat(os.path.join(raiz, nome))
+                inodes[(st.st_dev, st.st_ino)] = st.st_size
+    return sum(inodes.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--unicos", type=int, default=20)
+    parser.add_argument("--mb", type=float, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        caminho = os.path.join(tmp, "blobs.sqlite")
+        conn = conectar(caminho)
+        criar_tabelas_kanban(conn)
+        aplicar_migracoes(conn)
+        conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+        conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+        conn.commit()
+        conn.close()
+
+        origem = os.path.join(tmp, "origem")
+        os.makedirs(origem)
+        referencias = []
+        for i in range(args.unicos):
+            arq = os.path.join(origem, f"referencia{i}.png")
+            with open(arq, "wb") as f:
+                f.write(os.urandom(int(args.mb * 1024 * 1024)))
+            referencias.append(arq)
+        rnd = random.Random(5)
+        escolhas = [rnd.choice(referencias) for _ in range(args.cards)]
+
+        controle = ControleCardKanban(caminho)
+        try:
+            cards = [controle.criar_card(1, f"card {i}", tipo="folder")["id"] for i in range(args.cards)]
+
+            copias = os.path.join(tmp, "copias")
+            os.makedirs(copias)
+            inicio = time.perf_counter()
+            for i, (card_id, arq) in enumerate(zip(cards, escolhas)):
+                # import_file_to_folder anterior: cópia inteira + registro do anexo
+                destino = os.path.join(copias, f"{i}_{os.path.basename(arq)}")
+                shutil.copy2(arq, destino)
+                controle.adicionar_anexo(card_id, os.path.basename(arq), caminho_local=destino,
+                                         tamanho=os.path.getsize(destino))
+            t_copia = time.perf_counter() - inicio
+            d_copia = _uso_disco(copias)
+
+            inicio = time.perf_counter()
+            for card_id, arq in zip(cards, escolhas):
+                controle.import_file_to_folder(card_id, arq)
+            t_blob = time.perf_counter() - inicio
+            d_blob = _uso_disco(controle.IMPORT_BASE_DIR, controle.armazem.base_dir)
+        finally:
+            controle.close()
+
+        print(f"{args.cards} anexos, {args.unicos} conteúdos distintos de {args.mb} MB")
+        print(f"cópia por anexo : {t_copia:6.2f}s  disco {d_copia / 1048576:8.1f} MB")
+        print(f"armazém (blobs) : {t_blob:6.2f}s  disco {d_blob / 1048576:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
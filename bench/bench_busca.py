@@ -0,0 +1,113 @@
+# bench/bench_busca.py
+"""
+Benchmark da busca de cards: LIKE '%termo%' (listar_cards) x índice FTS5 (buscar_cards).
+
+Gera um banco temporário com N cards sintéticos (títulos/descrições com
+vocabulário aleatório, checklist e anexos em parte deles) e mede a latência
+média de cada caminho para alguns termos.
+
+Uso:
+    python -m bench.bench_busca [--cards 100000] [--repeticoes 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+VOCABULARIO = (
+    "relatório backup deploy servidor cliente fatura reunião design banco índice "
+    "migração layout login senha cache fila worker thread arquivo pasta imagem "
+    "contrato orçamento sprint revisão teste documentação suporte ticket api"
+).split()
+
+
+def _vocabulario_extra(rnd: random.Random, n: int = 20000):
+    silabas = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "xo", "za"]
+    return ["".join(rnd.choice(silabas) for _ in range(rnd.randint(2, 4))) for _ in range(n)]
+
+
+def _frase(rnd: random.Random, n: int, extra) -> str:
+    # ~1/4 das palavras vem do vocabulário do domínio; o resto segue uma cauda longa
+    # (distribuição aproximadamente Zipf), como texto livre real
+    palavras = []
+    for _ in range(n):
+        if rnd.random() < 0.25:
+            palavras.append(rnd.choice(VOCABULARIO))
+        else:
+            palavras.append(extra[min(len(extra) - 1, int(rnd.paretovariate(1.1)) - 1)])
+    return " ".join(palavras)
+
+
+def _popular(caminho: str, n_cards: int, seed: int = 42):
+    rnd = random.Random(seed)
+    extra = _vocabulario_extra(rnd)
+    conn = conectar(caminho)
+    try:
+        criar_tabelas_kanban(conn)
+        aplicar_migracoes(conn)
+        cur = conn.cursor()
+        cur.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+        quadro_id = cur.lastrowid
+        colunas = []
+        for i in range(5):
+            cur.execute("INSERT INTO kanban_colunas (quadro_id, titulo, ordem) VALUES (?, ?, ?)",
+                        (quadro_id, f"Coluna {i}", i))
+            colunas.append(cur.lastrowid)
+        cur.executemany(
+            "INSERT INTO kanban_cards (coluna_id, titulo, descricao, ordem) VALUES (?, ?, ?, ?)",
+            ((colunas[i % 5], _frase(rnd, 4, extra), _frase(rnd, 20, extra), i) for i in range(n_cards)))
+        cur.executemany(
+            "INSERT INTO kanban_card_checklist (card_id, descricao) VALUES (?, ?)",
+            ((rnd.randint(1, n_cards), _frase(rnd, 5, extra)) for _ in range(n_cards // 4)))
+        cur.executemany(
+            "INSERT INTO kanban_card_attachments (card_id, nome_arquivo) VALUES (?, ?)",
+            ((rnd.randint(1, n_cards), f"{rnd.choice(extra)}_{i}.pdf") for i in range(n_cards // 10)))
+        conn.commit()
+        return quadro_id, extra
+    finally:
+        conn.close()
+
+
+def _medir(fn, repeticoes: int):
+    fn()  # aquece cache de páginas
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = fn()
+    return (time.perf_counter() - inicio) / repeticoes, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--limite", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        caminho = os.path.join(tmp, "bench.sqlite")
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        inicio = time.perf_counter()
+        quadro_id, extra = _popular(caminho, args.cards)
+        print(f"{args.cards} cards gerados (com índice FTS via triggers) em {time.perf_counter() - inicio:.2f}s")
+
+        controle = ControleCardKanban(caminho)
+        print(f"{'termo':<14}{'LIKE (ms)':>12}{'FTS (ms)':>12}{'ganho':>8}{'hits LIKE':>11}{'hits FTS':>10}")
+        # termos comuns (vocabulário do domínio), raros (cauda longa) e sem resultado
+        termos = ("relat", "migração", "contrato api", extra[500], extra[5000][:4], "inexistente")
+        for termo in termos:
+            t_like, n_like = _medir(lambda: controle.listar_cards(search=termo, limit=args.limite), args.repeticoes)
+            t_fts, n_fts = _medir(lambda: controle.buscar_cards(termo, quadro_id=quadro_id, limit=args.limite),
+                                  args.repeticoes)
+            print(f"{termo:<14}{t_like * 1000:>12.2f}{t_fts * 1000:>12.2f}"
+                  f"{t_like / max(t_fts, 1e-9):>7.1f}x{n_like:>11}{n_fts:>10}")
+        controle.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# bench/bench_cache.py
+"""
+Benchmark do cache de leituras do ControleCardKanban (cache_cards.py).
+
+Reproduz as leituras de uma renderização de card: load_card_data (card, tags,
+checklist, anexos), view_card (tags de novo) e _render_dialog_sections
+(checklist de topo + subtarefas de cada item, recursivamente, e anexos).
+Mede, com e sem cache, quantos SELECTs cada renderização executa e o tempo
+médio, repetindo a renderização do mesmo card (ex.: abrir o diálogo de novo)
+com uma escrita no meio para exercitar a invalidação.
+
+Uso:
+    python -m bench.bench_cache [--itens 30] [--renders 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _criar_banco(caminho: str, itens: int) -> int:
+    conn = conectar(caminho)
+    criar_tabelas_kanban(conn)
+    aplicar_migracoes(conn)
+    conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+    conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+    conn.execute("INSERT INTO kanban_cards (coluna_id, titulo, meta) VALUES (1, 'card', ?)",
+                 ('{"prazo": "2025-01-01", "responsavel": "ana", "estimativa": 3}',))
+    card_id = conn.execute("SELECT MAX(id) FROM kanban_cards").fetchone()[0]
+    for i in range(itens):
+        cur = conn.execute("INSERT INTO kanban_card_checklist (card_id, descricao, ordem) VALUES (?, ?, ?)",
+                           (card_id, f"tarefa {i}", i))
+        if i % 3 == 0:
+            conn.execute("INSERT INTO kanban_card_checklist (card_id, pai_id, descricao) VALUES (?, ?, 'sub')",
+                         (card_id, cur.lastrowid))
+    conn.executemany("INSERT INTO kanban_card_attachments (card_id, nome_arquivo) VALUES (?, ?)",
+                     [(card_id, f"arquivo{i}.png") for i in range(5)])
+    conn.executemany("INSERT INTO kanban_tags (nome) VALUES (?)", [(f"tag{i}",) for i in range(3)])
+    conn.executemany("INSERT INTO kanban_card_tags (card_id, tag_id) VALUES (?, ?)", [(card_id, i + 1) for i in range(3)])
+    conn.commit()
+    conn.close()
+    return card_id
+
+
+def _renderizar(controle: ControleCardKanban, card_id: int) -> None:
+    # load_card_data
+    controle.get_card(card_id)
+    controle.listar_tags_do_card(card_id)
+    controle.listar_checklist(card_id)
+    controle.listar_anexos(card_id)
+    # view_card + _render_dialog_sections
+    controle.listar_tags_do_card(card_id)
+
+    def _itens(pai_id=None):
+        for item in controle.listar_checklist(card_id, parent_id=pai_id):
+            _itens(item["id"])
+
+    _itens()
+    controle.listar_anexos(card_id)
+
+
+def _medir(caminho: str, card_id: int, renders: int, max_entradas: int):
+    ControleCardKanban.CACHE_MAX_ENTRADAS = max_entradas
+    controle = ControleCardKanban(caminho)
+    selects = []
+    controle.conn.set_trace_callback(lambda sql: selects.append(sql) if sql.lstrip().upper().startswith("SELECT") else None)
+    inicio = time.perf_counter()
+    for i in range(renders):
+        if i % 10 == 0:
+            # uma escrita de vez em quando: o card é relido depois dela
+            controle.atualizar_checklist(controle.listar_checklist(card_id)[0]["id"], concluido=i % 20 == 0)
+        _renderizar(controle, card_id)
+    tempo = (time.perf_counter() - inicio) / renders
+    controle.conn.set_trace_callback(None)
+    stats = controle.estatisticas_cache()
+    controle.close()
+    return tempo, len(selects) / renders, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--itens", type=int, default=30)
+    parser.add_argument("--renders", type=int, default=200)
+    args = parser.parse_args()
+
+    max_original = ControleCardKanban.CACHE_MAX_ENTRADAS
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        caminho = os.path.join(tmp, "cache.sqlite")
+        card_id = _criar_banco(caminho, args.itens)
+        try:
+            t_sem, q_sem, _ = _medir(caminho, card_id, args.renders, 0)
+            t_com, q_com, stats = _medir(caminho, card_id, args.renders, max_original)
+        finally:
+            ControleCardKanban.CACHE_MAX_ENTRADAS = max_original
+    print(f"{'':<10}{'ms/render':>12}{'SELECTs/render':>16}")
+    print(f"{'sem cache':<10}{t_sem * 1000:>12.3f}{q_sem:>16.1f}")
+    print(f"{'com cache':<10}{t_com * 1000:>12.3f}{q_com:>16.1f}")
+    print(f"speedup   : {t_sem / t_com:.1f}x")
+    print(f"cache     : {stats['acertos']} acertos, {stats['faltas']} faltas, "
+          f"{stats['invalidacoes']} invalidações, taxa {stats['taxa_acerto']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
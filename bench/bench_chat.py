@@ -0,0 +1,80 @@
+# bench/bench_chat.py
+"""
+Benchmark do histórico do chat: lista completa (listar_mensagens, como a tela
+fazia a cada envio) x página por chave (listar_pagina / listar_apos, com o
+índice idx_chat_mensagens_sessao_id da migração 8).
+
+Para sessões de tamanhos diferentes mede o tempo médio de: abrir o chat,
+carregar uma página antiga (rolar até o topo) e buscar as mensagens novas
+depois de um envio. Também mostra o plano da query de página.
+
+Uso:
+    python -m bench.bench_chat [--tamanhos 1000 10000 100000] [--repeticoes 50]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from banco.controles.chat_mestre.controle_chat import ChatController
+from banco.database import conectar, usar_conexao
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_chat import criar_tabelas_chat
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _criar_banco(n: int) -> int:
+    # ChatController e criar_tabelas_chat usam o banco padrão de conectar()
+    criar_tabelas_chat()
+    conn = conectar()
+    criar_tabelas_kanban(conn)   # as migrações anteriores à 8 mexem no Kanban
+    aplicar_migracoes(conn)
+    # outra sessão intercalada: a página precisa filtrar por sessão
+    conn.executemany("INSERT INTO chat_sessions (usuario) VALUES (?)", [("outro",), ("bench",)])
+    conn.executemany("INSERT INTO chat_mensagens (session_id, remetente, conteudo) VALUES (?, ?, ?)",
+                     ((1 + i % 2, "user" if i % 4 < 2 else "bot", f"mensagem {i}") for i in range(2 * n)))
+    conn.commit()
+    conn.close()
+    return 2
+
+
+def _tempo(fn, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        fn()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    import banco.database as database
+    caminho_original = database.CAMINHO_DB
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        print(f"{'mensagens':>10}{'completa (ms)':>15}{'página (ms)':>13}{'antiga (ms)':>13}{'novas (ms)':>12}")
+        try:
+            for n in args.tamanhos:
+                caminho = os.path.join(tmp, f"chat_{n}.sqlite")
+                database.CAMINHO_DB = caminho
+                sessao = _criar_banco(n)
+                ultimo = ChatController.listar_pagina(sessao, limite=1)[-1][0]
+                meio = ultimo - n          # ~ metade da sessão
+                t_full = _tempo(lambda: ChatController.listar_mensagens(sessao), max(1, args.repeticoes // 10))
+                t_pag = _tempo(lambda: ChatController.listar_pagina(sessao), args.repeticoes)
+                t_ant = _tempo(lambda: ChatController.listar_pagina(sessao, meio), args.repeticoes)
+                t_nov = _tempo(lambda: ChatController.listar_apos(sessao, ultimo - 4), args.repeticoes)
+                print(f"{n:>10}{t_full * 1000:>15.2f}{t_pag * 1000:>13.3f}{t_ant * 1000:>13.3f}{t_nov * 1000:>12.3f}")
+            with usar_conexao(caminho) as conn:
+                plano = conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT id, remetente, conteudo, criado_em FROM chat_mensagens "
+                    "WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?", (sessao, meio, 50)).fetchall()
+            print("\nplano da página:", "; ".join(row[3] for row in plano))
+        finally:
+            database.CAMINHO_DB = caminho_original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench/bench_coluna_virtual.py
+"""
+Benchmark da coluna Kanban: um CardKanbanWidget por card x lista virtualizada.
+
+Mede, para colunas de tamanhos diferentes, o tempo de construção, o número de
+widgets criados, a memória residente adicional e o tempo médio de um passo de
+rolagem com repaint. Roda com Qt offscreen e um banco temporário.
+
+Uso:
+    python -m bench.bench_coluna_virtual [--tamanhos 100 500 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.controles.kanban.controle_coluna import ControleColunaKanban
+from interface.objeto.coluna_kanban import ColunaKanbanWidget
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _cards_sinteticos(n: int):
+    cards = []
+    for i in range(n):
+        cards.append({
+            "id": i + 1, "coluna_id": 1, "pai_id": None, "titulo": f"Card {i}",
+            "descricao": "Descrição de exemplo " * 3, "tipo": "card", "cor_etiqueta": None,
+            "ordem": i, "meta": {},
+            "tags": [{"id": 1, "nome": "bench"}] if i % 3 == 0 else [],
+            "checklist": [{"id": i, "descricao": "tarefa", "concluido": i % 2}],
+            "checklist_resumo": {"total": 1, "concluidos": i % 2},
+            "anexos": [], "pastas": [],
+        })
+    return cards
+
+
+def _medir(app, controle_card, cards, virtual: bool, passos: int = 50):
+    rss_antes = _rss_mb()
+    inicio = time.perf_counter()
+    coluna = ColunaKanbanWidget(coluna_id=1, titulo="bench", controle_card=controle_card,
+                                controle_coluna=ControleColunaKanban(), cards=cards, virtual=virtual)
+    coluna.resize(320, 900)
+    coluna.show()
+    app.processEvents()
+    construcao = time.perf_counter() - inicio
+    widgets = len(coluna.findChildren(QWidget))
+    rss = _rss_mb() - rss_antes
+
+    area = coluna.cards_view if virtual else coluna.cards_scroll
+    barra = area.verticalScrollBar()
+    inicio = time.perf_counter()
+    for i in range(passos):
+        barra.setValue(int(barra.maximum() * i / max(1, passos - 1)))
+        area.viewport().repaint()
+    rolagem = (time.perf_counter() - inicio) / passos
+
+    coluna.close()
+    coluna.deleteLater()
+    app.processEvents()
+    return construcao, widgets, rss, rolagem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        controle_card = ControleCardKanban(os.path.join(tmp, "bench.sqlite"))
+
+        print(f"{'modo':<10}{'cards':>7}{'construção (s)':>16}{'widgets':>9}{'RSS (MB)':>10}{'rolagem (ms)':>14}")
+        for n in args.tamanhos:
+            cards = _cards_sinteticos(n)
+            for virtual in (False, True):
+                construcao, widgets, rss, rolagem = _medir(app, controle_card, cards, virtual)
+                modo = "virtual" if virtual else "widgets"
+                print(f"{modo:<10}{n:>7}{construcao:>16.3f}{widgets:>9}{rss:>10.1f}{rolagem * 1000:>14.2f}")
+        controle_card.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench/bench_comandos.py
+"""
+Benchmark do registro de comandos do chat (trie de tokens).
+
+Para catálogos de tamanhos diferentes (comandos de uma e de várias palavras,
+como os cadastrados em chat_comandos) mede o tempo médio de: dispatch de um
+comando existente, dispatch de texto comum (sem comando), completar um
+prefixo e sugerir para um comando digitado errado. O dispatch não deve
+crescer com o catálogo.
+
+Uso:
+    python -m bench.bench_comandos [--tamanhos 10 1000 10000] [--repeticoes 2000]
+"""
+import argparse
+import random
+import time
+
+from nucleo.comandos.contexto import ContextoComando
+from nucleo.comandos.registro import RegistroComandos
+
+PALAVRAS = ["criar", "mover", "listar", "apagar", "abrir", "exportar", "card", "coluna",
+            "quadro", "tema", "pasta", "arquivo", "tag", "sessao", "relatorio", "backup"]
+
+
+def _registro(n: int, semente: int = 42) -> RegistroComandos:
+    aleatorio = random.Random(semente)
+    reg = RegistroComandos()
+    vistos = set()
+    while len(vistos) < n:
+        palavras = aleatorio.sample(PALAVRAS, aleatorio.randint(1, 3))
+        chave = " ".join(palavras) + (f" {len(vistos)}" if len(vistos) >= len(PALAVRAS) else "")
+        if chave not in vistos:
+            vistos.add(chave)
+            reg.register(chave, lambda ctx, args: args, "bench")
+    reg.register("kanban", lambda ctx, args: args, "bench")
+    return reg
+
+
+def _tempo(fn, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        fn()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'comandos':>9}{'cadastro (ms)':>15}{'dispatch (us)':>15}{'texto (us)':>12}"
+          f"{'completar (us)':>16}{'sugerir (ms)':>14}")
+    for n in args.tamanhos:
+        inicio = time.perf_counter()
+        reg = _registro(n)
+        t_cad = time.perf_counter() - inicio
+        ctx = ContextoComando(texto_original="")
+        t_cmd = _tempo(lambda: reg.dispatch("/kanban mover card 12 para coluna 3", ctx), args.repeticoes)
+        t_txt = _tempo(lambda: reg.dispatch("bom dia, alguém viu o relatório de ontem?", ctx), args.repeticoes)
+        t_comp = _tempo(lambda: reg.completar("/mover c"), args.repeticoes)
+        t_sug = _tempo(lambda: reg.sugerir("/kanbam mover"), max(1, args.repeticoes // 100))
+        print(f"{n:>9}{t_cad * 1000:>15.1f}{t_cmd * 1e6:>15.2f}{t_txt * 1e6:>12.2f}"
+              f"{t_comp * 1e6:>16.2f}{t_sug * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench/bench_conexao.py
+"""
+Benchmark do gerenciador de conexões.
+
+Compara o padrão antigo (sqlite3.connect + close a cada chamada, journal
+padrão) com conectar() via pool (conexão reaproveitada, WAL + PRAGMAs).
+Roda sobre um banco temporário; o devhive.sqlite do projeto não é tocado.
+
+Uso:
+    python -m bench.bench_conexao [--ops 5000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from banco.conexoes import PoolConexoes
+
+
+def _preparar(caminho: str, linhas: int = 1000):
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT NOT NULL)")
+    conn.executemany("INSERT INTO itens (nome) VALUES (?)", [(f"item {i}",) for i in range(linhas)])
+    conn.commit()
+    conn.close()
+
+
+def _leitura(conn, i):
+    cur = conn.cursor()
+    cur.execute("SELECT nome FROM itens WHERE id = ?", (i % 1000 + 1,))
+    cur.fetchone()
+
+
+def _escrita(conn, i):
+    cur = conn.cursor()
+    cur.execute("UPDATE itens SET nome = ? WHERE id = ?", (f"novo {i}", i % 1000 + 1))
+    conn.commit()
+
+
+def _medir(obter_conexao, operacao, ops: int) -> float:
+    inicio = time.perf_counter()
+    for i in range(ops):
+        conn = obter_conexao()
+        try:
+            operacao(conn, i)
+        finally:
+            conn.close()
+    return ops / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        antigo = os.path.join(tmp, "antigo.sqlite")
+        novo = os.path.join(tmp, "pool.sqlite")
+        _preparar(antigo)
+        _preparar(novo)
+
+        pool = PoolConexoes(novo)
+
+        def conectar_antigo():
+            return sqlite3.connect(antigo, timeout=30)
+
+        print(f"{'cenário':<12}{'antes (ops/s)':>16}{'depois (ops/s)':>18}{'ganho':>9}")
+        for nome, operacao in (("leitura", _leitura), ("escrita", _escrita)):
+            antes = _medir(conectar_antigo, operacao, args.ops)
+            depois = _medir(pool.obter, operacao, args.ops)
+            print(f"{nome:<12}{antes:>16.0f}{depois:>18.0f}{depois / antes:>8.1f}x")
+
+        pool.fechar_ociosas()
+        print("pool:", pool.estatisticas())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# bench/bench_escritor.py
+"""
+Benchmark do escritor único (banco/escritor.py).
+
+Várias threads gravam em surtos (como o pipeline do chat, a UI e as tarefas
+em background ao mesmo tempo). Compara:
+- por conexão: cada thread grava na sua conexão do pool, um commit por escrita
+  (o padrão antigo, com busy_timeout);
+- escritor: todas entregam as escritas ao EscritorBanco, que faz commit em grupo.
+
+Mostra escritas/s, erros "database is locked" e o tamanho médio dos lotes.
+Com o synchronous=NORMAL do projeto o commit em WAL já é barato; --synchronous
+FULL (fsync a cada commit) mostra o ganho do commit em grupo.
+Roda sobre um banco temporário; o devhive.sqlite do projeto não é tocado.
+
+Uso:
+    python -m bench.bench_escritor [--threads 8] [--escritas 500] [--timeout 1.0]
+                                   [--synchronous NORMAL|FULL] [--janela 0]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from banco.conexoes import PRAGMAS_PADRAO, PoolConexoes
+from banco.escritor import EscritorBanco
+
+SQL = "INSERT INTO mensagens (sessao, texto) VALUES (?, ?)"
+
+
+def _preparar(caminho: str):
+    conn = sqlite3.connect(caminho)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE mensagens (id INTEGER PRIMARY KEY, sessao INTEGER NOT NULL, texto TEXT NOT NULL)")
+    conn.commit()
+    conn.close()
+
+
+def _rodar(threads: int, funcao) -> float:
+    barreira = threading.Barrier(threads + 1)
+
+    def _thread(t):
+        barreira.wait()
+        funcao(t)
+
+    trabalhadores = [threading.Thread(target=_thread, args=(t,)) for t in range(threads)]
+    for w in trabalhadores:
+        w.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for w in trabalhadores:
+        w.join()
+    return time.perf_counter() - inicio
+
+
+def _pragmas(synchronous: str):
+    return tuple((nome, synchronous if nome == "synchronous" else valor) for nome, valor in PRAGMAS_PADRAO)
+
+
+def _por_conexao(caminho: str, threads: int, escritas: int, args):
+    pool = PoolConexoes(caminho, timeout=args.timeout, pragmas=_pragmas(args.synchronous))
+    erros = [0]
+    trava = threading.Lock()
+
+    def _gravar(t):
+        conn = pool.obter()
+        for i in range(escritas):
+            try:
+                conn.execute(SQL, (t, f"mensagem {i}"))
+                conn.commit()
+            except sqlite3.OperationalError:
+                conn.rollback()
+                with trava:
+                    erros[0] += 1
+        conn.close()
+
+    tempo = _rodar(threads, _gravar)
+    pool.fechar_ociosas()
+    return tempo, erros[0], None
+
+
+def _escritor(caminho: str, threads: int, escritas: int, args):
+    escritor = EscritorBanco(caminho, janela=args.janela, timeout=args.timeout,
+                             pragmas=_pragmas(args.synchronous))
+    erros = [0]
+    trava = threading.Lock()
+
+    def _gravar(t):
+        for i in range(escritas):
+            try:
+                escritor.escrever(lambda cur: cur.execute(SQL, (t, f"mensagem {i}")))
+            except sqlite3.OperationalError:
+                with trava:
+                    erros[0] += 1
+
+    tempo = _rodar(threads, _gravar)
+    stats = escritor.estatisticas()
+    escritor.parar()
+    return tempo, erros[0], stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--escritas", type=int, default=500, help="escritas por thread")
+    parser.add_argument("--timeout", type=float, default=1.0, help="busy_timeout (s)")
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL"])
+    parser.add_argument("--janela", type=float, default=EscritorBanco.JANELA,
+                        help="espera do escritor por mais pedidos num surto (s)")
+    args = parser.parse_args()
+
+    total = args.threads * args.escritas
+    print(f"{args.threads} threads x {args.escritas} escritas, busy_timeout {args.timeout}s, "
+          f"synchronous={args.synchronous}, janela {args.janela * 1000:g}ms")
+    print(f"{'modo':<14}{'escritas/s':>12}{'locked':>9}{'por lote':>10}")
+    for nome, funcao in (("por conexão", _por_conexao), ("escritor", _escritor)):
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = os.path.join(tmp, "bench.sqlite")
+            _preparar(caminho)
+            tempo, erros, stats = funcao(caminho, args.threads, args.escritas, args)
+            conn = sqlite3.connect(caminho)
+            gravadas = conn.execute("SELECT COUNT(*) FROM mensagens").fetchone()[0]
+            conn.close()
+        por_lote = f"{stats['media_por_lote']:.1f}" if stats else "1.0"
+        print(f"{nome:<14}{gravadas / tempo:>12.0f}{erros:>9}{por_lote:>10}"
+              + ("" if gravadas + erros == total else f"  (gravadas {gravadas}/{total})"))
+
+
+if __name__ == "__main__":
+    main()
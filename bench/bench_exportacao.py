@@ -0,0 +1,98 @@
+# bench/bench_exportacao.py
+"""
+Benchmark da exportação de pasta em ZIP: cópia para diretório temporário +
+zipfile (como era) x zip_pastas.escrever_zip_pasta (streaming, leitura em
+paralelo, mídia sem deflate).
+
+Gera uma pasta com arquivos de texto (compressíveis) e "mídia" (bytes
+aleatórios com extensão .jpg/.mp4) e mede tempo e bytes extras gravados em disco.
+
+Uso:
+    python -m bench.bench_exportacao [--mb 512] [--arquivos 200] [--workers 4]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from banco.controles.kanban.zip_pastas import escrever_zip_pasta
+
+
+def _gerar(pasta: str, total_mb: int, n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    linhas = [f"linha {i} de log com algum conteúdo repetitivo {i % 97}\n".encode() for i in range(4096)]
+    arquivos = []
+    por_arquivo = total_mb * 1024 * 1024 // n
+    for i in range(n):
+        ext = rnd.choice([".txt", ".log", ".csv", ".jpg", ".mp4"])
+        caminho = os.path.join(pasta, f"arq{i}{ext}")
+        tamanho = int(por_arquivo * rnd.uniform(0.2, 1.8))
+        with open(caminho, "wb") as f:
+            if ext in (".jpg", ".mp4"):
+                f.write(os.urandom(tamanho))
+            else:
+                escritos = 0
+                while escritos < tamanho:
+                    bloco = b"".join(rnd.choices(linhas, k=256))
+                    f.write(bloco)
+                    escritos += len(bloco)
+        arquivos.append((caminho, f"files/{i}_{os.path.basename(caminho)}"))
+    return arquivos
+
+
+def _exportar_copiando(zip_path: str, arquivos) -> int:
+    """Algoritmo anterior: copia tudo para um tempdir e zipa o tempdir (deflate em tudo)."""
+    tmpdir = tempfile.mkdtemp(prefix="kanban_export_")
+    try:
+        files_dir = os.path.join(tmpdir, "files")
+        os.makedirs(files_dir)
+        for src, arcname in arquivos:
+            shutil.copy2(src, os.path.join(files_dir, os.path.basename(arcname)))
+        extra = sum(os.path.getsize(os.path.join(files_dir, f)) for f in os.listdir(files_dir))
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("folder.json", "{}")
+            for fname in os.listdir(files_dir):
+                zf.write(os.path.join(files_dir, fname), arcname=f"files/{fname}")
+        return extra
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mb", type=int, default=512)
+    parser.add_argument("--arquivos", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        origem = os.path.join(tmp, "origem")
+        os.makedirs(origem)
+        arquivos = _gerar(origem, args.mb, args.arquivos)
+        total = sum(os.path.getsize(src) for src, _ in arquivos)
+        print(f"{len(arquivos)} arquivos, {total / 1048576:.0f} MB")
+
+        zip_antigo = os.path.join(tmp, "antigo.zip")
+        inicio = time.perf_counter()
+        extra = _exportar_copiando(zip_antigo, arquivos)
+        t_antigo = time.perf_counter() - inicio
+        tam_antigo = os.path.getsize(zip_antigo)
+        os.remove(zip_antigo)
+
+        zip_novo = os.path.join(tmp, "novo.zip")
+        inicio = time.perf_counter()
+        escrever_zip_pasta(zip_novo, {}, arquivos, workers=args.workers)
+        t_novo = time.perf_counter() - inicio
+        tam_novo = os.path.getsize(zip_novo)
+
+        print(f"cópia + zipfile : {t_antigo:7.2f}s  zip {tam_antigo / 1048576:7.1f} MB  "
+              f"disco extra {extra / 1048576:.0f} MB")
+        print(f"streaming       : {t_novo:7.2f}s  zip {tam_novo / 1048576:7.1f} MB  disco extra 0 MB")
+        print(f"speedup         : {t_antigo / t_novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# bench/bench_importacao.py
+"""
+Benchmark da importação de pasta (ZIP): extractall em diretório temporário +
+cópia + um commit por card/anexo (como era) x import_folder_from_zip
+(streaming do ZIP para o destino final, uma transação com executemany).
+
+Uso:
+    python -m bench.bench_importacao [--arquivos 3000] [--pastas 60] [--kb 16]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.controles.kanban.zip_pastas import ler_estrutura_zip
+from banco.database import conectar
+from banco.escritor import obter_escritor
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _preparar(tmp: str, n_arquivos: int, n_pastas: int, kb: int):
+    caminho = os.path.join(tmp, "import.sqlite")
+    conn = conectar(caminho)
+    criar_tabelas_kanban(conn)
+    aplicar_migracoes(conn)
+    conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+    conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+    conn.commit()
+    conn.close()
+
+    controle = ControleCardKanban(caminho)
+    raiz = controle.criar_card(1, "origem", tipo="folder")["id"]
+    pastas = [raiz]
+    for i in range(n_pastas):
+        pastas.append(controle.criar_card(1, f"pasta {i}", tipo="folder", pai_id=pastas[i // 4])["id"])
+    origem = os.path.join(tmp, "origem")
+    os.makedirs(origem)
+    dados = os.urandom(kb * 1024)
+    for i in range(n_arquivos):
+        arq = os.path.join(origem, f"arq{i}.bin")
+        with open(arq, "wb") as f:
+            f.write(dados)
+        controle.adicionar_anexo(pastas[i % len(pastas)], f"arq{i}.bin", caminho_local=arq, tamanho=len(dados))
+    zip_path = os.path.join(tmp, "pasta.zip")
+    controle.export_folder_as_zip(raiz, zip_path)
+    destino_antigo = controle.criar_card(1, "destino antigo", tipo="folder")["id"]
+    destino_novo = controle.criar_card(1, "destino novo", tipo="folder")["id"]
+    return controle, zip_path, destino_antigo, destino_novo
+
+
+def _importar_extraindo(controle: ControleCardKanban, parent_id: int, zip_path: str):
+    """Algoritmo anterior (resumido): extractall + cópia + criar_card/adicionar_anexo com commit cada."""
+    tmpdir = tempfile.mkdtemp(prefix="kanban_import_")
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extractall(tmpdir)
+            data = ler_estrutura_zip(zf)
+
+        def _restaurar(struct, pai_id):
+            novo = controle.criar_card(1, (struct.get("folder") or {}).get("titulo") or "Nova Pasta",
+                                       pai_id=pai_id, tipo="folder")["id"]
+            for a in struct.get("anexos", []):
+                src = os.path.join(tmpdir, "files", a["exported_filename"])
+                ts = int(time.time())
+                dest_dir = os.path.join(controle.IMPORT_BASE_DIR, str(ts))
+                os.makedirs(dest_dir, exist_ok=True)
+                dest = os.path.join(dest_dir, f"{ts}_{os.path.basename(src)}")
+                shutil.copy2(src, dest)
+                controle.adicionar_anexo(novo, a["nome_arquivo"], caminho_local=dest, tamanho=os.path.getsize(dest))
+            for sub in struct.get("subfolders", []):
+                _restaurar(sub, novo)
+
+        _restaurar(data, parent_id)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def _commits(controle: ControleCardKanban, chamada):
+    # toda escrita do controle passa pelo escritor único: um commit por lote
+    escritor = obter_escritor(controle.db_path)
+    antes = escritor.estatisticas()["lotes"]
+    inicio = time.perf_counter()
+    chamada()
+    return time.perf_counter() - inicio, escritor.estatisticas()["lotes"] - antes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--arquivos", type=int, default=3000)
+    parser.add_argument("--pastas", type=int, default=60)
+    parser.add_argument("--kb", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        controle, zip_path, destino_antigo, destino_novo = _preparar(tmp, args.arquivos, args.pastas, args.kb)
+        try:
+            t_antigo, c_antigo = _commits(controle, lambda: _importar_extraindo(controle, destino_antigo, zip_path))
+            t_novo, c_novo = _commits(controle, lambda: controle.import_folder_from_zip(destino_novo, zip_path))
+        finally:
+            controle.close()
+        print(f"{args.arquivos} arquivos em {args.pastas + 1} pastas ({args.kb} KB cada)")
+        print(f"extractall + cópia : {t_antigo:7.2f}s  {c_antigo:6d} commits")
+        print(f"streaming          : {t_novo:7.2f}s  {c_novo:6d} commits")
+        print(f"speedup            : {t_antigo / t_novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench/bench_ordem.py
+"""
+Benchmark de reordenação: deslocamento de irmãos (ordem densa, como era) x
+ordem esparsa (ControleCardKanban.move_card atual).
+
+Para colunas de tamanhos diferentes mede o tempo médio de um move para uma
+posição aleatória e quantas linhas cada move grava (total_changes da conexão
+do escritor único, por onde passam as duas versões).
+
+Uso:
+    python -m bench.bench_ordem [--tamanhos 100 1000 10000 50000] [--moves 300]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar, escrever
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _mover_deslocando(cur, card_id: int, coluna_id: int, nova_ordem: int):
+    """Algoritmo anterior: abre espaço somando/subtraindo 1 de todos os irmãos."""
+    card = cur.execute("SELECT coluna_id, pai_id, ordem FROM kanban_cards WHERE id = ?", (card_id,)).fetchone()
+    cur.execute(
+        "UPDATE kanban_cards SET ordem = ordem - 1 WHERE coluna_id = ? AND (pai_id IS ? OR pai_id = ?) AND ordem > ?",
+        (card[0], card[1], card[1], card[2]))
+    cur.execute(
+        "UPDATE kanban_cards SET ordem = ordem + 1 WHERE coluna_id = ? AND (pai_id IS ? OR pai_id = ?) AND ordem >= ?",
+        (coluna_id, None, None, nova_ordem))
+    cur.execute("UPDATE kanban_cards SET coluna_id = ?, pai_id = NULL, ordem = ? WHERE id = ?",
+                (coluna_id, nova_ordem, card_id))
+
+
+def _mudancas(caminho: str) -> int:
+    return escrever(lambda cur: cur.connection.total_changes, caminho)
+
+
+def _medir(n: int, moves: int, esparsa: bool, tmp: str, seed: int = 1):
+    caminho = os.path.join(tmp, f"ordem_{n}_{int(esparsa)}.sqlite")
+    conn = conectar(caminho)
+    criar_tabelas_kanban(conn)
+    aplicar_migracoes(conn)
+    conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+    conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+    passo = ControleCardKanban.ORDEM_PASSO if esparsa else 1
+    conn.executemany("INSERT INTO kanban_cards (coluna_id, titulo, ordem) VALUES (1, ?, ?)",
+                     ((f"c{i}", (i + 1) * passo if esparsa else i) for i in range(n)))
+    conn.commit()
+
+    controle = ControleCardKanban(caminho)
+    rnd = random.Random(seed)
+    escritas = 0
+    inicio = time.perf_counter()
+    for _ in range(moves):
+        card_id = rnd.randint(1, n)
+        posicao = rnd.randint(0, n - 1)
+        antes = _mudancas(caminho)
+        if esparsa:
+            controle.move_card(card_id, 1, posicao)
+        else:
+            escrever(lambda cur: _mover_deslocando(cur, card_id, 1, posicao), caminho)
+        escritas += _mudancas(caminho) - antes
+    tempo = (time.perf_counter() - inicio) / moves
+    controle.close()
+    conn.close()
+    return tempo, escritas / moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--moves", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        print(f"{'cards':>7}{'desloca (ms)':>14}{'linhas/move':>13}{'esparsa (ms)':>14}{'linhas/move':>13}")
+        for n in args.tamanhos:
+            t_old, w_old = _medir(n, args.moves, False, tmp)
+            t_new, w_new = _medir(n, args.moves, True, tmp)
+            print(f"{n:>7}{t_old * 1000:>14.3f}{w_old:>13.1f}{t_new * 1000:>14.3f}{w_new:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# bench/bench_refresh.py
+"""
+Benchmark de atualização da coluna após editar um card: recarga completa
+(como era: limpar a coluna e recriar todos os CardKanbanWidget) x atualização
+pontual pelos eventos do controle (ColunaKanbanWidget._on_evento_kanban).
+
+Para cada tamanho de coluna edita cards aleatórios via ControleCardKanban e mede
+o tempo médio por edição (escrita + atualização da UI com repaint) e quantos
+cards foram redesenhados (_apply_card_data). Roda com Qt offscreen e um banco
+temporário.
+
+Uso:
+    python -m bench.bench_refresh [--tamanhos 100 500] [--edicoes 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.controles.kanban.controle_coluna import ControleColunaKanban
+from banco.database import conectar
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+from interface.objeto.card_kanban import CardKanbanWidget
+from interface.objeto.coluna_kanban import ColunaKanbanWidget
+
+
+def _criar_banco(caminho: str, n: int):
+    conn = conectar(caminho)
+    criar_tabelas_kanban(conn)
+    aplicar_migracoes(conn)
+    conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'bench')")
+    conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+    conn.executemany("INSERT INTO kanban_cards (coluna_id, titulo, descricao, ordem) VALUES (1, ?, ?, ?)",
+                     ((f"Card {i}", "Descrição de exemplo", (i + 1) * ControleCardKanban.ORDEM_PASSO)
+                      for i in range(n)))
+    conn.executemany("INSERT INTO kanban_card_checklist (card_id, descricao, concluido, ordem) VALUES (?, 'tarefa', 0, 0)",
+                     ((i + 1,) for i in range(n)))
+    conn.commit()
+    conn.close()
+
+
+def _medir(app, caminho: str, n: int, edicoes: int, incremental: bool, seed: int = 1):
+    controle = ControleCardKanban(caminho)
+    coluna = ColunaKanbanWidget(coluna_id=1, titulo="bench", controle_card=controle,
+                                controle_coluna=ControleColunaKanban(), virtual=False)
+    coluna.resize(320, 900)
+    coluna.show()
+    app.processEvents()
+    if not incremental:
+        # comportamento anterior: sem ouvinte; cada escrita termina em recarga da coluna
+        controle.eventos.cancelar_assinatura(coluna._on_evento_kanban)
+
+    redesenhos = 0
+    original = CardKanbanWidget._apply_card_data
+
+    def _contar(self, *args):
+        nonlocal redesenhos
+        redesenhos += 1
+        return original(self, *args)
+
+    CardKanbanWidget._apply_card_data = _contar
+    rnd = random.Random(seed)
+    inicio = time.perf_counter()
+    try:
+        for i in range(edicoes):
+            card_id = rnd.randint(1, n)
+            controle.atualizar_card(card_id, titulo=f"Editado {i}")
+            if not incremental:
+                coluna.clear_cards_ui()
+                coluna.load_cards()
+            app.processEvents()
+            coluna.repaint()
+    finally:
+        CardKanbanWidget._apply_card_data = original
+    tempo = (time.perf_counter() - inicio) / edicoes
+
+    coluna.close()
+    coluna.deleteLater()
+    app.processEvents()
+    controle.close()
+    return tempo, redesenhos / edicoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--edicoes", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory(prefix="devhive_bench_") as tmp:
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        print(f"{'cards':>7}{'recarga (ms)':>14}{'cards/edição':>14}{'pontual (ms)':>14}{'cards/edição':>14}")
+        for n in args.tamanhos:
+            caminho = os.path.join(tmp, f"refresh_{n}.sqlite")
+            _criar_banco(caminho, n)
+            t_old, r_old = _medir(app, caminho, n, args.edicoes, incremental=False)
+            t_new, r_new = _medir(app, caminho, n, args.edicoes, incremental=True)
+            print(f"{n:>7}{t_old * 1000:>14.1f}{r_old:>14.1f}{t_new * 1000:>14.1f}{r_new:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench/check_cache_versao.py
+"""
+Verifica que o cache de cards (cache_cards.py) não aceita como "só minha" uma
+versão do banco que já inclui o commit de outro lote.
+
+Reproduz a intercalação: o controle da GUI tem listar_anexos(X) em cache, grava
+atualizar_card(Y) sozinho num lote e, entre o COMMIT dele e a leitura de
+PRAGMA data_version em CacheCards.escrita_propria, outro ControleCardKanban (em
+outra thread) grava um anexo em X pelo mesmo escritor. Depois disso
+listar_anexos(X) precisa ver o anexo novo. Também confere que uma escrita sem
+concorrência continua preservando o cache. Falha com exit code 1.
+
+Uso:
+    python -m bench.check_cache_versao
+"""
+import os
+import sys
+import tempfile
+import threading
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar, escritor_do_banco
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _popular(caminho: str) -> None:
+    conn = conectar(caminho)
+    try:
+        criar_tabelas_kanban(conn)
+        aplicar_migracoes(conn)
+        conn.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'cache')")
+        conn.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _intercalar(controle: ControleCardKanban, escrita_alheia) -> None:
+    """Na primeira leitura da versão depois do próximo COMMIT, roda escrita_alheia
+    em outra thread (e espera) antes de ler a versão de verdade."""
+    escritor = escritor_do_banco(controle.db_path)
+    antes = escritor.commits()[0]
+    versao_real = controle.cache._versao
+    feito = []
+
+    def _versao():
+        if not feito and escritor.commits()[0] > antes:
+            feito.append(True)
+            t = threading.Thread(target=escrita_alheia)
+            t.start()
+            t.join()
+        return versao_real()
+
+    controle.cache._versao = _versao
+
+
+def main() -> int:
+    falhas = 0
+    with tempfile.TemporaryDirectory(prefix="devhive_cache_") as tmp:
+        caminho = os.path.join(tmp, "cache.sqlite")
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        _popular(caminho)
+        controle = ControleCardKanban(caminho)
+        try:
+            x = controle.criar_card(1, "X")["id"]
+            y = controle.criar_card(1, "Y")["id"]
+
+            # sem concorrência: a escrita própria não derruba o resto do cache
+            controle.listar_anexos(x)
+            controle.atualizar_card(y, titulo="Y1")
+            ok = len(controle.cache) > 0 and controle.listar_anexos(x) == []
+            falhas += 0 if ok else 1
+            print(f"{'OK ' if ok else 'FALHOU'} escrita isolada preserva o cache")
+
+            # commit alheio entre o COMMIT próprio e a leitura da versão
+            def _outro_controle():
+                outro = ControleCardKanban(caminho)
+                try:
+                    outro.adicionar_anexo(x, "novo.txt", url_remoto="http://exemplo")
+                finally:
+                    outro.close()
+
+            controle.listar_anexos(x)
+            _intercalar(controle, _outro_controle)
+            controle.atualizar_card(y, titulo="Y2")
+            vistos = len(controle.listar_anexos(x))
+            ok = vistos == 1
+            falhas += 0 if ok else 1
+            print(f"{'OK ' if ok else 'FALHOU'} commit alheio depois do próprio invalida o cache "
+                  f"({vistos} de 1 anexo visto)")
+        finally:
+            controle.close()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
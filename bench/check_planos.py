@@ -0,0 +1,117 @@
+# bench/check_planos.py
+"""
+Verifica (EXPLAIN QUERY PLAN) que as queries quentes do Kanban usam os índices
+criados pelas migrações em banco/migracoes.py.
+
+As queries não são copiadas aqui: cada verificação chama o método real de
+ControleCardKanban e captura o SQL executado com set_trace_callback, então uma
+mudança no controle que perca o índice faz este script falhar (exit code 1).
+
+Uso:
+    python -m bench.check_planos
+"""
+import os
+import sys
+import tempfile
+from typing import Callable, List, Tuple
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.database import conectar
+from banco.migracoes import aplicar_migracoes
+from banco.modelos.db_model_quadro import criar_tabelas_kanban
+
+
+def _popular(caminho: str) -> None:
+    conn = conectar(caminho)
+    try:
+        criar_tabelas_kanban(conn)
+        aplicar_migracoes(conn)
+        cur = conn.cursor()
+        cur.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (1, 'planos')")
+        cur.execute("INSERT INTO kanban_colunas (quadro_id, titulo) VALUES (1, 'A')")
+        # distribuição parecida com um quadro real: maioria de cards de topo,
+        # poucos sub-cards, tags e prazos em uma fração dos cards
+        n = 2000
+        cur.executemany("INSERT INTO kanban_cards (coluna_id, pai_id, titulo, ordem, meta) VALUES (1, ?, ?, ?, ?)",
+                        [(None if i < n * 9 // 10 else i % 100 + 1, f"c{i}", i,
+                          '{"prazo": "2025-01-01"}' if i % 40 == 0 else "{}") for i in range(n)])
+        cur.executemany("INSERT INTO kanban_card_checklist (card_id, descricao) VALUES (?, 'x')",
+                        [(i % n + 1,) for i in range(n)])
+        cur.executemany("INSERT INTO kanban_card_attachments (card_id, nome_arquivo) VALUES (?, 'a.png')",
+                        [(i % n + 1,) for i in range(n // 2)])
+        cur.executemany("INSERT INTO kanban_tags (nome) VALUES (?)", [(f"tag{i}",) for i in range(20)])
+        cur.executemany("INSERT INTO kanban_card_tags (card_id, tag_id) VALUES (?, ?)",
+                        [(i, i % 20 + 1) for i in range(1, n, 3)])
+        cur.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _capturar(controle: ControleCardKanban, chamada: Callable[[], object]) -> List[str]:
+    sqls: List[str] = []
+    # sem o cache de leituras: a verificação precisa ver o SQL de cada chamada
+    controle.invalidar_cache()
+    controle.conn.set_trace_callback(sqls.append)
+    try:
+        chamada()
+    finally:
+        controle.conn.set_trace_callback(None)
+    return [s for s in sqls if s.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def _plano(controle: ControleCardKanban, sql: str) -> List[str]:
+    return [row[3] for row in controle.conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+
+
+CTES = ("topo", "arvore", "a", "cadeia")
+
+VERIFICACOES: List[Tuple[str, Callable[[ControleCardKanban], object], str]] = [
+    ("listar_cards(coluna, topo)", lambda c: c.listar_cards(coluna_id=1), "idx_cards_coluna_pai_ordem"),
+    ("_get_max_ordem", lambda c: c._get_max_ordem(1), "idx_cards_coluna_pai_ordem"),
+    ("load_column_snapshot", lambda c: c.load_column_snapshot(1), "idx_cards_coluna_pai_ordem"),
+    ("get_card_children", lambda c: c.get_card_children(1), "idx_cards_pai_ordem"),
+    ("listar_cards(pai_id)", lambda c: c.listar_cards(pai_id=1), "idx_cards_pai_ordem"),
+    ("listar_checklist", lambda c: c.listar_checklist(1), "idx_checklist_card_pai_ordem"),
+    ("listar_anexos", lambda c: c.listar_anexos(1), "idx_anexos_card_criado"),
+    ("load_board_snapshot (colunas)", lambda c: c.load_board_snapshot(1), "idx_colunas_quadro_ordem"),
+    ("get_subtree", lambda c: c.get_subtree(1), "idx_cards_pai_ordem"),
+    ("_gather_folder_structure", lambda c: c._gather_folder_structure(1), "idx_anexos_card_criado"),
+    ("listar_cards(tags)", lambda c: c.listar_cards(tags=[1]), "idx_card_tags_tag"),
+    ("listar_cards(meta prazo)", lambda c: c.listar_cards(meta_filters={"prazo": ("<=", "2025-06-01")}),
+     "idx_cards_meta_prazo"),
+]
+
+
+def main() -> int:
+    falhas = 0
+    with tempfile.TemporaryDirectory(prefix="devhive_planos_") as tmp:
+        caminho = os.path.join(tmp, "planos.sqlite")
+        ControleCardKanban.IMPORT_BASE_DIR = os.path.join(tmp, "kanban_storage")
+        _popular(caminho)
+        controle = ControleCardKanban(caminho)
+        try:
+            for nome, chamada, indice in VERIFICACOES:
+                planos = [_plano(controle, sql) for sql in _capturar(controle, lambda: chamada(controle))]
+                linhas = [linha for plano in planos for linha in plano]
+                usa_indice = any(f"INDEX {indice}" in linha for linha in linhas)
+                # índice automático = SQLite varrendo a tabela para montar um índice temporário
+                varre_auto = [linha for linha in linhas if "AUTOMATIC" in linha]
+                # SCAN em CTEs (e seus aliases) é esperado; SCAN em tabela não
+                varre = [linha for linha in linhas
+                         if linha.startswith("SCAN ") and "INDEX" not in linha
+                         and linha.split()[1] not in CTES and "CONSTANT ROW" not in linha]
+                ok = usa_indice and not varre and not varre_auto
+                falhas += 0 if ok else 1
+                print(f"{'OK ' if ok else 'FALHOU'} {nome:<32} {indice}")
+                if not ok:
+                    for linha in linhas:
+                        print(f"        {linha}")
+        finally:
+            controle.close()
+    print(f"\n{len(VERIFICACOES) - falhas}/{len(VERIFICACOES)} planos usando os índices esperados.")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# bench/gerador.py
+"""
+Gerador de banco sintético para os benchmarks.
+
+Preenche um banco (schema completo: tabelas base + migrações) com usuários,
+quadros, colunas, cards hierárquicos (pastas com sub-pastas e cards), checklist
+com subtarefas, tags, anexos e sessões de chat. Tudo sai de random.Random(semente):
+a mesma semente e escala geram o mesmo banco.
+
+Os anexos são arquivos esparsos (truncate até o tamanho, sem gravar dados)
+dentro de `armazenamento`, com o caminho de ControleCardKanban; a exportação de
+ZIP lê os bytes de verdade, sem ocupar o disco.
+
+Usuários precisam de bcrypt (banco/auth.py); sem ele a tabela fica vazia e o
+resumo avisa. Todos recebem a mesma senha (SENHA), com um hash só.
+
+Uso:
+    python -m bench.gerador --db /tmp/devhive_bench.sqlite [--escala media] [--semente 42]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+ESCALAS: Dict[str, Dict[str, int]] = {
+    # por quadro: colunas; por coluna: cards de topo; cada pasta tem sub-itens até `profundidade`
+    "pequena": dict(usuarios=5, quadros=2, colunas=4, cards=20, pastas=2, filhos=4, profundidade=3,
+                    checklist=4, tags=30, tags_por_card=2, anexos=2, kb_anexo=256,
+                    sessoes=2, mensagens=200),
+    "media": dict(usuarios=20, quadros=3, colunas=5, cards=60, pastas=3, filhos=5, profundidade=4,
+                  checklist=6, tags=200, tags_por_card=3, anexos=3, kb_anexo=512,
+                  sessoes=3, mensagens=2000),
+    "grande": dict(usuarios=50, quadros=4, colunas=6, cards=150, pastas=4, filhos=6, profundidade=5,
+                   checklist=8, tags=1000, tags_por_card=3, anexos=4, kb_anexo=1024,
+                   sessoes=4, mensagens=10000),
+}
+
+SENHA = "senha-bench-123"
+
+PALAVRAS = ["relatório", "deploy", "api", "bug", "tela", "login", "kanban", "chat", "backup", "tema",
+            "exportar", "importar", "cliente", "sprint", "revisão", "banco", "cache", "teste", "layout"]
+EXTENSOES = [(".png", "image/png"), (".jpg", "image/jpeg"), (".pdf", "application/pdf"),
+             (".txt", "text/plain"), (".mp4", "video/mp4")]
+COLUNAS = ["Backlog", "A fazer", "Em andamento", "Revisão", "Concluído", "Arquivo"]
+
+
+def _texto(rnd: random.Random, palavras: int) -> str:
+    return " ".join(rnd.choice(PALAVRAS) for _ in range(palavras))
+
+
+def _preparar_schema(caminho: str) -> None:
+    """Cria as tabelas e aplica as migrações no banco `caminho` (via CAMINHO_DB)."""
+    import banco.database as database
+    from banco.migracoes import aplicar_migracoes
+    from banco.modelos.db_model_chat import criar_tabelas_chat
+    from banco.modelos.db_model_quadro import criar_tabelas_kanban
+    from banco.modelos.db_model_tema import criar_tabela_tema
+
+    database.CAMINHO_DB = caminho
+    try:
+        from banco.auth import inicializar_tabela
+        inicializar_tabela()
+    except ImportError:
+        pass        # sem bcrypt: sem tabela de usuários
+    criar_tabelas_chat()
+    criar_tabelas_kanban()
+    criar_tabela_tema()
+    aplicar_migracoes()
+
+
+def _hash_senha() -> Optional[str]:
+    try:
+        import bcrypt
+    except ImportError:
+        return None
+    return bcrypt.hashpw(SENHA.encode(), bcrypt.gensalt()).decode()
+
+
+def gerar_banco(caminho: str, escala: str = "media", semente: int = 42,
+                armazenamento: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Gera o banco em `caminho` (que não pode existir) e devolve um resumo com as
+    contagens e ids úteis para os benchmarks (pasta raiz mais funda, sessão etc.).
+    """
+    if os.path.exists(caminho):
+        raise FileExistsError(f"{caminho} já existe; o gerador não sobrescreve bancos")
+    p = ESCALAS[escala]
+    rnd = random.Random(semente)
+    armazenamento = armazenamento or os.path.join(os.path.dirname(os.path.abspath(caminho)), "kanban_storage")
+    inicio = time.perf_counter()
+
+    _preparar_schema(caminho)
+    conn = sqlite3.connect(caminho)
+    conn.execute("PRAGMA foreign_keys = ON")
+    cur = conn.cursor()
+
+    # usuários
+    usuarios: List[str] = []
+    senha_hash = _hash_senha()
+    if senha_hash is not None:
+        for i in range(p["usuarios"]):
+            usuario_id = str(uuid.UUID(int=rnd.getrandbits(128)))
+            usuarios.append(usuario_id)
+            cur.execute(
+                "INSERT INTO usuarios (id, nome_exibicao, email, senha_hash, papel, cargo, data_criacao) "
+                "VALUES (?, ?, ?, ?, ?, ?, datetime('now'))",
+                (usuario_id, f"Usuário {i}", f"usuario{i}@bench.local", senha_hash,
+                 "admin" if i == 0 else "membro", rnd.choice(["Dev", "QA", "PM", "Design"])))
+    donos = usuarios or [f"bench-{i}" for i in range(p["usuarios"])]
+
+    # tags
+    cur.executemany("INSERT INTO kanban_tags (nome) VALUES (?)", [(f"tag-{i}",) for i in range(p["tags"])])
+    tag_ids = [r[0] for r in cur.execute("SELECT id FROM kanban_tags")]
+
+    contagem = {"cards": 0, "pastas": 0, "checklist": 0, "anexos": 0, "bytes_anexos": 0}
+    maior_pasta = (0, None)        # (itens na sub-árvore, id)
+    colunas_ids: List[int] = []
+
+    def _card(coluna_id: int, pai_id: Optional[int], tipo: str, ordem: int) -> int:
+        meta = {"prioridade": rnd.choice(["baixa", "media", "alta"])}
+        if rnd.random() < 0.5:
+            meta["prazo"] = f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        if rnd.random() < 0.1:
+            meta["arquivado"] = True
+        cur.execute(
+            "INSERT INTO kanban_cards (coluna_id, pai_id, titulo, descricao, tipo, ordem, meta) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (coluna_id, pai_id, _texto(rnd, 3).capitalize(), _texto(rnd, 12), tipo,
+             (ordem + 1) * 65536, json.dumps(meta)))
+        card_id = cur.lastrowid
+        contagem["cards"] += 1
+        # checklist com subtarefas
+        for j in range(rnd.randint(0, p["checklist"])):
+            cur.execute("INSERT INTO kanban_card_checklist (card_id, descricao, concluido, ordem) VALUES (?, ?, ?, ?)",
+                        (card_id, _texto(rnd, 4), rnd.random() < 0.4, j))
+            contagem["checklist"] += 1
+            if rnd.random() < 0.3:
+                cur.execute("INSERT INTO kanban_card_checklist (card_id, pai_id, descricao, ordem) VALUES (?, ?, ?, 0)",
+                            (card_id, cur.lastrowid, _texto(rnd, 3)))
+                contagem["checklist"] += 1
+        cur.executemany("INSERT OR IGNORE INTO kanban_card_tags (card_id, tag_id) VALUES (?, ?)",
+                        [(card_id, t) for t in rnd.sample(tag_ids, min(len(tag_ids), rnd.randint(0, p["tags_por_card"])))])
+        return card_id
+
+    def _anexos(card_id: int, pasta: str) -> None:
+        os.makedirs(pasta, exist_ok=True)
+        for k in range(rnd.randint(1, p["anexos"])):
+            ext, mime = rnd.choice(EXTENSOES)
+            nome = f"{card_id}_{k}{ext}"
+            caminho_arquivo = os.path.join(pasta, nome)
+            tamanho = rnd.randint(p["kb_anexo"] // 4, p["kb_anexo"]) * 1024
+            with open(caminho_arquivo, "wb") as f:
+                f.truncate(tamanho)        # esparso
+            cur.execute("INSERT INTO kanban_card_attachments (card_id, nome_arquivo, caminho_local, mime, tamanho) "
+                        "VALUES (?, ?, ?, ?, ?)", (card_id, nome, caminho_arquivo, mime, tamanho))
+            contagem["anexos"] += 1
+            contagem["bytes_anexos"] += tamanho
+
+    def _pasta(coluna_id: int, pai_id: Optional[int], ordem: int, nivel: int, caminho_pasta: str) -> Tuple[int, int]:
+        """Pasta com cards e sub-pastas; devolve (id, itens na sub-árvore)."""
+        pasta_id = _card(coluna_id, pai_id, "folder", ordem)
+        contagem["pastas"] += 1
+        pasta_fisica = os.path.join(caminho_pasta, f"{pasta_id}_pasta")
+        _anexos(pasta_id, pasta_fisica)
+        itens = 1
+        for k in range(p["filhos"]):
+            if nivel < p["profundidade"] and k < 2:
+                itens += _pasta(coluna_id, pasta_id, k, nivel + 1, pasta_fisica)[1]
+            else:
+                _card(coluna_id, pasta_id, "card", k)
+                itens += 1
+        return pasta_id, itens
+
+    for usuario_id in donos:
+        for q in range(p["quadros"]):
+            cur.execute("INSERT INTO quadros_kanban (usuario_id, nome) VALUES (?, ?)",
+                        (usuario_id, f"Quadro {q} — {_texto(rnd, 2)}"))
+            quadro_id = cur.lastrowid
+            for c in range(p["colunas"]):
+                cur.execute("INSERT INTO kanban_colunas (quadro_id, titulo, ordem) VALUES (?, ?, ?)",
+                            (quadro_id, COLUNAS[c % len(COLUNAS)], c))
+                coluna_id = cur.lastrowid
+                colunas_ids.append(coluna_id)
+                for k in range(p["cards"]):
+                    if k < p["pastas"]:
+                        pasta_id, itens = _pasta(coluna_id, None, k, 1, armazenamento)
+                        if itens > maior_pasta[0]:
+                            maior_pasta = (itens, pasta_id)
+                    else:
+                        _card(coluna_id, None, "card", k)
+        conn.commit()
+
+    # chat
+    sessoes: List[int] = []
+    for usuario_id in donos[:max(1, len(donos) // 4)]:
+        for _ in range(p["sessoes"]):
+            cur.execute("INSERT INTO chat_sessions (usuario) VALUES (?)", (usuario_id,))
+            sessao = cur.lastrowid
+            sessoes.append(sessao)
+            cur.executemany("INSERT INTO chat_mensagens (session_id, remetente, conteudo) VALUES (?, ?, ?)",
+                            ((sessao, "user" if m % 2 == 0 else "bot", _texto(rnd, rnd.randint(2, 20)))
+                             for m in range(p["mensagens"])))
+    conn.commit()
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
+    return {
+        "caminho": caminho,
+        "armazenamento": armazenamento,
+        "escala": escala,
+        "semente": semente,
+        "usuarios": len(usuarios),
+        "aviso_usuarios": None if usuarios else "bcrypt indisponível: nenhum usuário gerado",
+        "colunas": len(colunas_ids),
+        "colunas_ids": colunas_ids,
+        "pasta_raiz": maior_pasta[1],
+        "itens_pasta_raiz": maior_pasta[0],
+        "sessoes": sessoes,
+        "mensagens": len(sessoes) * p["mensagens"],
+        "emails": [f"usuario{i}@bench.local" for i in range(len(usuarios))],
+        "segundos": time.perf_counter() - inicio,
+        **contagem,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", required=True, help="arquivo do banco a criar (não pode existir)")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="media")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--armazenamento", help="pasta dos anexos (padrão: kanban_storage ao lado do banco)")
+    args = parser.parse_args()
+
+    resumo = gerar_banco(args.db, args.escala, args.semente, args.armazenamento)
+    for chave in ("usuarios", "colunas", "cards", "pastas", "checklist", "anexos", "mensagens"):
+        print(f"{chave:>10}: {resumo[chave]}")
+    print(f"{'anexos':>10}: {resumo['bytes_anexos'] / 1024 / 1024:.1f} MB (esparsos)")
+    if resumo["aviso_usuarios"]:
+        print(f"aviso: {resumo['aviso_usuarios']}")
+    print(f"gerado em {resumo['segundos']:.1f}s: {resumo['caminho']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# bench/suite.py
+"""
+Suíte de benchmarks dos controles do DevHive sobre um banco sintético.
+
+Gera um banco com bench/gerador.py (mesma escala e semente = mesmo banco) numa
+pasta temporária — o devhive.sqlite do projeto não é tocado — e mede:
+- listar_cards: cards de topo de uma coluna sorteada;
+- move_card: card sorteado para o topo de outra coluna (latência da chamada;
+  a gravação segue no escritor único e é drenada fora da medição);
+- get_card_tree / export_folder_as_zip: a maior pasta do banco;
+- processar_mensagem: texto comum e comando (/ajuda), com gravação no chat;
+- autenticar: login com bcrypt (precisa de bcrypt);
+- quadro_kanban: construção da QuadroKanbanWindow com Qt offscreen (precisa de PyQt5).
+
+Cada benchmark roda `--repeticoes` vezes (depois de um aquecimento) e grava
+mediana, p95, mínimo e máximo em ms. Dependência ausente não derruba a suíte:
+o resultado sai com status "indisponivel" e o motivo.
+
+Comparação: --comparar base.json compara a execução atual com uma anterior;
+`comparar a.json b.json` compara dois arquivos sem rodar nada. A mediana que
+piorar mais que --limiar (fração) é marcada como REGRESSÃO e o exit code é 1.
+
+Uso:
+    python -m bench.suite [--escala media] [--semente 42] [--repeticoes 30]
+                          [--so listar_cards move_card] [--saida resultados.json]
+                          [--comparar base.json] [--limiar 0.10]
+    python -m bench.suite comparar base.json resultados.json [--limiar 0.10]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from bench.gerador import ESCALAS, SENHA, gerar_banco
+
+
+class Indisponivel(Exception):
+    """O benchmark não roda neste ambiente (dependência ausente, banco sem dados)."""
+
+
+# ------------------ benchmarks ------------------
+# cada um recebe (resumo do gerador, rnd, pasta temporária) e devolve a função medida
+
+def _listar_cards(resumo, rnd, tmp):
+    from banco.controles.kanban.controle_card import ControleCardKanban
+    controle = ControleCardKanban()
+    return lambda: controle.listar_cards(coluna_id=rnd.choice(resumo["colunas_ids"]))
+
+
+def _move_card(resumo, rnd, tmp):
+    from banco.controles.kanban.controle_card import ControleCardKanban
+    from banco.database import conectar_leitura
+    controle = ControleCardKanban()
+    conn = conectar_leitura()
+    cards = [r[0] for r in conn.execute("SELECT id FROM kanban_cards WHERE pai_id IS NULL AND tipo = 'card'")]
+    conn.close()
+    if not cards:
+        raise Indisponivel("banco sem cards de topo")
+    return lambda: controle.move_card(rnd.choice(cards), rnd.choice(resumo["colunas_ids"]), nova_ordem=0)
+
+
+def _get_card_tree(resumo, rnd, tmp):
+    from banco.controles.kanban.controle_card import ControleCardKanban
+    controle = ControleCardKanban()
+    return lambda: controle.get_card_tree(resumo["pasta_raiz"])
+
+
+def _export_folder_as_zip(resumo, rnd, tmp):
+    from banco.controles.kanban.controle_card import ControleCardKanban
+    controle = ControleCardKanban()
+    destino = os.path.join(tmp, "export.zip")
+    return lambda: controle.export_folder_as_zip(resumo["pasta_raiz"], destino)
+
+
+def _processar_mensagem(resumo, rnd, tmp):
+    from banco.controles.chat_mestre.controle_chat import ChatController
+    textos = ["mensagem comum do benchmark", "/ajuda"]
+    return lambda: ChatController.processar_mensagem(rnd.choice(resumo["sessoes"]), rnd.choice(textos))
+
+
+def _autenticar(resumo, rnd, tmp):
+    try:
+        from banco.auth import autenticar
+    except ImportError as e:
+        raise Indisponivel(f"banco.auth: {e}")
+    if not resumo["emails"]:
+        raise Indisponivel(resumo["aviso_usuarios"] or "banco sem usuários")
+
+    def _login():
+        ok, dados = autenticar(rnd.choice(resumo["emails"]), SENHA)
+        if not ok:
+            raise RuntimeError(f"login falhou: {dados}")
+    return _login
+
+
+def _quadro_kanban(resumo, rnd, tmp):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from interface.objeto.quadro_kanban import QuadroKanbanWindow
+    except ImportError as e:
+        raise Indisponivel(f"PyQt5: {e}")
+    from banco.controles.kanban.controle_card import ControleCardKanban
+    from banco.controles.kanban.controle_coluna import ControleColunaKanban
+    from banco.database import conectar_leitura
+
+    app = QApplication.instance() or QApplication([])
+    conn = conectar_leitura()
+    quadros = [r[0] for r in conn.execute("SELECT id FROM quadros_kanban")]
+    conn.close()
+    controle_coluna, controle_card = ControleColunaKanban(), ControleCardKanban()
+
+    def _construir():
+        janela = QuadroKanbanWindow(quadro_id=rnd.choice(quadros), controle_coluna=controle_coluna,
+                                    controle_card=controle_card)
+        app.processEvents()
+        janela.deleteLater()
+        app.processEvents()
+    return _construir
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "listar_cards": _listar_cards,
+    "move_card": _move_card,
+    "get_card_tree": _get_card_tree,
+    "export_folder_as_zip": _export_folder_as_zip,
+    "processar_mensagem": _processar_mensagem,
+    "autenticar": _autenticar,
+    "quadro_kanban": _quadro_kanban,
+}
+
+
+def _drenar_escritas() -> None:
+    """Espera o escritor gravar o que ficou na fila (escritas sem espera)."""
+    from banco.database import escrever
+    escrever(lambda cur: None)
+
+
+def _medir(funcao: Callable[[], Any], repeticoes: int) -> Dict[str, Any]:
+    funcao()        # aquecimento (imports, caches, páginas do sqlite)
+    _drenar_escritas()
+    tempos: List[float] = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    _drenar_escritas()
+    tempos.sort()
+    return {
+        "status": "ok",
+        "repeticoes": repeticoes,
+        "mediana_ms": statistics.median(tempos),
+        "p95_ms": tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))],
+        "min_ms": tempos[0],
+        "max_ms": tempos[-1],
+    }
+
+
+def rodar(escala: str = "media", semente: int = 42, repeticoes: int = 30,
+          so: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Gera o banco sintético, roda os benchmarks e devolve {"meta": ..., "resultados": ...}."""
+    import banco.database as database
+    from banco.controles.kanban.controle_card import ControleCardKanban
+
+    nomes = so or list(BENCHMARKS)
+    resultados: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="devhive_suite_") as tmp:
+        resumo = gerar_banco(os.path.join(tmp, "devhive.sqlite"), escala, semente)
+        ControleCardKanban.IMPORT_BASE_DIR = resumo["armazenamento"]
+        database.CAMINHO_DB = resumo["caminho"]
+        print(f"banco {escala} (semente {semente}): {resumo['cards']} cards, {resumo['pastas']} pastas, "
+              f"{resumo['mensagens']} mensagens, gerado em {resumo['segundos']:.1f}s", file=sys.stderr)
+        for nome in nomes:
+            # mesma sequência de sorteios em toda execução, independente dos outros benchmarks
+            rnd = random.Random(f"{semente}:{nome}")
+            try:
+                resultados[nome] = _medir(BENCHMARKS[nome](resumo, rnd, tmp), repeticoes)
+            except Indisponivel as e:
+                resultados[nome] = {"status": "indisponivel", "motivo": str(e)}
+            print(f"  {nome}: {_formatar(resultados[nome])}", file=sys.stderr)
+        from banco.escritor import parar_escritores
+        parar_escritores()
+
+    meta = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "escala": escala,
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "banco": {k: resumo[k] for k in ("usuarios", "colunas", "cards", "pastas", "checklist",
+                                         "anexos", "mensagens", "itens_pasta_raiz")},
+    }
+    return {"meta": meta, "resultados": resultados}
+
+
+# ------------------ comparação ------------------
+def _formatar(resultado: Dict[str, Any]) -> str:
+    if resultado.get("status") != "ok":
+        return f"indisponível ({resultado.get('motivo', '?')})"
+    return f"mediana {resultado['mediana_ms']:.2f}ms, p95 {resultado['p95_ms']:.2f}ms"
+
+
+def comparar(base: Dict[str, Any], atual: Dict[str, Any], limiar: float = 0.10) -> List[str]:
+    """Imprime a tabela base x atual (medianas) e devolve os nomes que regrediram."""
+    for chave in ("escala", "semente"):
+        if base["meta"].get(chave) != atual["meta"].get(chave):
+            print(f"aviso: {chave} diferente ({base['meta'].get(chave)} x {atual['meta'].get(chave)}); "
+                  "bancos diferentes não são comparáveis")
+    regressoes: List[str] = []
+    print(f"{'benchmark':<22}{'base (ms)':>12}{'atual (ms)':>12}{'delta':>9}")
+    for nome in sorted(set(base["resultados"]) | set(atual["resultados"])):
+        a, b = base["resultados"].get(nome, {}), atual["resultados"].get(nome, {})
+        if a.get("status") != "ok" or b.get("status") != "ok":
+            print(f"{nome:<22}{_mediana(a):>12}{_mediana(b):>12}{'—':>9}")
+            continue
+        delta = (b["mediana_ms"] - a["mediana_ms"]) / a["mediana_ms"] if a["mediana_ms"] else 0.0
+        marca = ""
+        if delta > limiar:
+            marca = "  REGRESSÃO"
+            regressoes.append(nome)
+        elif delta < -limiar:
+            marca = "  melhora"
+        print(f"{nome:<22}{a['mediana_ms']:>12.2f}{b['mediana_ms']:>12.2f}{delta:>+9.1%}{marca}")
+    return regressoes
+
+
+def _mediana(resultado: Dict[str, Any]) -> str:
+    return f"{resultado['mediana_ms']:.2f}" if resultado.get("status") == "ok" else "—"
+
+
+def _carregar(caminho: str) -> Dict[str, Any]:
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "comparar":
+        parser = argparse.ArgumentParser(prog="python -m bench.suite comparar",
+                                         description="Compara dois resultados da suíte")
+        parser.add_argument("base")
+        parser.add_argument("atual")
+        parser.add_argument("--limiar", type=float, default=0.10, help="piora relativa da mediana (0.10 = 10%%)")
+        args = parser.parse_args(sys.argv[2:])
+        sys.exit(1 if comparar(_carregar(args.base), _carregar(args.atual), args.limiar) else 0)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="media")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--so", nargs="+", choices=list(BENCHMARKS), help="roda só estes benchmarks")
+    parser.add_argument("--saida", help="grava os resultados neste JSON")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--limiar", type=float, default=0.10, help="piora relativa da mediana (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    resultado = rodar(args.escala, args.semente, args.repeticoes, args.so)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"resultados em {args.saida}")
+    else:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    if args.comparar:
+        sys.exit(1 if comparar(_carregar(args.comparar), resultado, args.limiar) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,28 @@ import sqlite3
 from pathlib import Path
 from typing import List, Tuple
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
+    QComboBox,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QListWidget,
+    QPushButton,
     QSplitter,
     QTableWidget,
     QTableWidgetItem,
+    QTabWidget,
     QTreeWidget,
     QTreeWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
+from banco import rastreio
 from banco.database import CAMINHO_DB
+from interface.objeto.barramento_alteracoes import get_barramento_alteracoes
 
 
 class InfoBadge(QFrame):
@@ -41,14 +47,124 @@ class InfoBadge(QFrame):
         self.lbl_value.setText(value)
 
 
+class PainelConsultas(QWidget):
+    """Painel de desenvolvedor: comandos SQL mais caros do app (banco/rastreio.py)."""
+
+    INTERVALO_MS = 2000
+    ORDENS = [("Tempo total", "total_ms"), ("Chamadas", "chamadas"), ("p95", "p95_ms"),
+              ("Máximo", "max_ms"), ("Linhas", "linhas")]
+    COLUNAS = ["Consulta", "Chamadas", "Total (ms)", "Média (ms)", "p95 (ms)", "Máx (ms)", "Linhas", "Erros", "Local"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        barra = QHBoxLayout()
+        self.btn_ativo = QPushButton()
+        self.btn_ativo.setCheckable(True)
+        self.btn_ativo.setChecked(rastreio.rastreio_ativo())
+        self.btn_ativo.toggled.connect(self._alternar)
+        barra.addWidget(self.btn_ativo)
+
+        self.combo_ordem = QComboBox()
+        for titulo, _chave in self.ORDENS:
+            self.combo_ordem.addItem(f"Ordenar: {titulo}")
+        self.combo_ordem.currentIndexChanged.connect(self.atualizar)
+        barra.addWidget(self.combo_ordem)
+
+        btn_limpar = QPushButton("Limpar")
+        btn_limpar.clicked.connect(self._limpar)
+        barra.addWidget(btn_limpar)
+        barra.addStretch(1)
+        layout.addLayout(barra)
+
+        self.lbl_resumo = QLabel()
+        self.lbl_resumo.setWordWrap(True)
+        self.lbl_resumo.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.lbl_resumo)
+
+        self.tabela = QTableWidget(0, len(self.COLUNAS))
+        self.tabela.setHorizontalHeaderLabels(self.COLUNAS)
+        self.tabela.setAlternatingRowColors(True)
+        self.tabela.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabela.setSelectionBehavior(QTableWidget.SelectRows)
+        layout.addWidget(self.tabela, 3)
+
+        layout.addWidget(QLabel(f"Possíveis N+1 (mesmo comando {rastreio.LIMIAR_N_MAIS_1}+ vezes numa ação)"))
+        self.lista_n_mais_1 = QListWidget()
+        layout.addWidget(self.lista_n_mais_1, 1)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVALO_MS)
+        self._timer.timeout.connect(self.atualizar)
+        self._atualizar_botao()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.atualizar()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def _atualizar_botao(self):
+        ativo = self.btn_ativo.isChecked()
+        self.btn_ativo.setText("Rastreio ligado" if ativo else "Rastreio desligado")
+
+    def _alternar(self, ativo: bool):
+        rastreio.ativar_rastreio(ativo)
+        self._atualizar_botao()
+        self.atualizar()
+
+    def _limpar(self):
+        rastreio.obter_rastreador().limpar()
+        self.atualizar()
+
+    def atualizar(self):
+        rastreador = rastreio.obter_rastreador()
+        stats = rastreador.estatisticas()
+        self.lbl_resumo.setText(
+            f"{stats['execucoes']} execuções de {stats['comandos']} comandos, "
+            f"{stats['total_ms']:.1f} ms no total. "
+            f"{stats['lentas']} acima de {rastreador.limiar_lenta_ms:g} ms, em {rastreador.caminho_log}")
+
+        ordem = self.ORDENS[max(self.combo_ordem.currentIndex(), 0)][1]
+        linhas = rastreador.top(50, ordem)
+        self.tabela.setRowCount(len(linhas))
+        for i, r in enumerate(linhas):
+            valores = [r["sql"], str(r["chamadas"]), f"{r['total_ms']:.2f}", f"{r['media_ms']:.3f}",
+                       f"{r['p95_ms']:g}", f"{r['max_ms']:.2f}", str(r["linhas"]), str(r["erros"]),
+                       r["locais"][0] if r["locais"] else ""]
+            for j, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                if j == 0:
+                    item.setToolTip(r["sql"] + "\n\n" + "\n".join(r["locais"]))
+                elif j < len(valores) - 1:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tabela.setItem(i, j, item)
+        self.tabela.resizeColumnsToContents()
+        self.tabela.setColumnWidth(0, min(self.tabela.columnWidth(0), 420))
+
+        self.lista_n_mais_1.clear()
+        for s in rastreador.suspeitas_n_mais_1():
+            self.lista_n_mais_1.addItem(
+                f"{s['max_repeticoes']}x em '{s['acao']}' ({s['acoes']} ações) — {s['local']}: {s['sql']}")
+
+
 class MainWidget(QWidget):
     def __init__(self, dados_usuario=None):
         super().__init__()
         self.dados_usuario = dados_usuario or {}
         self.db_path = Path(CAMINHO_DB)
         self._build_ui()
+        self._preview_atual = None
         self._load_tree()
         self._refresh_metrics()
+        # contagens e amostra acompanham as escritas de todo o app (uma atualização por rajada)
+        get_barramento_alteracoes().assinar(None, self._on_alteracoes_banco, atraso_ms=1000, dono=self)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -82,11 +198,18 @@ class MainWidget(QWidget):
         self.tree.itemClicked.connect(self._on_tree_item_clicked)
         splitter.addWidget(self.tree)
 
+        self.tabs = QTabWidget()
+        splitter.addWidget(self.tabs)
+
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(0, 0, 0, 0)
         right_layout.setSpacing(8)
-        splitter.addWidget(right_panel)
+        self.tabs.addTab(right_panel, "Amostra")
+
+        # painel de desenvolvedor: consultas mais caras (rastreio de banco/rastreio.py)
+        self.painel_consultas = PainelConsultas()
+        self.tabs.addTab(self.painel_consultas, "Consultas")
 
         self.preview_title = QLabel("Selecione uma tabela para visualizar")
         self.preview_title.setFont(QFont("", 12, QFont.Bold))
@@ -157,13 +280,35 @@ class MainWidget(QWidget):
             child.setData(0, Qt.UserRole, table_name)
             tables_root.addChild(child)
 
+    def _on_alteracoes_banco(self, lote):
+        """Atualiza só a contagem das tabelas alteradas (e a amostra aberta, se for uma delas)."""
+        itens = {}
+        for i in range(self.tree.topLevelItemCount()):
+            db_item = self.tree.topLevelItem(i)
+            for j in range(db_item.childCount()):
+                tables_root = db_item.child(j)
+                for k in range(tables_root.childCount()):
+                    child = tables_root.child(k)
+                    itens[child.data(0, Qt.UserRole)] = child
+        if not lote or not lote.tabelas <= itens.keys():
+            # tabela nova (ou lote sem detalhes): monta a árvore de novo
+            self._load_tree()
+        else:
+            for table_name in lote.tabelas:
+                itens[table_name].setText(1, str(self._table_row_count(table_name)))
+        self._refresh_metrics()
+        if self._preview_atual and (not lote or self._preview_atual in lote.tabelas):
+            self._load_table_preview(self._preview_atual)
+
     def _on_tree_item_clicked(self, item: QTreeWidgetItem):
         table_name = item.data(0, Qt.UserRole)
         if not table_name:
             return
+        self.tabs.setCurrentIndex(0)
         self._load_table_preview(str(table_name))
 
     def _load_table_preview(self, table_name: str):
+        self._preview_atual = table_name
         self.preview_title.setText(f"Tabela: {table_name} (amostra de 50 linhas)")
         columns, rows = self._fetch_preview(table_name, limit=50)
 
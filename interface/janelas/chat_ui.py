@@ -2,55 +2,18 @@
 
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QLabel, QFrame,
+    QLineEdit, QPushButton, QLabel,
     QTabWidget, QListWidget,
-    QFormLayout, QDialog, QGroupBox
+    QFormLayout, QDialog, QGroupBox, QMessageBox
 )
-from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
 from banco.controles.chat_mestre.controle_chat import ChatController
 from banco.controles.chat_mestre.controle_comando import ComandoController
-
-
-# ======================================================
-# Bolha de Mensagem
-# ======================================================
-class ChatBubble(QFrame):
-    def __init__(self, texto: str, remetente="user"):
-        super().__init__()
-
-        self.setObjectName("chatBubble")
-        self.setProperty("sender", remetente)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(6, 6, 6, 6)
-
-        label = QLabel(texto)
-        label.setWordWrap(True)
-        label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        layout.addWidget(label)
-
-        if remetente == "user":
-            self.setStyleSheet(
-                """
-                QFrame#chatBubble[sender="user"] {
-                    background-color: rgba(70, 130, 255, 0.28);
-                    border-radius: 12px;
-                    padding: 8px;
-                }
-                """
-            )
-        else:
-            self.setStyleSheet(
-                """
-                QFrame#chatBubble[sender="bot"] {
-                    background-color: rgba(255, 255, 255, 0.06);
-                    border-radius: 12px;
-                    padding: 8px;
-                }
-                """
-            )
+from banco.controles.chat_mestre.pipeline_chat import FilaChatCheia
+from interface.objeto.barramento_alteracoes import get_barramento_alteracoes
+from interface.objeto.lista_mensagens_chat import ListaMensagensChat
+from interface.objeto.processador_chat import get_processador_chat
 
 
 # ======================================================
@@ -70,6 +33,20 @@ class MainWidget(QWidget):
         self.init_ui()
         self.carregar_historico()
 
+        # mensagens e comandos gravados por qualquer tela/conexão chegam pelo barramento
+        barramento = get_barramento_alteracoes()
+        self._assinatura_mensagens = barramento.assinar(
+            ["chat_mensagens"], self._on_mensagens_alteradas, dono=self)
+        self._assinatura_comandos = barramento.assinar(
+            ["chat_comandos"], lambda _lote: self.atualizar_lista_comandos(), dono=self)
+
+        # envio assíncrono: gravação e comandos rodam nas threads do pipeline
+        self.processador = get_processador_chat()
+        self.processador.mensagem_salva.connect(self.lista_mensagens.confirmar_envio)
+        self.processador.resposta_parcial.connect(self.lista_mensagens.atualizar_resposta)
+        self.processador.resposta_concluida.connect(self.lista_mensagens.concluir_resposta)
+        self.processador.pedido_falhou.connect(self.lista_mensagens.falhar_envio)
+
     # ======================================================
     # UI BASE
     # ======================================================
@@ -99,11 +76,9 @@ class MainWidget(QWidget):
     def init_chat_ui(self):
         layout = QVBoxLayout(self.chat_tab)
 
-        self.area_mensagens = QVBoxLayout()
-        container = QWidget()
-        container.setLayout(self.area_mensagens)
-
-        layout.addWidget(container, 1)
+        # histórico paginado/virtualizado (carrega páginas antigas ao rolar para o topo)
+        self.lista_mensagens = ListaMensagensChat(self.session_id)
+        layout.addWidget(self.lista_mensagens, 1)
 
         input_layout = QHBoxLayout()
 
@@ -119,53 +94,35 @@ class MainWidget(QWidget):
         layout.addLayout(input_layout)
 
     # ======================================================
-    # Lógica Chat (100% delegada ao controller)
+    # Lógica Chat (100% delegada ao pipeline/controller)
     # ======================================================
     def enviar_mensagem(self):
         texto = self.input_mensagem.text().strip()
         if not texto:
             return
 
+        try:
+            pedido = self.processador.enviar(self.session_id, texto, self.nome_usuario)
+        except FilaChatCheia as e:
+            QMessageBox.warning(self, "Chat", str(e))
+            return
+
         self.input_mensagem.clear()
 
-        # 🔥 AGORA O CONTROLLER FAZ TUDO:
-        resposta = ChatController.processar_mensagem(self.session_id, texto)
+        # aparece na hora; gravação e resposta chegam pelos sinais do processador
+        self.lista_mensagens.adicionar_envio(pedido)
 
-        # Atualiza interface após persistência
-        self.carregar_mensagens_recentes()
+    def _on_mensagens_alteradas(self, lote):
+        # lote vazio = barramento sem registro: recarrega
+        if not lote or self.session_id in lote.refs.get("chat_mensagens", ()):
+            self.carregar_mensagens_recentes()
 
     def carregar_mensagens_recentes(self):
-        # limpa layout atual
-        while self.area_mensagens.count():
-            item = self.area_mensagens.takeAt(0)
-            if item.layout():
-                while item.layout().count():
-                    sub = item.layout().takeAt(0)
-                    if sub.widget():
-                        sub.widget().deleteLater()
-
-        self.carregar_historico()
-
-    def adicionar_mensagem(self, texto, remetente):
-        bubble = ChatBubble(texto, remetente)
-
-        linha = QHBoxLayout()
-        if remetente == "user":
-            linha.addStretch()
-            linha.addWidget(bubble)
-        else:
-            linha.addWidget(bubble)
-            linha.addStretch()
-
-        self.area_mensagens.addLayout(linha)
+        # só as mensagens novas entram no fim da lista; as existentes não são recriadas
+        self.lista_mensagens.carregar_novas()
 
     def carregar_historico(self):
-        mensagens = ChatController.listar_mensagens(self.session_id)
-
-        for msg in mensagens:
-            # msg = (id, remetente, conteudo, criado_em)
-            _, remetente, conteudo, _ = msg
-            self.adicionar_mensagem(conteudo, remetente)
+        self.lista_mensagens.carregar_inicial()
 
     # ======================================================
     # GERENCIADOR DE COMANDOS
@@ -219,7 +176,7 @@ class MainWidget(QWidget):
 
             if nome:
                 ComandoController.criar_comando(nome, desc)
-                self.atualizar_lista_comandos()
+                self._assinatura_comandos.atualizar_agora()
                 dialog.accept()
 
         btn_salvar.clicked.connect(salvar)
@@ -104,6 +104,19 @@ def listar_usuarios() -> List[Dict[str, str]]:
     return base_listar_usuarios()  # type: ignore
 
 
+def espera_bloqueio(email: str) -> float:
+    """Segundos até o email poder tentar login de novo (limitador de banco.auth; 0 no fallback)."""
+    if USE_FALLBACK:
+        return 0.0
+    return _auth_mod.obter_limitador().espera((email or "").strip().lower())
+
+
+def mensagem_bloqueio(segundos: float) -> str:
+    if USE_FALLBACK:
+        return ""
+    return _auth_mod.mensagem_bloqueio(segundos)
+
+
 def buscar_usuario_por_email(email: str) -> Optional[Dict[str, str]]:
     return base_buscar_usuario_por_email(email)  # type: ignore
 
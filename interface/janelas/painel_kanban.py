@@ -8,6 +8,7 @@ from PyQt5.QtCore import Qt
 from banco.controles.kanban.controle_kanban import ControleKanban
 from banco.controles.kanban.controle_coluna import ControleColunaKanban
 from banco.controles.kanban.controle_card import ControleCardKanban
+from interface.objeto.barramento_alteracoes import get_barramento_alteracoes
 from interface.objeto.quadro_kanban import QuadroKanbanWindow
 
 class PainelKanban(QWidget):
@@ -57,6 +58,9 @@ class PainelKanban(QWidget):
         self.btn_novo_quadro.clicked.connect(self.acao_novo_quadro)
 
         self.carregar_quadros()
+        # quadros criados/renomeados/excluídos em qualquer lugar recarregam a grade
+        self._assinatura_quadros = get_barramento_alteracoes().assinar(
+            ["quadros_kanban"], lambda _lote: self.carregar_quadros(), dono=self)
 
     def limpar_grade(self):
         while self.grid_layout.count():
@@ -140,18 +144,18 @@ class PainelKanban(QWidget):
         nome = QuadroKanbanWindow.criar_novo_quadro(self)
         if nome:
             self.controle_kanban.criar_quadro(user_id=self.user_id, nome=nome)
-            self.carregar_quadros()
+            self._assinatura_quadros.atualizar_agora()
 
     def acao_editar_quadro(self, qid, nome_atual):
         novo_nome = QuadroKanbanWindow.editar_nome_quadro(self, nome_atual)
         if novo_nome:
             if self.controle_kanban.editar_quadro(qid, novo_nome):
-                self.carregar_quadros()
+                self._assinatura_quadros.atualizar_agora()
 
     def acao_excluir_quadro(self, qid, nome):
         if QuadroKanbanWindow.confirmar_exclusao(self, nome):
             if self.controle_kanban.deletar_quadro(qid):
-                self.carregar_quadros()
+                self._assinatura_quadros.atualizar_agora()
 
     def abrir_quadro_por_id(self, quadro_id, nome_quadro):
         """
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QMessageBox, QFrame, QApplication,
     QGraphicsDropShadowEffect, QGraphicsOpacityEffect, QSizePolicy,
-    QFileDialog
+    QFileDialog, QCheckBox
 )
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QSize, QRect
 from PyQt5.QtGui import QFont, QColor, QPixmap, QIcon, QPainter, QPen, QBrush, QPalette
@@ -18,15 +18,44 @@ from interface.theme_engine import build_login_qss, build_theme_tokens, load_act
 from interface.janelas.login_backend import (
     USE_FALLBACK,
     autenticar,
-    buscar_usuario_por_email,
     buscar_usuario_por_nome,
     criar_usuario,
+    espera_bloqueio,
     listar_usuarios,
+    mensagem_bloqueio,
     seed_demo_user_if_needed,
     validar_email,
     validar_nome,
     validar_senha,
 )
+from banco.sessoes import lembrar_login
+from interface.objeto.tarefas_io import GerenciadorTarefas, Tarefa
+
+
+# --- login/cadastro fora da thread da GUI (bcrypt leva centenas de ms) ---
+class TarefaAutenticacao(Tarefa):
+    """Roda funcao(*args) na thread de trabalho. Resultado: (sucesso, dados ou mensagem)."""
+
+    cancelavel = False
+
+    def __init__(self, titulo: str, funcao, *args):
+        super().__init__(titulo)
+        self.funcao = funcao
+        self.args = args
+
+    def executar(self):
+        return self.funcao(*self.args)
+
+
+_gerenciador_auth: Optional[GerenciadorTarefas] = None
+
+
+def get_gerenciador_auth() -> GerenciadorTarefas:
+    """Uma thread só para login/cadastro, fora do pool das tarefas de I/O do Kanban."""
+    global _gerenciador_auth
+    if _gerenciador_auth is None:
+        _gerenciador_auth = GerenciadorTarefas(max_threads=1, max_pendentes=1)
+    return _gerenciador_auth
 
 
 # --- CustomLineEdit: caret próprio e Enter handling ---
@@ -144,6 +173,7 @@ class TelaLogin(QWidget):
         self.modo_cadastro = False
         self._single_user: Optional[Dict[str, str]] = None
         self._selected_foto_path: Optional[str] = None
+        self._tarefa_auth: Optional[TarefaAutenticacao] = None
         self._theme_tokens = build_theme_tokens(load_active_theme_record())
 
         self.setWindowTitle("DevHive - Acesso")
@@ -271,6 +301,12 @@ class TelaLogin(QWidget):
 
         self.container_layout.addWidget(self.password_container)
 
+        # sessão lembrada (banco/sessoes.py): as próximas aberturas pulam o login
+        self.check_lembrar = QCheckBox("Lembrar de mim neste dispositivo", self.container)
+        self.check_lembrar.setObjectName("checkLembrar")
+        self.check_lembrar.setCursor(Qt.PointingHandCursor)
+        self.container_layout.addWidget(self.check_lembrar)
+
         # botões
         self.botao_principal = QPushButton("Entrar", self.container)
         self.botao_principal.setObjectName("botaoPrincipal")
@@ -496,6 +532,7 @@ class TelaLogin(QWidget):
         self.input_nome.setVisible(self.modo_cadastro)
         self.input_cargo.setVisible(self.modo_cadastro)
         self.foto_btn.setVisible(self.modo_cadastro)
+        self.check_lembrar.setVisible(not self.modo_cadastro)
         # mostrar thumb apenas se já tiver selecionado foto
         self.foto_thumb.setVisible(self.modo_cadastro and bool(self._selected_foto_path))
 
@@ -621,38 +658,101 @@ class TelaLogin(QWidget):
             else:
                 self.focusNextChild()
 
-    def _attempt_auth(self, identifier: str, senha: str) -> Tuple[bool, object]:
+    @staticmethod
+    def _attempt_auth(identifier: str, senha: str, lembrar: bool = False) -> Tuple[bool, object]:
+        """
+        Roda na thread de trabalho (TarefaAutenticacao): nada de widgets aqui.
+        Resolve nome -> email antes e confere a senha uma vez só (um bcrypt por tentativa).
+        Com `lembrar`, cria a sessão deste dispositivo (falha nela não impede o login).
+        """
         identifier = (identifier or "").strip()
         senha = (senha or "")
 
-        try:
-            sucesso, resultado = autenticar(identifier, senha)
-            if sucesso:
-                return True, resultado
-        except Exception:
-            pass
-
+        email = identifier
         if identifier and "@" not in identifier:
             user = buscar_usuario_por_nome(identifier)
             if user:
-                try:
-                    sucesso, resultado = autenticar(user.get('email'), senha)
-                    if sucesso:
-                        return True, resultado
-                except Exception:
-                    pass
+                email = user.get('email') or identifier
 
-        if identifier:
-            user = buscar_usuario_por_email(identifier)
-            if user:
-                try:
-                    sucesso, resultado = autenticar(user.get('email'), senha)
-                    if sucesso:
-                        return True, resultado
-                except Exception:
-                    pass
+        # bloqueado pelo limite de tentativas: avisa em vez da mensagem genérica
+        espera = espera_bloqueio(email)
+        if espera > 0:
+            return False, mensagem_bloqueio(espera)
+
+        try:
+            sucesso, resultado = autenticar(email, senha)
+        except Exception:
+            sucesso, resultado = False, None
+        if not sucesso:
+            return False, "Email/nome ou senha inválidos."
+
+        if lembrar and resultado.get('id'):
+            try:
+                resultado['sessao_id'] = lembrar_login(resultado['id'])
+            except Exception:
+                traceback.print_exc()
+        return True, resultado
+
+    @staticmethod
+    def _cadastrar(nome: str, email: str, senha: str, cargo: Optional[str],
+                   foto_origem: Optional[str]) -> Tuple[bool, str]:
+        """Roda na thread de trabalho: copia a foto e cria o usuário (bcrypt)."""
+        # se foto selecionada, copia para assets/user_photos com nome único
+        foto_to_store = None
+        if foto_origem:
+            try:
+                base_dir = os.path.dirname(os.path.dirname(__file__))
+                photos_dir = os.path.join(base_dir, "assets", "user_photos")
+                os.makedirs(photos_dir, exist_ok=True)
+                ext = os.path.splitext(foto_origem)[1].lower() or ".png"
+                new_name = f"{uuid.uuid4().hex}{ext}"
+                dest = os.path.join(photos_dir, new_name)
+                shutil.copy2(foto_origem, dest)
+                foto_to_store = dest
+            except Exception as e:
+                # não falhar o cadastro por problema na cópia da foto; apenas logar
+                print("Aviso: não foi possível copiar foto:", e)
+                foto_to_store = None
 
-        return False, "Email/nome ou senha inválidos."
+        try:
+            return criar_usuario(nome, email, senha, cargo, foto_to_store)
+        except Exception as e:
+            return False, f"Erro ao criar usuário: {e}"
+
+    def _executar_em_background(self, texto: str, funcao, ao_concluir, *args):
+        """Entrega funcao(*args) à thread de autenticação; a tela fica ocupada até a resposta."""
+        if self._tarefa_auth is not None:
+            return
+        tarefa = TarefaAutenticacao(texto, funcao, *args)
+        self._tarefa_auth = tarefa
+        self._definir_ocupado(True, texto)
+
+        def _concluida(resultado):
+            self._liberar_tarefa_auth()
+            ao_concluir(resultado)
+
+        def _falhou(erro):
+            self._liberar_tarefa_auth()
+            QMessageBox.warning(self, "Erro", erro)
+
+        tarefa.concluida.connect(_concluida)
+        tarefa.falhou.connect(_falhou)
+        get_gerenciador_auth().submeter(tarefa)
+
+    def _liberar_tarefa_auth(self):
+        self._tarefa_auth = None
+        self._definir_ocupado(False)
+
+    def _definir_ocupado(self, ocupado: bool, texto: Optional[str] = None):
+        for widget in (self.input_nome, self.input_email, self.input_cargo, self.input_senha,
+                       self.eye_btn, self.foto_btn, self.check_lembrar, self.botao_principal, self.botao_alternar):
+            widget.setEnabled(not ocupado)
+        if ocupado:
+            self.botao_principal.setText(texto or "Aguarde...")
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.botao_principal.setText("Cadastrar" if self.modo_cadastro else "Entrar")
+            self.unsetCursor()
 
     def _escolher_foto(self):
         # abre dialog e armazena caminho temporário
@@ -694,43 +794,8 @@ class TelaLogin(QWidget):
                 self.input_senha.setFocus()
                 return
 
-            # se foto selecionada, copia para assets/user_photos com nome único
-            foto_to_store = None
-            if self._selected_foto_path:
-                try:
-                    base_dir = os.path.dirname(os.path.dirname(__file__))
-                    photos_dir = os.path.join(base_dir, "assets", "user_photos")
-                    os.makedirs(photos_dir, exist_ok=True)
-                    ext = os.path.splitext(self._selected_foto_path)[1].lower() or ".png"
-                    new_name = f"{uuid.uuid4().hex}{ext}"
-                    dest = os.path.join(photos_dir, new_name)
-                    shutil.copy2(self._selected_foto_path, dest)
-                    foto_to_store = dest
-                except Exception as e:
-                    # não falhar o cadastro por problema na cópia da foto; apenas logar
-                    print("Aviso: não foi possível copiar foto:", e)
-                    foto_to_store = None
-
-            try:
-                sucesso, mensagem = criar_usuario(nome, email, senha, cargo, foto_to_store)
-            except Exception as e:
-                QMessageBox.warning(self, "Erro", f"Erro ao criar usuário: {e}")
-                return
-
-            if sucesso:
-                QMessageBox.information(self, "Sucesso", mensagem)
-                # limpa formulário / estado foto
-                self.input_nome.clear()
-                self.input_email.clear()
-                self.input_senha.clear()
-                self.input_cargo.clear()
-                self._selected_foto_path = None
-                self.foto_thumb.clear()
-                self.foto_thumb.hide()
-                self.alternar_modo()
-                QTimer.singleShot(50, self._check_single_user)
-            else:
-                QMessageBox.warning(self, "Erro", mensagem)
+            self._executar_em_background("Cadastrando...", self._cadastrar, self._on_cadastro_concluido,
+                                         nome, email, senha, cargo, self._selected_foto_path)
         else:
             if self._single_user and (not email_or_identifier):
                 email_or_identifier = self._single_user.get('email') or self._single_user.get('nome')
@@ -760,18 +825,41 @@ class TelaLogin(QWidget):
                     self.input_email.setFocus()
                     return
 
-            sucesso, resultado = self._attempt_auth(email_or_identifier, senha)
-            if sucesso:
-                try:
-                    QMessageBox.information(self, "Bem-vindo", f"Olá, {resultado.get('nome', 'Usuário')}!")
-                except Exception:
-                    QMessageBox.information(self, "Bem-vindo", "Login efetuado!")
-                try:
-                    self.ao_logar_callback(resultado)
-                except Exception:
-                    pass
-            else:
-                QMessageBox.warning(self, "Erro", resultado)
+            self._executar_em_background("Entrando...", self._attempt_auth, self._on_login_concluido,
+                                         email_or_identifier, senha, self.check_lembrar.isChecked())
+
+    def _on_cadastro_concluido(self, resultado):
+        sucesso, mensagem = resultado
+        if sucesso:
+            QMessageBox.information(self, "Sucesso", mensagem)
+            # limpa formulário / estado foto
+            self.input_nome.clear()
+            self.input_email.clear()
+            self.input_senha.clear()
+            self.input_cargo.clear()
+            self._selected_foto_path = None
+            self.foto_thumb.clear()
+            self.foto_thumb.hide()
+            self.alternar_modo()
+            QTimer.singleShot(50, self._check_single_user)
+        else:
+            QMessageBox.warning(self, "Erro", mensagem)
+
+    def _on_login_concluido(self, resultado):
+        sucesso, dados = resultado
+        if sucesso:
+            try:
+                QMessageBox.information(self, "Bem-vindo", f"Olá, {dados.get('nome', 'Usuário')}!")
+            except Exception:
+                QMessageBox.information(self, "Bem-vindo", "Login efetuado!")
+            try:
+                self.ao_logar_callback(dados)
+            except Exception:
+                pass
+        else:
+            QMessageBox.warning(self, "Erro", dados)
+            self.input_senha.setFocus()
+            self.input_senha.selectAll()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,241 @@
+# interface/objeto/barramento_alteracoes.py
+"""
+Barramento de alterações do banco para as telas.
+
+Os triggers de banco/modelos/db_model_alteracoes.py registram toda escrita em
+db_alteracoes, venha de onde vier (outra tela, tarefa em segundo plano, outro
+processo). O BarramentoAlteracoes da aplicação (get_barramento_alteracoes())
+lê esse registro na thread da GUI a cada INTERVALO_MS e entrega um
+LoteAlteracoes às assinaturas interessadas:
+
+- cada assinatura declara as tabelas que lhe importam e recebe só essa parte;
+- leituras seguidas são acumuladas e entregues uma vez depois de `atraso_ms`
+  sem novidades (debounce), com teto de ATRASO_MAX_FATOR x atraso_ms para uma
+  sequência longa de escritas não adiar a atualização para sempre;
+- assinaturas com `dono` (um widget) são canceladas quando o dono é destruído
+  e, se o dono está escondido, a entrega espera até ele aparecer: uma aba
+  fechada acumula as alterações e recarrega uma única vez ao ser mostrada.
+
+Depois de uma escrita feita pela própria tela, Assinatura.atualizar_agora()
+antecipa a leitura e a entrega em vez de esperar o próximo ciclo. As atualizações finas do quadro Kanban
+(banco/controles/kanban/eventos.py) continuam síncronas; o barramento cobre
+o que elas não veem (outras conexões e outras telas).
+
+A cada leitura o barramento informa até onde leu, e a cada INTERVALO_PODA
+pede ao escritor único a poda do registro (só o que todos os leitores já
+leram). Se mesmo assim faltar um trecho (barramento parado por mais que
+LEITOR_EXPIRA), todas as assinaturas recebem um lote vazio: "recarregue tudo".
+"""
+import sqlite3
+import time
+from typing import Callable, Iterable, List, Optional
+
+from PyQt5.QtCore import QEvent, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget
+
+from banco.database import escrever, usar_conexao
+from banco.modelos.db_model_alteracoes import (
+    LoteAlteracoes, alteracoes_perdidas, informar_posicao, ler_alteracoes, nome_leitor,
+    podar_alteracoes, ultimo_id_alteracao
+)
+
+OuvinteAlteracoes = Callable[[LoteAlteracoes], None]
+
+
+class Assinatura:
+    """Uma assinatura do barramento; guarda o lote pendente e o timer de debounce."""
+
+    def __init__(self, barramento: "BarramentoAlteracoes", tabelas: Optional[Iterable[str]],
+                 ouvinte: OuvinteAlteracoes, atraso_ms: int, dono: Optional[QObject]):
+        self.barramento = barramento
+        self.tabelas = frozenset(tabelas) if tabelas is not None else None
+        self.ouvinte = ouvinte
+        self.atraso_ms = atraso_ms
+        self.dono = dono
+        self.pendente: Optional[LoteAlteracoes] = None
+        self._recarregar = False
+        self._desde = 0.0
+        self._timer = QTimer(barramento)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.entregar)
+
+    def acumular(self, lote: LoteAlteracoes) -> None:
+        parte = lote.filtrar(self.tabelas) if self.tabelas is not None else lote
+        if not parte:
+            return
+        if self.pendente is None:
+            self.pendente = parte
+            self._desde = time.monotonic()
+        else:
+            self.pendente.mesclar(parte)
+        if self.atraso_ms <= 0:
+            self.entregar()
+            return
+        espera = (time.monotonic() - self._desde) * 1000
+        if espera < self.atraso_ms * BarramentoAlteracoes.ATRASO_MAX_FATOR or not self._timer.isActive():
+            self._timer.start(self.atraso_ms)
+
+    def recarregar_tudo(self) -> None:
+        """Parte do registro se perdeu: a próxima entrega é um lote vazio,
+        mesmo que outras alterações se acumulem até lá."""
+        self._recarregar = True
+        if self.pendente is None:
+            self.pendente = LoteAlteracoes()
+            self._desde = time.monotonic()
+        self._timer.start(max(self.atraso_ms, 0))
+
+    def entregar(self) -> None:
+        self._timer.stop()
+        if self.pendente is None:
+            return
+        if isinstance(self.dono, QWidget) and not self.dono.isVisible():
+            # entregue quando o dono aparecer (BarramentoAlteracoes.eventFilter)
+            return
+        lote, self.pendente = self.pendente, None
+        if self._recarregar:
+            self._recarregar = False
+            lote = LoteAlteracoes(ultimo_id=lote.ultimo_id)
+        try:
+            self.ouvinte(lote)
+        except Exception as e:
+            # um assinante com problema não impede os demais
+            print("Erro em assinante do barramento de alterações:", e)
+
+    def atualizar_agora(self) -> None:
+        """Depois de uma escrita da própria tela: lê o registro e entrega já,
+        sem esperar o ciclo nem o debounce (e sem uma segunda entrega depois).
+        Sem registro de alterações (barramento parado), entrega um lote vazio:
+        para o assinante isso significa "recarregue tudo"."""
+        self.barramento.verificar()
+        if not self.barramento.ativo and self.pendente is None:
+            self.pendente = LoteAlteracoes()
+        self.entregar()
+
+    def cancelar(self) -> None:
+        self._timer.stop()
+        self.pendente = None
+        self._recarregar = False
+        self.barramento.cancelar_assinatura(self)
+
+
+class BarramentoAlteracoes(QObject):
+    """Lê db_alteracoes periodicamente e distribui os lotes às assinaturas."""
+
+    INTERVALO_MS = 300
+    ATRASO_PADRAO_MS = 150
+    ATRASO_MAX_FATOR = 4
+    LIMITE_LEITURA = 5000
+    INTERVALO_PODA = 60.0      # segundos entre podas do registro
+
+    # lote bruto de cada leitura (antes do debounce), para diagnóstico
+    alteracoes = pyqtSignal(object)
+
+    def __init__(self, db_path=None, intervalo_ms: int = INTERVALO_MS, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self._assinaturas: List[Assinatura] = []
+        self._ultimo_id: Optional[int] = None
+        self._ultima_poda = time.monotonic()
+        self._leitor = nome_leitor("barramento")
+        self._timer = QTimer(self)
+        self._timer.setInterval(intervalo_ms)
+        self._timer.timeout.connect(self.verificar)
+
+    # -------------------------
+    # Ciclo de vida
+    # -------------------------
+    def iniciar(self) -> None:
+        if self._ultimo_id is None:
+            # só interessa o que acontecer daqui para frente
+            try:
+                with usar_conexao(self.db_path, somente_leitura=True) as conn:
+                    self._ultimo_id = ultimo_id_alteracao(conn)
+            except sqlite3.OperationalError as e:
+                print("Barramento de alterações indisponível (migração 7 aplicada?):", e)
+                return
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def parar(self) -> None:
+        self._timer.stop()
+
+    @property
+    def ativo(self) -> bool:
+        return self._timer.isActive()
+
+    # -------------------------
+    # Assinaturas
+    # -------------------------
+    def assinar(self, tabelas: Optional[Iterable[str]], ouvinte: OuvinteAlteracoes,
+                atraso_ms: int = ATRASO_PADRAO_MS, dono: Optional[QObject] = None) -> Assinatura:
+        """Chama `ouvinte(lote)` quando alguma das `tabelas` mudar (None = todas)."""
+        assinatura = Assinatura(self, tabelas, ouvinte, atraso_ms, dono)
+        self._assinaturas.append(assinatura)
+        if dono is not None:
+            dono.destroyed.connect(lambda *_: self.cancelar_assinatura(assinatura))
+            if isinstance(dono, QWidget):
+                dono.installEventFilter(self)
+        self.iniciar()
+        return assinatura
+
+    def cancelar_assinatura(self, assinatura: Assinatura) -> None:
+        try:
+            self._assinaturas.remove(assinatura)
+        except ValueError:
+            pass
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show:
+            for assinatura in list(self._assinaturas):
+                if assinatura.dono is obj and assinatura.pendente is not None:
+                    QTimer.singleShot(0, assinatura.entregar)
+        return False
+
+    # -------------------------
+    # Leitura
+    # -------------------------
+    def verificar(self) -> LoteAlteracoes:
+        """Lê as alterações novas e repassa às assinaturas. Retorna o lote lido."""
+        if self._ultimo_id is None:
+            self.iniciar()
+            if self._ultimo_id is None:
+                return LoteAlteracoes()
+        lote = LoteAlteracoes(ultimo_id=self._ultimo_id)
+        try:
+            with usar_conexao(self.db_path, somente_leitura=True) as conn:
+                perdidas = alteracoes_perdidas(conn, lote.ultimo_id)
+                if perdidas:
+                    lote = LoteAlteracoes(ultimo_id=ultimo_id_alteracao(conn))
+                while True:
+                    parte = ler_alteracoes(conn, lote.ultimo_id, self.LIMITE_LEITURA)
+                    if parte.ultimo_id == lote.ultimo_id:
+                        break
+                    lote.mesclar(parte)
+        except sqlite3.Error as e:
+            print("Erro ao ler alterações do banco:", e)
+            return LoteAlteracoes(ultimo_id=self._ultimo_id)
+        self._ultimo_id = lote.ultimo_id
+        informar_posicao(self._leitor, self._ultimo_id)
+        if time.monotonic() - self._ultima_poda > self.INTERVALO_PODA:
+            self._ultima_poda = time.monotonic()
+            # no escritor único; a GUI não espera a poda
+            escrever(podar_alteracoes, self.db_path, esperar=False)
+        if perdidas:
+            print("Registro de alterações podado além da última leitura; recarregando as telas.")
+            for assinatura in list(self._assinaturas):
+                assinatura.recarregar_tudo()
+        if lote:
+            self.alteracoes.emit(lote)
+            for assinatura in list(self._assinaturas):
+                assinatura.acumular(lote)
+        return lote
+
+
+_barramento: Optional[BarramentoAlteracoes] = None
+
+
+def get_barramento_alteracoes() -> BarramentoAlteracoes:
+    global _barramento
+    if _barramento is None:
+        _barramento = BarramentoAlteracoes()
+    return _barramento
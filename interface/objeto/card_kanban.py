@@ -6,8 +6,16 @@ from PyQt5.QtWidgets import (
     QCheckBox, QLineEdit
 )
 from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtGui import QDesktopServices, QPixmap
+from PyQt5.QtGui import QDesktopServices
 from banco.controles.kanban.controle_card import ControleCardKanban
+from interface.objeto.miniaturas import get_cache_miniaturas
+from interface.objeto.tarefas_io import (
+    FilaCheia,
+    exportar_pasta_em_background,
+    importar_arquivos_em_background,
+    importar_pasta_em_background,
+    remover_arquivos_em_background,
+)
 import json
 import os
 import traceback  # coloque no topo do arquivo (se já não existir)
@@ -22,7 +30,7 @@ class CardKanbanWidget(QFrame):
 
     IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
 
-    def __init__(self, card_id=None, titulo="Novo Card", coluna_id=None, parent_coluna=None):
+    def __init__(self, card_id=None, titulo="Novo Card", coluna_id=None, parent_coluna=None, dados=None):
         super().__init__(parent_coluna)
         self.setObjectName("kanbanCard")
         self.card_id = card_id
@@ -35,6 +43,8 @@ class CardKanbanWidget(QFrame):
         self.cor_etiqueta = None
         self.meta = {}
         self.pai_id = None
+        # último snapshot aplicado (a coluna compara antes de redesenhar)
+        self._dados = None
 
         # Layout e aparência
         self.setStyleSheet("""
@@ -87,7 +97,11 @@ class CardKanbanWidget(QFrame):
                 print("Erro ao criar card inicial:", e)
 
         if self.card_id:
-            self.load_card_data()
+            if dados is not None:
+                # dados pré-carregados (snapshot do quadro/coluna): sem queries por card
+                self.aplicar_snapshot(dados)
+            else:
+                self.load_card_data()
 
     # ------------------------
     # HEADER
@@ -178,6 +192,35 @@ class CardKanbanWidget(QFrame):
         card = self.controle_card.get_card(self.card_id)
         if not card:
             return
+        tags = self.controle_card.listar_tags_do_card(self.card_id)
+        checklist = self.controle_card.listar_checklist(self.card_id)
+        anexos = self.controle_card.listar_anexos(self.card_id)
+        folders = [c for c in self.controle_card.listar_cards(pai_id=self.card_id) if c.get('tipo') == 'folder']
+        self._dados = None
+        self._apply_card_data(card, tags, checklist, anexos, folders)
+
+    def aplicar_snapshot(self, dados):
+        """Aplica um card no formato do snapshot; não redesenha se nada mudou."""
+        if dados == self._dados:
+            return False
+        self._dados = dados
+        self._apply_card_data(dados, dados.get("tags", []), dados.get("checklist", []),
+                              dados.get("anexos", []), dados.get("pastas", []))
+        return True
+
+    def _na_coluna(self):
+        """True se este é o widget que a coluna mantém para o card (atualizado pelos eventos)."""
+        widgets = getattr(self.parent_coluna, '_card_widgets', None)
+        return bool(widgets) and widgets.get(self.card_id) is self
+
+    def _recarregar(self):
+        """Reflete uma escrita feita por este card. O widget da coluna já foi atualizado
+        pelo evento do controle; cópias em diálogos recarregam por conta própria."""
+        if not self._na_coluna():
+            self.load_card_data()
+
+    def _apply_card_data(self, card, tags, checklist, anexos, folders):
+        """Aplica dados do card (vindos do banco ou de um snapshot) aos widgets."""
         self.titulo = card.get("titulo", "Novo Card")
         self.label_titulo.setText(self.titulo)
         self.descricao = card.get("descricao", "")
@@ -187,11 +230,11 @@ class CardKanbanWidget(QFrame):
         self.meta = card.get("meta", {})
 
         # Atualiza tags e outros itens
-        self.atualizar_tags()
+        self._render_tags(tags)
         # Precarrega tasks/anexos/folders em atributos para uso posterior
-        self._cached_checklist = self.controle_card.listar_checklist(self.card_id)
-        self._cached_anexos = self.controle_card.listar_anexos(self.card_id)
-        self._cached_folders = [c for c in self.controle_card.listar_cards(pai_id=self.card_id) if c.get('tipo') == 'folder']
+        self._cached_checklist = checklist
+        self._cached_anexos = anexos
+        self._cached_folders = folders
 
         # Recria as seções visuais
         self._render_sections()
@@ -288,9 +331,7 @@ class CardKanbanWidget(QFrame):
                 caminho = a.get('caminho_local')
                 if caminho and self._is_image_path(caminho):
                     try:
-                        pm = QPixmap(caminho).scaledToWidth(80)
-                        pic = QLabel()
-                        pic.setPixmap(pm)
+                        pic = self._thumbnail_label(caminho, 80)
                         sec['layout'].addWidget(pic)
                     except Exception:
                         sec['layout'].addWidget(QLabel(name))
@@ -312,6 +353,12 @@ class CardKanbanWidget(QFrame):
         v.addLayout(h)
         return {'frame': frame, 'layout': v}
 
+    def _thumbnail_label(self, caminho, largura):
+        """QLabel com a miniatura do cache (placeholder até o decode em background terminar)."""
+        pic = QLabel()
+        pic.setPixmap(get_cache_miniaturas().request(caminho, largura, pic.setPixmap))
+        return pic
+
     def _is_image_path(self, path):
         if not path:
             return False
@@ -335,27 +382,38 @@ class CardKanbanWidget(QFrame):
             caminho, _ = QFileDialog.getOpenFileName(self, 'Selecionar arquivo')
             if caminho:
                 nome = os.path.basename(caminho)
-                try:
-                    tamanho = os.path.getsize(caminho)
-                except Exception:
-                    tamanho = None
-                # copia para import dir e adiciona
-                try:
-                    anexo_id = self.controle_card.import_file_to_folder(self.card_id, caminho)
-                    if anexo_id:
+
+                def _anexo_concluido(_ids):
+                    # o card pode ter sido fechado durante a cópia
+                    try:
+                        # a escrita foi feita pelo controle da tarefa: avisa quem usa este controle
+                        self.controle_card.notificar_alteracao(self.card_id)
                         QMessageBox.information(self, 'Anexo', f"Arquivo '{nome}' adicionado.")
-                except Exception as e:
+                        self._recarregar()
+                        if parent_dialog is not None and hasattr(self, 'dialog_items_layout'):
+                            self._render_dialog_sections()
+                    except RuntimeError:
+                        pass
+
+                def _anexo_falhou(erro):
+                    try:
+                        QMessageBox.warning(self, 'Erro', f'Falha ao adicionar anexo: {erro}')
+                    except RuntimeError:
+                        pass
+
+                # copia para o armazém em background; o painel de tarefas mostra o progresso
+                try:
+                    tarefa = importar_arquivos_em_background(self.controle_card, self.card_id, [caminho])
+                    tarefa.concluida.connect(_anexo_concluido)
+                    tarefa.falhou.connect(_anexo_falhou)
+                except FilaCheia as e:
                     QMessageBox.warning(self, 'Erro', f'Falha ao adicionar anexo: {e}')
         elif section_type == 'folder':
             titulo, ok = QInputDialog.getText(self, 'Nova Pasta', 'Nome da pasta:')
             if ok and titulo.strip():
-                created = self.controle_card.criar_card(coluna_id=self.coluna_id, titulo=titulo.strip(), pai_id=self.card_id, tipo='folder')
+                # CARD_CRIADO com pai_id = este card: a coluna atualiza o card pai
+                self.controle_card.criar_card(coluna_id=self.coluna_id, titulo=titulo.strip(), pai_id=self.card_id, tipo='folder')
                 QMessageBox.information(self, 'Pasta', 'Pasta criada.')
-                if self.parent_coluna and hasattr(self.parent_coluna, 'refresh_cards'):
-                    try:
-                        self.parent_coluna.refresh_cards()
-                    except Exception:
-                        pass
         elif section_type == 'tag':
             tag, ok = QInputDialog.getText(self, 'Nova Tag', 'Nome:')
             if ok and tag.strip():
@@ -367,7 +425,7 @@ class CardKanbanWidget(QFrame):
                 QMessageBox.information(self, 'Tag', 'Tag criada e associada.')
 
         # recarrega dados e UI
-        self.load_card_data()
+        self._recarregar()
         if parent_dialog is not None and hasattr(self, 'dialog_items_layout'):
             self._render_dialog_sections()
 
@@ -467,9 +525,7 @@ class CardKanbanWidget(QFrame):
                 caminho = a.get('caminho_local')
                 if caminho and self._is_image_path(caminho):
                     try:
-                        pm = QPixmap(caminho).scaledToWidth(120)
-                        pic = QLabel()
-                        pic.setPixmap(pm)
+                        pic = self._thumbnail_label(caminho, 120)
                         row_layout.addWidget(pic)
                     except Exception:
                         row_layout.addWidget(QLabel(a.get('nome_arquivo', 'arquivo')))
@@ -537,24 +593,50 @@ class CardKanbanWidget(QFrame):
             caminho, _ = QFileDialog.getOpenFileName(self, "Selecionar arquivo para importar")
             if not caminho:
                 return
+            def _arquivo_concluido(_ids):
+                try:
+                    self.controle_card.notificar_alteracao(folder_card_id)
+                    QMessageBox.information(self, "Importar", "Arquivo importado com sucesso.")
+                    self._populate_folder_container(folder_card_id)
+                except RuntimeError:
+                    pass
+
+            def _arquivo_falhou(erro):
+                try:
+                    QMessageBox.warning(self, "Erro", f"Falha ao importar arquivo: {erro}")
+                except RuntimeError:
+                    pass
+
             try:
-                self.controle_card.import_file_to_folder(folder_card_id, caminho)
-                QMessageBox.information(self, "Importar", "Arquivo importado com sucesso.")
-                self._populate_folder_container(folder_card_id)
-            except Exception as e:
+                tarefa = importar_arquivos_em_background(self.controle_card, folder_card_id, [caminho])
+                tarefa.concluida.connect(_arquivo_concluido)
+                tarefa.falhou.connect(_arquivo_falhou)
+            except FilaCheia as e:
                 QMessageBox.warning(self, "Erro", f"Falha ao importar arquivo: {e}")
         else:
             # importar pasta (ZIP)
             caminho, _ = QFileDialog.getOpenFileName(self, "Selecionar ZIP de pasta", filter="ZIP Files (*.zip)")
             if not caminho:
                 return
-            try:
-                ok = self.controle_card.import_folder_from_zip(folder_card_id, caminho)
-                if ok:
+            def _pasta_concluida(_resultado):
+                try:
+                    self.controle_card.notificar_alteracao(folder_card_id)
                     QMessageBox.information(self, "Importar", "Pasta importada com sucesso.")
                     self._populate_folder_container(folder_card_id)
-                else:
-                    QMessageBox.warning(self, "Importar", "Não foi possível importar a pasta.")
+                except RuntimeError:
+                    # card fechado durante a importação
+                    pass
+
+            def _pasta_falhou(erro):
+                try:
+                    QMessageBox.warning(self, "Erro", f"Falha ao importar pasta: {erro}")
+                except RuntimeError:
+                    pass
+
+            try:
+                tarefa = importar_pasta_em_background(self.controle_card, folder_card_id, caminho, self.window())
+                tarefa.concluida.connect(_pasta_concluida)
+                tarefa.falhou.connect(_pasta_falhou)
             except Exception as e:
                 QMessageBox.warning(self, "Erro", f"Falha ao importar pasta: {e}")
 
@@ -564,12 +646,25 @@ class CardKanbanWidget(QFrame):
             return
         if not path.lower().endswith(".zip"):
             path = path + ".zip"
+        janela = self.window()
+
+        # o card pode ter sido fechado durante a exportação; a janela principal continua
+        def _exportacao_concluida(_zip_path):
+            try:
+                QMessageBox.information(janela, "Exportar", "Pasta exportada com sucesso.")
+            except RuntimeError:
+                pass
+
+        def _exportacao_falhou(erro):
+            try:
+                QMessageBox.warning(janela, "Exportar", f"Erro ao exportar pasta: {erro}")
+            except RuntimeError:
+                pass
+
         try:
-            ok = self.controle_card.export_folder_as_zip(folder_card_id, path)
-            if ok:
-                QMessageBox.information(self, "Exportar", "Pasta exportada com sucesso.")
-            else:
-                QMessageBox.warning(self, "Exportar", "Erro ao exportar pasta.")
+            tarefa = exportar_pasta_em_background(self.controle_card, folder_card_id, path)
+            tarefa.concluida.connect(_exportacao_concluida)
+            tarefa.falhou.connect(_exportacao_falhou)
         except Exception as e:
             QMessageBox.warning(self, "Erro", f"Erro exportando: {e}")
 
@@ -582,7 +677,7 @@ class CardKanbanWidget(QFrame):
         except Exception as e:
             print('Erro deletando anexo:', e)
         self._populate_folder_container(folder_id)
-        self.load_card_data()
+        self._recarregar()
 
     # ---------- Atualiza _delete_folder_and_refresh para usar rotina ----------
     def _delete_folder_and_refresh(self, folder_id, parent_folder_id):
@@ -590,7 +685,7 @@ class CardKanbanWidget(QFrame):
         if resp != QMessageBox.Yes:
             return
         try:
-            self._delete_recursive(folder_id)
+            self._purge_card(folder_id)
         except Exception as e:
             print('Erro deletando pasta:', e)
             QMessageBox.warning(self, "Erro", f"Erro deletando pasta: {e}")
@@ -601,14 +696,9 @@ class CardKanbanWidget(QFrame):
         except Exception:
             traceback.print_exc()
         try:
-            self.load_card_data()
+            self._recarregar()
         except Exception:
             traceback.print_exc()
-        if self.parent_coluna and hasattr(self.parent_coluna, 'refresh_cards'):
-            try:
-                self.parent_coluna.refresh_cards()
-            except Exception:
-                traceback.print_exc()
 
     # ------------------------
     # Checklist rendering helpers (recursivo)
@@ -659,7 +749,7 @@ class CardKanbanWidget(QFrame):
         except Exception as e:
             print('Erro atualizando checklist:', e)
         self._render_dialog_sections()
-        self.load_card_data()
+        self._recarregar()
 
     def _add_subtask_dialog(self, checklist_id):
         text, ok = QInputDialog.getText(self, 'Nova Subtarefa', 'Descrição:')
@@ -670,7 +760,7 @@ class CardKanbanWidget(QFrame):
         except Exception as e:
             print("Erro ao adicionar subtarefa:", e)
         self._render_dialog_sections()
-        self.load_card_data()
+        self._recarregar()
 
     def _rename_checklist_item(self, checklist_id, current_text=''):
         novo, ok = QInputDialog.getText(self, 'Renomear tarefa', 'Nova descrição:', text=current_text)
@@ -680,7 +770,7 @@ class CardKanbanWidget(QFrame):
             except Exception as e:
                 print("Erro renomeando checklist:", e)
         self._render_dialog_sections()
-        self.load_card_data()
+        self._recarregar()
 
     def _delete_checklist_item(self, checklist_id):
         resp = QMessageBox.question(self, 'Remover tarefa', 'Remover tarefa e todas subtarefas?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
@@ -691,7 +781,7 @@ class CardKanbanWidget(QFrame):
         except Exception as e:
             print('Erro removendo checklist:', e)
         self._render_dialog_sections()
-        self.load_card_data()
+        self._recarregar()
 
     # ------------------------
     # Ações de anexo / pasta (restantes já movidas acima)
@@ -767,14 +857,8 @@ class CardKanbanWidget(QFrame):
         except Exception as e:
             print("[DEBUG] erro removendo widget da UI:", e)
 
-        if self.parent_coluna and hasattr(self.parent_coluna, "refresh_cards"):
-            try:
-                self.parent_coluna.refresh_cards()
-                print("[DEBUG] parent_coluna.refresh_cards() chamado")
-            except Exception as e:
-                print("[DEBUG] erro chamando refresh_cards():", e)
-        else:
-            print("[DEBUG] parent_coluna ausente ou sem refresh_cards()")
+        if self.parent_coluna and hasattr(self.parent_coluna, "remove_card_widget"):
+            self.parent_coluna.remove_card_widget(self)
 
     # ------------------------
     # TOOLBAR ACTIONS (CARD WIDGET)
@@ -789,7 +873,6 @@ class CardKanbanWidget(QFrame):
                 self.controle_card.adicionar_tag_ao_card(self.card_id, tag_id)
             except Exception:
                 pass
-            self.atualizar_tags()
             QMessageBox.information(self, "Tag", f"Tag '{tag}' adicionada ao card.")
             self.refresh()
 
@@ -797,14 +880,20 @@ class CardKanbanWidget(QFrame):
     # HELPERS
     # ------------------------
     def atualizar_tags(self):
+        if not self.card_id or not self.controle_card:
+            self._render_tags([])
+            return
+        self._render_tags(self.controle_card.listar_tags_do_card(self.card_id))
+
+    def _render_tags(self, tags):
         # limpa a tags_container e re-popula (tags ficam acima do cartão)
         for i in reversed(range(self.tags_container.count())):
-            w = self.tags_container.itemAt(i).widget()
+            item = self.tags_container.itemAt(i)
+            w = item.widget()
             if w:
                 w.setParent(None)
-        if not self.card_id or not self.controle_card:
-            return
-        tags = self.controle_card.listar_tags_do_card(self.card_id)
+            else:
+                self.tags_container.removeItem(item)
         for t in tags:
             lbl = QLabel(t['nome'])
             lbl.setObjectName('tagLabel')
@@ -812,18 +901,9 @@ class CardKanbanWidget(QFrame):
         self.tags_container.addStretch()
 
     def refresh(self):
-        """Recarrega dados do card e atualiza a representação visual."""
-        self.load_card_data()
-        # atualiza rótulos visuais
-        self.label_titulo.setText(self.titulo)
-        self.label_descricao.setText(self.descricao or "(sem descrição)")
-        self.atualizar_tags()
-        # avisa a coluna pai (se suportar)
-        if self.parent_coluna and hasattr(self.parent_coluna, "refresh_cards"):
-            try:
-                self.parent_coluna.refresh_cards()
-            except Exception:
-                pass
+        """Atualiza a representação visual após uma escrita neste card.
+        A coluna é avisada pelo evento do controle e repinta só este card."""
+        self._recarregar()
     # ------------------------
     # ABRIR SUBPASTA (NAVEGAÇÃO INTERNA)
     # ------------------------
@@ -878,7 +958,7 @@ class CardKanbanWidget(QFrame):
             return
 
         try:
-            self._delete_recursive(self.card_id)
+            self._purge_card(self.card_id)
         except Exception as e:
             QMessageBox.warning(self, "Erro", f"Falha ao excluir: {e}")
             traceback.print_exc()
@@ -904,94 +984,23 @@ class CardKanbanWidget(QFrame):
         except Exception:
             traceback.print_exc()
 
-        # atualizar views relacionadas
-        try:
-            if self.parent_coluna and hasattr(self.parent_coluna, "refresh_cards"):
-                self.parent_coluna.refresh_cards()
-        except Exception:
-            traceback.print_exc()
-
         # se estiver num dialog (view_card), força reload do dialog principal caso necessário
         try:
             self.load_card_data()
         except Exception:
             pass
     
-    # ---------- Deleção recursiva robusta ----------
-    def _delete_recursive(self, card_id):
+    # ---------- Exclusão da sub-árvore ----------
+    def _purge_card(self, card_id):
         """
-        Remove recursivamente card + filhos + checklist + anexos (arquivo físico + registro) + tags.
-        No final tenta excluir fisicamente (hard=True). Se falhar, faz soft-delete.
+        Remove card + filhos + checklist + anexos + tags em uma única transação
+        (ControleCardKanban.purge_subtree) e apaga os arquivos físicos dos anexos
+        em background (progresso no painel de tarefas da janela principal).
         """
         if not card_id:
             return
-
-        try:
-            # 1) filhos (cards cuja pai_id == card_id)
-            filhos = self.controle_card.listar_cards(coluna_id=self.coluna_id, pai_id=card_id)
-        except Exception:
-            filhos = []
-
-        for f in filhos:
-            try:
-                self._delete_recursive(f["id"])
-            except Exception:
-                # garanta que erro em um filho não pare o processo todo
-                traceback.print_exc()
-
-        # 2) checklist do card (apagar subtarefas via API existente)
-        try:
-            items = self.controle_card.listar_checklist(card_id)
-            for it in items:
-                try:
-                    self.controle_card.deletar_checklist(it['id'])
-                except Exception:
-                    traceback.print_exc()
-        except Exception:
-            traceback.print_exc()
-
-        # 3) anexos: remover arquivo físico (se existir) e registro DB
-        try:
-            anexos = self.controle_card.listar_anexos(card_id)
-            for a in anexos:
-                try:
-                    caminho = a.get('caminho_local')
-                    if caminho and os.path.isfile(caminho):
-                        try:
-                            os.remove(caminho)
-                        except Exception:
-                            # não fatal — ainda tentamos remover registro
-                            traceback.print_exc()
-                    # remover registro do anexo
-                    try:
-                        self.controle_card.deletar_anexo(a['id'])
-                    except Exception:
-                        traceback.print_exc()
-                except Exception:
-                    traceback.print_exc()
-        except Exception:
-            traceback.print_exc()
-
-        # 4) tags / associações
-        try:
-            tags = self.controle_card.listar_tags_do_card(card_id)
-            for t in tags:
-                try:
-                    self.controle_card.remover_tag_do_card(card_id, t['id'])
-                except Exception:
-                    traceback.print_exc()
-        except Exception:
-            # se listar_tags falhar, não interrompe
-            traceback.print_exc()
-
-        # 5) deletar o próprio card (hard delete preferível)
-        try:
-            self.controle_card.deletar_card(card_id, hard=True)
-        except Exception:
-            # fallback: marcar arquivado caso hard delete falhe
-            try:
-                self.controle_card.deletar_card(card_id, hard=False)
-            except Exception:
-                traceback.print_exc()
+        arquivos = self.controle_card.purge_subtree(card_id)
+        # entra mesmo com a fila cheia: os registros já saíram do banco
+        remover_arquivos_em_background(arquivos)
 
 # fim do arquivo
@@ -1,4 +1,6 @@
 # interface/objeto/coluna_kanban.py
+import bisect
+
 from PyQt5.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea, QWidget, QSizePolicy, QInputDialog, QMessageBox
@@ -6,7 +8,11 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from banco.controles.kanban.controle_card import ControleCardKanban
 from banco.controles.kanban.controle_coluna import ControleColunaKanban
+from banco.controles.kanban.eventos import (
+    CARD_ATUALIZADO, CARD_CRIADO, CARD_MOVIDO, CARD_REMOVIDO, CARDS_ALTERADOS, CHECKLIST_ALTERADO
+)
 from interface.objeto.card_kanban import CardKanbanWidget
+from interface.objeto.lista_cards_virtual import ListaCardsVirtual
 
 
 class ColunaKanbanWidget(QFrame):
@@ -19,15 +25,31 @@ class ColunaKanbanWidget(QFrame):
     - compact: se True renderiza versão compacta (para o quadro principal)
     - controle_card: instância de ControleCardKanban (opcional)
     - controle_coluna: instância de ControleColunaKanban (opcional)
+    - cards: cards já carregados (formato de ControleCardKanban.load_board_snapshot);
+      se informado, a coluna não consulta o banco na construção
+    - virtual: True força a lista virtualizada (QListView + delegate), False força
+      um CardKanbanWidget por card; None escolhe pelo tamanho da coluna
+
+    A coluna assina os eventos do controle_card (banco/controles/kanban/eventos.py)
+    e atualiza só o card afetado; load_cards() reconcilia pelo id do card,
+    reaproveitando os widgets que já existem.
     """
 
+    # acima deste número de cards a coluna usa a lista virtualizada
+    VIRTUAL_THRESHOLD = 150
+
     def __init__(self, coluna_id=None, titulo="Nova Coluna", parent=None, compact=True,
-                 controle_card=None, controle_coluna=None):
+                 controle_card=None, controle_coluna=None, cards=None, virtual=None):
         super().__init__(parent)
         self.setObjectName("kanbanColumn")
         self.coluna_id = coluna_id
         self.titulo = titulo
         self.compact = compact
+        self.virtual = virtual
+        self.cards_view = None
+        # estado exibido: snapshots na ordem da coluna + widget de cada card (modo não virtual)
+        self._cards = []
+        self._card_widgets = {}
 
         # injeção de dependência: preferir o controle passado
         self.controle_card = controle_card if controle_card is not None else ControleCardKanban()
@@ -127,15 +149,22 @@ class ColunaKanbanWidget(QFrame):
         self.cards_scroll.setWidget(self.cards_container)
         self.main_layout.addWidget(self.cards_scroll)
 
-        # placeholder quando não há cards
+        # placeholder quando não há cards (fica sempre no fim do layout)
         self._empty_label = QLabel('(Nenhum card)')
+        self.cards_layout.addWidget(self._empty_label)
 
         # carregar cards iniciais (tenta, não falha se der exceção)
         try:
-            self.load_cards()
+            self.load_cards(cards)
         except Exception as e:
             print("ColunaKanbanWidget.load_cards erro:", e)
 
+        # atualizações pontuais vindas do controle
+        if self.controle_card is not None and hasattr(self.controle_card, "eventos"):
+            eventos = self.controle_card.eventos
+            eventos.assinar(self._on_evento_kanban)
+            self.destroyed.connect(lambda *_: eventos.cancelar_assinatura(self._on_evento_kanban))
+
     # ---------------------------------
     # UI e interações
     # ---------------------------------
@@ -152,47 +181,214 @@ class ColunaKanbanWidget(QFrame):
         if not ok or not titulo.strip():
             return
         try:
-            created = self.controle_card.criar_card(coluna_id=self.coluna_id, titulo=titulo.strip())
+            # o evento CARD_CRIADO insere o widget (ver _on_evento_kanban)
+            self.controle_card.criar_card(coluna_id=self.coluna_id, titulo=titulo.strip())
             QMessageBox.information(self, 'Card', 'Card criado.')
-            self.load_cards()
-            # notifica parent (quadro) para reordenar se necessário
-            parent = self.parent()
-            if parent and hasattr(parent, 'refresh'):
-                try:
-                    parent.refresh()
-                except Exception:
-                    pass
         except Exception as e:
             QMessageBox.warning(self, 'Erro', f'Não foi possível criar card: {e}')
 
     def clear_cards_ui(self):
-        for i in reversed(range(self.cards_layout.count())):
-            w = self.cards_layout.itemAt(i).widget()
-            if w:
-                w.setParent(None)
-
-    def load_cards(self):
-        self.clear_cards_ui()
-        cards = []
-        try:
-            if self.controle_card and self.coluna_id is not None:
-                cards = self.controle_card.listar_cards(coluna_id=self.coluna_id, pai_id=None)
-        except Exception as e:
-            print('Erro ao listar cards na coluna:', e)
+        for w in self._card_widgets.values():
+            self.cards_layout.removeWidget(w)
+            w.setParent(None)
+            w.deleteLater()
+        self._card_widgets = {}
+
+    def load_cards(self, cards=None):
+        """Mostra os cards da coluna. Sem `cards`, busca o snapshot da coluna
+        (tags/checklist/anexos/pastas em lote) em vez de uma query por card.
+
+        Reconcilia pelo id: cards que já têm widget são reaproveitados (e só
+        redesenhados se o snapshot mudou), novos são criados e os que sumiram
+        são removidos."""
+        if cards is None:
             cards = []
+            try:
+                if self.controle_card and self.coluna_id is not None:
+                    cards = self.controle_card.load_column_snapshot(self.coluna_id)
+            except Exception as e:
+                print('Erro ao listar cards na coluna:', e)
+                cards = []
+        self._cards = list(cards)
 
-        if not cards:
-            self.cards_layout.addWidget(self._empty_label)
+        if self._use_virtual(self._cards):
+            self.clear_cards_ui()
+            self._show_virtual_cards(self._cards)
             return
-
-        for c in cards:
+        self._hide_virtual_cards()
+        self._reconciliar_widgets()
+
+    def _criar_card_widget(self, card):
+        card_widget = CardKanbanWidget(card_id=card.get('id'), titulo=card.get('titulo'),
+                                       coluna_id=self.coluna_id, parent_coluna=self,
+                                       dados=card)
+        card_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
+        return card_widget
+
+    def _reconciliar_widgets(self):
+        antigos = self._card_widgets
+        self._card_widgets = {}
+        for pos, card in enumerate(self._cards):
+            widget = antigos.pop(card.get('id'), None)
             try:
-                card_widget = CardKanbanWidget(card_id=c.get('id'), titulo=c.get('titulo'),
-                                               coluna_id=self.coluna_id, parent_coluna=self)
-                card_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
-                self.cards_layout.addWidget(card_widget)
+                if widget is None:
+                    widget = self._criar_card_widget(card)
+                else:
+                    widget.aplicar_snapshot(card)
             except Exception as e:
                 print('Erro criando CardKanbanWidget:', e)
+                continue
+            self._card_widgets[card.get('id')] = widget
+            atual = self.cards_layout.indexOf(widget)
+            if atual != pos:
+                if atual >= 0:
+                    self.cards_layout.removeWidget(widget)
+                self.cards_layout.insertWidget(pos, widget)
+        for widget in antigos.values():
+            self.cards_layout.removeWidget(widget)
+            widget.setParent(None)
+            widget.deleteLater()
+        self._empty_label.setVisible(not self._cards)
+
+    # ---------------------------------
+    # atualização incremental (eventos do controle)
+    # ---------------------------------
+    @staticmethod
+    def _chave_ordem(card):
+        # mesma ordem do snapshot: ORDER BY ordem, criado_em
+        return (card.get('ordem') or 0, card.get('criado_em') or '')
+
+    def _indice_card(self, card_id):
+        for i, c in enumerate(self._cards):
+            if c.get('id') == card_id:
+                return i
+        return -1
+
+    def _on_evento_kanban(self, evento):
+        if evento.tipo == CARDS_ALTERADOS:
+            self.load_cards()
+            return
+        nesta_coluna = evento.coluna_id == self.coluna_id and evento.pai_id is None
+        veio_desta_coluna = (evento.tipo == CARD_MOVIDO and evento.coluna_origem == self.coluna_id
+                             and evento.pai_origem is None)
+
+        if evento.tipo == CARD_REMOVIDO or (veio_desta_coluna and not nesta_coluna):
+            self._remover_card(evento.card_id)
+        elif nesta_coluna and evento.tipo in (CARD_CRIADO, CARD_MOVIDO, CARD_ATUALIZADO, CHECKLIST_ALTERADO):
+            self._atualizar_card(evento.card_id)
+
+        # sub-pastas aparecem no card pai (snapshot.pastas): atualiza o pai se ele está aqui
+        for pai in (evento.pai_id, evento.pai_origem):
+            if pai is not None and self._indice_card(pai) >= 0:
+                self._atualizar_card(pai)
+
+    def sincronizar_cards(self, snapshots):
+        """Aplica cards já carregados ({card_id: snapshot ou None se removido}),
+        vindos do barramento de alterações (QuadroKanbanWindow._on_alteracoes_banco).
+        Cards que não são desta coluna e não estão nela são ignorados."""
+        for card_id, card in snapshots.items():
+            if card is None:
+                self._remover_card(card_id)
+            elif self._pertence(card) or self._indice_card(card_id) >= 0:
+                self._atualizar_card(card_id, card)
+
+    def _pertence(self, card):
+        return card.get('coluna_id') == self.coluna_id and card.get('pai_id') is None
+
+    def _atualizar_card(self, card_id, card=None):
+        """Recarrega um card (1 snapshot, se `card` não vier pronto) e ajusta só o widget/linha dele."""
+        if card is None:
+            card = self.controle_card.load_card_snapshot(card_id)
+        if card is None or not self._pertence(card):
+            self._remover_card(card_id)
+            return
+        idx = self._indice_card(card_id)
+        if idx >= 0:
+            if self._cards[idx] == card:
+                return
+            if self._chave_ordem(self._cards[idx]) == self._chave_ordem(card):
+                self._cards[idx] = card
+                self._patch_card(idx, card)
+                return
+            # posição mudou: tira e reinsere no lugar certo
+            del self._cards[idx]
+            self._remover_da_view(idx, card_id, manter_widget=True)
+        chaves = [self._chave_ordem(c) for c in self._cards]
+        pos = bisect.bisect_right(chaves, self._chave_ordem(card))
+        self._cards.insert(pos, card)
+        self._inserir_na_view(pos, card)
+
+    def _remover_card(self, card_id):
+        idx = self._indice_card(card_id)
+        if idx < 0:
+            return
+        del self._cards[idx]
+        self._remover_da_view(idx, card_id)
+
+    def _modo_virtual_ativo(self):
+        return self.cards_view is not None and not self.cards_view.isHidden()
+
+    def _patch_card(self, idx, card):
+        if self._modo_virtual_ativo():
+            self.cards_view.model_cards.atualizar_card(idx, card)
+            return
+        widget = self._card_widgets.get(card.get('id'))
+        if widget is not None:
+            widget.aplicar_snapshot(card)
+
+    def _inserir_na_view(self, pos, card):
+        if self._use_virtual(self._cards) and not self._modo_virtual_ativo():
+            # passou do limite: troca para a lista virtual (a volta só acontece num load_cards)
+            self.load_cards(self._cards)
+            return
+        if self._modo_virtual_ativo():
+            self.cards_view.model_cards.inserir_card(pos, card)
+            return
+        widget = self._card_widgets.get(card.get('id'))
+        try:
+            if widget is None:
+                widget = self._criar_card_widget(card)
+                self._card_widgets[card.get('id')] = widget
+            else:
+                widget.aplicar_snapshot(card)
+        except Exception as e:
+            print('Erro criando CardKanbanWidget:', e)
+            return
+        self.cards_layout.insertWidget(pos, widget)
+        self._empty_label.setVisible(False)
+
+    def _remover_da_view(self, idx, card_id, manter_widget=False):
+        if self._modo_virtual_ativo():
+            self.cards_view.model_cards.remover_card(idx)
+            return
+        widget = self._card_widgets.get(card_id)
+        if widget is not None:
+            self.cards_layout.removeWidget(widget)
+            if not manter_widget:
+                del self._card_widgets[card_id]
+                widget.setParent(None)
+                widget.deleteLater()
+        self._empty_label.setVisible(not self._cards)
+
+    def _use_virtual(self, cards):
+        if self.virtual is not None:
+            return bool(self.virtual)
+        return len(cards) > self.VIRTUAL_THRESHOLD
+
+    def _show_virtual_cards(self, cards):
+        """Modo virtualizado: só as linhas visíveis são pintadas; sem widget por card."""
+        if self.cards_view is None:
+            self.cards_view = ListaCardsVirtual(coluna=self, parent=self)
+            self.main_layout.addWidget(self.cards_view, 1)
+        self.cards_scroll.hide()
+        self.cards_view.set_cards(cards)
+        self.cards_view.show()
+
+    def _hide_virtual_cards(self):
+        if self.cards_view is not None and not self.cards_view.isHidden():
+            self.cards_view.hide()
+            self.cards_view.set_cards([])
+        self.cards_scroll.show()
 
     # alias
     def refresh(self):
@@ -202,6 +398,8 @@ class ColunaKanbanWidget(QFrame):
         self.refresh()
 
     def remove_card_widget(self, card_widget):
+        # normalmente o evento CARD_REMOVIDO já tirou o widget; aqui cobre chamadas diretas
+        self._remover_card(getattr(card_widget, 'card_id', None))
         try:
             self.cards_layout.removeWidget(card_widget)
             card_widget.deleteLater()
@@ -278,8 +476,11 @@ class ColunaKanbanWidget(QFrame):
         try:
             sucesso = self.controle_coluna.deletar_coluna(self.coluna_id)
             if sucesso:
+                # o layout do quadro reparenta a coluna no container: sobe até o QuadroKanbanWindow
                 parent = self.parent()
-                if parent and hasattr(parent, "load_columns"):
+                while parent is not None and not hasattr(parent, "load_columns"):
+                    parent = parent.parent()
+                if parent is not None:
                     parent.load_columns()
                 else:
                     # fallback visual
@@ -0,0 +1,230 @@
+# interface/objeto/lista_cards_virtual.py
+"""
+Lista virtualizada de cards para colunas grandes.
+
+Em vez de um CardKanbanWidget (QFrame com toolbar, seções e pixmaps) por card,
+a coluna usa um QListView com modelo + delegate: só as linhas visíveis são
+pintadas e nenhum widget é criado por card. O widget completo é criado sob
+demanda apenas para o card que está sendo editado.
+
+Os dados seguem o formato de ControleCardKanban.load_board_snapshot
+(tags, checklist_resumo, anexos, pastas já agrupados por card).
+"""
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QDialog, QListView, QStyle, QStyledItemDelegate, QVBoxLayout
+)
+from interface.objeto.card_kanban import CardKanbanWidget
+
+CardRole = Qt.UserRole + 1
+
+
+class CardListModel(QAbstractListModel):
+    """Modelo simples: uma linha por card (dict do snapshot)."""
+
+    def __init__(self, cards=None, parent=None):
+        super().__init__(parent)
+        self._cards = list(cards or [])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._cards)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._cards)):
+            return None
+        card = self._cards[index.row()]
+        if role == Qt.DisplayRole:
+            return card.get("titulo") or ""
+        if role == Qt.ToolTipRole:
+            return card.get("descricao") or None
+        if role == CardRole:
+            return card
+        return None
+
+    def set_cards(self, cards):
+        """Troca a lista. Com os mesmos ids na mesma ordem, só as linhas que mudaram
+        são repintadas (dataChanged) em vez de resetar o modelo."""
+        cards = list(cards or [])
+        if [c.get("id") for c in cards] != [c.get("id") for c in self._cards]:
+            self.beginResetModel()
+            self._cards = cards
+            self.endResetModel()
+            return
+        for row, card in enumerate(cards):
+            if card != self._cards[row]:
+                self.atualizar_card(row, card)
+
+    def atualizar_card(self, row, card):
+        self._cards[row] = card
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx)
+
+    def inserir_card(self, row, card):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._cards.insert(row, card)
+        self.endInsertRows()
+
+    def remover_card(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._cards[row]
+        self.endRemoveRows()
+
+    def card_at(self, row):
+        if 0 <= row < len(self._cards):
+            return self._cards[row]
+        return None
+
+
+class CardDelegate(QStyledItemDelegate):
+    """Pinta o resumo do card (tags, título, descrição e contadores) com QPainter."""
+
+    ROW_HEIGHT = 96
+    MARGIN = 4
+    PADDING = 8
+
+    def sizeHint(self, option, index):
+        # altura fixa: com uniformItemSizes o QListView não precisa medir cada linha
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index):
+        card = index.data(CardRole)
+        if not card:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        fg = option.palette.text().color()
+
+        # fundo do card (mesmo visual translúcido do CardKanbanWidget)
+        bg = QColor(255, 255, 255, 30 if option.state & QStyle.State_Selected else 13)
+        if option.state & QStyle.State_MouseOver:
+            bg.setAlpha(bg.alpha() + 12)
+        path = QPainterPath()
+        path.addRoundedRect(rect.x(), rect.y(), rect.width(), rect.height(), 6, 6)
+        painter.fillPath(path, bg)
+        border = QColor(card.get("cor_etiqueta") or "#ffffff")
+        border.setAlpha(90 if card.get("cor_etiqueta") else 36)
+        painter.setPen(QPen(border, 1))
+        painter.drawPath(path)
+
+        inner = rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        y = inner.y()
+
+        # tags
+        tags = card.get("tags") or []
+        if tags:
+            tag_font = QFont(option.font)
+            tag_font.setBold(True)
+            tag_font.setPointSizeF(max(7.0, option.font.pointSizeF() - 1))
+            painter.setFont(tag_font)
+            fm = QFontMetrics(tag_font)
+            x = inner.x()
+            for t in tags:
+                nome = t.get("nome") or ""
+                w = fm.horizontalAdvance(nome) + 12
+                if x + w > inner.right():
+                    break
+                tag_rect = QRect(x, y, w, fm.height() + 2)
+                tag_path = QPainterPath()
+                tag_path.addRoundedRect(tag_rect.x(), tag_rect.y(), tag_rect.width(), tag_rect.height(), 4, 4)
+                painter.fillPath(tag_path, QColor(100, 100, 255, 38))
+                painter.setPen(fg)
+                painter.drawText(tag_rect, Qt.AlignCenter, nome)
+                x += w + 4
+            y += fm.height() + 6
+
+        # título
+        title_font = QFont(option.font)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        fm = QFontMetrics(title_font)
+        titulo = fm.elidedText(card.get("titulo") or "", Qt.ElideRight, inner.width())
+        painter.setPen(fg)
+        painter.drawText(QRect(inner.x(), y, inner.width(), fm.height()), Qt.AlignLeft | Qt.AlignVCenter, titulo)
+        y += fm.height() + 2
+
+        # descrição (uma linha)
+        painter.setFont(option.font)
+        fm = QFontMetrics(option.font)
+        descricao = (card.get("descricao") or "(sem descrição)").replace("\n", " ")
+        descricao = fm.elidedText(descricao, Qt.ElideRight, inner.width())
+        dim = QColor(fg)
+        dim.setAlpha(170)
+        painter.setPen(dim)
+        painter.drawText(QRect(inner.x(), y, inner.width(), fm.height()), Qt.AlignLeft | Qt.AlignVCenter, descricao)
+
+        # contadores no rodapé
+        resumo = card.get("checklist_resumo") or {}
+        partes = []
+        if resumo.get("total"):
+            partes.append(f"✅ {resumo.get('concluidos', 0)}/{resumo['total']}")
+        if card.get("anexos"):
+            partes.append(f"📎 {len(card['anexos'])}")
+        if card.get("pastas"):
+            partes.append(f"📁 {len(card['pastas'])}")
+        if partes:
+            painter.drawText(QRect(inner.x(), inner.bottom() - fm.height(), inner.width(), fm.height()),
+                             Qt.AlignLeft | Qt.AlignVCenter, "   ".join(partes))
+
+        painter.restore()
+
+
+class ListaCardsVirtual(QListView):
+    """QListView configurado para colunas grandes (rolagem em tempo constante)."""
+
+    def __init__(self, coluna=None, parent=None):
+        super().__init__(parent)
+        self.coluna = coluna
+        self.model_cards = CardListModel(parent=self)
+        self.setModel(self.model_cards)
+        self.setItemDelegate(CardDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; }")
+        self.activated.connect(self._on_activated)
+        self._editing = None
+
+    def set_cards(self, cards):
+        self.model_cards.set_cards(cards)
+
+    def _on_activated(self, index):
+        card = self.model_cards.card_at(index.row())
+        if card:
+            self.open_card_editor(card)
+
+    def open_card_editor(self, card):
+        """Cria o CardKanbanWidget completo apenas para o card selecionado."""
+        if self._editing is not None:
+            return
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Card: {card.get('titulo') or ''}")
+        layout = QVBoxLayout(dialog)
+        widget = CardKanbanWidget(card_id=card.get("id"), titulo=card.get("titulo"),
+                                  coluna_id=card.get("coluna_id"), parent_coluna=self.coluna,
+                                  dados=card)
+        widget.setParent(dialog)
+        widget.setMaximumWidth(16777215)
+        layout.addWidget(widget)
+        self._editing = widget
+        try:
+            dialog.resize(420, 360)
+            dialog.exec_()
+        finally:
+            self._editing = None
+            for obj in (widget, dialog):
+                try:
+                    obj.deleteLater()
+                except RuntimeError:
+                    # o widget pode já ter sido destruído (ex.: card excluído no diálogo)
+                    pass
+        # edições feitas no widget completo chegam à coluna pelos eventos do controle
+        # (ColunaKanbanWidget._on_evento_kanban), que repinta só a linha do card
@@ -0,0 +1,485 @@
+# interface/objeto/lista_mensagens_chat.py
+"""
+Histórico do chat paginado e virtualizado.
+
+Em vez de um ChatBubble (QFrame + QLabel) por mensagem, recriados a cada envio,
+o histórico é um QListView com modelo + delegate: só as bolhas visíveis são
+pintadas. As mensagens chegam em páginas por chave (ChatController.listar_pagina
+/ listar_apos, índice da migração 8):
+
+- abertura: a página mais recente;
+- rolar até o topo: carrega a página anterior, mantendo a posição na tela;
+- mensagens novas: só as de id maior que a última entram no fim da lista;
+- no máximo MAX_EM_MEMORIA mensagens ficam no modelo; o excesso sai pela ponta
+  oposta à que está sendo lida e volta por página se o usuário rolar até lá.
+
+Envio otimista (PipelineChat): a mensagem do usuário e a resposta em
+andamento entram na hora como linhas pendentes, sempre no fim do modelo
+("cauda" pendente). As mensagens gravadas entram antes da cauda, em ordem de
+id; cada linha pendente é trocada pela mensagem gravada quando o pipeline
+avisa (ou some, se o barramento já tiver trazido a mensagem). A resposta
+pendente mostra os trechos parciais enquanto o comando roda.
+"""
+from typing import Any, Dict, List, Optional
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt, QTimer
+from PyQt5.QtGui import QColor, QFontMetrics, QGuiApplication, QKeySequence, QPainter, QPainterPath
+from PyQt5.QtWidgets import QAbstractItemView, QListView, QMenu, QStyledItemDelegate
+
+from banco.controles.chat_mestre.controle_chat import ChatController
+from banco.controles.chat_mestre.pipeline_chat import PedidoChat
+
+MensagemRole = Qt.UserRole + 1
+
+
+def _mensagem(row) -> Dict[str, Any]:
+    # row = (id, remetente, conteudo, criado_em)
+    mensagem_id, remetente, conteudo, criado_em = row
+    return {"id": mensagem_id, "remetente": remetente, "conteudo": conteudo or "", "criado_em": criado_em}
+
+
+def _pendente(chave: tuple, remetente: str, conteudo: str) -> Dict[str, Any]:
+    # linha otimista: ainda sem id; `chave` = (remetente, id do PedidoChat)
+    return {"id": None, "chave": chave, "remetente": remetente, "conteudo": conteudo,
+            "criado_em": None, "pendente": True}
+
+
+class MensagensModel(QAbstractListModel):
+    """Uma linha por mensagem (dict), em ordem crescente de id, seguidas das pendentes."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mensagens: List[Dict[str, Any]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._mensagens)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._mensagens)):
+            return None
+        mensagem = self._mensagens[index.row()]
+        if role == Qt.DisplayRole:
+            return mensagem["conteudo"]
+        if role == Qt.ToolTipRole:
+            return mensagem.get("erro") or mensagem.get("criado_em")
+        if role == MensagemRole:
+            return mensagem
+        return None
+
+    def _fim_gravadas(self) -> int:
+        # início da cauda de pendentes (poucas linhas: varre do fim)
+        fim = len(self._mensagens)
+        while fim and self._mensagens[fim - 1].get("pendente"):
+            fim -= 1
+        return fim
+
+    def primeiro_id(self) -> Optional[int]:
+        return self._mensagens[0]["id"] if self._mensagens else None
+
+    def ultimo_id(self) -> Optional[int]:
+        fim = self._fim_gravadas()
+        return self._mensagens[fim - 1]["id"] if fim else None
+
+    def inserir_no_inicio(self, mensagens: List[Dict[str, Any]]) -> None:
+        if not mensagens:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(mensagens) - 1)
+        self._mensagens[:0] = mensagens
+        self.endInsertRows()
+
+    def inserir_no_fim(self, mensagens: List[Dict[str, Any]]) -> None:
+        """Mensagens gravadas: entram depois da última gravada, antes das pendentes."""
+        if not mensagens:
+            return
+        inicio = self._fim_gravadas()
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(mensagens) - 1)
+        self._mensagens[inicio:inicio] = mensagens
+        self.endInsertRows()
+
+    def remover_do_inicio(self, n: int) -> None:
+        n = min(n, len(self._mensagens))
+        if n <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, n - 1)
+        del self._mensagens[:n]
+        self.endRemoveRows()
+
+    def remover_do_fim(self, n: int) -> None:
+        """Descarta as `n` últimas gravadas; as pendentes ficam."""
+        fim = self._fim_gravadas()
+        n = min(n, fim)
+        if n <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), fim - n, fim - 1)
+        del self._mensagens[fim - n:fim]
+        self.endRemoveRows()
+
+    def limpar(self) -> None:
+        self.beginResetModel()
+        self._mensagens = []
+        self.endResetModel()
+
+    # -------------------------
+    # Pendentes (envio otimista)
+    # -------------------------
+    def pendentes(self) -> List[Dict[str, Any]]:
+        return self._mensagens[self._fim_gravadas():]
+
+    def adicionar_pendentes(self, mensagens: List[Dict[str, Any]]) -> None:
+        if not mensagens:
+            return
+        inicio = len(self._mensagens)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(mensagens) - 1)
+        self._mensagens.extend(mensagens)
+        self.endInsertRows()
+
+    def linha_pendente(self, chave: tuple) -> Optional[int]:
+        for linha in range(len(self._mensagens) - 1, self._fim_gravadas() - 1, -1):
+            if self._mensagens[linha].get("chave") == chave:
+                return linha
+        return None
+
+    def atualizar_pendente(self, chave: tuple, **valores) -> Optional[int]:
+        linha = self.linha_pendente(chave)
+        if linha is not None:
+            self._mensagens[linha].update(valores)
+            index = self.index(linha)
+            self.dataChanged.emit(index, index)
+        return linha
+
+    def remover_pendente(self, chave: tuple) -> None:
+        linha = self.linha_pendente(chave)
+        if linha is not None:
+            self.beginRemoveRows(QModelIndex(), linha, linha)
+            del self._mensagens[linha]
+            self.endRemoveRows()
+
+    def confirmar_pendente(self, chave: tuple, mensagem: Dict[str, Any], inserir: bool = True) -> Optional[int]:
+        """
+        Troca a linha pendente pela mensagem gravada. Se a mensagem já entrou
+        (barramento foi mais rápido) ou `inserir` é False (fim do histórico fora
+        da memória), só remove a pendente. Retorna a linha trocada no lugar.
+        """
+        ultimo = self.ultimo_id()
+        nova = inserir and (ultimo is None or mensagem["id"] > ultimo)
+        linha = self.linha_pendente(chave)
+        if nova and linha is not None and linha == self._fim_gravadas():
+            # primeira da cauda: vira gravada sem mexer na posição
+            self._mensagens[linha] = mensagem
+            index = self.index(linha)
+            self.dataChanged.emit(index, index)
+            return linha
+        self.remover_pendente(chave)
+        if nova:
+            self.inserir_no_fim([mensagem])
+        return None
+
+
+class BolhaDelegate(QStyledItemDelegate):
+    """Pinta a bolha (usuário à direita, bot à esquerda) com o texto quebrado em linhas."""
+
+    MARGEM = 4
+    PADDING = 10
+    LARGURA_MAX = 0.7       # fração da largura da lista
+    COR_USUARIO = QColor(70, 130, 255, 71)
+    COR_BOT = QColor(255, 255, 255, 15)
+    COR_ERRO = QColor(220, 60, 60, 90)
+    OPACIDADE_PENDENTE = 0.6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # altura por (id da mensagem, texto, largura): sizeHint é chamado muitas vezes pelo QListView
+        self._alturas: Dict[tuple, int] = {}
+
+    def _largura_lista(self, option) -> int:
+        # no sizeHint o QListView não preenche option.rect: usa a largura visível da lista
+        view = self.parent()
+        if isinstance(view, QListView):
+            return view.viewport().width()
+        return option.rect.width()
+
+    @staticmethod
+    def _texto(mensagem: Dict[str, Any]) -> str:
+        texto = mensagem.get("conteudo") or ""
+        # resposta pendente ainda sem nenhum trecho
+        return texto or ("…" if mensagem.get("pendente") else "")
+
+    def _retangulo_texto(self, option, texto: str, largura_lista: int) -> QRect:
+        largura = max(80, int(largura_lista * self.LARGURA_MAX) - 2 * self.PADDING)
+        fm = QFontMetrics(option.font)
+        return fm.boundingRect(QRect(0, 0, largura, 100000), Qt.TextWordWrap, texto)
+
+    def sizeHint(self, option, index):
+        mensagem = index.data(MensagemRole) or {}
+        texto = self._texto(mensagem)
+        largura = self._largura_lista(option)
+        chave = (mensagem.get("id"), texto, largura)
+        altura = self._alturas.get(chave)
+        if altura is None:
+            altura = self._retangulo_texto(option, texto, largura).height() + 2 * (self.PADDING + self.MARGEM)
+            if len(self._alturas) > 5000:
+                self._alturas.clear()
+            self._alturas[chave] = altura
+        return QSize(largura, altura)
+
+    def paint(self, painter: QPainter, option, index):
+        mensagem = index.data(MensagemRole)
+        if not mensagem:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if mensagem.get("pendente"):
+            painter.setOpacity(self.OPACIDADE_PENDENTE)
+
+        texto = self._texto(mensagem)
+        caixa = self._retangulo_texto(option, texto, self._largura_lista(option))
+        largura = caixa.width() + 2 * self.PADDING
+        altura = caixa.height() + 2 * self.PADDING
+        area = option.rect.adjusted(self.MARGEM, self.MARGEM, -self.MARGEM, -self.MARGEM)
+        do_usuario = mensagem.get("remetente") == "user"
+        x = area.right() - largura if do_usuario else area.x()
+        bolha = QRect(x, area.y(), largura, altura)
+
+        path = QPainterPath()
+        path.addRoundedRect(bolha.x(), bolha.y(), bolha.width(), bolha.height(), 12, 12)
+        cor = self.COR_ERRO if mensagem.get("erro") else (self.COR_USUARIO if do_usuario else self.COR_BOT)
+        painter.fillPath(path, cor)
+
+        painter.setFont(option.font)
+        painter.setPen(option.palette.text().color())
+        painter.drawText(bolha.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING),
+                         Qt.TextWordWrap, texto)
+        painter.restore()
+
+
+class ListaMensagensChat(QListView):
+    """Histórico de uma sessão do chat com carga por páginas (ver docstring do módulo)."""
+
+    PAGINA = ChatController.PAGINA_MENSAGENS
+    MAX_EM_MEMORIA = 500
+
+    def __init__(self, session_id: int, parent=None):
+        super().__init__(parent)
+        self.session_id = session_id
+        self.model_mensagens = MensagensModel(self)
+        self.setModel(self.model_mensagens)
+        self.setItemDelegate(BolhaDelegate(self))
+        self.setUniformItemSizes(False)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setResizeMode(QListView.Adjust)
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; } QListView::item:selected { background: transparent; }")
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._menu_contexto)
+
+        # há mensagens antes da primeira / depois da última carregada?
+        self._ha_anteriores = False
+        self._no_fim = True
+        self._carregando = False
+        # ajuste de rolagem aplicado quando o intervalo da barra muda (após o layout)
+        self._distancia_do_fim: Optional[int] = None
+        self._distancia_do_topo: Optional[int] = None
+
+        barra = self.verticalScrollBar()
+        barra.valueChanged.connect(self._on_rolagem)
+        barra.rangeChanged.connect(self._on_intervalo)
+
+    # -------------------------
+    # Carga
+    # -------------------------
+    def carregar_inicial(self) -> None:
+        """Mostra a página mais recente e rola para o fim (as pendentes continuam no fim)."""
+        pagina = [_mensagem(r) for r in ChatController.listar_pagina(self.session_id, limite=self.PAGINA)]
+        pendentes = self.model_mensagens.pendentes()
+        self.model_mensagens.limpar()
+        self._ha_anteriores = len(pagina) >= self.PAGINA
+        self._no_fim = True
+        self._distancia_do_fim = 0
+        self.model_mensagens.inserir_no_fim(pagina)
+        self.model_mensagens.adicionar_pendentes(pendentes)
+        QTimer.singleShot(0, self._completar_viewport)
+
+    def carregar_anteriores(self) -> None:
+        primeiro = self.model_mensagens.primeiro_id()
+        if self._carregando or not self._ha_anteriores or primeiro is None:
+            return
+        self._carregando = True
+        try:
+            pagina = [_mensagem(r) for r in ChatController.listar_pagina(self.session_id, primeiro, self.PAGINA)]
+            self._ha_anteriores = len(pagina) >= self.PAGINA
+            if not pagina:
+                return
+            barra = self.verticalScrollBar()
+            # mantém na tela a mensagem que estava visível
+            self._distancia_do_fim = barra.maximum() - barra.value()
+            self.model_mensagens.inserir_no_inicio(pagina)
+            excesso = self.model_mensagens.rowCount() - self.MAX_EM_MEMORIA
+            if excesso > 0:
+                self.model_mensagens.remover_do_fim(excesso)
+                self._no_fim = False
+                self._distancia_do_fim = None
+                self._distancia_do_topo = self._altura_linhas(0, len(pagina)) + barra.value()
+        finally:
+            self._carregando = False
+
+    def carregar_posteriores(self) -> None:
+        """Página seguinte quando o fim foi descartado (usuário voltou a rolar para baixo)."""
+        ultimo = self.model_mensagens.ultimo_id()
+        if self._carregando or self._no_fim or ultimo is None:
+            return
+        self._carregando = True
+        try:
+            pagina = [_mensagem(r) for r in ChatController.listar_apos(self.session_id, ultimo, self.PAGINA)]
+            self._no_fim = len(pagina) < self.PAGINA
+            barra = self.verticalScrollBar()
+            self._distancia_do_topo = barra.value()
+            self.model_mensagens.inserir_no_fim(pagina)
+            self._aparar_inicio()
+        finally:
+            self._carregando = False
+
+    def carregar_novas(self) -> None:
+        """Acrescenta só as mensagens com id maior que a última exibida."""
+        if not self._no_fim:
+            # o usuário está lendo o passado; as novas chegam por carregar_posteriores
+            return
+        ultimo = self.model_mensagens.ultimo_id()
+        if ultimo is None:
+            self.carregar_inicial()
+            return
+        novas: List[Dict[str, Any]] = []
+        while True:
+            pagina = ChatController.listar_apos(self.session_id, ultimo, self.PAGINA)
+            novas.extend(_mensagem(r) for r in pagina)
+            if len(pagina) < self.PAGINA:
+                break
+            ultimo = pagina[-1][0]
+        if not novas:
+            return
+        self._manter_no_fim()
+        self.model_mensagens.inserir_no_fim(novas)
+        self._aparar_inicio()
+
+    # -------------------------
+    # Envio otimista (sinais do ProcessadorChat)
+    # -------------------------
+    def adicionar_envio(self, pedido: PedidoChat) -> None:
+        """Mostra na hora a mensagem enviada e a resposta ainda vazia."""
+        if pedido.session_id != self.session_id:
+            return
+        if not self._no_fim:
+            # quem envia quer ver a conversa atual
+            self.carregar_inicial()
+        self._distancia_do_fim = 0
+        self.model_mensagens.adicionar_pendentes([
+            _pendente(("user", pedido.id), "user", pedido.texto),
+            _pendente(("bot", pedido.id), "bot", ""),
+        ])
+
+    def confirmar_envio(self, pedido: PedidoChat) -> None:
+        if pedido.session_id == self.session_id:
+            self._confirmar(("user", pedido.id), pedido.mensagem_id, "user", pedido.texto)
+
+    def atualizar_resposta(self, pedido: PedidoChat, texto: str) -> None:
+        if pedido.session_id != self.session_id:
+            return
+        self._manter_no_fim()
+        linha = self.model_mensagens.atualizar_pendente(("bot", pedido.id), conteudo=texto)
+        if linha is not None:
+            # o texto cresceu: a bolha muda de altura
+            self.itemDelegate().sizeHintChanged.emit(self.model_mensagens.index(linha))
+
+    def concluir_resposta(self, pedido: PedidoChat) -> None:
+        if pedido.session_id == self.session_id:
+            self._confirmar(("bot", pedido.id), pedido.resposta_id, "bot", pedido.resposta)
+
+    def falhar_envio(self, pedido: PedidoChat) -> None:
+        if pedido.session_id != self.session_id:
+            return
+        self.model_mensagens.remover_pendente(("bot", pedido.id))
+        if pedido.mensagem_id is None:
+            # não chegou a ser gravada: a bolha fica marcada com o erro
+            self.model_mensagens.atualizar_pendente(("user", pedido.id), erro=f"Falha ao enviar: {pedido.erro}")
+        else:
+            self.carregar_novas()
+
+    def _confirmar(self, chave: tuple, mensagem_id: int, remetente: str, conteudo: str) -> None:
+        self._manter_no_fim()
+        mensagem = {"id": mensagem_id, "remetente": remetente, "conteudo": conteudo or "", "criado_em": None}
+        linha = self.model_mensagens.confirmar_pendente(chave, mensagem, inserir=self._no_fim)
+        if linha is not None:
+            self.itemDelegate().sizeHintChanged.emit(self.model_mensagens.index(linha))
+
+    def _manter_no_fim(self) -> None:
+        barra = self.verticalScrollBar()
+        if barra.value() >= barra.maximum() - 4:
+            self._distancia_do_fim = 0      # estava no fim: continua no fim
+
+    def _aparar_inicio(self) -> None:
+        excesso = self.model_mensagens.rowCount() - self.MAX_EM_MEMORIA
+        if excesso <= 0:
+            return
+        barra = self.verticalScrollBar()
+        if self._distancia_do_fim is None:
+            self._distancia_do_topo = max(0, (self._distancia_do_topo or barra.value()) - self._altura_linhas(0, excesso))
+        self.model_mensagens.remover_do_inicio(excesso)
+        self._ha_anteriores = True
+
+    def _altura_linhas(self, inicio: int, fim: int) -> int:
+        return sum(self.sizeHintForRow(row) for row in range(inicio, fim))
+
+    def _completar_viewport(self) -> None:
+        # histórico curto que não enche a tela não gera rolagem até o topo: busca mais
+        if self._ha_anteriores and self.verticalScrollBar().maximum() == 0:
+            self.carregar_anteriores()
+            QTimer.singleShot(0, self._completar_viewport)
+
+    # -------------------------
+    # Rolagem
+    # -------------------------
+    def _on_intervalo(self, _minimo: int, maximo: int) -> None:
+        barra = self.verticalScrollBar()
+        if self._distancia_do_fim is not None:
+            barra.setValue(maximo - self._distancia_do_fim)
+            self._distancia_do_fim = None
+        elif self._distancia_do_topo is not None:
+            barra.setValue(min(maximo, self._distancia_do_topo))
+            self._distancia_do_topo = None
+
+    def _on_rolagem(self, valor: int) -> None:
+        barra = self.verticalScrollBar()
+        if barra.maximum() == 0:
+            return
+        if valor <= barra.minimum():
+            self.carregar_anteriores()
+        elif valor >= barra.maximum() and not self._no_fim:
+            self.carregar_posteriores()
+
+    # -------------------------
+    # Copiar (as bolhas são pintadas, não há QLabel para selecionar texto)
+    # -------------------------
+    def _texto_selecionado(self) -> Optional[str]:
+        indices = self.selectedIndexes()
+        return indices[0].data(Qt.DisplayRole) if indices else None
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            texto = self._texto_selecionado()
+            if texto:
+                QGuiApplication.clipboard().setText(texto)
+            return
+        super().keyPressEvent(event)
+
+    def _menu_contexto(self, pos):
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        acao = menu.addAction("Copiar mensagem")
+        if menu.exec_(self.viewport().mapToGlobal(pos)) is acao:
+            QGuiApplication.clipboard().setText(index.data(Qt.DisplayRole) or "")
@@ -0,0 +1,221 @@
+# interface/objeto/miniaturas.py
+"""
+Cache de miniaturas para anexos de imagem do Kanban.
+
+- chave: caminho + mtime + tamanho do arquivo + largura pedida;
+- disco: PNGs em `kanban_thumbs/`, ao lado de ControleCardKanban.IMPORT_BASE_DIR,
+  limitado a DISCO_MAX_BYTES: na criação do cache uma tarefa em background apaga
+  os PNGs sem uso há DISCO_IDADE_MAX segundos (miniaturas de arquivos que mudaram
+  ou sumiram) e, se ainda passar do limite, os de uso mais antigo (mtime, renovado
+  a cada leitura);
+- memória: LRU de QPixmap limitado por bytes; chaves cuja decodificação falhou
+  ficam num cache negativo e não são tentadas de novo;
+- decodificação/redimensionamento em QThreadPool (QImageReader já decodifica
+  na escala reduzida); a UI recebe um placeholder na hora e o pixmap real
+  quando ficar pronto.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from PyQt5.QtCore import QObject, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QImageReader, QPixmap
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+
+THUMBS_DIR = os.path.join(os.path.dirname(ControleCardKanban.IMPORT_BASE_DIR), "kanban_thumbs")
+BUDGET_BYTES_PADRAO = 48 * 1024 * 1024
+DISCO_MAX_BYTES = 256 * 1024 * 1024
+DISCO_IDADE_MAX = 30 * 24 * 3600
+MAX_FALHAS = 4096
+
+
+class _Sinais(QObject):
+    pronto = pyqtSignal(str, QImage)
+
+
+class _TarefaMiniatura(QRunnable):
+    """Gera (ou lê do disco) a miniatura fora da thread da GUI."""
+
+    def __init__(self, chave: str, caminho: str, largura: int, arquivo_cache: str, sinais: _Sinais):
+        super().__init__()
+        self.chave = chave
+        self.caminho = caminho
+        self.largura = largura
+        self.arquivo_cache = arquivo_cache
+        self.sinais = sinais
+
+    def run(self):
+        img = QImage()
+        if os.path.isfile(self.arquivo_cache):
+            img = QImage(self.arquivo_cache)
+            if not img.isNull():
+                try:
+                    # uso recente: a poda do disco apaga primeiro os de mtime mais antigo
+                    os.utime(self.arquivo_cache)
+                except OSError:
+                    pass
+        if img.isNull():
+            reader = QImageReader(self.caminho)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if size.isValid() and size.width() > self.largura:
+                altura = max(1, round(size.height() * self.largura / size.width()))
+                reader.setScaledSize(QSize(self.largura, altura))
+            img = reader.read()
+            if not img.isNull():
+                try:
+                    os.makedirs(os.path.dirname(self.arquivo_cache), exist_ok=True)
+                    img.save(self.arquivo_cache, "PNG")
+                except Exception:
+                    # cache em disco é opcional; a miniatura em memória continua válida
+                    pass
+        self.sinais.pronto.emit(self.chave, img)
+
+
+class _TarefaPodaDisco(QRunnable):
+    """Mantém `kanban_thumbs/` dentro do limite (ver docstring do módulo)."""
+
+    def __init__(self, thumbs_dir: str, max_bytes: int, idade_max: float):
+        super().__init__()
+        self.thumbs_dir = thumbs_dir
+        self.max_bytes = max_bytes
+        self.idade_max = idade_max
+
+    def run(self):
+        limite = time.time() - self.idade_max
+        arquivos = []   # (mtime, tamanho, caminho)
+        total = 0
+        for raiz, _dirs, nomes in os.walk(self.thumbs_dir):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    st = os.stat(caminho)
+                    if st.st_mtime < limite:
+                        os.remove(caminho)
+                        continue
+                except OSError:
+                    continue
+                arquivos.append((st.st_mtime, st.st_size, caminho))
+                total += st.st_size
+        arquivos.sort()
+        for _mtime, tamanho, caminho in arquivos:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+
+
+class CacheMiniaturas(QObject):
+    def __init__(self, thumbs_dir: str = THUMBS_DIR, budget_bytes: int = BUDGET_BYTES_PADRAO,
+                 max_threads: int = 2, disco_max_bytes: int = DISCO_MAX_BYTES,
+                 disco_idade_max: float = DISCO_IDADE_MAX, parent=None):
+        super().__init__(parent)
+        self.thumbs_dir = thumbs_dir
+        self.budget_bytes = budget_bytes
+        self._lru: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._bytes = 0
+        self._pendentes: Dict[str, List[Callable[[QPixmap], None]]] = {}
+        self._falhas: Set[str] = set()
+        self._placeholders: Dict[int, QPixmap] = {}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._sinais = _Sinais()
+        self._sinais.pronto.connect(self._on_pronto)
+        if os.path.isdir(thumbs_dir):
+            self._pool.start(_TarefaPodaDisco(thumbs_dir, disco_max_bytes, disco_idade_max))
+
+    # ------------------ utilitários ------------------
+    @staticmethod
+    def _chave(caminho: str, largura: int) -> Optional[str]:
+        try:
+            st = os.stat(caminho)
+        except OSError:
+            return None
+        return f"{os.path.abspath(caminho)}|{st.st_mtime_ns}|{st.st_size}|{largura}"
+
+    def _arquivo_cache(self, chave: str) -> str:
+        nome = hashlib.sha1(chave.encode("utf-8")).hexdigest()
+        return os.path.join(self.thumbs_dir, nome[:2], nome + ".png")
+
+    @staticmethod
+    def _custo(pix: QPixmap) -> int:
+        return max(1, pix.width() * pix.height() * max(1, pix.depth()) // 8)
+
+    def _guardar(self, chave: str, pix: QPixmap):
+        antigo = self._lru.pop(chave, None)
+        if antigo is not None:
+            self._bytes -= self._custo(antigo)
+        self._lru[chave] = pix
+        self._bytes += self._custo(pix)
+        while self._bytes > self.budget_bytes and len(self._lru) > 1:
+            _, removido = self._lru.popitem(last=False)
+            self._bytes -= self._custo(removido)
+
+    def placeholder(self, largura: int) -> QPixmap:
+        pix = self._placeholders.get(largura)
+        if pix is None:
+            pix = QPixmap(largura, max(1, largura * 3 // 4))
+            pix.fill(QColor(255, 255, 255, 20))
+            self._placeholders[largura] = pix
+        return pix
+
+    # ------------------ API ------------------
+    def request(self, caminho: str, largura: int, callback: Optional[Callable[[QPixmap], None]] = None) -> QPixmap:
+        """Retorna a miniatura se já estiver em memória; caso contrário agenda a
+        geração em background, retorna um placeholder e chama `callback(pixmap)`
+        na thread da GUI quando pronta."""
+        chave = self._chave(caminho, largura)
+        if chave is None or chave in self._falhas:
+            # arquivo sumiu ou não decodifica; a chave muda se o arquivo mudar
+            return self.placeholder(largura)
+
+        pix = self._lru.get(chave)
+        if pix is not None:
+            self._lru.move_to_end(chave)
+            return pix
+
+        callbacks = self._pendentes.get(chave)
+        if callbacks is not None:
+            if callback:
+                callbacks.append(callback)
+            return self.placeholder(largura)
+
+        self._pendentes[chave] = [callback] if callback else []
+        self._pool.start(_TarefaMiniatura(chave, caminho, largura, self._arquivo_cache(chave), self._sinais))
+        return self.placeholder(largura)
+
+    def _on_pronto(self, chave: str, img: QImage):
+        callbacks = self._pendentes.pop(chave, [])
+        if img.isNull():
+            if len(self._falhas) >= MAX_FALHAS:
+                self._falhas.clear()
+            self._falhas.add(chave)
+            return
+        pix = QPixmap.fromImage(img)
+        self._guardar(chave, pix)
+        for cb in callbacks:
+            try:
+                cb(pix)
+            except RuntimeError:
+                # o QLabel de destino já foi destruído (card recarregado/fechado)
+                pass
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {"itens": len(self._lru), "bytes": self._bytes, "pendentes": len(self._pendentes),
+                "falhas": len(self._falhas)}
+
+
+_CACHE: Optional[CacheMiniaturas] = None
+
+
+def get_cache_miniaturas() -> CacheMiniaturas:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = CacheMiniaturas()
+    return _CACHE
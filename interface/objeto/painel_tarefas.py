@@ -0,0 +1,111 @@
+# interface/objeto/painel_tarefas.py
+"""
+Painel com as tarefas de I/O do Kanban (interface/objeto/tarefas_io.py).
+
+Uma linha por tarefa: título, barra de progresso, estado e botão de cancelar.
+O painel some quando não há tarefas para mostrar; "Limpar" remove as finalizadas.
+"""
+from typing import Dict
+
+from PyQt5.QtWidgets import (
+    QFrame, QHBoxLayout, QLabel, QProgressBar, QPushButton, QScrollArea, QVBoxLayout, QWidget
+)
+
+from interface.objeto.tarefas_io import CONCLUIDA, ESTADOS_FINAIS, GerenciadorTarefas, Tarefa, get_gerenciador_tarefas
+
+
+class _LinhaTarefa(QWidget):
+    def __init__(self, tarefa: Tarefa, parent=None):
+        super().__init__(parent)
+        self.tarefa = tarefa
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+
+        self.titulo = QLabel(tarefa.titulo)
+        self.titulo.setMinimumWidth(220)
+        self.barra = QProgressBar()
+        self.barra.setRange(0, 1000)   # escala fixa: totais em bytes passam de int32
+        self.barra.setTextVisible(False)
+        self.estado = QLabel(tarefa.estado)
+        self.estado.setMinimumWidth(80)
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.setEnabled(tarefa.cancelavel)
+        self.btn_cancelar.clicked.connect(tarefa.cancelar)
+
+        layout.addWidget(self.titulo)
+        layout.addWidget(self.barra, 1)
+        layout.addWidget(self.estado)
+        layout.addWidget(self.btn_cancelar)
+
+        tarefa.progresso.connect(self._on_progresso)
+        tarefa.estado_alterado.connect(self._on_estado)
+        tarefa.falhou.connect(lambda erro: self.estado.setToolTip(erro))
+        if tarefa.total:
+            self._on_progresso(tarefa.feitos, tarefa.total)
+        self._on_estado(tarefa.estado)
+
+    def _on_progresso(self, feitos, total):
+        self.barra.setValue(int(feitos * 1000 / total) if total else 0)
+
+    def _on_estado(self, estado: str):
+        self.estado.setText(estado)
+        if estado in ESTADOS_FINAIS:
+            self.btn_cancelar.setEnabled(False)
+        if estado == CONCLUIDA:
+            self.barra.setValue(1000)
+
+
+class PainelTarefas(QFrame):
+    """Lista as tarefas do gerenciador; adicionado no rodapé do QuadroKanbanWindow."""
+
+    def __init__(self, gerenciador: GerenciadorTarefas = None, parent=None):
+        super().__init__(parent)
+        self.gerenciador = gerenciador or get_gerenciador_tarefas()
+        self._linhas: Dict[int, _LinhaTarefa] = {}
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setMaximumHeight(160)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        topo = QHBoxLayout()
+        topo.addWidget(QLabel("Tarefas em segundo plano"), 1)
+        btn_limpar = QPushButton("Limpar")
+        btn_limpar.clicked.connect(self.limpar_finalizadas)
+        topo.addWidget(btn_limpar)
+        layout.addLayout(topo)
+
+        self._container = QWidget()
+        self._lista = QVBoxLayout(self._container)
+        self._lista.setContentsMargins(0, 0, 0, 0)
+        self._lista.addStretch(1)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        scroll.setWidget(self._container)
+        layout.addWidget(scroll)
+
+        for tarefa in self.gerenciador.tarefas():
+            self._adicionar(tarefa)
+        self.gerenciador.tarefa_adicionada.connect(self._adicionar)
+        self._atualizar_visibilidade()
+
+    def _adicionar(self, tarefa: Tarefa):
+        if tarefa.id in self._linhas:
+            return
+        linha = _LinhaTarefa(tarefa, self._container)
+        self._linhas[tarefa.id] = linha
+        # mais recentes no topo
+        self._lista.insertWidget(0, linha)
+        self._atualizar_visibilidade()
+
+    def limpar_finalizadas(self):
+        self.gerenciador.limpar_finalizadas()
+        for tid, linha in list(self._linhas.items()):
+            if linha.tarefa.estado in ESTADOS_FINAIS:
+                self._lista.removeWidget(linha)
+                linha.deleteLater()
+                del self._linhas[tid]
+        self._atualizar_visibilidade()
+
+    def _atualizar_visibilidade(self):
+        self.setVisible(bool(self._linhas))
@@ -0,0 +1,58 @@
+# interface/objeto/processador_chat.py
+"""
+Ponte entre o PipelineChat (banco/controles/chat_mestre/pipeline_chat.py) e a GUI.
+
+Os eventos do pipeline acontecem nas threads dele; aqui viram sinais de um
+QObject que vive na thread da GUI, então chegam por conexão enfileirada e os
+slots podem tocar em widgets. Um único processador por aplicação
+(get_processador_chat()), compartilhado pelas telas de chat.
+"""
+from typing import Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from banco.controles.chat_mestre.pipeline_chat import (
+    CONCLUIDA, FALHOU, PARCIAL, SALVA, PedidoChat, PipelineChat
+)
+
+
+class ProcessadorChat(QObject):
+    """Recebe PedidoChat do pipeline e reemite como sinais na thread da GUI."""
+
+    mensagem_salva = pyqtSignal(object)          # pedido (pedido.mensagem_id preenchido)
+    resposta_parcial = pyqtSignal(object, str)   # pedido, texto acumulado até agora
+    resposta_concluida = pyqtSignal(object)      # pedido (pedido.resposta / resposta_id)
+    pedido_falhou = pyqtSignal(object)           # pedido (pedido.erro)
+
+    def __init__(self, pipeline: Optional[PipelineChat] = None, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline or PipelineChat()
+        self.pipeline.ao_evento = self._ao_evento
+
+    def enviar(self, session_id: int, texto: str, usuario: Optional[str] = None) -> PedidoChat:
+        """Pode levantar FilaChatCheia."""
+        return self.pipeline.enviar(session_id, texto, usuario)
+
+    def parar(self, timeout: Optional[float] = None) -> None:
+        self.pipeline.parar(timeout)
+
+    def _ao_evento(self, tipo: str, pedido: PedidoChat, dado) -> None:
+        # thread do pipeline: só emite
+        if tipo == SALVA:
+            self.mensagem_salva.emit(pedido)
+        elif tipo == PARCIAL:
+            self.resposta_parcial.emit(pedido, dado)
+        elif tipo == CONCLUIDA:
+            self.resposta_concluida.emit(pedido)
+        elif tipo == FALHOU:
+            self.pedido_falhou.emit(pedido)
+
+
+_processador: Optional[ProcessadorChat] = None
+
+
+def get_processador_chat() -> ProcessadorChat:
+    global _processador
+    if _processador is None:
+        _processador = ProcessadorChat()
+    return _processador
@@ -2,16 +2,27 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QInputDialog, QMessageBox,
     QPushButton, QHBoxLayout, QScrollArea, QFrame, QSizePolicy,
-    QApplication
+    QLineEdit, QListWidget, QListWidgetItem, QDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from banco.controles.kanban.controle_coluna import ControleColunaKanban
 from banco.controles.kanban.controle_card import ControleCardKanban
+from interface.objeto.barramento_alteracoes import get_barramento_alteracoes
+from interface.objeto.card_kanban import CardKanbanWidget
 from interface.objeto.coluna_kanban import ColunaKanbanWidget
+from interface.objeto.painel_tarefas import PainelTarefas
 
 
 class QuadroKanbanWindow(QWidget):
 
+    # tabelas do registro de alterações que afetam o quadro (ver _on_alteracoes_banco)
+    TABELAS_ALTERACOES = (
+        "kanban_colunas", "kanban_cards", "kanban_card_attachments",
+        "kanban_card_checklist", "kanban_tags", "kanban_card_tags",
+    )
+    # acima disso uma recarga (reconciliada) do quadro sai mais barata que snapshots por card
+    LIMITE_CARDS_PONTUAL = 200
+
     def __init__(self, quadro_id=None, nome_quadro=None, controle_coluna=None, controle_card=None, parent=None):
         super().__init__(parent)
         self.quadro_id = quadro_id
@@ -36,10 +47,30 @@ class QuadroKanbanWindow(QWidget):
         self.header.setAlignment(Qt.AlignCenter)
         self.header.setStyleSheet("font-weight: bold; font-size: 20px;")
 
+        # BUSCA (índice FTS — ver ControleCardKanban.buscar_cards)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Buscar cards, checklists e anexos...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedHeight(40)
+        self.search_input.setMinimumWidth(280)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._executar_busca)
+        self.search_input.textChanged.connect(lambda _: self._search_timer.start())
+        self.search_input.returnPressed.connect(self._executar_busca)
+
         header_layout.addWidget(self.btn_voltar)
         header_layout.addWidget(self.header, 1)
+        header_layout.addWidget(self.search_input)
         self.layout.addLayout(header_layout)
 
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(220)
+        self.search_results.setVisible(False)
+        self.search_results.itemActivated.connect(self._on_resultado_ativado)
+        self.layout.addWidget(self.search_results)
+
         # ÁREA DE COLUNAS
         self.columns_scroll = QScrollArea()
         self.columns_scroll.setWidgetResizable(True)
@@ -62,9 +93,17 @@ class QuadroKanbanWindow(QWidget):
         self.columns_scroll.setWidget(self.columns_container)
         self.layout.addWidget(self.columns_scroll, 1)
 
-        # carregar colunas (o placeholder será criado dentro de load_columns)
+        # TAREFAS DE I/O (importação/exportação/remoção de arquivos em background)
+        self.painel_tarefas = PainelTarefas(parent=self)
+        self.layout.addWidget(self.painel_tarefas)
+
+        # carregar colunas (o botão de nova coluna é criado dentro de load_columns)
+        self.add_column_button = None
         self.load_columns()
 
+        # escritas de outras conexões (tarefas em background, outras telas, outro processo)
+        get_barramento_alteracoes().assinar(self.TABELAS_ALTERACOES, self._on_alteracoes_banco, dono=self)
+
     def buscar_nome_quadro(self):
         return f"Quadro {self.quadro_id}" if self.quadro_id else "Quadro"
 
@@ -134,65 +173,135 @@ class QuadroKanbanWindow(QWidget):
 
     def load_columns(self):
         """
-        Recarrega as colunas do quadro.
-        Limpa corretamente widgets e itens do layout, recria placeholder como botão visível e força redraw.
+        Recarrega as colunas do quadro a partir do snapshot.
+        Reconcilia pelo id da coluna: colunas que continuam no quadro mantêm o
+        widget (e reconciliam os próprios cards), novas são criadas e as
+        removidas saem do layout. O botão de nova coluna fica sempre no fim.
         """
-        # limpa o layout de colunas (trata widgets e spacers)
-        while self.columns_layout.count():
-            item = self.columns_layout.takeAt(0)
-            if item is None:
-                continue
-            w = item.widget()
-            if w:
-                w.setParent(None)
-                w.deleteLater()
-            # spacers/itens não-widget já foram removidos pelo takeAt
-
-        self._coluna_widgets = []
-
-        # recria placeholder (agora botão)
-        self.add_column_button = self._create_add_column_button()
+        if getattr(self, "add_column_button", None) is None:
+            self.add_column_button = self._create_add_column_button()
+            self.columns_layout.addWidget(self.add_column_button)
+            # pequeno spacer para o botão não ficar colado à borda direita em janelas largas
+            self.columns_layout.addStretch(1)
 
         colunas = []
         try:
-            colunas = self.controle_coluna.listar_colunas(self.quadro_id) or []
+            # snapshot: colunas + cards + tags/checklist/anexos/pastas em queries fixas
+            colunas = self.controle_card.load_board_snapshot(self.quadro_id).get("colunas") or []
         except Exception as e:
             # não interrompe a UI — mostra o placeholder mesmo que a listagem falhe
-            print("Erro ao listar colunas:", e)
+            print("Erro ao carregar snapshot do quadro:", e)
             colunas = []
 
-        for coluna in colunas:
-            widget_coluna = ColunaKanbanWidget(
-                coluna_id=coluna.get("id"),
-                titulo=coluna.get("titulo"),
-                parent=self,
-                compact=True,
-                controle_card=self.controle_card,
-                controle_coluna=self.controle_coluna
-            )
-            widget_coluna.setMinimumWidth(260)
-            widget_coluna.setMaximumWidth(400)
-            widget_coluna.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
-
-            if hasattr(widget_coluna, "load_cards"):
-                try:
-                    widget_coluna.load_cards()
-                except Exception:
-                    pass
-
-            self.columns_layout.addWidget(widget_coluna)
+        antigos = {w.coluna_id: w for w in self._coluna_widgets}
+        self._coluna_widgets = []
+        for pos, coluna in enumerate(colunas):
+            widget_coluna = antigos.pop(coluna.get("id"), None)
+            if widget_coluna is None:
+                widget_coluna = ColunaKanbanWidget(
+                    coluna_id=coluna.get("id"),
+                    titulo=coluna.get("titulo"),
+                    parent=self,
+                    compact=True,
+                    controle_card=self.controle_card,
+                    controle_coluna=self.controle_coluna,
+                    cards=coluna.get("cards")
+                )
+                widget_coluna.setMinimumWidth(260)
+                widget_coluna.setMaximumWidth(400)
+                widget_coluna.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+            else:
+                if widget_coluna.titulo != coluna.get("titulo"):
+                    widget_coluna.titulo = coluna.get("titulo")
+                    widget_coluna.lbl_title.setText(widget_coluna.titulo)
+                widget_coluna.load_cards(coluna.get("cards") or [])
+
+            atual = self.columns_layout.indexOf(widget_coluna)
+            if atual != pos:
+                if atual >= 0:
+                    self.columns_layout.removeWidget(widget_coluna)
+                self.columns_layout.insertWidget(pos, widget_coluna)
             self._coluna_widgets.append(widget_coluna)
 
-        # sempre adicionar o botão de nova coluna ao final (visível mesmo com zero colunas)
-        self.columns_layout.addWidget(self.add_column_button)
-        # adiciona um pequeno spacer para evitar que o botão fique colado à borda direita em janelas largas
-        self.columns_layout.addStretch(1)
+        for widget_coluna in antigos.values():
+            self.columns_layout.removeWidget(widget_coluna)
+            widget_coluna.setParent(None)
+            widget_coluna.deleteLater()
 
-        # força atualização visual do container
-        self.columns_container.adjustSize()
-        self.columns_container.update()
-        self.columns_scroll.update()
-        QApplication.processEvents()
+    def _on_alteracoes_banco(self, lote):
+        """
+        Alterações vindas do registro do banco. As escritas feitas por este quadro
+        já foram aplicadas pelos eventos do controle; aqui os snapshots batem com
+        o que está na tela e nada é redesenhado. Lote vazio: recarrega tudo.
+        """
+        if not lote or self.quadro_id in lote.refs.get("kanban_colunas", ()) or "kanban_tags" in lote.tabelas:
+            self.load_columns()
+            return
+        card_ids = lote.ids("kanban_cards") | lote.refs.get("kanban_cards", set())  # + pais (pastas)
+        card_ids |= lote.refs.get("kanban_card_attachments", set())
+        card_ids |= lote.refs.get("kanban_card_checklist", set())
+        card_ids |= lote.ids("kanban_card_tags")
+        if not card_ids:
+            return
+        if len(card_ids) > self.LIMITE_CARDS_PONTUAL:
+            self.load_columns()
+            return
+        snapshots = {cid: self.controle_card.load_card_snapshot(cid) for cid in card_ids}
+        for widget_coluna in self._coluna_widgets:
+            widget_coluna.sincronizar_cards(snapshots)
+
+    # ---------- busca ----------
+    def _executar_busca(self):
+        self._search_timer.stop()
+        termo = self.search_input.text().strip()
+        self.search_results.clear()
+        if not termo:
+            self.search_results.setVisible(False)
+            return
+
+        resultados = self.controle_card.buscar_cards(termo, quadro_id=self.quadro_id, limit=50)
+        titulos_colunas = {w.coluna_id: w.titulo for w in self._coluna_widgets}
+        if not resultados:
+            item = QListWidgetItem("Nenhum card encontrado.")
+            item.setFlags(Qt.NoItemFlags)
+            self.search_results.addItem(item)
+        for card in resultados:
+            coluna = titulos_colunas.get(card.get("coluna_id"), "")
+            texto = f"{card.get('titulo') or ''}  —  {coluna}"
+            trecho = (card.get("trecho") or "").replace("\n", " ")
+            if trecho:
+                texto += f"\n    {trecho}"
+            item = QListWidgetItem(texto)
+            item.setData(Qt.UserRole, card)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(True)
+
+    def _on_resultado_ativado(self, item):
+        card = item.data(Qt.UserRole)
+        if not card:
+            return
+        parent_coluna = next((w for w in self._coluna_widgets if w.coluna_id == card.get("coluna_id")), self)
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Card: {card.get('titulo') or ''}")
+        layout = QVBoxLayout(dialog)
+        widget = CardKanbanWidget(card_id=card.get("id"), titulo=card.get("titulo"),
+                                  coluna_id=card.get("coluna_id"), parent_coluna=parent_coluna)
+        widget.setParent(dialog)
+        widget.setMaximumWidth(16777215)
+        layout.addWidget(widget)
+        try:
+            dialog.resize(420, 360)
+            dialog.exec_()
+        finally:
+            for obj in (widget, dialog):
+                try:
+                    obj.deleteLater()
+                except RuntimeError:
+                    # o widget pode já ter sido destruído (ex.: card excluído no diálogo)
+                    pass
+        # edições feitas no diálogo chegam às colunas pelos eventos do controle;
+        # só a lista de resultados precisa ser refeita
+        self._executar_busca()
 
     def _on_add_column_clicked(self):
         titulo, ok = QInputDialog.getText(self, "Nova Coluna", "Título da coluna:")
@@ -205,7 +314,7 @@ class QuadroKanbanWindow(QWidget):
             QMessageBox.warning(self, "Erro", "Não foi possível criar a coluna.")
             return
 
-        # recarrega colunas
+        # reconcilia: só a coluna nova é criada
         self.load_columns()
 
     def resizeEvent(self, event):
@@ -0,0 +1,363 @@
+# interface/objeto/tarefas_io.py
+"""
+Tarefas de I/O do Kanban fora da thread da GUI.
+
+Toda operação de arquivo do Kanban (importar anexos, importar/exportar pasta em
+ZIP, apagar arquivos após purge_subtree) é um objeto Tarefa submetido ao
+GerenciadorTarefas da aplicação (get_gerenciador_tarefas()):
+
+- a Tarefa vive na thread da GUI; executar() roda em um QThreadPool próprio e
+  os sinais (progresso, estado, concluida/falhou/cancelada) chegam na GUI por
+  conexão enfileirada, então os slots podem tocar em widgets;
+- tarefas que usam o banco criam um ControleCardKanban na thread de trabalho
+  (as conexões sqlite são por thread, ver banco/conexoes.py);
+- progresso é limitado a um sinal a cada INTERVALO_PROGRESSO, para não encher
+  a fila de eventos da GUI em arquivos grandes;
+- cancelar() marca um Event consultado pelo callback de progresso, que
+  interrompe a operação com OperacaoCancelada;
+- a fila é limitada (MAX_PENDENTES): submeter() levanta FilaCheia em vez de
+  acumular trabalho sem fim.
+
+O painel interface/objeto/painel_tarefas.py mostra as tarefas em andamento.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, List, Optional, Set
+
+from PyQt5.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QProgressDialog
+
+from banco.controles.kanban.controle_card import ControleCardKanban
+from banco.controles.kanban.zip_pastas import OperacaoCancelada, escrever_zip_pasta
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluída"
+CANCELADA = "cancelada"
+FALHOU = "falhou"
+ESTADOS_FINAIS = (CONCLUIDA, CANCELADA, FALHOU)
+
+_ids = itertools.count(1)
+
+
+class FilaCheia(RuntimeError):
+    """Levantada por GerenciadorTarefas.submeter quando há tarefas pendentes demais."""
+
+
+class Tarefa(QObject):
+    """Base das tarefas: subclasses implementam executar() (roda fora da GUI)."""
+
+    progresso = pyqtSignal(object, object)   # feitos, total (bytes ou itens; podem passar de 2 GB)
+    estado_alterado = pyqtSignal(str)
+    concluida = pyqtSignal(object)           # resultado de executar()
+    falhou = pyqtSignal(str)
+    cancelada = pyqtSignal()
+    finalizada = pyqtSignal()                # qualquer desfecho, depois dos sinais acima
+
+    titulo = "Tarefa"
+    cancelavel = True
+    INTERVALO_PROGRESSO = 0.05
+
+    def __init__(self, titulo: Optional[str] = None):
+        super().__init__()
+        self.id = next(_ids)
+        if titulo:
+            self.titulo = titulo
+        self.estado = PENDENTE
+        self.feitos = 0
+        self.total = 0
+        self.erro = ""
+        self.resultado: Any = None
+        self._cancelar = threading.Event()
+        self._ultimo_progresso = 0.0
+
+    # ------------------ API (thread da GUI) ------------------
+    def cancelar(self):
+        if self.cancelavel:
+            self._cancelar.set()
+
+    @property
+    def finalizada_em_estado(self) -> bool:
+        return self.estado in ESTADOS_FINAIS
+
+    # ------------------ API (thread de trabalho) ------------------
+    def executar(self) -> Any:
+        raise NotImplementedError
+
+    def reportar(self, feitos: int, total: int) -> bool:
+        """Callback de progresso no formato de zip_pastas/import_folder_from_zip: False = cancelar."""
+        self.feitos, self.total = feitos, total
+        agora = time.monotonic()
+        if feitos >= total or agora - self._ultimo_progresso >= self.INTERVALO_PROGRESSO:
+            self._ultimo_progresso = agora
+            self.progresso.emit(feitos, total)
+        return not self._cancelar.is_set()
+
+    def avancador(self, total: int):
+        """Callback avancar(n) que acumula bytes e levanta OperacaoCancelada se pedido."""
+        self.total = total
+
+        def _avancar(n: int):
+            if not self.reportar(self.feitos + n, self.total):
+                raise OperacaoCancelada()
+        return _avancar
+
+    def _mudar_estado(self, estado: str):
+        self.estado = estado
+        self.estado_alterado.emit(estado)
+
+    def _rodar(self):
+        if self._cancelar.is_set():
+            self._mudar_estado(CANCELADA)
+            self.cancelada.emit()
+            self.finalizada.emit()
+            return
+        self._mudar_estado(EXECUTANDO)
+        try:
+            self.resultado = self.executar()
+        except OperacaoCancelada:
+            self._mudar_estado(CANCELADA)
+            self.cancelada.emit()
+        except Exception as e:
+            self.erro = str(e)
+            self._mudar_estado(FALHOU)
+            self.falhou.emit(self.erro)
+        else:
+            self._mudar_estado(CONCLUIDA)
+            self.concluida.emit(self.resultado)
+        self.finalizada.emit()
+
+
+class _Executor(QRunnable):
+    def __init__(self, tarefa: Tarefa):
+        super().__init__()
+        self.tarefa = tarefa
+
+    def run(self):
+        self.tarefa._rodar()
+
+
+class GerenciadorTarefas(QObject):
+    """Pool de threads + fila limitada + histórico das tarefas recentes (para o painel)."""
+
+    MAX_THREADS = 2
+    MAX_PENDENTES = 32
+    HISTORICO = 50
+
+    tarefa_adicionada = pyqtSignal(object)
+
+    def __init__(self, max_threads: int = MAX_THREADS, max_pendentes: int = MAX_PENDENTES, parent=None):
+        super().__init__(parent)
+        self.max_pendentes = max_pendentes
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._ativas: Set[Tarefa] = set()
+        self._historico: "deque[Tarefa]" = deque(maxlen=self.HISTORICO)
+
+    def submeter(self, tarefa: Tarefa, forcar: bool = False) -> Tarefa:
+        """Enfileira a tarefa. Acima de max_pendentes levanta FilaCheia, exceto com
+        forcar=True: tarefas obrigatórias (ex.: apagar os arquivos de registros já
+        removidos do banco) entram mesmo assim e só esperam a vez no pool."""
+        pendentes = sum(1 for t in self._ativas if t.estado == PENDENTE)
+        if pendentes >= self.max_pendentes and not forcar:
+            raise FilaCheia(f"Há {pendentes} tarefas aguardando; tente novamente em instantes.")
+        # a referência em _ativas mantém a tarefa viva até terminar, mesmo que o widget de origem suma
+        self._ativas.add(tarefa)
+        tarefa.finalizada.connect(lambda t=tarefa: self._ativas.discard(t))
+        self._historico.append(tarefa)
+        self.tarefa_adicionada.emit(tarefa)
+        self._pool.start(_Executor(tarefa))
+        return tarefa
+
+    def tarefas(self) -> List[Tarefa]:
+        return list(self._historico)
+
+    def ativas(self) -> List[Tarefa]:
+        return [t for t in self._historico if not t.finalizada_em_estado]
+
+    def limpar_finalizadas(self):
+        for t in [t for t in self._historico if t.finalizada_em_estado]:
+            self._historico.remove(t)
+
+    def cancelar_todas(self):
+        for t in list(self._ativas):
+            t.cancelar()
+
+    def aguardar(self, timeout_ms: int = -1) -> bool:
+        """Bloqueia até o pool esvaziar (usado ao fechar a aplicação)."""
+        return self._pool.waitForDone(timeout_ms)
+
+
+_gerenciador: Optional[GerenciadorTarefas] = None
+
+
+def get_gerenciador_tarefas() -> GerenciadorTarefas:
+    global _gerenciador
+    if _gerenciador is None:
+        _gerenciador = GerenciadorTarefas()
+    return _gerenciador
+
+
+# ==========================================================
+# Tarefas do Kanban
+# ==========================================================
+class TarefaImportarArquivos(Tarefa):
+    """Importa arquivos para a pasta de um card (import_file_to_folder). Resultado: ids dos anexos."""
+
+    def __init__(self, db_path: Optional[str], card_id: int, caminhos: List[str]):
+        nomes = ", ".join(os.path.basename(c) for c in caminhos[:2]) + ("..." if len(caminhos) > 2 else "")
+        super().__init__(f"Importar {nomes}")
+        self.db_path = db_path
+        self.card_id = card_id
+        self.caminhos = list(caminhos)
+
+    def executar(self) -> List[int]:
+        total = sum(os.path.getsize(c) for c in self.caminhos)
+        avancar = self.avancador(total)
+        controle = ControleCardKanban(self.db_path)
+        try:
+            return [controle.import_file_to_folder(self.card_id, c, avancar) for c in self.caminhos]
+        finally:
+            controle.close()
+
+
+class TarefaExportarPasta(Tarefa):
+    """Grava o ZIP de uma pasta já preparada na GUI (ControleCardKanban.preparar_exportacao)."""
+
+    def __init__(self, controle: ControleCardKanban, folder_card_id: int, zip_path: str):
+        super().__init__(f"Exportar {os.path.basename(zip_path)}")
+        self.zip_path = zip_path
+        # leitura do banco na thread dona da conexão; a escrita do ZIP vai para o pool
+        self.estrutura, self.arquivos = controle.preparar_exportacao(folder_card_id)
+
+    def executar(self) -> str:
+        escrever_zip_pasta(self.zip_path, self.estrutura, self.arquivos, progresso=self.reportar)
+        return self.zip_path
+
+
+class TarefaImportarPasta(Tarefa):
+    """import_folder_from_zip em um controle próprio. Segura a escrita no banco até terminar."""
+
+    def __init__(self, db_path: Optional[str], parent_folder_id: int, zip_path: str):
+        super().__init__(f"Importar {os.path.basename(zip_path)}")
+        self.db_path = db_path
+        self.parent_folder_id = parent_folder_id
+        self.zip_path = zip_path
+
+    def executar(self) -> bool:
+        controle = ControleCardKanban(self.db_path)
+        try:
+            if not controle.import_folder_from_zip(self.parent_folder_id, self.zip_path, progresso=self.reportar):
+                raise OperacaoCancelada()
+            return True
+        finally:
+            controle.close()
+
+
+class TarefaRemoverArquivos(Tarefa):
+    """
+    Apaga os arquivos devolvidos por purge_subtree e as pastas que ficarem vazias
+    dentro de base_dir. Não é cancelável: os registros já saíram do banco.
+    Resultado: (removidos, erros [(caminho, mensagem)]).
+    """
+
+    cancelavel = False
+
+    def __init__(self, arquivos: List[str], base_dir: Optional[str] = None):
+        super().__init__(f"Remover {len(arquivos)} arquivo(s)")
+        self.arquivos = list(arquivos)
+        self.base_dir = os.path.abspath(base_dir or ControleCardKanban.IMPORT_BASE_DIR)
+
+    def _limpar_pastas_vazias(self, pastas: Set[str]):
+        # sobe removendo diretórios vazios, sem nunca sair de base_dir
+        for pasta in sorted(pastas, key=len, reverse=True):
+            atual = os.path.abspath(pasta)
+            while atual.startswith(self.base_dir + os.sep):
+                try:
+                    os.rmdir(atual)
+                except OSError:
+                    break
+                atual = os.path.dirname(atual)
+
+    def executar(self):
+        total = len(self.arquivos)
+        removidos = 0
+        erros = []
+        pastas: Set[str] = set()
+        for i, caminho in enumerate(self.arquivos, start=1):
+            try:
+                if os.path.isfile(caminho):
+                    os.remove(caminho)
+                    removidos += 1
+                pastas.add(os.path.dirname(caminho))
+            except OSError as e:
+                erros.append((caminho, str(e)))
+            self.reportar(i, total)
+        self._limpar_pastas_vazias(pastas)
+        for caminho, msg in erros:
+            print(f"Falha ao remover arquivo {caminho}: {msg}")
+        return removidos, erros
+
+
+# ==========================================================
+# Atalhos usados pela UI
+# ==========================================================
+def dialogo_progresso(tarefa: Tarefa, parent_widget=None, modal: bool = False) -> QProgressDialog:
+    """QProgressDialog ligado aos sinais da tarefa (para operações que precisam bloquear a janela)."""
+    dialog = QProgressDialog(tarefa.titulo, "Cancelar" if tarefa.cancelavel else None, 0, 1000, parent_widget)
+    dialog.setWindowTitle(tarefa.titulo)
+    if modal:
+        dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.canceled.connect(tarefa.cancelar)
+    dialog.setValue(0)
+
+    def _progresso(feitos, total):
+        try:
+            # escala 0..1000: QProgressDialog usa int de 32 bits
+            dialog.setValue(int(feitos * 1000 / total) if total else 1000)
+        except RuntimeError:
+            pass
+
+    def _fechar():
+        try:
+            dialog.close()
+            dialog.deleteLater()
+        except RuntimeError:
+            pass
+
+    tarefa.progresso.connect(_progresso)
+    tarefa.finalizada.connect(_fechar)
+    return dialog
+
+
+def importar_arquivos_em_background(controle: ControleCardKanban, card_id: int, caminhos: List[str]) -> Tarefa:
+    return get_gerenciador_tarefas().submeter(TarefaImportarArquivos(controle.db_path, card_id, caminhos))
+
+
+def exportar_pasta_em_background(controle: ControleCardKanban, folder_card_id: int, zip_path: str) -> Tarefa:
+    return get_gerenciador_tarefas().submeter(TarefaExportarPasta(controle, folder_card_id, zip_path))
+
+
+def importar_pasta_em_background(controle: ControleCardKanban, parent_folder_id: int, zip_path: str,
+                                 parent_widget=None) -> Tarefa:
+    """A importação de ZIP segura a escrita no banco até o commit, então mostra um diálogo modal."""
+    tarefa = TarefaImportarPasta(controle.db_path, parent_folder_id, zip_path)
+    dialogo_progresso(tarefa, parent_widget, modal=True)
+    return get_gerenciador_tarefas().submeter(tarefa)
+
+
+def remover_arquivos_em_background(arquivos: List[str]) -> Optional[Tarefa]:
+    """
+    Atalho usado após purge_subtree(). Retorna None se não houver arquivos.
+    Nunca recusa por fila cheia: os registros já saíram do banco e nenhuma outra
+    rotina apaga esses arquivos (coletar_lixo só olha o armazém de blobs).
+    """
+    if not arquivos:
+        return None
+    return get_gerenciador_tarefas().submeter(TarefaRemoverArquivos(arquivos), forcar=True)
@@ -1,10 +1,15 @@
 import os
 import traceback
+from datetime import datetime, timezone
+from functools import partial
 from typing import Optional
 
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPainter, QPainterPath, QPixmap, QColor
-from PyQt5.QtWidgets import QApplication, QFrame, QLabel, QPushButton, QVBoxLayout, QWidget, QHBoxLayout
+from PyQt5.QtWidgets import (QApplication, QFrame, QLabel, QMessageBox, QPushButton, QVBoxLayout, QWidget,
+                             QHBoxLayout)
+
+from banco.sessoes import apagar_token_local, esquecer_dispositivo, listar_sessoes, revogar_sessao, revogar_todas
 
 
 class ProfileMixin:
@@ -178,6 +183,7 @@ class ProfileMixin:
 
             try:
                 self._insert_if_missing(layout, self._profile_card, 0)
+                self._recarregar_sessoes()
                 self._profile_card.show()
                 self._profile_card.raise_()
                 frame.raise_()
@@ -299,6 +305,10 @@ class ProfileMixin:
         v.addWidget(row_papel)
         v.addWidget(row_cargo)
 
+        sessoes = self._criar_secao_sessoes()
+        if sessoes is not None:
+            v.addWidget(sessoes)
+
         btn_row = QHBoxLayout()
         btn_row.addStretch()
         btn_close = QPushButton("Fechar")
@@ -317,3 +327,110 @@ class ProfileMixin:
         }
 
         return card
+
+    # ------------------ sessões lembradas (banco/sessoes.py) ------------------
+    def _criar_secao_sessoes(self) -> Optional[QWidget]:
+        if not (self.dados_usuario or {}).get("id"):
+            return None
+        box = QWidget()
+        layout = QVBoxLayout(box)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        lbl = QLabel("Sessões lembradas")
+        lbl.setProperty("fieldLabel", True)
+        layout.addWidget(lbl)
+
+        lista = QVBoxLayout()
+        lista.setSpacing(4)
+        layout.addLayout(lista)
+
+        btn_todas = QPushButton("Revogar todas")
+        btn_todas.setFixedHeight(26)
+        btn_todas.setCursor(Qt.PointingHandCursor)
+        btn_todas.clicked.connect(self._revogar_todas_sessoes)
+        layout.addWidget(btn_todas, alignment=Qt.AlignRight)
+
+        box._lista_sessoes = lista
+        box._btn_todas = btn_todas
+        self._sessoes_box = box
+        self._recarregar_sessoes()
+        return box
+
+    def _recarregar_sessoes(self):
+        box = getattr(self, "_sessoes_box", None)
+        usuario_id = (self.dados_usuario or {}).get("id")
+        if box is None or not usuario_id:
+            return
+        lista = box._lista_sessoes
+        while lista.count():
+            item = lista.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+        try:
+            sessoes = listar_sessoes(usuario_id)
+        except Exception:
+            traceback.print_exc()
+            sessoes = []
+
+        if not sessoes:
+            vazio = QLabel("Nenhuma sessão lembrada.")
+            vazio.setFont(QFont("", 9))
+            lista.addWidget(vazio)
+
+        atual = self.dados_usuario.get("sessao_id")
+        for sessao in sessoes:
+            row = QWidget()
+            h = QHBoxLayout(row)
+            h.setContentsMargins(0, 0, 0, 0)
+            h.setSpacing(6)
+            nome = sessao.get("dispositivo") or "dispositivo"
+            if sessao["id"] == atual:
+                nome += " (este)"
+            lbl = QLabel(f"{nome}\nÚltimo uso: {self._formatar_data_sessao(sessao.get('ultimo_uso'))}")
+            lbl.setFont(QFont("", 9))
+            lbl.setWordWrap(True)
+            btn = QPushButton("Revogar")
+            btn.setFixedHeight(24)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(partial(self._revogar_sessao, sessao["id"]))
+            h.addWidget(lbl, 1)
+            h.addWidget(btn)
+            lista.addWidget(row)
+
+        box._btn_todas.setEnabled(bool(sessoes))
+
+    @staticmethod
+    def _formatar_data_sessao(valor: Optional[str]) -> str:
+        # gravado em UTC (datetime.utcnow().isoformat()); mostrado no fuso local
+        try:
+            return datetime.fromisoformat(valor).replace(tzinfo=timezone.utc).astimezone().strftime("%d/%m/%Y %H:%M")
+        except (TypeError, ValueError):
+            return "—"
+
+    def _revogar_sessao(self, sessao_id: int):
+        usuario_id = self.dados_usuario.get("id")
+        try:
+            if sessao_id == self.dados_usuario.get("sessao_id"):
+                # a deste dispositivo: apaga também o token local
+                esquecer_dispositivo(usuario_id, sessao_id)
+                self.dados_usuario.pop("sessao_id", None)
+            else:
+                revogar_sessao(sessao_id, usuario_id)
+        except Exception:
+            traceback.print_exc()
+        self._recarregar_sessoes()
+
+    def _revogar_todas_sessoes(self):
+        resposta = QMessageBox.question(
+            self, "Revogar sessões",
+            "Encerrar todas as sessões lembradas? Os dispositivos voltarão a pedir a senha.")
+        if resposta != QMessageBox.Yes:
+            return
+        try:
+            revogar_todas(self.dados_usuario.get("id"))
+            if self.dados_usuario.pop("sessao_id", None) is not None:
+                apagar_token_local()
+        except Exception:
+            traceback.print_exc()
+        self._recarregar_sessoes()
@@ -43,8 +43,10 @@ def get_registry() -> RegistroComandos:
     return reg
 
 
-def dispatch_chat_command(texto: str, session_id: Optional[int] = None, usuario: Optional[str] = None) -> ResultadoComando:
-    contexto = ContextoComando(texto_original=texto, session_id=session_id, usuario=usuario)
+def dispatch_chat_command(texto: str, session_id: Optional[int] = None, usuario: Optional[str] = None,
+                          contexto: Optional[ContextoComando] = None) -> ResultadoComando:
+    if contexto is None:
+        contexto = ContextoComando(texto_original=texto, session_id=session_id, usuario=usuario)
     registry = get_registry()
     return registry.dispatch(texto, contexto)
 
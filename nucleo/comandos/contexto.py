@@ -1,5 +1,6 @@
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 @dataclass
@@ -8,4 +9,17 @@ class ContextoComando:
     session_id: Optional[int] = None
     usuario: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # resposta parcial: handlers longos chamam parcial(trecho) enquanto trabalham
+    ao_parcial: Optional[Callable[[str], None]] = None
+    parciais: List[str] = field(default_factory=list)
+    # marcado quando o processamento estoura o tempo ou é cancelado
+    cancelamento: threading.Event = field(default_factory=threading.Event)
 
+    def parcial(self, trecho: str) -> None:
+        self.parciais.append(trecho)
+        if self.ao_parcial is not None:
+            self.ao_parcial(trecho)
+
+    @property
+    def cancelado(self) -> bool:
+        return self.cancelamento.is_set()
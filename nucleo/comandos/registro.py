@@ -1,11 +1,48 @@
+"""
+Registro de comandos do chat.
+
+As palavras-chave podem ter mais de uma palavra ("criar comando") e ficam num
+trie de tokens: o dispatch percorre os tokens do texto enquanto houver filho
+no trie e usa o comando mais longo encontrado, então o custo depende do
+tamanho do comando digitado, não do número de comandos cadastrados.
+
+Para o que não casou:
+- completar(prefixo): chaves que começam com o prefixo (lista ordenada + bisect);
+- sugerir(texto): chaves a até MAX_DISTANCIA edições do início do texto,
+  mais as completações do que foi digitado. A distância de Levenshtein é
+  calculada descendo o próprio trie (uma linha da tabela por caractere,
+  compartilhada pelas chaves com o mesmo prefixo) e um ramo é abandonado
+  assim que nenhuma célula da linha fica dentro do limite.
+
+Comandos podem ser removidos/substituídos (unregister) sem reconstruir o
+índice, o que permite recarregar só os comandos de banco que mudaram.
+"""
+import re
+import threading
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from nucleo.comandos.contexto import ContextoComando
 
 
 CommandHandler = Callable[[ContextoComando, str], str]
 
+_TOKEN = re.compile(r"\S+")
+
+
+def normalizar_chave(keyword: str) -> str:
+    """'  Criar   Comando ' -> 'criar comando'."""
+    return " ".join(keyword.lower().split())
+
+
+def _proxima_linha(linha: List[int], caractere: str, alvo: str) -> List[int]:
+    """Uma linha da tabela de Levenshtein: `linha` + `caractere` contra cada prefixo de `alvo`."""
+    nova = [linha[0] + 1]
+    for j, c in enumerate(alvo, 1):
+        nova.append(min(nova[j - 1] + 1, linha[j] + 1, linha[j - 1] + (c != caractere)))
+    return nova
+
 
 @dataclass
 class ComandoDef:
@@ -13,6 +50,7 @@ class ComandoDef:
     description: str
     handler: CommandHandler
     aliases: Iterable[str] = field(default_factory=tuple)
+    origem: str = "codigo"      # "codigo" ou "banco" (chat_comandos)
 
 
 @dataclass
@@ -20,57 +58,216 @@ class ResultadoComando:
     matched: bool
     keyword: Optional[str] = None
     message: Optional[str] = None
+    sugestoes: List[str] = field(default_factory=list)
+
+
+class _NoTrie:
+    __slots__ = ("filhos", "comando")
+
+    def __init__(self):
+        self.filhos: Dict[str, "_NoTrie"] = {}
+        self.comando: Optional[ComandoDef] = None
 
 
 class RegistroComandos:
+    MAX_SUGESTOES = 3
+    MAX_DISTANCIA = 2           # edições aceitas numa sugestão (1 para textos de até 4 letras)
+
     def __init__(self):
         self._handlers: Dict[str, ComandoDef] = {}
+        self._raiz = _NoTrie()
+        self._chaves: List[str] = []          # ordenadas, para completar()
+        # dispatch só lê o trie (sem iterar); escritas e buscas que iteram usam a trava
+        self._lock = threading.RLock()
 
+    # -------------------------
+    # Cadastro
+    # -------------------------
     def register(
         self,
         keyword: str,
         handler: CommandHandler,
         description: str = "",
         aliases: Iterable[str] = (),
+        origem: str = "codigo",
     ) -> None:
-        normalized = keyword.strip().lower()
+        normalized = normalizar_chave(keyword)
         if not normalized:
             raise ValueError("keyword inválida")
         cmd = ComandoDef(
             keyword=normalized,
             description=description.strip(),
             handler=handler,
-            aliases=tuple(a.strip().lower() for a in aliases if a.strip()),
+            aliases=tuple(normalizar_chave(a) for a in aliases if a.strip()),
+            origem=origem,
         )
-        self._handlers[normalized] = cmd
-        for alias in cmd.aliases:
-            self._handlers[alias] = cmd
+        with self._lock:
+            existente = self._handlers.get(normalized)
+            if existente is not None and existente.keyword == normalized:
+                # substituição: os aliases antigos saem junto
+                self.unregister(normalized)
+            for chave in (cmd.keyword, *cmd.aliases):
+                self._indexar(chave, cmd)
+
+    def unregister(self, keyword: str) -> bool:
+        """Remove o comando (e os aliases dele). Retorna False se não existia."""
+        with self._lock:
+            cmd = self._handlers.get(normalizar_chave(keyword))
+            if cmd is None:
+                return False
+            for chave in (cmd.keyword, *cmd.aliases):
+                if self._handlers.get(chave) is cmd:
+                    self._desindexar(chave)
+            return True
+
+    def get(self, keyword: str) -> Optional[ComandoDef]:
+        return self._handlers.get(normalizar_chave(keyword))
+
+    def _indexar(self, chave: str, cmd: ComandoDef) -> None:
+        no = self._raiz
+        for token in chave.split(" "):
+            no = no.filhos.setdefault(token, _NoTrie())
+        no.comando = cmd
+        if chave not in self._handlers:
+            insort(self._chaves, chave)
+        self._handlers[chave] = cmd
+
+    def _desindexar(self, chave: str) -> None:
+        del self._handlers[chave]
+        del self._chaves[bisect_left(self._chaves, chave)]
+        caminho = [self._raiz]
+        tokens = chave.split(" ")
+        for token in tokens:
+            caminho.append(caminho[-1].filhos[token])
+        caminho[-1].comando = None
+        # poda os nós que ficaram sem comando e sem filhos
+        for i in range(len(tokens), 0, -1):
+            no = caminho[i]
+            if no.comando is not None or no.filhos:
+                break
+            del caminho[i - 1].filhos[tokens[i - 1]]
 
     def list_commands(self) -> Dict[str, str]:
         unique = {}
-        for cmd in self._handlers.values():
+        for cmd in list(self._handlers.values()):
             unique[cmd.keyword] = cmd.description
         return dict(sorted(unique.items()))
 
+    # -------------------------
+    # Busca
+    # -------------------------
+    @staticmethod
+    def _token_normalizado(match: re.Match, primeiro: bool) -> str:
+        token = match.group(0).lower()
+        if primeiro and token.startswith(("/", "!")):
+            token = token[1:]
+        return token.rstrip(":")
+
+    def encontrar(self, texto: str) -> Tuple[Optional[ComandoDef], str]:
+        """Comando mais longo no início do texto e os argumentos depois dele."""
+        raw = (texto or "").strip()
+        no = self._raiz
+        achado: Optional[ComandoDef] = None
+        fim_achado = 0
+        for i, match in enumerate(_TOKEN.finditer(raw)):
+            token = self._token_normalizado(match, i == 0)
+            if i == 0 and not token:
+                continue      # "/ kanban"
+            no = no.filhos.get(token)
+            if no is None:
+                break
+            if no.comando is not None:
+                achado, fim_achado = no.comando, match.end()
+        if achado is None:
+            return None, ""
+        return achado, raw[fim_achado:].strip()
+
+    def completar(self, prefixo: str, limite: int = 10) -> List[str]:
+        """Chaves (comandos e aliases) que começam com `prefixo`, em ordem alfabética."""
+        prefixo = normalizar_chave(prefixo.lstrip().lstrip("/!"))
+        if not prefixo:
+            return []
+        with self._lock:
+            resultado = []
+            i = bisect_left(self._chaves, prefixo)
+            while i < len(self._chaves) and len(resultado) < limite and self._chaves[i].startswith(prefixo):
+                resultado.append(self._chaves[i])
+                i += 1
+            return resultado
+
+    def sugerir(self, texto: str, limite: int = MAX_SUGESTOES) -> List[str]:
+        """Comandos parecidos com o início do texto (erros de digitação e prefixos)."""
+        matches = _TOKEN.finditer((texto or "").strip())
+        tokens = [t for t in (self._token_normalizado(m, i == 0) for i, m in enumerate(matches)) if t]
+        if not tokens:
+            return []
+        alvo = " ".join(tokens[:4])
+        # limite por prefixo do alvo que termina numa palavra (1, 2, ... palavras digitadas)
+        limites = {}
+        fim = -1
+        for token in tokens[:4]:
+            fim += len(token) + 1
+            limites[fim] = 1 if fim <= 4 else self.MAX_DISTANCIA
+        melhores: Dict[str, int] = {}
+        with self._lock:
+            pilha = [(self._raiz, list(range(len(alvo) + 1)))]
+            while pilha:
+                no, linha = pilha.pop()
+                for filho, nova in self._descer(no, linha, alvo):
+                    if filho.comando is not None:
+                        dist = min((nova[k] for k, lim in limites.items() if nova[k] <= lim), default=None)
+                        keyword = filho.comando.keyword
+                        if dist is not None and dist < melhores.get(keyword, self.MAX_DISTANCIA + 1):
+                            melhores[keyword] = dist
+                    pilha.append((filho, nova))
+            # "/kan" -> kanban: completações valem como distância máxima
+            for chave in self.completar(tokens[0], limite):
+                melhores.setdefault(self._handlers[chave].keyword, self.MAX_DISTANCIA)
+        return [k for k, _ in sorted(melhores.items(), key=lambda kv: (kv[1], kv[0]))][:limite]
+
+    def _descer(self, no: _NoTrie, linha: List[int], alvo: str):
+        """Filhos de `no` ainda a até MAX_DISTANCIA de algum prefixo do alvo, com a linha de cada um.
+        Os tokens são visitados em ordem para reaproveitar as linhas do prefixo comum
+        com o anterior (irmãos como 'acao1', 'acao2'... calculam 'acao' uma vez)."""
+        separador = "" if no is self._raiz else " "
+        linhas = [linha]          # linhas[i]: depois dos i primeiros caracteres do token atual
+        anterior = ""
+        for token in sorted(no.filhos):
+            texto = separador + token
+            comum = 0
+            limite_comum = min(len(anterior), len(texto), len(linhas) - 1)
+            while comum < limite_comum and anterior[comum] == texto[comum]:
+                comum += 1
+            del linhas[comum + 1:]
+            anterior = texto
+            if min(linhas[-1]) > self.MAX_DISTANCIA:
+                continue          # prefixo comum já fora do limite
+            for caractere in texto[comum:]:
+                nova = _proxima_linha(linhas[-1], caractere, alvo)
+                linhas.append(nova)
+                if min(nova) > self.MAX_DISTANCIA:
+                    break
+            else:
+                yield no.filhos[token], linhas[-1]
+
+    # -------------------------
+    # Execução
+    # -------------------------
     def dispatch(self, texto: str, contexto: ContextoComando) -> ResultadoComando:
         raw = (texto or "").strip()
         if not raw:
             return ResultadoComando(matched=False)
 
-        token, sep, remainder = raw.partition(" ")
-        if token.startswith(("/", "!")):
-            keyword = token[1:].strip().lower()
-        else:
-            keyword = token.strip().lower()
-        keyword = keyword.rstrip(":")
-
-        cmd = self._handlers.get(keyword)
+        cmd, args = self.encontrar(raw)
         if not cmd:
-            return ResultadoComando(matched=False)
+            sugestoes = self.sugerir(raw) if raw.startswith(("/", "!")) else []
+            return ResultadoComando(matched=False, sugestoes=sugestoes)
 
-        args = remainder.strip() if sep else ""
         try:
             output = cmd.handler(contexto, args)
         except Exception as exc:
             output = f"Comando '{cmd.keyword}' reconhecido, mas falhou ao executar: {exc}"
+        if not output and contexto.parciais:
+            # handler que só transmitiu trechos (contexto.parcial) sem retornar texto
+            output = "".join(contexto.parciais)
         return ResultadoComando(matched=True, keyword=cmd.keyword, message=output)
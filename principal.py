@@ -3,6 +3,7 @@ import sys
 from PyQt5.QtWidgets import QApplication
 
 from banco.init_db import inicializar_banco
+from banco.sessoes import entrar_com_token_salvo
 
 from interface.janelas.tela_login import TelaLogin
 from interface.interface import InterfaceWindow
@@ -33,14 +34,22 @@ class AppController:
         # 3️⃣ Aplica tema ativo automaticamente
         aplicar_tema_global(self.app)
 
-        # 4️⃣ Abre tela de login
+        # 4️⃣ Sessão lembrada (banco/sessoes.py): abre direto, sem login nem splash
+        self.login = None
+        dados_usuario = entrar_com_token_salvo()
+        if dados_usuario:
+            self.usuario_logado(dados_usuario)
+            return
+
+        # 5️⃣ Abre tela de login
         self.login = TelaLogin(self.usuario_logado)
         self.login.show()
 
     def usuario_logado(self, dados_usuario):
         self.main_window = InterfaceWindow(dados_usuario)
         self.main_window.show()
-        self.login.close()
+        if self.login is not None:
+            self.login.close()
 
     def run(self):
         sys.exit(self.app.exec())